@@ -7,10 +7,12 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from titulospub.dados.orquestrador import VariaveisMercado
+from titulospub.dados.snapshot import get_snapshot
+from titulospub.utils.instrumentacao import estatisticas_cargas
 
 from .logging_config import get_logger
 from .middleware.metrics import MetricsMiddleware
-from .routers import carteiras, equivalencia, lft, ltn, ntnb, ntnf, vencimentos
+from .routers import carteiras, curvas, equivalencia, lft, ltn, ntnb, ntnf, taxa_implicita, vencimentos
 from .utils import marcar_atualizado, precisa_atualizar_mercado
 
 # Logger para este módulo
@@ -29,8 +31,10 @@ async def lifespan(app: FastAPI):
         logger.info("Atualizando variáveis de mercado (primeira vez hoje)")
         try:
             vm = VariaveisMercado()
-            # Usar o método atualizar_tudo() que já faz tudo automaticamente
-            vm.atualizar_tudo(verbose=True)
+            # Fontes em paralelo, cada uma com seu timeout e fallback para o armazém
+            relatorio = vm.atualizar_tudo(verbose=True)
+            for fonte, resultado in relatorio.items():
+                logger.info(f"Atualização de {fonte}: {resultado['status']} em {resultado['tempo']:.2f}s")
             marcar_atualizado()
             print("✅ Variáveis de mercado atualizadas com sucesso!")
             logger.info("Variáveis de mercado atualizadas com sucesso")
@@ -41,6 +45,13 @@ async def lifespan(app: FastAPI):
     else:
         print("ℹ️ Variáveis de mercado já atualizadas hoje. Usando dados em cache.")
         logger.info("Variáveis de mercado já atualizadas hoje, usando cache")
+
+    # Aquece o snapshot de mercado para que as requisições não façam I/O
+    try:
+        snapshot = get_snapshot().carregar()
+        logger.info(f"Snapshot de mercado carregado: {snapshot.versao}")
+    except Exception as e:
+        logger.warning(f"Erro ao carregar snapshot de mercado: {e}")
     
     yield
     
@@ -75,8 +86,10 @@ app.include_router(lft.router)
 app.include_router(ntnb.router)
 app.include_router(ntnf.router)
 app.include_router(equivalencia.router)
+app.include_router(taxa_implicita.router)
 app.include_router(vencimentos.router)
 app.include_router(carteiras.router)
+app.include_router(curvas.router)
 
 
 @app.get("/", tags=["Root"])
@@ -99,7 +112,8 @@ def root():
                 },
                 "ntnf": "POST /titulos/ntnf"
             },
-            "equivalencia": "POST /equivalencia"
+            "equivalencia": "POST /equivalencia",
+            "taxa_implicita": "POST /taxa-implicita"
         }
     }
 
@@ -115,7 +129,8 @@ def health_check():
     
     return {
         "status": "healthy",
-        "ultima_atualizacao_mercado": get_ultima_atualizacao()
+        "ultima_atualizacao_mercado": get_ultima_atualizacao(),
+        "snapshot_versao": get_snapshot().versao
     }
 
 
@@ -179,13 +194,15 @@ def forcar_atualizacao_mercado():
         print("🔄 Forçando atualização de variáveis de mercado...")
         logger.info("Forçando atualização de variáveis de mercado (endpoint admin)")
         vm = VariaveisMercado()
-        vm.atualizar_tudo(verbose=True)
+        relatorio = vm.atualizar_tudo(verbose=True)
         marcar_atualizado()
         logger.info("Variáveis de mercado atualizadas com sucesso (endpoint admin)")
         return {
             "status": "success",
             "message": "Variáveis de mercado atualizadas com sucesso",
-            "data": get_ultima_atualizacao()
+            "data": get_ultima_atualizacao(),
+            "snapshot_versao": get_snapshot().versao,
+            "fontes": relatorio
         }
     except Exception as e:
         logger.error(f"Erro ao atualizar variáveis de mercado (endpoint admin): {e}")
@@ -193,3 +210,15 @@ def forcar_atualizacao_mercado():
             "status": "error",
             "message": f"Erro ao atualizar: {str(e)}"
         }
+
+
+@app.get("/cargas-implicitas", tags=["Admin"])
+def listar_cargas_implicitas():
+    """
+    Retorna as cargas implícitas de dados de mercado (por fonte e função chamadora)
+    registradas desde o início do processo.
+    """
+    return {
+        "snapshot_versao": get_snapshot().versao,
+        "cargas": estatisticas_cargas()
+    }
@@ -9,7 +9,7 @@ Os modelos Pydantic servem para:
 """
 
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional, Union
 
 from pydantic import BaseModel, Field
 
@@ -239,6 +239,91 @@ class EquivalenciaRequest(BaseModel):
     )
 
 
+class EquivalenciaOrigem(BaseModel):
+    """Título de origem da matriz de equivalência"""
+
+    titulo: str = Field(..., description="Tipo do título", example="LTN")
+    vencimento: str = Field(..., description="Data de vencimento (formato: YYYY-MM-DD)", example="2029-01-01")
+    quantidade: float = Field(..., description="Quantidade do título", gt=0, example=10000)
+    taxa: Optional[float] = Field(None, description="Taxa (%). Se não informado, usa ANBIMA", example=12.5)
+
+
+class EquivalenciaDestino(BaseModel):
+    """Título de destino da matriz de equivalência"""
+
+    titulo: str = Field(..., description="Tipo do título", example="NTNB")
+    vencimento: str = Field(..., description="Data de vencimento (formato: YYYY-MM-DD)", example="2035-05-15")
+    taxa: Optional[float] = Field(None, description="Taxa (%). Se não informado, usa ANBIMA", example=7.53)
+
+
+class EquivalenciaMatrizRequest(BaseModel):
+    """Request model para a matriz de equivalência entre vários títulos"""
+
+    origens: List[EquivalenciaOrigem] = Field(..., description="Títulos de origem (linhas da matriz)", min_length=1)
+    destinos: List[EquivalenciaDestino] = Field(..., description="Títulos de destino (colunas da matriz)", min_length=1)
+    criterios: List[str] = Field(
+        default=["dv", "fin"], description="Critérios a calcular: 'dv' (DV01) e/ou 'fin' (financeiro)"
+    )
+    data_base: Optional[str] = Field(None, description="Data base (YYYY-MM-DD). Se não informado, usa hoje")
+    dias_liquidacao: int = Field(1, description="Dias para liquidação", ge=0)
+
+
+class LTNLoteRequest(BaseModel):
+    """Request model para cálculo de várias LTNs em lote"""
+
+    data_vencimentos: List[str] = Field(
+        ...,
+        description="Datas de vencimento dos títulos (formato: YYYY-MM-DD)",
+        min_length=1,
+        example=["2027-01-01", "2028-01-01"],
+    )
+    taxas: Optional[List[float]] = Field(
+        None,
+        description="Taxas de juros (%), uma por vencimento. Se não informado, usa ANBIMA",
+        example=[12.5, 12.8],
+    )
+    data_base: Optional[str] = Field(
+        None,
+        description="Data base para cálculo (formato: YYYY-MM-DD). Se não informado, usa data atual",
+        example="2024-01-15",
+    )
+    dias_liquidacao: Optional[int] = Field(
+        1, description="Dias úteis para liquidação (padrão: 1)", ge=0, example=1
+    )
+    quantidade: Optional[float] = Field(
+        50000, description="Quantidade de cada título", gt=0, example=50000
+    )
+
+
+class TaxaImplicitaRequest(BaseModel):
+    """Request model para cálculo de taxas a partir de PUs (em lote)"""
+
+    tipo: str = Field(..., description="Tipo do título: LTN, NTNF, NTNB ou LFT", example="NTNF")
+    data_vencimentos: List[str] = Field(
+        ...,
+        description="Datas de vencimento dos títulos (formato: YYYY-MM-DD)",
+        min_length=1,
+        example=["2029-01-01", "2033-01-01"],
+    )
+    pus: List[float] = Field(
+        ...,
+        description="PUs na data de liquidação, um por vencimento",
+        min_length=1,
+        example=[950.123456, 880.654321],
+    )
+    data_base: Optional[str] = Field(
+        None,
+        description="Data base para cálculo (formato: YYYY-MM-DD). Se não informado, usa data atual",
+        example="2024-01-15",
+    )
+    dias_liquidacao: Optional[int] = Field(
+        1, description="Dias úteis para liquidação (padrão: 1)", ge=0, example=1
+    )
+    casas_decimais: Optional[int] = Field(
+        None, description="Casas decimais para arredondar as taxas (opcional)", ge=0, example=4
+    )
+
+
 # ==================== RESPONSE MODELS ====================
 # Cada título tem sua própria classe de resposta completa, sem herança
 
@@ -385,6 +470,70 @@ class EquivalenciaResponse(BaseModel):
     criterio: str = Field(..., description="Critério usado para cálculo")
 
 
+class EquivalenciaMatrizResponse(BaseModel):
+    """Response model para a matriz de equivalência (origens x destinos)"""
+
+    origens: List[EquivalenciaOrigem] = Field(..., description="Títulos de origem (linhas das matrizes)")
+    destinos: List[EquivalenciaDestino] = Field(..., description="Títulos de destino (colunas das matrizes)")
+    dv: Optional[List[List[Optional[float]]]] = Field(
+        None, description="Quantidade equivalente por DV01 (nula nos pares com LFT)"
+    )
+    fin: Optional[List[List[Optional[float]]]] = Field(None, description="Quantidade equivalente por financeiro")
+
+
+class TaxaImplicitaItem(BaseModel):
+    """Taxa implícita de um vencimento"""
+
+    data_vencimento: str = Field(..., description="Data de vencimento")
+    pu: float = Field(..., description="PU informado")
+    taxa: Optional[float] = Field(None, description="Taxa (%) que gera o PU; nula se não houver solução")
+
+
+class TaxaImplicitaResponse(BaseModel):
+    """Response model para cálculo de taxas a partir de PUs"""
+
+    tipo: str = Field(..., description="Tipo do título")
+    data_base: str = Field(..., description="Data base")
+    data_liquidacao: str = Field(..., description="Data de liquidação")
+    taxas: List[TaxaImplicitaItem] = Field(..., description="Taxas por vencimento")
+
+
+class PontoBreakeven(BaseModel):
+    """Inflação implícita em um vencimento"""
+
+    vencimento: str = Field(..., description="Data de vencimento")
+    dias_uteis: int = Field(..., description="Dias úteis a partir da data base")
+    taxa_nominal: float = Field(..., description="Taxa nominal (DI1, % a.a.)")
+    taxa_real: float = Field(..., description="Taxa real (DAP, % a.a.)")
+    inflacao_implicita: float = Field(..., description="Inflação implícita (% a.a.)")
+
+
+class CurvaBreakevenResponse(BaseModel):
+    """Response model para a estrutura de inflação implícita (DI1 x DAP)"""
+
+    data_base: str = Field(..., description="Data base das curvas")
+    vertices: List[PontoBreakeven] = Field(..., description="Vértices (vencimentos dos DAPs)")
+    pontos: List[PontoBreakeven] = Field(default=[], description="Datas informadas, interpoladas por flat-forward 252")
+
+
+class ContratoDI(BaseModel):
+    """Contrato de DI1 precificado"""
+
+    codigo: str = Field(..., description="Código do contrato (ex: DI1F27)")
+    vencimento: str = Field(..., description="Data de vencimento (ajustada para dia útil)")
+    dias_uteis: int = Field(..., description="Dias úteis a partir da data base")
+    taxa: float = Field(..., description="Taxa de ajuste (% a.a.)")
+    pu: float = Field(..., description="PU do contrato")
+    dv01: float = Field(..., description="DV01 por contrato")
+
+
+class CurvaDIResponse(BaseModel):
+    """Response model para os contratos de DI1 precificados"""
+
+    data_base: str = Field(..., description="Data base (liquidação) dos contratos")
+    contratos: List[ContratoDI] = Field(..., description="Contratos a vencer, em ordem de vencimento")
+
+
 class ErrorResponse(BaseModel):
     """Modelo para respostas de erro"""
 
@@ -490,6 +639,36 @@ class CarteiraUpdateQuantidadeRequest(BaseModel):
     quantidade: float = Field(..., description="Nova quantidade", gt=0, example=50000)
 
 
+class CenarioRequest(BaseModel):
+    """Definição de um cenário de choque de taxas"""
+
+    tipo: str = Field(
+        ..., description="Tipo do cenário: paralelo, inclinacao, borboleta ou vetor", example="paralelo"
+    )
+    nome: Optional[str] = Field(None, description="Nome do cenário (opcional)", example="+50bp")
+    bps: Optional[float] = Field(None, description="Choque paralelo (bps)", example=50)
+    curto: Optional[float] = Field(None, description="Inclinação: choque no vencimento mais curto (bps)", example=-10)
+    longo: Optional[float] = Field(None, description="Inclinação: choque no vencimento mais longo (bps)", example=30)
+    asas: Optional[float] = Field(None, description="Borboleta: choque nas pontas (bps)", example=10)
+    miolo: Optional[float] = Field(None, description="Borboleta: choque no prazo médio (bps)", example=-20)
+    choques: Optional[Union[List[float], Dict[str, float]]] = Field(
+        None,
+        description="Vetor: um choque (bps) por vencimento ou {vencimento: bps}",
+        example={"2027-01-01": 25},
+    )
+
+
+class CarteiraCenariosRequest(BaseModel):
+    """Request model para simulação de cenários de uma carteira"""
+
+    cenarios: List[CenarioRequest] = Field(
+        ...,
+        description="Cenários a simular",
+        min_length=1,
+        example=[{"tipo": "paralelo", "bps": 50}, {"tipo": "inclinacao", "curto": -10, "longo": 30}],
+    )
+
+
 class TituloCarteiraData(BaseModel):
     """Modelo para dados de um título na carteira"""
 
@@ -519,3 +698,19 @@ class CarteiraResponse(BaseModel):
     dias_liquidacao: int = Field(..., description="Dias para liquidação")
     total_titulos: int = Field(..., description="Total de títulos na carteira")
     titulos: list[TituloCarteiraData] = Field(..., description="Lista de títulos na carteira")
+
+
+class CarteiraCenariosResponse(BaseModel):
+    """Response model para cenários de uma carteira (matrizes cenários x vencimentos)"""
+
+    carteira_id: str = Field(..., description="ID da carteira")
+    tipo: str = Field(..., description="Tipo do título (LTN, LFT, NTNB, NTNF)")
+    data_base: Optional[str] = Field(None, description="Data base")
+    dias_liquidacao: int = Field(..., description="Dias para liquidação")
+    vencimentos: List[str] = Field(..., description="Vencimentos (colunas das matrizes)")
+    cenarios: List[str] = Field(..., description="Cenários (linhas das matrizes)")
+    choques: List[List[float]] = Field(..., description="Choques aplicados (bps)")
+    pu: List[List[Optional[float]]] = Field(..., description="PU de cada vencimento em cada cenário")
+    financeiro: List[List[Optional[float]]] = Field(..., description="Financeiro de cada posição em cada cenário")
+    pnl: List[List[Optional[float]]] = Field(..., description="P&L de cada posição em relação ao financeiro atual")
+    pnl_total: List[float] = Field(..., description="P&L total da carteira em cada cenário")
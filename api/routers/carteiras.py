@@ -16,6 +16,8 @@ from fastapi import APIRouter, HTTPException
 from api.logging_config import get_logger
 
 from api.models import (
+    CarteiraCenariosRequest,
+    CarteiraCenariosResponse,
     CarteiraCreateRequest,
     CarteiraResponse,
     CarteiraUpdateDiasRequest,
@@ -24,11 +26,13 @@ from api.models import (
     CarteiraUpdateTaxaRequest,
     TituloCarteiraData,
 )
+from api.utils import serialize_matriz
 from titulospub.core.carteiras import (
     CarteiraLFT,
     CarteiraLTN,
     CarteiraNTNB,
     CarteiraNTNF,
+    montar_choques,
 )
 
 router = APIRouter(prefix="/carteiras", tags=["Carteiras"])
@@ -363,6 +367,52 @@ def atualizar_dias_liquidacao_carteira(carteira_id: str, request: CarteiraUpdate
         )
 
 
+@router.post("/{carteira_id}/cenarios", response_model=CarteiraCenariosResponse, summary="Simular cenários de taxa")
+def simular_cenarios_carteira(carteira_id: str, request: CarteiraCenariosRequest):
+    """
+    Reprecifica todas as posições da carteira em cada cenário de choque de taxas
+    (paralelo, inclinação, borboleta ou vetor por vencimento) em uma única
+    precificação em lote. A carteira não é alterada.
+    """
+    with _carteiras_lock:
+        if carteira_id not in _carteiras:
+            raise HTTPException(status_code=404, detail="Carteira não encontrada")
+        
+        carteira = _carteiras[carteira_id]["carteira"]
+        tipo_carteira = _carteiras[carteira_id]["tipo"]
+    
+    try:
+        choques = montar_choques(
+            especificacoes=[cenario.model_dump() for cenario in request.cenarios],
+            prazos=carteira.prazos(),
+            vencimentos=carteira.vencimentos,
+        )
+        res = carteira.precificar_cenarios(choques)
+        
+        return CarteiraCenariosResponse(
+            carteira_id=carteira_id,
+            tipo=tipo_carteira.upper(),
+            data_base=carteira._data_base,
+            dias_liquidacao=carteira._dias_liquidacao,
+            vencimentos=res["vencimentos"],
+            cenarios=res["cenarios"],
+            choques=res["choques"].tolist(),
+            pu=serialize_matriz(res["pu"]),
+            financeiro=serialize_matriz(res["financeiro"]),
+            pnl=serialize_matriz(res["pnl"]),
+            pnl_total=res["pnl_total"].tolist(),
+        )
+    except ValueError as e:
+        logger.warning(f"Erro de validação: {e}")
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.error(f"Erro interno: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="Erro interno ao simular cenários. Verifique os logs do servidor."
+        )
+
+
 # ==================== ROTA GENÉRICA (DEVE VIR POR ÚLTIMO) ====================
 
 @router.get("/{carteira_id}", response_model=CarteiraResponse, summary="Obter dados da carteira")
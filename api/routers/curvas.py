@@ -0,0 +1,106 @@
+"""
+Endpoints para curvas de juros e inflação implícita.
+"""
+from typing import List, Optional
+
+import pandas as pd
+from fastapi import APIRouter, HTTPException, Query
+
+from api.logging_config import get_logger
+from api.models import ContratoDI, CurvaBreakevenResponse, CurvaDIResponse, PontoBreakeven
+from titulospub import obter_curva_breakeven, obter_curva_contratos_di
+
+router = APIRouter(prefix="/curvas", tags=["Curvas"])
+logger = get_logger("api.routers.curvas")
+
+
+def _pontos(tabela: pd.DataFrame) -> List[PontoBreakeven]:
+    """Converte a tabela de vértices da CurvaBreakeven nos itens da resposta."""
+    return [
+        PontoBreakeven(
+            vencimento=linha.VENCIMENTO.strftime("%Y-%m-%d"),
+            dias_uteis=int(linha.DIAS_UTEIS),
+            taxa_nominal=float(linha.TAXA_NOMINAL),
+            taxa_real=float(linha.TAXA_REAL),
+            inflacao_implicita=float(linha.INFLACAO_IMPLICITA),
+        )
+        for linha in tabela.itertuples(index=False)
+    ]
+
+
+@router.get("/breakeven", response_model=CurvaBreakevenResponse, summary="Inflação implícita (DI1 x DAP)")
+def curva_breakeven(
+    data_base: Optional[str] = Query(None, description="Data base (YYYY-MM-DD). Se não informado, usa hoje"),
+    datas: Optional[List[str]] = Query(None, description="Datas para interpolar (YYYY-MM-DD)"),
+) -> CurvaBreakevenResponse:
+    """
+    Retorna a estrutura a termo da inflação implícita
+
+    - **vertices**: vencimentos dos DAPs, com a taxa nominal interpolada na curva de DI1
+    - **pontos**: datas informadas em `datas`, interpoladas nas duas curvas por flat-forward 252
+    """
+    try:
+        curva = obter_curva_breakeven(data_base=data_base)
+
+        pontos = []
+        if datas:
+            datas_pontos = pd.DatetimeIndex(pd.to_datetime(datas))
+            dias = curva.curva_real.dias_uteis(datas_pontos)
+            pontos = _pontos(pd.DataFrame({
+                "VENCIMENTO": datas_pontos,
+                "DIAS_UTEIS": dias,
+                "TAXA_NOMINAL": curva.curva_nominal.taxas_dias(dias),
+                "TAXA_REAL": curva.curva_real.taxas_dias(dias),
+                "INFLACAO_IMPLICITA": curva.inflacao_dias(dias),
+            }))
+
+        return CurvaBreakevenResponse(
+            data_base=curva.data_referencia.strftime("%Y-%m-%d"),
+            vertices=_pontos(curva.tabela()),
+            pontos=pontos,
+        )
+    except ValueError as e:
+        logger.warning(f"Erro de validação na curva de inflação implícita: {e}")
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.error(f"Erro interno na curva de inflação implícita: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="Erro interno ao calcular a inflação implícita. Verifique os logs do servidor."
+        )
+
+
+@router.get("/di", response_model=CurvaDIResponse, summary="Contratos de DI1 precificados")
+def curva_di(
+    data_base: Optional[str] = Query(None, description="Data base (YYYY-MM-DD). Se não informado, usa hoje"),
+) -> CurvaDIResponse:
+    """
+    Retorna PU e DV01 de todos os contratos de DI1 da BMF a vencer na data base
+
+    - **contratos**: código, vencimento, dias úteis, taxa de ajuste, PU e DV01 de cada contrato
+    """
+    try:
+        curva = obter_curva_contratos_di(data_base=data_base)
+        return CurvaDIResponse(
+            data_base=curva.data_referencia.strftime("%Y-%m-%d"),
+            contratos=[
+                ContratoDI(
+                    codigo=linha.CODIGO,
+                    vencimento=linha.VENCIMENTO.strftime("%Y-%m-%d"),
+                    dias_uteis=int(linha.DIAS_UTEIS),
+                    taxa=float(linha.TAXA),
+                    pu=float(linha.PU),
+                    dv01=float(linha.DV01),
+                )
+                for linha in curva.tabela().itertuples(index=False)
+            ],
+        )
+    except ValueError as e:
+        logger.warning(f"Erro de validação na curva de DI1: {e}")
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.error(f"Erro interno na curva de DI1: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="Erro interno ao precificar os contratos de DI1. Verifique os logs do servidor."
+        )
@@ -4,8 +4,14 @@ Endpoints para cálculo de equivalência entre títulos públicos.
 from fastapi import APIRouter, HTTPException
 
 from api.logging_config import get_logger
-from api.models import EquivalenciaRequest, EquivalenciaResponse
-from titulospub import equivalencia
+from api.models import (
+    EquivalenciaMatrizRequest,
+    EquivalenciaMatrizResponse,
+    EquivalenciaRequest,
+    EquivalenciaResponse,
+)
+from api.utils import serialize_matriz
+from titulospub import equivalencia, equivalencia_matriz
 
 router = APIRouter(prefix="/equivalencia", tags=["Equivalência"])
 logger = get_logger("api.routers.equivalencia")
@@ -87,7 +93,42 @@ def calcular_equivalencia(request: EquivalenciaRequest) -> EquivalenciaResponse:
         )
 
 
+@router.post("/matriz", response_model=EquivalenciaMatrizResponse, summary="Calcular matriz de equivalência")
+def calcular_equivalencia_matriz(request: EquivalenciaMatrizRequest) -> EquivalenciaMatrizResponse:
+    """
+    Calcula a equivalência de todos os pares origem x destino de uma vez.
 
+    Cada título é precificado uma única vez (em lote por tipo) e as matrizes
+    são calculadas vetorialmente:
+    - **dv**: quantidade equivalente do destino por DV01 (nula nos pares com LFT)
+    - **fin**: quantidade equivalente do destino pelo financeiro da origem
+    """
+    try:
+        logger.info(
+            f"Calculando matriz de equivalência: {len(request.origens)} origens x "
+            f"{len(request.destinos)} destinos, critérios={request.criterios}"
+        )
+        matrizes = equivalencia_matriz(
+            origens=[origem.model_dump() for origem in request.origens],
+            destinos=[destino.model_dump() for destino in request.destinos],
+            criterios=request.criterios,
+            data_base=request.data_base,
+            dias_liquidacao=request.dias_liquidacao,
+        )
 
-
-
+        return EquivalenciaMatrizResponse(
+            origens=request.origens,
+            destinos=request.destinos,
+            **{criterio: serialize_matriz(valores) for criterio, valores in matrizes.items()},
+        )
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=f"Parâmetro inválido: {str(e)}")
+    except ValueError as e:
+        logger.warning(f"Erro de validação em matriz de equivalência: {e}")
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.error(f"Erro interno ao calcular matriz de equivalência: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="Erro interno ao calcular matriz de equivalência. Verifique os logs do servidor."
+        )
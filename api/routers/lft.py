@@ -6,7 +6,7 @@ from fastapi import APIRouter, HTTPException
 from api.logging_config import get_logger
 from api.models import LFTRequest, LFTResponse
 from api.utils import serialize_datetime
-from titulospub import LFT
+from titulospub import obter_titulo
 
 router = APIRouter(prefix="/titulos/lft", tags=["LFT"])
 logger = get_logger("api.routers.lft")
@@ -36,7 +36,7 @@ def criar_lft(request: LFTRequest) -> LFTResponse:
         if request.quantidade is not None:
             kwargs["quantidade"] = request.quantidade
         
-        titulo = LFT(**kwargs)
+        titulo = obter_titulo("LFT", **kwargs)
         
         # Definir quantidade ou financeiro
         if request.financeiro is not None:
@@ -1,17 +1,46 @@
 """
 Endpoints para título LTN (Letra do Tesouro Nacional)
 """
+from typing import List
+
 from fastapi import APIRouter, HTTPException
 
 from api.logging_config import get_logger
-from api.models import LTNRequest, LTNResponse
+from api.models import LTNLoteRequest, LTNRequest, LTNResponse
 from api.utils import serialize_datetime
-from titulospub import LTN
+from titulospub import LTN, obter_titulo
 
 router = APIRouter(prefix="/titulos/ltn", tags=["LTN"])
 logger = get_logger("api.routers.ltn")
 
 
+def _montar_resposta(titulo: LTN) -> LTNResponse:
+    """Constrói a resposta da API a partir de um título LTN calculado."""
+    return LTNResponse(
+        tipo="LTN",
+        nome=getattr(titulo, "_nome", "LTN"),
+        data_vencimento=serialize_datetime(titulo._data_vencimento_titulo),
+        data_base=serialize_datetime(titulo.data_base),
+        data_liquidacao=serialize_datetime(titulo.data_liquidacao),
+        dias_liquidacao=titulo.dias_liquidacao,
+        taxa=titulo.taxa,
+        quantidade=titulo.quantidade,
+        financeiro=titulo.financeiro,
+        pu_d0=titulo.pu_d0,
+        pu_termo=getattr(titulo, "pu_termo", None),
+        pu_carregado=getattr(titulo, "pu_carregado", None),
+        dv01=getattr(titulo, "dv01", None),
+        carrego_brl=getattr(titulo, "carrego_brl", None),
+        carrego_bps=getattr(titulo, "carrego_bps", None),
+        premio=getattr(titulo, "premio", None),
+        di=getattr(titulo, "di", None),
+        ajuste_di=getattr(titulo, "ajuste_di", None),
+        premio_anbima=getattr(titulo, "premio_anbima", None),
+        hedge_di=getattr(titulo, "hedge_di", None),
+        taxa_anbima=getattr(titulo, "taxa_anbima", None),
+    )
+
+
 @router.post("", response_model=LTNResponse, summary="Criar título LTN")
 def criar_ltn(request: LTNRequest) -> LTNResponse:
     """
@@ -42,7 +71,7 @@ def criar_ltn(request: LTNRequest) -> LTNResponse:
         if request.quantidade is not None:
             kwargs["quantidade"] = request.quantidade
         
-        titulo = LTN(**kwargs)
+        titulo = obter_titulo("LTN", **kwargs)
         
         # Definir quantidade ou financeiro
         if request.financeiro is not None:
@@ -50,30 +79,7 @@ def criar_ltn(request: LTNRequest) -> LTNResponse:
         elif request.quantidade is not None:
             titulo.quantidade = request.quantidade
         
-        # Construir resposta
-        return LTNResponse(
-            tipo="LTN",
-            nome=getattr(titulo, "_nome", "LTN"),
-            data_vencimento=serialize_datetime(titulo._data_vencimento_titulo),
-            data_base=serialize_datetime(titulo.data_base),
-            data_liquidacao=serialize_datetime(titulo.data_liquidacao),
-            dias_liquidacao=titulo.dias_liquidacao,
-            taxa=titulo.taxa,
-            quantidade=titulo.quantidade,
-            financeiro=titulo.financeiro,
-            pu_d0=titulo.pu_d0,
-            pu_termo=getattr(titulo, "pu_termo", None),
-            pu_carregado=getattr(titulo, "pu_carregado", None),
-            dv01=getattr(titulo, "dv01", None),
-            carrego_brl=getattr(titulo, "carrego_brl", None),
-            carrego_bps=getattr(titulo, "carrego_bps", None),
-            premio=getattr(titulo, "premio", None),
-            di=getattr(titulo, "di", None),
-            ajuste_di=getattr(titulo, "ajuste_di", None),
-            premio_anbima=getattr(titulo, "premio_anbima", None),
-            hedge_di=getattr(titulo, "hedge_di", None),
-            taxa_anbima=getattr(titulo, "taxa_anbima", None),
-        )
+        return _montar_resposta(titulo)
     except ValueError as e:
         logger.warning(f"Erro de validação ao criar LTN: {e}")
         raise HTTPException(status_code=422, detail=str(e))
@@ -87,7 +93,32 @@ def criar_ltn(request: LTNRequest) -> LTNResponse:
         )
 
 
+@router.post("/lote", response_model=List[LTNResponse], summary="Calcular LTNs em lote")
+def criar_ltn_lote(request: LTNLoteRequest) -> List[LTNResponse]:
+    """
+    Calcula várias LTNs de uma vez, com uma única precificação vetorizada
 
-
-
-
+    - **data_vencimentos**: Datas de vencimento dos títulos (YYYY-MM-DD)
+    - **taxas**: Taxas de juros, uma por vencimento (opcional, usa ANBIMA se não informado)
+    - **data_base**: Data base (opcional)
+    - **dias_liquidacao**: Dias úteis para liquidação (padrão: 1)
+    - **quantidade**: Quantidade de cada título (padrão: 50000)
+    """
+    try:
+        titulos = LTN.criar_lote(
+            vencimentos=request.data_vencimentos,
+            data_base=request.data_base,
+            dias_liquidacao=request.dias_liquidacao if request.dias_liquidacao is not None else 1,
+            taxas=request.taxas,
+            quantidade=request.quantidade if request.quantidade is not None else 50000,
+        )
+        return [_montar_resposta(titulo) for titulo in titulos.values()]
+    except ValueError as e:
+        logger.warning(f"Erro de validação ao calcular LTNs em lote: {e}")
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.error(f"Erro interno ao calcular LTNs em lote: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=400,
+            detail=f"Erro ao calcular LTNs em lote: {str(e)}"
+        )
@@ -6,7 +6,7 @@ from fastapi import APIRouter, HTTPException
 from api.logging_config import get_logger
 from api.models import NTNBHedgeDIRequest, NTNBHedgeDIResponse, NTNBRequest, NTNBResponse
 from api.utils import serialize_datetime
-from titulospub import NTNB
+from titulospub import obter_curva_di, obter_titulo
 
 router = APIRouter(prefix="/titulos/ntnb", tags=["NTNB"])
 logger = get_logger("api.routers.ntnb")
@@ -47,7 +47,7 @@ def criar_ntnb(request: NTNBRequest) -> NTNBResponse:
         if request.quantidade is not None:
             kwargs["quantidade"] = request.quantidade
         
-        titulo = NTNB(**kwargs)
+        titulo = obter_titulo("NTNB", **kwargs)
         
         # Definir quantidade ou financeiro
         if request.financeiro is not None:
@@ -76,13 +76,13 @@ def criar_ntnb(request: NTNBRequest) -> NTNBResponse:
             premio=getattr(titulo, "premio", None),
             cotacao=getattr(titulo, "cotacao", None),
             duration=getattr(titulo, "duration", None),
-            data_vencimento_duration=serialize_datetime(getattr(titulo, "_data_vencimento_duration", None)),
-            dias_duration=getattr(titulo, "_dias_duration", None),
+            data_vencimento_duration=serialize_datetime(titulo.data_vencimento_duration),
+            dias_duration=titulo.dias_duration,
             ajuste_dap=getattr(titulo, "ajuste_dap", None),
             premio_anbima_dap=getattr(titulo, "premio_anbima_dap", None),
             hedge_dap=getattr(titulo, "hedge_dap", None),
-            vna=getattr(titulo, "_vna", None),
-            vna_tesouro=getattr(titulo, "_vna_tesouro", None),
+            vna=titulo.vna,
+            vna_tesouro=titulo.vna_tesouro,
             taxa_anbima=getattr(titulo, "taxa_anbima", None),
         )
     except ValueError as e:
@@ -125,7 +125,7 @@ def calcular_hedge_di_ntnb(request: NTNBHedgeDIRequest) -> NTNBHedgeDIResponse:
         if request.quantidade is not None:
             kwargs["quantidade"] = request.quantidade
         
-        titulo = NTNB(**kwargs)
+        titulo = obter_titulo("NTNB", **kwargs)
         
         # Definir quantidade ou financeiro
         if request.financeiro is not None:
@@ -137,9 +137,7 @@ def calcular_hedge_di_ntnb(request: NTNBHedgeDIRequest) -> NTNBHedgeDIResponse:
         hedge_di = titulo.calcular_hedge_di(codigo_di=request.codigo_di)
         
         # Buscar ajuste DI usado
-        curva_di = titulo._vm.get_bmf()["DI"]
-        serie_adj = curva_di.loc[curva_di["DI"] == request.codigo_di, "ADJ"]
-        ajuste_di = float(serie_adj.iloc[0]) if not serie_adj.empty else None
+        ajuste_di = obter_curva_di(titulo._vm, titulo.data_base).taxa_contrato(request.codigo_di)
         
         # Construir resposta
         return NTNBHedgeDIResponse(
@@ -6,7 +6,7 @@ from fastapi import APIRouter, HTTPException
 from api.logging_config import get_logger
 from api.models import NTNFRequest, NTNFResponse
 from api.utils import serialize_datetime
-from titulospub import NTNF
+from titulospub import obter_titulo
 
 router = APIRouter(prefix="/titulos/ntnf", tags=["NTNF"])
 logger = get_logger("api.routers.ntnf")
@@ -42,7 +42,7 @@ def criar_ntnf(request: NTNFRequest) -> NTNFResponse:
         if request.quantidade is not None:
             kwargs["quantidade"] = request.quantidade
         
-        titulo = NTNF(**kwargs)
+        titulo = obter_titulo("NTNF", **kwargs)
         
         # Definir quantidade ou financeiro
         if request.financeiro is not None:
@@ -0,0 +1,62 @@
+"""
+Endpoints para cálculo de taxas a partir de PUs (taxa implícita).
+"""
+import numpy as np
+from fastapi import APIRouter, HTTPException
+
+from api.logging_config import get_logger
+from api.models import TaxaImplicitaItem, TaxaImplicitaRequest, TaxaImplicitaResponse
+from titulospub.core.taxa_implicita import calcular_taxas_implicitas
+
+router = APIRouter(prefix="/taxa-implicita", tags=["Taxa Implícita"])
+logger = get_logger("api.routers.taxa_implicita")
+
+
+@router.post("", response_model=TaxaImplicitaResponse, summary="Calcular taxas a partir de PUs")
+def calcular_taxa_implicita(request: TaxaImplicitaRequest) -> TaxaImplicitaResponse:
+    """
+    Calcula, em lote, a taxa que gera cada PU informado
+    
+    - **tipo**: Tipo do título (LTN, NTNF, NTNB, LFT)
+    - **data_vencimentos**: Datas de vencimento (YYYY-MM-DD)
+    - **pus**: PUs na data de liquidação, um por vencimento
+    - **data_base**: Data base (opcional, usa data atual se não informado)
+    - **dias_liquidacao**: Dias úteis para liquidação (padrão: 1)
+    - **casas_decimais**: Arredondamento das taxas (opcional)
+    
+    Vencimentos cujo PU não pode ser gerado por nenhuma taxa retornam taxa nula.
+    """
+    try:
+        logger.info(f"Calculando taxas implícitas: {request.tipo}, {len(request.data_vencimentos)} vencimentos")
+        resultado = calcular_taxas_implicitas(
+            tipo=request.tipo,
+            vencimentos=request.data_vencimentos,
+            pus=request.pus,
+            data_base=request.data_base,
+            dias_liquidacao=request.dias_liquidacao,
+            casas_decimais=request.casas_decimais
+        )
+
+        taxas = [
+            TaxaImplicitaItem(
+                data_vencimento=vencimento,
+                pu=pu,
+                taxa=None if np.isnan(taxa) else float(taxa)
+            )
+            for vencimento, pu, taxa in zip(request.data_vencimentos, request.pus, resultado["taxas"])
+        ]
+        return TaxaImplicitaResponse(
+            tipo=request.tipo.upper(),
+            data_base=resultado["data_base"].strftime("%Y-%m-%d"),
+            data_liquidacao=resultado["data_liquidacao"].strftime("%Y-%m-%d"),
+            taxas=taxas
+        )
+    except ValueError as e:
+        logger.warning(f"Erro de validação em taxa implícita: {e}")
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.error(f"Erro interno ao calcular taxa implícita: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="Erro interno ao calcular taxa implícita. Verifique os logs do servidor."
+        )
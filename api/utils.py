@@ -4,12 +4,14 @@ Utilitários para a API.
 Este módulo contém funções auxiliares para:
 - Controle de atualização de mercado (arquivo .ultima_atualizacao.json)
 - Serialização de datas para formato ISO
+- Serialização de matrizes NumPy para JSON
 """
 import json
 from datetime import date, datetime
 from pathlib import Path
 from typing import Optional, Union
 
+import numpy as np
 import pandas as pd
 
 # Caminho para arquivo de controle de atualização
@@ -114,6 +116,19 @@ def serialize_datetime(
     return str(dt)
 
 
+def serialize_matriz(valores: np.ndarray) -> list:
+    """
+    Converte uma matriz NumPy em listas, com NaN como None.
+
+    Args:
+        valores: Matriz 2D de floats
+
+    Returns:
+        list: Lista de linhas, cada uma uma lista de floats ou None
+    """
+    return [[None if np.isnan(v) else float(v) for v in linha] for linha in valores]
+
+
 
 
 
@@ -0,0 +1,209 @@
+"""
+Testes de regressão para o armazém local de dados de mercado.
+
+Estes testes validam, em uma pasta temporária:
+- Gravação e leitura de cada tipo de valor (tabelas, datas, JSON, pickle)
+- Gravações concorrentes de vários processos sob a trava do manifesto
+- Descarte das versões antigas de cada partição
+- Versões descartadas continuam legíveis pelos leitores que já as abriram
+- Migração do cache pickle legado para o armazém
+"""
+
+import multiprocessing
+import os
+import pickle
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from titulospub.dados import cache
+from titulospub.dados.armazem import MANTER_VERSOES, TRAVA, TRAVA_EXPIRACAO, ArmazemMercado
+from titulospub.dados.cache import save_cache
+from titulospub.dados.orquestrador import VariaveisMercado
+
+
+def _anbimas(taxa: float) -> dict:
+    """Tabelas no formato de ANBIMA, com a mesma taxa em todos os títulos."""
+    vencimentos = pd.to_datetime(["2026-01-01", "2027-01-01", "2029-01-01"])
+    return {
+        titulo: pd.DataFrame({"Data de Vencimento": vencimentos,
+                              "Tx. Indicativas": np.full(3, taxa),
+                              "PU": np.array([950.0, 850.0, 700.0])})
+        for titulo in ("LTN", "NTN-F")
+    }
+
+
+def _gravar_em_processo(diretorio: str, indice: int) -> int:
+    """Grava a partir de outro processo (alvo do pool de processos)."""
+    armazem = ArmazemMercado(diretorio)
+    armazem.gravar("cdi", "2025-06-02", 14.0 + indice / 100)
+    armazem.gravar("vna_lft", f"2025-06-{indice + 1:02d}", 16000.0 + indice)
+    return indice
+
+
+@pytest.fixture
+def armazem(tmp_path):
+    """Armazém vazio em uma pasta temporária."""
+    return ArmazemMercado(str(tmp_path / "armazem"))
+
+
+class TestGravacaoLeitura:
+    """Testes para a gravação e a leitura das partições"""
+
+    def test_tabelas(self, armazem):
+        """Dicionários de DataFrames voltam com colunas, tipos e índice"""
+        valor = _anbimas(13.0)
+        valor["NTN-F"] = valor["NTN-F"].set_index("Data de Vencimento")
+        armazem.gravar("anbimas", "2025-06-02", valor)
+
+        lido = armazem.ler("anbimas", "2025-06-02")
+        assert list(lido) == ["LTN", "NTN-F"]
+        for titulo in valor:
+            pd.testing.assert_frame_equal(lido[titulo], valor[titulo])
+        assert armazem.verificar("anbimas", "2025-06-02")
+
+    def test_datas_json_pickle(self, armazem):
+        """Listas de datas, escalares, dicionários simples e outros objetos"""
+        feriados = list(pd.to_datetime(["2025-11-20", "2025-12-25"]))
+        ipca = {"IPCA_USADO": 0.33, "INDICE_IPCA_FECHADO_ATUAL": 7111.86}
+        serie = pd.Series([1.0, 2.0], name="serie")
+        armazem.gravar("feriados", "2025-06-02", feriados)
+        armazem.gravar("cdi", "2025-06-02", 14.65)
+        armazem.gravar("ipca_dict", "2025-06-02", ipca)
+        armazem.gravar("outro", "2025-06-02", serie)
+
+        assert armazem.ler("feriados") == feriados
+        assert armazem.ler("cdi", "2025-06-02") == 14.65
+        assert armazem.ler("ipca_dict", "2025-06-02") == ipca
+        pd.testing.assert_series_equal(armazem.ler("outro"), serie)
+
+    def test_datas_e_ate(self, armazem):
+        """Sem data, a partição mais recente; com ate=True, a mais recente até a data"""
+        armazem.gravar("cdi", "2025-06-20", 14.90)
+        armazem.gravar("cdi", "2025-06-02", 14.65)
+
+        assert armazem.datas("cdi") == [pd.Timestamp("2025-06-02"), pd.Timestamp("2025-06-20")]
+        assert armazem.ler("cdi") == 14.90
+        assert armazem.ler("cdi", "2025-06-10") is None
+        assert armazem.ler("cdi", "2025-06-10", ate=True) == 14.65
+        assert armazem.ler("cdi", "2025-06-01", ate=True) is None
+
+    def test_remover(self, armazem):
+        """Remove uma data ou todas as datas da fonte"""
+        armazem.gravar("cdi", "2025-06-02", 14.65)
+        armazem.gravar("cdi", "2025-06-20", 14.90)
+
+        armazem.remover("cdi", "2025-06-20")
+        assert armazem.datas("cdi") == [pd.Timestamp("2025-06-02")]
+        armazem.remover("cdi")
+        assert armazem.ler("cdi") is None
+        assert not os.path.exists(os.path.join(armazem.diretorio, "cdi", "2025-06-02"))
+
+    def test_verificar_detecta_arquivo_alterado(self, armazem):
+        """O checksum do manifesto acusa um arquivo alterado"""
+        armazem.gravar("feriados", "2025-06-02", list(pd.to_datetime(["2025-11-20"])))
+        caminho = os.path.join(armazem.diretorio, armazem.manifesto()["particoes"]["feriados"]["2025-06-02"]["caminho"],
+                               "datas.npy")
+        with open(caminho, "ab") as f:
+            f.write(b"0")
+        assert not armazem.verificar("feriados", "2025-06-02")
+
+
+class TestTravaManifesto:
+    """Testes para as gravações concorrentes no mesmo armazém"""
+
+    def test_processos_concorrentes(self, armazem):
+        """Nenhuma gravação de outro processo se perde no manifesto"""
+        processos = 4
+        contexto = multiprocessing.get_context("fork")
+        with contexto.Pool(processos) as pool:
+            assert sorted(pool.starmap(_gravar_em_processo,
+                                       [(armazem.diretorio, i) for i in range(processos)])) == list(range(processos))
+
+        manifesto = armazem.manifesto()
+        assert manifesto["versao"] == 2 * processos
+        assert manifesto["particoes"]["cdi"]["2025-06-02"]["versao"] == processos
+        assert len(armazem.datas("vna_lft")) == processos
+        assert armazem.verificar("cdi", "2025-06-02")
+        assert not os.path.exists(os.path.join(armazem.diretorio, TRAVA))
+
+    def test_trava_abandonada(self, armazem):
+        """Uma trava mais antiga que TRAVA_EXPIRACAO não bloqueia a gravação"""
+        os.makedirs(armazem.diretorio)
+        caminho = os.path.join(armazem.diretorio, TRAVA)
+        open(caminho, "w").close()
+        antiga = time.time() - TRAVA_EXPIRACAO - 1
+        os.utime(caminho, (antiga, antiga))
+
+        assert armazem.gravar("cdi", "2025-06-02", 14.65) == 1
+        assert not os.path.exists(caminho)
+
+
+class TestDescarteVersoes:
+    """Testes para o descarte das versões antigas de cada partição"""
+
+    def test_mantem_versoes_recentes(self, armazem):
+        """Só a versão corrente e as MANTER_VERSOES - 1 anteriores ficam no disco"""
+        for versao in range(1, 6):
+            assert armazem.gravar("cdi", "2025-06-02", 14.0 + versao / 100) == versao
+
+        pastas = sorted(nome for nome in os.listdir(os.path.join(armazem.diretorio, "cdi", "2025-06-02"))
+                        if nome.startswith("v"))
+        assert [int(nome[1:].split(".")[0]) for nome in pastas] == list(range(6 - MANTER_VERSOES, 6))
+        assert armazem.ler("cdi") == 14.05
+
+
+class TestVersoesDescartadas:
+    """Testes para a leitura de versões descartadas por gravações posteriores"""
+
+    def test_leitor_vivo_sobrevive_ao_descarte(self, armazem):
+        """Uma tabela não acessada antes do descarte ainda é lida da versão aberta"""
+        armazem.gravar("anbimas", "2025-06-02", _anbimas(13.0))
+        vivo = armazem.ler("anbimas", "2025-06-02")
+        assert vivo["LTN"]["Tx. Indicativas"].tolist() == [13.0] * 3
+
+        armazem.gravar("anbimas", "2025-06-02", _anbimas(13.1))
+        armazem.gravar("anbimas", "2025-06-02", _anbimas(13.2))
+
+        assert vivo["NTN-F"]["Tx. Indicativas"].tolist() == [13.0] * 3
+        assert armazem.ler("anbimas", "2025-06-02")["NTN-F"]["Tx. Indicativas"].tolist() == [13.2] * 3
+
+    def test_pickle_nao_depende_dos_arquivos(self, armazem):
+        """O pickle leva as tabelas montadas, e não o caminho da versão"""
+        armazem.gravar("anbimas", "2025-06-02", _anbimas(13.0))
+        copia = pickle.dumps(armazem.ler("anbimas", "2025-06-02"))
+
+        armazem.gravar("anbimas", "2025-06-02", _anbimas(13.1))
+        armazem.gravar("anbimas", "2025-06-02", _anbimas(13.2))
+
+        tabelas = pickle.loads(copia)
+        assert list(tabelas) == ["LTN", "NTN-F"]
+        pd.testing.assert_frame_equal(tabelas["NTN-F"], _anbimas(13.0)["NTN-F"])
+
+
+class TestMigracaoLegado:
+    """Testes para a migração do cache pickle legado"""
+
+    def test_migra_pickle_legado(self, tmp_path, monkeypatch):
+        """Sem partição gravada, o "<fonte>.pkl" é lido e gravado no armazém"""
+        monkeypatch.setattr(cache, "CACHE_DIR", str(tmp_path / "cache"))
+        save_cache(14.65, "cdi.pkl")
+        modificado = pd.Timestamp("2025-06-02 18:30")
+        os.utime(os.path.join(cache.CACHE_DIR, "cdi.pkl"), (modificado.timestamp(), modificado.timestamp()))
+
+        assert VariaveisMercado().get_cdi() == 14.65
+
+        armazem = ArmazemMercado(os.path.join(cache.CACHE_DIR, "armazem"))
+        assert armazem.datas("cdi") == [pd.Timestamp("2025-06-02")]
+        assert armazem.ler("cdi") == 14.65
+
+    def test_armazem_informado_nao_migra(self, tmp_path, monkeypatch):
+        """Um armazém informado ignora o cache pickle legado"""
+        monkeypatch.setattr(cache, "CACHE_DIR", str(tmp_path / "cache"))
+        save_cache(14.65, "cdi.pkl")
+        armazem = ArmazemMercado(str(tmp_path / "outro"))
+
+        assert VariaveisMercado(armazem=armazem)._ler_armazenado("cdi") is None
+        assert armazem.ler("cdi") is None
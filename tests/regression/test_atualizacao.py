@@ -0,0 +1,141 @@
+"""
+Testes de regressão para a atualização paralela das fontes de mercado.
+
+As fontes são lidas de um servidor HTTP local, gravadas uma vez e depois
+reproduzidas com latência artificial (ver titulospub.scraping.gravacao).
+Estes testes validam:
+- A ordem das dependências entre as fontes (IPCA depois dos feriados)
+- O timeout por fonte, com fallback para a versão gravada no armazém
+- Uma busca que termina depois do timeout só grava no armazém
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+from titulospub.dados.armazem import ArmazemMercado
+from titulospub.dados.orquestrador import VariaveisMercado
+from titulospub.scraping.gravacao import MODO_GRAVAR, MODO_REPRODUZIR, gravacao
+from titulospub.scraping.requisicoes import ClienteHTTP, ler_url, usar_cliente
+
+VALORES = {"feriados": b"1", "ipca_dict": b"0.33", "cdi": b"14.90"}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serve o valor de cada fonte em /<fonte>."""
+
+    def do_GET(self):
+        conteudo = VALORES[self.path.strip("/")]
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(conteudo)))
+        self.end_headers()
+        self.wfile.write(conteudo)
+
+    def log_message(self, *args):
+        pass
+
+
+class _VariaveisGravadas(VariaveisMercado):
+    """Fontes lidas do servidor local, registrando o início e o fim de cada busca."""
+
+    url = None
+    eventos = []
+
+    def _buscar(self, fonte):
+        self.eventos.append(("inicio", fonte))
+        valor = ler_url(f"{self.url}/{fonte}", lambda conteudo: float(conteudo.decode()))
+        self._gravar_armazenado(fonte, None, valor)
+        self.eventos.append(("fim", fonte))
+        setattr(self, f"_{fonte}", valor)
+        return valor
+
+    def get_feriados(self, force_update=False):
+        return self._buscar("feriados")
+
+    def get_ipca_dict(self, data=None, feriados=None, force_update=False):
+        return self._buscar("ipca_dict")
+
+    def get_cdi(self, force_update=False):
+        return self._buscar("cdi")
+
+
+@pytest.fixture
+def gravacoes(tmp_path):
+    """Grava as respostas de um servidor local e devolve a pasta das gravações."""
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=servidor.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{servidor.server_address[1]}"
+    diretorio = str(tmp_path / "gravacoes")
+    try:
+        with gravacao(MODO_GRAVAR, diretorio):
+            for fonte in VALORES:
+                ClienteHTTP().baixar(f"{url}/{fonte}")
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+    _VariaveisGravadas.url = url
+    _VariaveisGravadas.eventos = []
+    return diretorio
+
+
+@pytest.fixture
+def armazem(tmp_path):
+    """Armazém com a versão anterior de cada fonte."""
+    armazem = ArmazemMercado(str(tmp_path / "armazem"))
+    for fonte in VALORES:
+        armazem.gravar(fonte, "2025-06-02", 0.0)
+    return armazem
+
+
+def _aguardar_buscas():
+    """Espera as threads de atualização que passaram do timeout."""
+    for thread in threading.enumerate():
+        if thread.name.startswith("atualizar-"):
+            thread.join()
+
+
+class TestAtualizarFontes:
+    """Testes para VariaveisMercado._atualizar_fontes"""
+
+    def test_ordem_das_dependencias(self, gravacoes, armazem):
+        """O IPCA só começa depois dos feriados; o CDI roda em paralelo"""
+        vm = _VariaveisGravadas(armazem=armazem)
+        with usar_cliente(ClienteHTTP()), gravacao(MODO_REPRODUZIR, gravacoes, latencia=0.2):
+            relatorio = vm._atualizar_fontes(tuple(VALORES), {fonte: 5.0 for fonte in VALORES})
+
+        eventos = _VariaveisGravadas.eventos
+        assert eventos.index(("fim", "feriados")) < eventos.index(("inicio", "ipca_dict"))
+        assert eventos.index(("inicio", "cdi")) < eventos.index(("fim", "feriados"))
+        assert all(resultado["status"] == "ok" for resultado in relatorio.values())
+        assert (vm._feriados, vm._ipca_dict, vm._cdi) == (1.0, 0.33, 14.90)
+
+    def test_timeout_usa_armazem_e_busca_atrasada_so_grava(self, gravacoes, armazem):
+        """A busca atrasada não sobrescreve o fallback reportado, mas grava no armazém"""
+        vm = _VariaveisGravadas(armazem=armazem)
+        with usar_cliente(ClienteHTTP()), gravacao(MODO_REPRODUZIR, gravacoes, latencia=0.5):
+            relatorio = vm._atualizar_fontes(("cdi",), {"cdi": 0.1})
+            assert relatorio["cdi"]["status"] == "timeout"
+            assert relatorio["cdi"]["fallback"] == "armazem"
+            assert vm._cdi == 0.0
+            _aguardar_buscas()
+
+        assert ("fim", "cdi") in _VariaveisGravadas.eventos
+        assert vm._cdi == 0.0
+        assert armazem.ler("cdi") == 14.90
+        assert armazem.datas("cdi")[-1] == pd.Timestamp.today().normalize()
+
+    def test_busca_no_prazo_atualiza_a_instancia(self, gravacoes, armazem):
+        """Dentro do timeout, o valor buscado é o da instância"""
+        vm = _VariaveisGravadas(armazem=armazem)
+        inicio = time.perf_counter()
+        with usar_cliente(ClienteHTTP()), gravacao(MODO_REPRODUZIR, gravacoes, latencia=0.1):
+            relatorio = vm._atualizar_fontes(("cdi",), {"cdi": 5.0})
+
+        assert time.perf_counter() - inicio < 5.0
+        assert relatorio["cdi"] == {"status": "ok", "tempo": relatorio["cdi"]["tempo"],
+                                    "fallback": None, "erro": None}
+        assert vm._cdi == 14.90
@@ -0,0 +1,69 @@
+"""
+Testes de regressão para /carteiras.
+"""
+
+import pytest
+
+
+class TestCarteiras:
+    """Testes para carteiras de títulos"""
+
+    def test_atualizar_taxa_carteira_ltn(self, client):
+        """Testa que a atualização de taxa altera apenas o vencimento informado"""
+        response = client.post("/carteiras/ltn", json={"dias_liquidacao": 1})
+        assert response.status_code == 200
+
+        data = response.json()
+        assert data["total_titulos"] == len(data["titulos"])
+        assert data["total_titulos"] > 1
+
+        antes = {t["vencimento"]: t for t in data["titulos"]}
+        vencimento = data["titulos"][-1]["vencimento"]
+
+        response = client.put(
+            f"/carteiras/{data['carteira_id']}/taxa",
+            json={"vencimento": vencimento, "taxa": antes[vencimento]["taxa"] + 1},
+        )
+        assert response.status_code == 200
+
+        for titulo in response.json()["titulos"]:
+            if titulo["vencimento"] == vencimento:
+                assert titulo["pu_d0"] < antes[vencimento]["pu_d0"]
+            else:
+                assert titulo == antes[titulo["vencimento"]]
+            assert titulo["financeiro"] == pytest.approx(titulo["quantidade"] * titulo["pu_d0"])
+
+    def test_cenarios_carteira_ntnf(self, client):
+        """Testa a simulação de cenários de choque de taxas"""
+        response = client.post("/carteiras/ntnf", json={"dias_liquidacao": 1})
+        assert response.status_code == 200
+        carteira = response.json()
+
+        payload = {
+            "cenarios": [
+                {"tipo": "paralelo", "bps": 0},
+                {"tipo": "paralelo", "bps": 50},
+                {"tipo": "inclinacao", "curto": -10, "longo": 30},
+            ]
+        }
+        response = client.post(f"/carteiras/{carteira['carteira_id']}/cenarios", json=payload)
+        assert response.status_code == 200
+
+        data = response.json()
+        n = carteira["total_titulos"]
+        assert data["cenarios"] == ["paralelo +0bp", "paralelo +50bp", "inclinacao -10/+30bp"]
+        assert len(data["vencimentos"]) == n
+        assert all(len(linha) == n for linha in data["pu"] + data["financeiro"] + data["pnl"])
+
+        # Sem choque o P&L é nulo; alta paralela de taxas gera perda
+        assert data["pnl_total"][0] == 0
+        assert data["pnl_total"][1] < 0
+        assert data["financeiro"][0] == [t["financeiro"] for t in carteira["titulos"]]
+
+    def test_cenarios_tipo_invalido(self, client):
+        """Testa erro de validação para tipo de cenário desconhecido"""
+        response = client.post("/carteiras/ltn", json={"dias_liquidacao": 1})
+        carteira_id = response.json()["carteira_id"]
+
+        response = client.post(f"/carteiras/{carteira_id}/cenarios", json={"cenarios": [{"tipo": "rotacao"}]})
+        assert response.status_code == 422
@@ -0,0 +1,109 @@
+"""
+Testes de regressão para GET /curvas, para a curva zero prefixada e para o
+PRT do DAP.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from titulospub.core.dap.calculo_dap import calculo_prt, precificar_dap_lote
+from titulospub.core.interpolacao.curva_zero import CurvaZeroPrefixada
+from titulospub.core.ntnf.cash_flow_ntnf import cotacao_ntnf_vetor, cronograma_ntnf
+from titulospub.utils.calendario import Calendario
+
+
+class TestCurvas:
+    """Testes para curvas de juros e inflação implícita"""
+
+    def test_curva_breakeven(self, client):
+        """Testa a estrutura de inflação implícita e a interpolação nas datas informadas"""
+        response = client.get("/curvas/breakeven")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert len(data["vertices"]) > 0
+        assert data["pontos"] == []
+
+        # Interpolação em um vértice reproduz o vértice
+        vertice = data["vertices"][0]
+        response = client.get("/curvas/breakeven", params={"datas": [vertice["vencimento"]]})
+        assert response.status_code == 200
+
+        ponto = response.json()["pontos"][0]
+        assert ponto["dias_uteis"] == vertice["dias_uteis"]
+        assert abs(ponto["inflacao_implicita"] - vertice["inflacao_implicita"]) < 1e-9
+
+    def test_curva_di(self, client):
+        """Testa PU e DV01 dos contratos de DI1 em ordem de vencimento"""
+        response = client.get("/curvas/di")
+        assert response.status_code == 200
+
+        contratos = response.json()["contratos"]
+        assert len(contratos) > 0
+
+        dias = [contrato["dias_uteis"] for contrato in contratos]
+        assert dias == sorted(dias)
+        assert all(0 < contrato["pu"] < 100000 and contrato["dv01"] > 0 for contrato in contratos)
+
+
+class TestCurvaZero:
+    """Testes para o bootstrap da curva zero a partir de LTN e NTN-F"""
+
+    DATA_REFERENCIA = pd.Timestamp("2025-06-02")
+    FERIADOS = pd.to_datetime(["2025-11-20", "2025-12-25", "2026-01-01", "2026-04-21", "2027-01-01",
+                               "2028-01-01", "2029-01-01", "2031-01-01", "2033-01-01", "2035-01-01"])
+    VENCIMENTOS_LTN = pd.to_datetime(["2025-10-01", "2026-01-01", "2026-07-01", "2027-01-01", "2028-01-01"])
+    TAXAS_LTN = np.array([14.90, 14.75, 14.30, 13.95, 13.60])
+    VENCIMENTOS_NTNF = pd.to_datetime(["2027-01-01", "2029-01-01", "2031-01-01", "2033-01-01", "2035-01-01"])
+    TAXAS_NTNF = np.array([13.98, 13.55, 13.70, 13.82, 13.90])
+
+    def _curva(self, calendario):
+        return CurvaZeroPrefixada(self.DATA_REFERENCIA, self.VENCIMENTOS_LTN, self.TAXAS_LTN,
+                                  self.VENCIMENTOS_NTNF, self.TAXAS_NTNF, feriados=calendario)
+
+    def test_reprecifica_ltn(self):
+        """A taxa zero no vencimento de cada LTN é a sua taxa ANBIMA"""
+        curva = self._curva(Calendario(self.FERIADOS))
+        np.testing.assert_allclose(curva.taxa_zero(self.VENCIMENTOS_LTN), self.TAXAS_LTN, rtol=0, atol=1e-10)
+
+    def test_reprecifica_ntnf(self):
+        """Os fluxos de cada NTN-F descontados pela curva reproduzem a cotação na taxa ANBIMA"""
+        calendario = Calendario(self.FERIADOS)
+        curva = self._curva(calendario)
+
+        # NTN-Fs que vencem até a última LTN não viram vértices
+        tabela = curva.tabela()
+        ntnf = tabela[tabela["TITULO"] == "NTN-F"]
+        assert list(ntnf["VENCIMENTO"]) == list(self.VENCIMENTOS_NTNF[1:])
+
+        cronograma = cronograma_ntnf(self.DATA_REFERENCIA, self.VENCIMENTOS_NTNF[1:], calendario)
+        cotacoes = cotacao_ntnf_vetor(cronograma["fv"], cronograma["dias"], self.TAXAS_NTNF[1:])
+        for i, cotacao in enumerate(cotacoes):
+            mascara = cronograma["mascara"][i]
+            fatores = curva.fator_desconto(pd.DatetimeIndex(cronograma["datas"][i][mascara]))
+            assert np.sum(cronograma["fv"][i][mascara] * fatores) == pytest.approx(cotacao, abs=1e-8)
+
+
+class TestPRT:
+    """Testes para o pró-rata do IPCA usado no financeiro do DAP"""
+
+    IPCA_DICT = {"INDICE_IPCA_FECHADO_ATUAL": 7111.86, "IPCA_USADO": 0.33}
+
+    def _prt_esperado(self, data, calendario, inicio, fim):
+        dias_totais = calendario.dias_uteis(inicio, fim)
+        dias_passados = calendario.dias_uteis(inicio, data)
+        return round(7111.86 * (1 + 0.33 / 100) ** (dias_passados / dias_totais), 2)
+
+    def test_mes_do_ipca_da_data_de_referencia(self):
+        """O mês do IPCA vem da data de referência do ipca_dict, não de hoje"""
+        calendario = Calendario(pd.to_datetime(["2025-11-20"]))
+        data = pd.Timestamp("2025-06-12")
+
+        prt = calculo_prt(data=data, ipca_dict=self.IPCA_DICT, feriados=calendario,
+                          data_referencia="2025-06-10")
+        assert prt == self._prt_esperado(data, calendario, pd.Timestamp("2025-05-15"), pd.Timestamp("2025-06-16"))
+
+        lote = precificar_dap_lote(taxas=[13.5], codigos=["DAPK35"], datas_liquidacao=data,
+                                   ipca_dict=self.IPCA_DICT, feriados=calendario, data_referencia="2025-06-10")
+        assert lote["prt"][0] == prt
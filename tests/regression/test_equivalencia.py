@@ -75,3 +75,28 @@ class TestEquivalencia:
         response = client.post("/equivalencia", json=payload)
         # Deve retornar erro 422 ou 400
         assert response.status_code in [400, 422]
+
+    def test_equivalencia_matriz(self, client, sample_vencimentos):
+        """Testa a matriz de equivalência entre todos os pares origem x destino"""
+        payload = {
+            "origens": [{"titulo": "NTNF", "vencimento": sample_vencimentos["ntnf"], "quantidade": 10000}],
+            "destinos": [
+                {"titulo": "NTNF", "vencimento": sample_vencimentos["ntnf"]},
+                {"titulo": "NTNF", "vencimento": sample_vencimentos["ntnf"], "taxa": 20.0},
+            ],
+        }
+
+        response = client.post("/equivalencia/matriz", json=payload)
+        assert response.status_code == 200
+
+        data = response.json()
+
+        # Uma linha por origem e uma coluna por destino
+        assert len(data["dv"]) == 1 and len(data["dv"][0]) == 2
+        assert len(data["fin"]) == 1 and len(data["fin"][0]) == 2
+
+        # Mesmo título como destino: DV01 equivalente igual à quantidade
+        assert data["dv"][0][0] == pytest.approx(10000)
+
+        # Destino com taxa maior tem PU menor: mais títulos para o mesmo financeiro
+        assert data["fin"][0][1] > data["fin"][0][0] > 0
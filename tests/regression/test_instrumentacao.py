@@ -0,0 +1,50 @@
+"""
+Testes de regressão para o modo estrito (sem I/O implícito).
+
+Estes testes validam:
+- Após o aquecimento do snapshot, os endpoints de títulos não fazem cargas implícitas
+- O endpoint de estatísticas de cargas implícitas
+"""
+
+import pytest
+
+from titulospub.dados.snapshot import get_snapshot
+from titulospub.utils.instrumentacao import modo_estrito, total_cargas_implicitas
+
+
+class TestModoEstrito:
+    """Testes para o modo estrito após aquecimento"""
+
+    def test_titulos_sem_carga_implicita(self, client):
+        """Após aquecer o snapshot, criar títulos não deve fazer I/O"""
+        snapshot = get_snapshot().carregar()
+        anbimas = snapshot.get_anbimas()
+        cargas_antes = total_cargas_implicitas()
+
+        with modo_estrito():
+            for tipo, chave in [("ltn", "LTN"), ("lft", "LFT"), ("ntnb", "NTN-B"), ("ntnf", "NTN-F")]:
+                # Vencimento mais longo disponível, para não depender da data atual
+                vencimento = anbimas[chave]["VENCIMENTO"].max()
+                payload = {
+                    "data_vencimento": vencimento.strftime("%Y-%m-%d"),
+                    "quantidade": 1000,
+                    "dias_liquidacao": 1,
+                }
+                response = client.post(f"/titulos/{tipo}", json=payload)
+                assert response.status_code == 200
+
+        assert total_cargas_implicitas() == cargas_antes
+
+    def test_listar_cargas_implicitas(self, client):
+        """Testa GET /cargas-implicitas"""
+        response = client.get("/cargas-implicitas")
+        assert response.status_code == 200
+
+        data = response.json()
+        assert "snapshot_versao" in data
+        assert isinstance(data["cargas"], list)
+        for item in data["cargas"]:
+            assert "fonte" in item
+            assert "funcao" in item
+            assert "cargas" in item
+            assert "tempo_s" in item
@@ -0,0 +1,115 @@
+"""
+Testes de regressão para a camada de requisições HTTP do scraping.
+
+Estes testes validam, contra um servidor HTTP local:
+- Memoização por URL dentro de uma rodada de atualização
+- Requisições condicionais (ETag / 304)
+- Interpretação evitada quando o conteúdo não muda
+- Gravação e reprodução offline das respostas
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from titulospub.scraping.gravacao import GravacaoAusenteError, gravacao
+from titulospub.scraping.requisicoes import ClienteHTTP
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Serve /com-etag (com ETag) e /sem-etag (sem validadores), contando as requisições."""
+
+    conteudo = b"indicadores"
+    requisicoes = []
+
+    def do_GET(self):
+        self.requisicoes.append((self.path, self.headers.get("If-None-Match")))
+        if self.path == "/com-etag" and self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        if self.path == "/com-etag":
+            self.send_header("ETag", '"v1"')
+        self.send_header("Content-Length", str(len(self.conteudo)))
+        self.end_headers()
+        self.wfile.write(self.conteudo)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def servidor():
+    """Servidor HTTP local em uma porta livre."""
+    _Handler.requisicoes = []
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=servidor.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{servidor.server_address[1]}"
+    servidor.shutdown()
+    servidor.server_close()
+
+
+class TestClienteHTTP:
+    """Testes para o ClienteHTTP"""
+
+    def test_rodada_baixa_cada_url_uma_vez(self, servidor):
+        """Dentro da rodada, a mesma URL não é baixada de novo"""
+        cliente = ClienteHTTP()
+        with cliente.rodada():
+            assert cliente.baixar(f"{servidor}/sem-etag") == b"indicadores"
+            assert cliente.baixar(f"{servidor}/sem-etag") == b"indicadores"
+
+        assert len(_Handler.requisicoes) == 1
+        assert cliente.estatisticas()["memoizadas"] == 1
+
+    def test_etag_reaproveita_conteudo(self, servidor):
+        """Fora da rodada, a URL é revalidada e o 304 não reinterpreta o conteúdo"""
+        cliente = ClienteHTTP()
+        interpretacoes = []
+
+        def interpretar(conteudo):
+            interpretacoes.append(conteudo)
+            return conteudo.decode()
+
+        assert cliente.ler_url(f"{servidor}/com-etag", interpretar) == "indicadores"
+        assert cliente.ler_url(f"{servidor}/com-etag", interpretar) == "indicadores"
+
+        assert _Handler.requisicoes == [("/com-etag", None), ("/com-etag", '"v1"')]
+        assert len(interpretacoes) == 1
+        assert cliente.estatisticas()["nao_modificadas"] == 1
+
+    def test_conteudo_identico_nao_reinterpreta(self, servidor):
+        """Sem validadores, o hash do conteúdo evita a nova interpretação"""
+        cliente = ClienteHTTP()
+        interpretacoes = []
+
+        def interpretar(conteudo):
+            interpretacoes.append(conteudo)
+            return len(conteudo)
+
+        assert cliente.ler_url(f"{servidor}/sem-etag", interpretar) == len(b"indicadores")
+        assert cliente.ler_url(f"{servidor}/sem-etag", interpretar) == len(b"indicadores")
+
+        assert len(_Handler.requisicoes) == 2
+        assert len(interpretacoes) == 1
+        assert cliente.estatisticas()["interpretacoes_evitadas"] == 1
+
+
+class TestGravacao:
+    """Testes para a gravação/reprodução das leituras"""
+
+    def test_reproduz_sem_servidor(self, servidor, tmp_path):
+        """A resposta gravada é reproduzida sem nova requisição"""
+        url = f"{servidor}/sem-etag"
+        with gravacao("gravar", str(tmp_path)):
+            assert ClienteHTTP().baixar(url) == b"indicadores"
+
+        with gravacao("reproduzir", str(tmp_path)):
+            assert ClienteHTTP().baixar(url) == b"indicadores"
+            with pytest.raises(GravacaoAusenteError):
+                ClienteHTTP().baixar(f"{servidor}/com-etag")
+
+        assert len(_Handler.requisicoes) == 1
@@ -0,0 +1,98 @@
+"""
+Testes de regressão para os dados de mercado fixados em datas passadas.
+
+Estes testes validam, com um armazém temporário e as fontes externas
+reproduzidas de uma gravação vazia (sem rede):
+- get_snapshot(data passada) devolve os valores gravados para a data
+- O CDI histórico é o último gravado até a data
+- Fontes que só fornecem o dado corrente não preenchem uma data passada
+"""
+
+from collections import OrderedDict
+
+import pandas as pd
+import pytest
+
+from titulospub.dados import cache, snapshot
+from titulospub.dados.armazem import ArmazemMercado, get_armazem
+from titulospub.dados.orquestrador import DadosHistoricosIndisponiveisError, VariaveisMercado
+from titulospub.dados.snapshot import get_snapshot
+from titulospub.scraping.gravacao import MODO_REPRODUZIR, gravacao
+
+FERIADOS = [pd.Timestamp("2025-04-18"), pd.Timestamp("2025-04-21"), pd.Timestamp("2025-05-01")]
+
+
+@pytest.fixture
+def sem_rede(tmp_path):
+    """Reproduz uma gravação vazia: toda leitura externa falha."""
+    with gravacao(MODO_REPRODUZIR, str(tmp_path / "gravacoes")):
+        yield
+
+
+@pytest.fixture
+def armazem_local(tmp_path, monkeypatch):
+    """Armazém do processo em uma pasta temporária, sem snapshots históricos em memória."""
+    monkeypatch.setattr(cache, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(snapshot, "_snapshots_historicos", OrderedDict())
+    armazem = get_armazem()
+    armazem.gravar("feriados", "2025-05-02", FERIADOS)
+    return armazem
+
+
+class TestSnapshotHistorico:
+    """Testes para snapshots fixados em datas passadas"""
+
+    def test_snapshot_usa_particao_da_data(self, armazem_local, sem_rede):
+        """Cada data passada lê a sua própria partição"""
+        armazem_local.gravar("ipca_dict", "2025-06-02", {"ipca_fechado": 0.26})
+        armazem_local.gravar("ipca_dict", "2025-06-03", {"ipca_fechado": 0.40})
+
+        assert get_snapshot("2025-06-02").get_ipca_dict()["ipca_fechado"] == 0.26
+        assert get_snapshot("2025-06-03").get_ipca_dict()["ipca_fechado"] == 0.40
+        assert get_snapshot("2025-06-02") is get_snapshot("2025-06-02")
+
+    def test_cdi_ultimo_ate_a_data(self, armazem_local, sem_rede):
+        """O CDI vale até a próxima publicação"""
+        armazem_local.gravar("cdi", "2025-06-02", 14.65)
+        armazem_local.gravar("cdi", "2025-06-20", 14.90)
+
+        assert get_snapshot("2025-06-10").get_cdi() == 14.65
+        assert get_snapshot("2025-06-20").get_cdi() == 14.90
+
+    def test_fonte_corrente_nao_preenche_data_passada(self, armazem_local, sem_rede):
+        """Sem partição, IPCA e CDI de uma data passada levantam erro e nada é gravado"""
+        with pytest.raises(DadosHistoricosIndisponiveisError):
+            get_snapshot("2025-06-02").get_ipca_dict()
+        with pytest.raises(DadosHistoricosIndisponiveisError):
+            get_snapshot("2025-06-02").get_cdi()
+
+        assert armazem_local.ler("ipca_dict") is None
+        assert armazem_local.ler("cdi") is None
+
+
+class TestVariaveisMercadoHistoricas:
+    """Testes para as fontes de um VariaveisMercado com data de referência passada"""
+
+    def test_fallback_nao_grava_na_data(self, tmp_path, sem_rede):
+        """Com a busca pela data indisponível, ANBIMA e BMF não usam backup nem a net"""
+        armazem = ArmazemMercado(str(tmp_path / "armazem"))
+        armazem.gravar("feriados", "2025-05-02", FERIADOS)
+        vm = VariaveisMercado(data_referencia="2025-06-03", armazem=armazem)
+
+        with pytest.raises(DadosHistoricosIndisponiveisError):
+            vm.get_anbimas()
+        with pytest.raises(DadosHistoricosIndisponiveisError):
+            vm.get_bmf()
+
+        assert armazem.ler("anbimas") is None
+        assert armazem.ler("bmf") is None
+
+    def test_restaura_ultima_versao_ate_a_data(self, tmp_path):
+        """O fallback da atualização não usa uma versão posterior à data"""
+        armazem = ArmazemMercado(str(tmp_path / "armazem"))
+        armazem.gravar("cdi", "2025-06-02", 14.65)
+        armazem.gravar("cdi", "2025-06-20", 14.90)
+        vm = VariaveisMercado(data_referencia="2025-06-10", armazem=armazem)
+
+        assert vm._restaurar_armazenado("cdi")
+        assert vm.get_cdi() == 14.65
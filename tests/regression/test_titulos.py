@@ -10,6 +10,8 @@ Estes testes validam:
 
 import pytest
 
+from titulospub.dados.snapshot import get_snapshot
+
 
 class TestLTN:
     """Testes para POST /titulos/ltn"""
@@ -99,6 +101,27 @@ class TestLTN:
         assert isinstance(data["taxa"], (int, float))
         assert data["taxa"] > 0
 
+    def test_criar_ltn_lote(self, client):
+        """Testa que o cálculo em lote coincide com o cálculo individual"""
+        anbimas = get_snapshot().get_anbimas()
+        vencimentos = [v.strftime("%Y-%m-%d") for v in anbimas["LTN"]["VENCIMENTO"].tail(3)]
+        taxas = [12.5, 12.8, 13.1]
+
+        response = client.post(
+            "/titulos/ltn/lote",
+            json={"data_vencimentos": vencimentos, "taxas": taxas, "quantidade": 50000},
+        )
+        assert response.status_code == 200
+
+        lote = response.json()
+        assert [item["data_vencimento"][:10] for item in lote] == vencimentos
+
+        for item, vencimento, taxa in zip(lote, vencimentos, taxas):
+            payload = {"data_vencimento": vencimento, "taxa": taxa, "quantidade": 50000}
+            individual = client.post("/titulos/ltn", json=payload).json()
+            for campo in ("pu_d0", "pu_termo", "pu_carregado", "dv01", "financeiro"):
+                assert item[campo] == individual[campo]
+
 
 class TestLFT:
     """Testes para POST /titulos/lft"""
@@ -188,3 +211,35 @@ class TestNTNF:
         # Validar valores numéricos principais
         assert data["taxa"] == 12.5
         assert data["pu_d0"] > 0
+
+    def test_criar_ntnf_requisicoes_independentes(self, client, sample_vencimentos):
+        """Testa que a taxa de uma requisição não altera as seguintes (pool de títulos)"""
+        payload = {"data_vencimento": sample_vencimentos["ntnf"], "quantidade": 50000}
+
+        anbima = client.post("/titulos/ntnf", json=payload).json()
+        com_taxa = client.post("/titulos/ntnf", json={**payload, "taxa": anbima["taxa"] + 1}).json()
+        novamente = client.post("/titulos/ntnf", json=payload).json()
+
+        assert com_taxa["pu_d0"] < anbima["pu_d0"]
+        assert novamente["taxa"] == anbima["taxa"]
+        assert novamente["pu_d0"] == anbima["pu_d0"]
+
+    def test_taxa_implicita_ntnf(self, client):
+        """Testa que a taxa implícita recupera a taxa usada para gerar o PU"""
+        anbimas = get_snapshot().get_anbimas()
+        vencimentos = [v.strftime("%Y-%m-%d") for v in anbimas["NTN-F"]["VENCIMENTO"].tail(2)]
+        taxas = [12.5, 13.1]
+
+        pus = []
+        for vencimento, taxa in zip(vencimentos, taxas):
+            payload = {"data_vencimento": vencimento, "taxa": taxa, "quantidade": 50000}
+            pus.append(client.post("/titulos/ntnf", json=payload).json()["pu_termo"])
+
+        response = client.post(
+            "/taxa-implicita",
+            json={"tipo": "NTNF", "data_vencimentos": vencimentos, "pus": pus, "casas_decimais": 4},
+        )
+        assert response.status_code == 200
+
+        data = response.json()
+        assert [item["taxa"] for item in data["taxas"]] == taxas
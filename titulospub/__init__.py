@@ -26,7 +26,13 @@ Exemplo de uso:
 from .core import NTNB, LTN, LFT, NTNF, DI
 
 # Importar função de equivalência
-from .core.equivalencia import equivalencia
+from .core.equivalencia import equivalencia, equivalencia_matriz
+from .core.pool_titulos import PoolTitulos, get_pool_titulos, obter_titulo
+from .core.interpolacao.funcoes_interpolacao import (CurvaFlatForward252, interpolar_flat_forward_252, obter_curva_bmf,
+                                                     obter_curva_dap, obter_curva_di)
+from .core.interpolacao.curva_breakeven import CurvaBreakeven, obter_curva_breakeven
+from .core.interpolacao.curva_zero import CurvaZeroPrefixada, obter_curva_zero
+from .core.di.curva_di import CurvaDI, obter_curva_contratos_di
 
 # Importar funções principais de cada módulo
 from .scraping import (
@@ -50,6 +56,14 @@ from .utils import (
     listar_datas,
     data_vencimento_ajustada,
     datas_pagamento_cupons,
+    Calendario,
+    obter_calendario,
+    CargaImplicitaError,
+    estatisticas_cargas,
+    modo_estrito,
+    modo_estrito_ativo,
+    resetar_estatisticas,
+    total_cargas_implicitas,
     path_backup_csv,
     path_backup_pickle,
     path_logs,
@@ -73,7 +87,13 @@ from .dados import (
     ajustes_bmf,
     ajustes_bmf_net,
     dicionario_ipca,
-    VariaveisMercado
+    VariaveisMercado,
+    MarketSnapshot,
+    carregar_snapshots,
+    get_snapshot,
+    publicar_snapshot,
+    recarregar_snapshot,
+    snapshot_historico
 )
 
 # Lista de todas as classes e funções disponíveis
@@ -87,6 +107,21 @@ __all__ = [
     
     # Função de equivalência
     'equivalencia',
+    'equivalencia_matriz',
+    'PoolTitulos',
+    'get_pool_titulos',
+    'obter_titulo',
+    'CurvaFlatForward252',
+    'interpolar_flat_forward_252',
+    'obter_curva_di',
+    'obter_curva_dap',
+    'obter_curva_bmf',
+    'CurvaBreakeven',
+    'obter_curva_breakeven',
+    'CurvaZeroPrefixada',
+    'obter_curva_zero',
+    'CurvaDI',
+    'obter_curva_contratos_di',
     
     # Funções de scraping
     'scrap_cdi',
@@ -108,6 +143,14 @@ __all__ = [
     'listar_datas',
     'data_vencimento_ajustada',
     'datas_pagamento_cupons',
+    'Calendario',
+    'obter_calendario',
+    'CargaImplicitaError',
+    'estatisticas_cargas',
+    'modo_estrito',
+    'modo_estrito_ativo',
+    'resetar_estatisticas',
+    'total_cargas_implicitas',
     'path_backup_csv',
     'path_backup_pickle',
     'path_logs',
@@ -130,7 +173,13 @@ __all__ = [
     'ajustes_bmf',
     'ajustes_bmf_net',
     'dicionario_ipca',
-    'VariaveisMercado'
+    'VariaveisMercado',
+    'MarketSnapshot',
+    'get_snapshot',
+    'snapshot_historico',
+    'carregar_snapshots',
+    'publicar_snapshot',
+    'recarregar_snapshot'
 ]
 
 # Versão do módulo
@@ -29,10 +29,29 @@ from .di.di_contrato import DI
 from .di.calculo_di import taxa_pu_di, calculo_dv01_di
 
 # Importar funções de cálculo de DAP
-from .dap.calculo_dap import dia_15_do_mes, calculo_prt, calculo_pu_dap, calculo_financeiro_dap
+from .dap.calculo_dap import (dia_15_do_mes, calculo_prt, calculo_pu_dap, calculo_financeiro_dap,
+                              dv01_dap, precificar_dap_lote)
 
 # Importar função de equivalência
-from .equivalencia import equivalencia
+from .equivalencia import equivalencia, equivalencia_matriz
+
+# Importar curvas de juros interpoladas (flat-forward 252)
+from .interpolacao.funcoes_interpolacao import (CurvaFlatForward252, interpolar_flat_forward_252, obter_curva_bmf,
+                                                obter_curva_dap, obter_curva_di)
+from .interpolacao.curva_breakeven import CurvaBreakeven, obter_curva_breakeven
+from .interpolacao.curva_zero import CurvaZeroPrefixada, obter_curva_zero
+from .di.curva_di import CurvaDI, obter_curva_contratos_di
+
+# Importar pool de títulos pré-precificados
+from .pool_titulos import PoolTitulos, get_pool_titulos, obter_titulo
+
+# Importar funções de sensibilidade (DV01)
+from .sensibilidade import (METODO_ANALITICO, METODO_BUMP, dv01_dap_vetor, dv01_di_vetor,
+                            dv01_ltn_vetor, dv01_ntnb_vetor, dv01_ntnf_vetor)
+
+# Importar funções de taxa implícita (taxa a partir do PU)
+from .taxa_implicita import (calcular_taxas_implicitas, resolver_taxas, taxa_lft_de_pu,
+                             taxa_ltn_de_pu, taxa_ntnb_de_pu, taxa_ntnf_de_pu)
 
 # Lista de todas as classes disponíveis
 __all__ = [
@@ -42,12 +61,42 @@ __all__ = [
     'NTNF',
     'DI',
     'equivalencia',
+    'equivalencia_matriz',
+    'PoolTitulos',
+    'get_pool_titulos',
+    'obter_titulo',
+    'CurvaFlatForward252',
+    'interpolar_flat_forward_252',
+    'obter_curva_di',
+    'obter_curva_dap',
+    'obter_curva_bmf',
+    'CurvaBreakeven',
+    'obter_curva_breakeven',
+    'CurvaZeroPrefixada',
+    'obter_curva_zero',
+    'CurvaDI',
+    'obter_curva_contratos_di',
     'taxa_pu_di',
     'calculo_dv01_di',
     'dia_15_do_mes',
     'calculo_prt',
     'calculo_pu_dap',
-    'calculo_financeiro_dap'
+    'calculo_financeiro_dap',
+    'dv01_dap',
+    'precificar_dap_lote',
+    'METODO_BUMP',
+    'METODO_ANALITICO',
+    'dv01_ltn_vetor',
+    'dv01_ntnf_vetor',
+    'dv01_ntnb_vetor',
+    'dv01_di_vetor',
+    'dv01_dap_vetor',
+    'resolver_taxas',
+    'taxa_ltn_de_pu',
+    'taxa_ntnf_de_pu',
+    'taxa_ntnb_de_pu',
+    'taxa_lft_de_pu',
+    'calcular_taxas_implicitas'
 ]
 
 # Versão do módulo
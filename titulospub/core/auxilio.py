@@ -1,9 +1,60 @@
+import math
+import numpy as np
 import pandas as pd 
 from math import trunc
 
 from titulospub.utils import _carregar_feriados_se_necessario, _carrecar_cdi_se_necessario, dias_trabalho_total
 
-def calculo_pu_carregado(data, data_liquidacao, pu, cdi=None, feriados=None):
+# pow da libm aplicado elemento a elemento: np.power usa rotinas vetorizadas
+# que podem diferir no último bit do operador ** usado nos cálculos escalares
+_pow_libm = np.frompyfunc(math.pow, 2, 1)
+
+
+def truncar_vetor(valores, casas_decimais: int) -> np.ndarray:
+    """
+    Trunca (em direção a zero) um array de valores, com a mesma semântica do
+    truncar escalar usado nos cálculos: trunc(valor * 10**casas) / 10**casas.
+
+    Args:
+        valores: Array (ou escalar) de valores
+        casas_decimais: Número de casas decimais
+
+    Returns:
+        Array de valores truncados
+    """
+    fator = 10 ** casas_decimais
+    return np.trunc(np.asarray(valores, dtype=np.float64) * fator) / fator
+
+
+def potencia_vetor(base, expoente) -> np.ndarray:
+    """
+    Calcula base ** expoente elemento a elemento, bit a bit igual ao operador **
+    de float do Python.
+
+    Args:
+        base: Array (ou escalar) de bases
+        expoente: Array (ou escalar) de expoentes
+
+    Returns:
+        Array de float64
+    """
+    return np.asarray(_pow_libm(base, expoente), dtype=np.float64)
+
+
+def fator_carregamento(data, data_liquidacao, cdi=None, feriados=None) -> float:
+    """
+    Fator de carregamento pelo CDI entre a data base e a liquidação
+    (mínimo de 1 dia útil).
+
+    Args:
+        data: Data base
+        data_liquidacao: Data de liquidação
+        cdi: Taxa CDI (se None, carrega automaticamente)
+        feriados: Lista de feriados ou Calendario (se None, carrega automaticamente)
+
+    Returns:
+        (1 + cdi/100) ** (dias/252)
+    """
     feriados = _carregar_feriados_se_necessario(feriados)
     cdi = _carrecar_cdi_se_necessario(cdi)
 
@@ -12,8 +63,13 @@ def calculo_pu_carregado(data, data_liquidacao, pu, cdi=None, feriados=None):
     if liq == 0:
         liq += 1
 
+    return (1 + cdi / 100) ** (liq / 252)
+
+def calculo_pu_carregado(data, data_liquidacao, pu, cdi=None, feriados=None):
+    fator = fator_carregamento(data=data, data_liquidacao=data_liquidacao, cdi=cdi, feriados=feriados)
+
     truncar = lambda valor, casas_decimais: trunc(valor * 10 ** casas_decimais) / 10 ** casas_decimais
-    return truncar(((1 + cdi / 100) ** (liq / 252)) * pu, 6)
+    return truncar(fator * pu, 6)
 
 def codigo_vencimento_bmf(codigo: str ):
     letras  = {"F":"01", "G":"02", "H":"03",
@@ -0,0 +1,65 @@
+"""
+Cálculo sob demanda dos valores derivados dos títulos.
+
+As classes de títulos declaram em _DEPENDENCIAS cada saída derivada, o
+método que a calcula e as entradas de que ela depende. Uma saída só é
+calculada no primeiro acesso e fica guardada até que uma das suas entradas
+mude: os setters chamam _invalidar com as entradas alteradas e apenas as
+saídas afetadas são descartadas.
+
+Entradas usadas pelos títulos:
+- "taxa": taxa, prêmio e DI
+- "datas": data base, data de liquidação e dias de liquidação
+- "quantidade": quantidade e financeiro
+"""
+from typing import Dict, Tuple
+
+
+class CalculoSobDemanda:
+    """
+    Mixin com cache de saídas derivadas e invalidação por dependência.
+
+    As subclasses definem:
+        _DEPENDENCIAS = {saida: (nome_do_metodo, (entradas, ...))}
+
+    As dependências devem ser listadas de forma transitiva: uma saída que
+    usa outra saída depende também das entradas dela.
+    """
+
+    _DEPENDENCIAS: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+
+    def _valores_calculados(self) -> dict:
+        try:
+            return self.__dict__["_calculados"]
+        except KeyError:
+            calculados = self.__dict__["_calculados"] = {}
+            return calculados
+
+    def _obter(self, saida: str):
+        """Retorna a saída, calculando-a se ainda não estiver disponível."""
+        calculados = self._valores_calculados()
+        try:
+            return calculados[saida]
+        except KeyError:
+            pass
+        metodo, _ = self._DEPENDENCIAS[saida]
+        valor = getattr(self, metodo)()
+        calculados[saida] = valor
+        return valor
+
+    def _definir(self, saida: str, valor):
+        """Armazena uma saída já calculada (por exemplo, por uma precificação em lote)."""
+        if saida not in self._DEPENDENCIAS:
+            raise KeyError(f"Saída desconhecida: {saida}")
+        self._valores_calculados()[saida] = valor
+
+    def _invalidar(self, *entradas: str):
+        """Descarta as saídas que dependem de alguma das entradas informadas."""
+        calculados = self._valores_calculados()
+        for saida, (_, dependencias) in self._DEPENDENCIAS.items():
+            if saida in calculados and not set(dependencias).isdisjoint(entradas):
+                del calculados[saida]
+
+    def _calculado(self, saida: str) -> bool:
+        """Indica se a saída já está disponível sem recálculo."""
+        return saida in self._valores_calculados()
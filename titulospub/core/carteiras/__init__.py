@@ -5,16 +5,28 @@ Este módulo contém classes para gerenciar carteiras de títulos,
 permitindo ajustar parâmetros individuais sem recalcular todos os vencimentos.
 """
 
+from .carteira_base import CarteiraBase
 from .carteira_ltn import CarteiraLTN
 from .carteira_lft import CarteiraLFT
 from .carteira_ntnb import CarteiraNTNB
 from .carteira_ntnf import CarteiraNTNF
+from .cenarios import choque_borboleta, choque_inclinacao, choque_paralelo, choque_vetor, montar_choques
+from .risco import carregar_variacoes_historicas, simular_pnl_historico, var_historico
 
 __all__ = [
+    "CarteiraBase",
     "CarteiraLTN",
     "CarteiraLFT",
     "CarteiraNTNB",
     "CarteiraNTNF",
+    "choque_paralelo",
+    "choque_inclinacao",
+    "choque_borboleta",
+    "choque_vetor",
+    "montar_choques",
+    "carregar_variacoes_historicas",
+    "simular_pnl_historico",
+    "var_historico",
 ]
 
 
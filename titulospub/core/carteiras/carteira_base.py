@@ -0,0 +1,393 @@
+"""
+Núcleo das carteiras de títulos em colunas.
+
+Cada carteira guarda os seus vencimentos como colunas NumPy contíguas
+(vencimento, taxa, quantidade, PUs, DV01, carrego...), uma linha por
+vencimento. As atualizações escrevem diretamente nas colunas: mudar a
+quantidade não reprecifica nada, mudar a taxa reprecifica uma linha e
+mudar os dias de liquidação reprecifica a carteira inteira em uma única
+chamada vetorizada. Objetos de título só são criados em obter_titulo.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from titulospub.core.interpolacao.funcoes_interpolacao import obter_curva_bmf
+from titulospub.dados.orquestrador import VariaveisMercado
+from titulospub.dados.snapshot import MarketSnapshot, get_snapshot
+
+
+class CarteiraBase:
+    """
+    Carteira de títulos armazenada em colunas (struct-of-arrays).
+
+    As subclasses definem:
+        _TIPO: nome do título usado nas mensagens (ex.: "LTN")
+        _COLUNAS_ESTATICAS: colunas de _dados_estaticos (taxa inicial incluída)
+        _COLUNAS_PRECO: colunas preenchidas pela precificação em lote
+        _COLUNAS_TABELA: campos de obter_dados_tabela, na ordem de saída
+        _COLUNAS_DICT: campos de obter_dados_dict
+        _vencimentos_disponiveis(): vencimentos a carregar
+        _dados_estaticos(vencimento): colunas que não dependem da taxa nem das datas
+        _precificar_lote(vencimentos, taxas): precificação em lote (arrays do mesmo tamanho)
+        _criar_titulo(i): materializa o título da linha i
+    """
+
+    _TIPO = ""
+    _COLUNAS_ESTATICAS: Tuple[str, ...] = ()
+    _COLUNAS_PRECO: Tuple[str, ...] = ()
+    _COLUNAS_TABELA: Tuple[str, ...] = ()
+    _COLUNAS_DICT: Tuple[str, ...] = ()
+
+    # Campos da tabela exibidos como None quando nulos (mesma regra do "x if x else None")
+    _ZERO_COMO_NULO = ("taxa", "pu_termo", "pu_d0", "dv01", "financeiro")
+
+    # Campos da tabela convertidos para inteiro (ex.: número de contratos)
+    _COLUNAS_INTEIRAS: Tuple[str, ...] = ()
+
+    # Se True, linhas com vencimento até a liquidação ficam sem preço (NaN)
+    _MASCARAR_VENCIDOS = True
+
+    # PU usado no financeiro da posição
+    _PU_FINANCEIRO = "pu_d0"
+
+    def __init__(
+        self,
+        data_base: Optional[str] = None,
+        dias_liquidacao: int = 1,
+        quantidade_padrao: float = 10000,
+        variaveis_mercado: Optional[VariaveisMercado | MarketSnapshot] = None,
+    ):
+        """
+        Inicializa a carteira.
+
+        Args:
+            data_base: Data base para cálculos (default: hoje)
+            dias_liquidacao: Dias para liquidação (default: 1)
+            quantidade_padrao: Quantidade padrão para cada título
+            variaveis_mercado: Instância compartilhada de VariaveisMercado ou MarketSnapshot (default: snapshot do processo)
+        """
+        self._vm = variaveis_mercado or get_snapshot(data_base)
+        self._calendario = self._vm.get_calendario()
+        self._data_base = data_base
+        self._dias_liquidacao = dias_liquidacao
+        self._quantidade_padrao = quantidade_padrao
+
+        self._data_referencia = (pd.to_datetime(data_base).normalize()
+                                 if data_base
+                                 else pd.Timestamp.today().normalize())
+        self._data_liquidacao = self._calendario.adicionar_dias_uteis(self._data_referencia, dias_liquidacao)
+
+        # Vencimentos (YYYY-MM-DD) em ordem, posição de cada um e colunas
+        self._chaves: List[str] = []
+        self._indice: Dict[str, int] = {}
+        self._colunas: Dict[str, np.ndarray] = {}
+
+        # Carrega vencimentos disponíveis
+        self._carregar_vencimentos()
+
+    # ==================== CARGA ====================
+
+    def _carregar_vencimentos(self):
+        """Carrega todos os vencimentos disponíveis e precifica a carteira."""
+        linhas = {}
+        for vencimento in self._vencimentos_disponiveis():
+            try:
+                linhas[vencimento] = self._dados_estaticos(vencimento)
+            except Exception as e:
+                print(f"[WARN] Erro ao carregar {self._TIPO} {vencimento}: {e}")
+
+        self._montar_colunas(linhas)
+        self._precificar_todos()
+
+        # Vencimentos sem DV01 (vencidos ou liquidando no vencimento) não entram na carteira
+        if "dv01" in self._colunas:
+            dv01 = self._colunas["dv01"]
+            invalidos = np.isnan(dv01) | (dv01 == 0)
+            for i in np.flatnonzero(invalidos):
+                print(f"[WARN] Erro ao carregar {self._TIPO} {self._chaves[i]}: DV01 nulo")
+            if invalidos.any():
+                self._manter_linhas(~invalidos)
+
+    def _montar_colunas(self, linhas: Dict[str, dict]):
+        """Cria as colunas a partir dos dados estáticos de cada vencimento."""
+        self._chaves = sorted(linhas)
+        self._indice = {chave: i for i, chave in enumerate(self._chaves)}
+        n = len(self._chaves)
+
+        colunas = {
+            "vencimento": pd.to_datetime(self._chaves).values,
+            "quantidade": np.full(n, float(self._quantidade_padrao)),
+        }
+        for campo in self._COLUNAS_ESTATICAS:
+            colunas[campo] = np.array([linhas[chave][campo] for chave in self._chaves], dtype=np.float64)
+        for campo in self._COLUNAS_PRECO:
+            colunas[campo] = np.full(n, np.nan)
+        self._colunas = colunas
+
+    def _manter_linhas(self, mascara: np.ndarray):
+        """Remove da carteira as linhas fora da máscara."""
+        self._colunas = {nome: coluna[mascara] for nome, coluna in self._colunas.items()}
+        self._chaves = [chave for chave, manter in zip(self._chaves, mascara) if manter]
+        self._indice = {chave: i for i, chave in enumerate(self._chaves)}
+
+    # ==================== PRECIFICAÇÃO ====================
+
+    def _linhas_ativas(self, indices: np.ndarray) -> np.ndarray:
+        """Filtra as linhas que ainda não venceram na data de liquidação."""
+        if not self._MASCARAR_VENCIDOS or len(indices) == 0:
+            return indices
+        vencimentos = self._calendario.proximo_dia_util(pd.DatetimeIndex(self._colunas["vencimento"][indices]))
+        dias = np.asarray(self._calendario.dias_uteis(self._data_liquidacao, vencimentos))
+        return indices[dias > 0]
+
+    def _precificar(self, indices: np.ndarray):
+        """Reprecifica as linhas informadas e escreve o resultado nas colunas."""
+        for campo in self._COLUNAS_PRECO:
+            self._colunas[campo][indices] = np.nan
+
+        ativas = self._linhas_ativas(indices)
+        if len(ativas) == 0:
+            return
+
+        res = self._precificar_lote(self._colunas["vencimento"][ativas], self._colunas["taxa"][ativas])
+        for campo in self._COLUNAS_PRECO:
+            self._colunas[campo][ativas] = res[campo]
+
+    def _precificar_todos(self):
+        """Reprecifica a carteira inteira em uma única chamada em lote."""
+        self._precificar(np.arange(len(self._chaves)))
+
+    def _posicao(self, vencimento: str) -> int:
+        """Posição do vencimento nas colunas."""
+        try:
+            return self._indice[vencimento]
+        except KeyError:
+            raise ValueError(f"Vencimento {vencimento} não encontrado na carteira") from None
+
+    # ==================== ATUALIZAÇÕES ====================
+
+    def atualizar_taxa(self, vencimento: str, taxa: float):
+        """
+        Atualiza a taxa de um título específico.
+
+        Args:
+            vencimento: Data de vencimento (YYYY-MM-DD)
+            taxa: Nova taxa de juros
+        """
+        i = self._posicao(vencimento)
+        self._colunas["taxa"][i] = float(taxa)
+        self._precificar(np.array([i]))
+
+    def atualizar_dias_liquidacao(self, dias: int):
+        """
+        Atualiza dias de liquidação para todos os títulos.
+
+        Args:
+            dias: Novo número de dias para liquidação
+        """
+        self._dias_liquidacao = int(dias)
+        self._data_liquidacao = self._calendario.adicionar_dias_uteis(self._data_referencia, self._dias_liquidacao)
+        self._precificar_todos()
+
+    def atualizar_quantidade(self, vencimento: str, quantidade: float):
+        """
+        Atualiza a quantidade de um título específico.
+
+        Args:
+            vencimento: Data de vencimento (YYYY-MM-DD)
+            quantidade: Nova quantidade
+        """
+        i = self._posicao(vencimento)
+        if quantidade <= 0:
+            raise ValueError("Quantidade deve ser maior que zero")
+
+        # Os valores por unidade não mudam: nada é reprecificado
+        self._colunas["quantidade"][i] = float(quantidade)
+
+    # ==================== CONSULTAS ====================
+
+    def obter_titulo(self, vencimento: str):
+        """
+        Obtém um título específico, criado a partir da linha da carteira.
+
+        O título é um objeto novo a cada chamada: alterá-lo não altera a carteira.
+
+        Args:
+            vencimento: Data de vencimento (YYYY-MM-DD)
+
+        Returns:
+            Instância do título ou None se não encontrado
+        """
+        i = self._indice.get(vencimento)
+        if i is None:
+            return None
+        return self._criar_titulo(i)
+
+    def _colunas_derivadas(self) -> Dict[str, np.ndarray]:
+        """Colunas calculadas a partir das demais (valores da posição)."""
+        quantidade = self._colunas["quantidade"]
+        derivadas = {"financeiro": quantidade * self._colunas[self._PU_FINANCEIRO]}
+        if "dv01" in self._colunas:
+            derivadas["dv01"] = self._colunas["dv01"] * quantidade
+        if "carrego_brl" in self._colunas:
+            derivadas["carrego_brl"] = self._colunas["carrego_brl"] * quantidade
+        return derivadas
+
+    def obter_colunas(self) -> Dict[str, np.ndarray]:
+        """
+        Obtém a carteira em formato de colunas.
+
+        Valores por unidade (PUs, carrego_bps) vêm como estão nas colunas;
+        dv01, carrego_brl e financeiro já multiplicados pela quantidade.
+
+        Returns:
+            Dicionário {coluna: array}, com uma posição por vencimento
+        """
+        colunas = {nome: coluna.copy() for nome, coluna in self._colunas.items()}
+        colunas.update(self._colunas_derivadas())
+        return colunas
+
+    def obter_dados_tabela(self) -> List[Dict]:
+        """
+        Obtém dados de todos os títulos em formato de lista para tabela.
+
+        Returns:
+            Lista de dicionários com dados dos títulos
+        """
+        return self._linhas(self._COLUNAS_TABELA, com_vencimento=True)
+
+    def obter_dados_dict(self) -> Dict[str, Dict]:
+        """
+        Obtém dados de todos os títulos em formato de dicionário.
+
+        Returns:
+            Dicionário {vencimento: {dados do título}}
+        """
+        linhas = self._linhas(self._COLUNAS_DICT, com_vencimento=False)
+        return dict(zip(self._chaves, linhas))
+
+    def _linhas(self, campos: Tuple[str, ...], com_vencimento: bool) -> List[Dict]:
+        """Converte as colunas em uma lista de dicionários (NaN vira None)."""
+        colunas = self.obter_colunas()
+        valores = {campo: colunas[campo].tolist() for campo in campos}
+
+        dados = []
+        for i, vencimento in enumerate(self._chaves):
+            linha = {"vencimento": vencimento} if com_vencimento else {}
+            for campo in campos:
+                valor = valores[campo][i]
+                if valor != valor or (campo in self._ZERO_COMO_NULO and not valor):
+                    valor = None
+                elif campo in self._COLUNAS_INTEIRAS:
+                    valor = int(valor)
+                linha[campo] = valor
+            dados.append(linha)
+        return dados
+
+    # ==================== CENÁRIOS ====================
+
+    def prazos(self) -> np.ndarray:
+        """
+        Prazo de cada vencimento em anos úteis (dias úteis da liquidação ao vencimento / 252).
+
+        Returns:
+            Array de prazos, na ordem de vencimentos
+        """
+        vencimentos = self._calendario.proximo_dia_util(pd.DatetimeIndex(self._colunas["vencimento"]))
+        return np.asarray(self._calendario.dias_uteis(self._data_liquidacao, vencimentos)) / 252
+
+    def precificar_cenarios(self, choques: Dict[str, np.ndarray]) -> Dict:
+        """
+        Reprecifica todas as posições em todos os cenários de uma vez.
+
+        As taxas chocadas de todos os cenários são empilhadas e precificadas em
+        uma única chamada em lote; a carteira não é alterada.
+
+        Args:
+            choques: Dicionário {nome do cenário: choques em bps}, cada um com
+                uma posição por vencimento ou um escalar (choque paralelo)
+                (ver titulospub.core.carteiras.cenarios.montar_choques)
+
+        Returns:
+            Dicionário com cenarios, vencimentos e as matrizes
+            (cenários x vencimentos) pu, financeiro e pnl, além de pnl_total
+            por cenário. O P&L é o financeiro do cenário menos o atual.
+        """
+        n = len(self._chaves)
+        nomes = list(choques)
+        try:
+            matriz = np.array([np.broadcast_to(np.asarray(choques[nome], dtype=np.float64), (n,))
+                               for nome in nomes]).reshape(len(nomes), n)
+        except ValueError:
+            raise ValueError(f"Cada cenário deve ter {n} choques, um por vencimento") from None
+
+        pu = np.full((len(nomes), n), np.nan)
+        ativas = self._linhas_ativas(np.arange(n))
+        if len(nomes) and len(ativas):
+            taxas = self._colunas["taxa"][ativas] + matriz[:, ativas] / 100
+            res = self._precificar_lote(np.tile(self._colunas["vencimento"][ativas], len(nomes)), taxas.ravel())
+            pu[:, ativas] = np.asarray(res[self._PU_FINANCEIRO]).reshape(len(nomes), len(ativas))
+
+        quantidade = self._colunas["quantidade"]
+        financeiro = quantidade * pu
+        pnl = financeiro - quantidade * self._colunas[self._PU_FINANCEIRO]
+
+        return {
+            "cenarios": nomes,
+            "vencimentos": list(self._chaves),
+            "choques": matriz,
+            "pu": pu,
+            "financeiro": financeiro,
+            "pnl": pnl,
+            "pnl_total": np.nansum(pnl, axis=1),
+        }
+
+    @property
+    def vencimentos(self) -> List[str]:
+        """Lista de vencimentos disponíveis."""
+        return list(self._chaves)
+
+    @property
+    def total_titulos(self) -> int:
+        """Número total de títulos na carteira."""
+        return len(self._chaves)
+
+    # ==================== PONTOS DE EXTENSÃO ====================
+
+    def _vencimentos_disponiveis(self) -> List[str]:
+        raise NotImplementedError
+
+    def _dados_estaticos(self, vencimento: str) -> dict:
+        raise NotImplementedError
+
+    def _precificar_lote(self, vencimentos: np.ndarray, taxas: np.ndarray) -> Dict[str, np.ndarray]:
+        raise NotImplementedError
+
+    def _criar_titulo(self, i: int):
+        raise NotImplementedError
+
+    # ==================== AUXILIARES ====================
+
+    def _anbima(self, chave: str, vencimento: str) -> float:
+        """Taxa ANBIMA do vencimento (ValueError se não encontrado)."""
+        data_vencimento = pd.to_datetime(vencimento)
+        df = self._vm.get_anbimas()[chave]
+        linha = df[df["VENCIMENTO"] == data_vencimento]
+        if linha.empty:
+            raise ValueError(f"Vencimento {data_vencimento.date()} não encontrado na ANBIMA.")
+        return float(linha.squeeze()["ANBIMA"])
+
+    def _ajuste_bmf(self, chave: str, codigo: str) -> Optional[float]:
+        """
+        Ajuste do contrato BMF (DI/DAP) de referência, interpolado na curva se
+        o contrato não tiver ajuste (None se a curva não tiver vértices).
+        """
+        return obter_curva_bmf(chave, self._vm, self._data_referencia).taxa_contrato(codigo)
+
+    @staticmethod
+    def _opcional(valor: float) -> Optional[float]:
+        """Valor de uma coluna como float, ou None se NaN."""
+        return None if valor != valor else float(valor)
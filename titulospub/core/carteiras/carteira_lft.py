@@ -5,184 +5,101 @@ Gerencia múltiplos vencimentos de LFT, permitindo ajustar parâmetros
 individuais sem recalcular todos os títulos.
 """
 
-from typing import Dict, List, Optional
-from datetime import datetime
+from typing import List, Optional
 
+import numpy as np
+
+from titulospub.core.carteiras.carteira_base import CarteiraBase
+from titulospub.core.lft.ajuste_vna_lft import obter_projecao_vna_lft
+from titulospub.core.lft.calculo_lft import precificar_lft_lote
 from titulospub.core.lft.titulo_lft import LFT
 from titulospub.dados.orquestrador import VariaveisMercado
+from titulospub.dados.snapshot import MarketSnapshot
 from titulospub.dados.vencimentos import get_vencimentos_lft
 
 
-class CarteiraLFT:
+class CarteiraLFT(CarteiraBase):
     """
     Carteira de títulos LFT.
-    
-    Armazena todos os vencimentos disponíveis e permite ajustar
+
+    Armazena todos os vencimentos disponíveis em colunas e permite ajustar
     parâmetros específicos de cada vencimento.
     """
-    
+
+    _TIPO = "LFT"
+    _COLUNAS_ESTATICAS = ("taxa_anbima", "taxa")
+    _COLUNAS_PRECO = ("cotacao", "pu_d0", "pu_termo", "pu_carregado")
+    _COLUNAS_TABELA = ("taxa_anbima", "taxa", "pu_termo", "pu_d0", "quantidade", "financeiro")
+    _COLUNAS_DICT = ("pu_termo", "pu_d0", "quantidade", "financeiro")
+
+    # Taxa zero é uma taxa válida de LFT
+    _ZERO_COMO_NULO = ("pu_termo", "pu_d0", "financeiro")
+
+    # A LFT é precificada mesmo depois do vencimento
+    _MASCARAR_VENCIDOS = False
+
     def __init__(
         self,
         data_base: Optional[str] = None,
         dias_liquidacao: int = 1,
         quantidade_padrao: float = 10000,
-        variaveis_mercado: Optional[VariaveisMercado] = None,
+        variaveis_mercado: Optional[VariaveisMercado | MarketSnapshot] = None,
     ):
         """
         Inicializa a carteira LFT.
-        
+
         Args:
             data_base: Data base para cálculos (default: hoje)
             dias_liquidacao: Dias para liquidação (default: 1)
             quantidade_padrao: Quantidade padrão para cada título
-            variaveis_mercado: Instância compartilhada de VariaveisMercado
-        """
-        self._vm = variaveis_mercado or VariaveisMercado()
-        self._data_base = data_base
-        self._dias_liquidacao = dias_liquidacao
-        self._quantidade_padrao = quantidade_padrao
-        
-        # Dicionário de títulos: {vencimento: LFT}
-        self._titulos: Dict[str, LFT] = {}
-        
-        # Carrega vencimentos disponíveis
-        self._carregar_vencimentos()
-    
-    def _carregar_vencimentos(self):
-        """Carrega todos os vencimentos disponíveis."""
-        vencimentos = get_vencimentos_lft()
-        
-        for vencimento in vencimentos:
-            try:
-                titulo = LFT(
-                    data_vencimento_titulo=vencimento,
-                    data_base=self._data_base,
-                    dias_liquidacao=self._dias_liquidacao,
-                    quantidade=self._quantidade_padrao,
-                    variaveis_mercado=self._vm,
-                )
-                self._titulos[vencimento] = titulo
-            except Exception as e:
-                print(f"[WARN] Erro ao carregar LFT {vencimento}: {e}")
-                continue
-    
-    def atualizar_dias_liquidacao(self, dias: int):
-        """
-        Atualiza dias de liquidação para todos os títulos.
-        
-        Args:
-            dias: Novo número de dias para liquidação
-        """
-        self._dias_liquidacao = dias
-        for titulo in self._titulos.values():
-            titulo.dias_liquidacao = dias
-    
-    def atualizar_quantidade(self, vencimento: str, quantidade: float):
-        """
-        Atualiza a quantidade de um título específico.
-        
-        Args:
-            vencimento: Data de vencimento (YYYY-MM-DD)
-            quantidade: Nova quantidade
-        """
-        if vencimento not in self._titulos:
-            raise ValueError(f"Vencimento {vencimento} não encontrado na carteira")
-        
-        self._titulos[vencimento].quantidade = quantidade
-    
-    def atualizar_taxa(self, vencimento: str, nova_taxa: float):
-        """
-        Atualiza a taxa de um título específico.
-        
-        Args:
-            vencimento: Data de vencimento (YYYY-MM-DD)
-            nova_taxa: Nova taxa de juros (%)
+            variaveis_mercado: Instância compartilhada de VariaveisMercado ou MarketSnapshot (default: snapshot do processo)
         """
-        if vencimento not in self._titulos:
-            raise ValueError(f"Vencimento {vencimento} não encontrado na carteira")
-        
-        # Cria novo título com nova taxa mantendo quantidade
-        titulo_antigo = self._titulos[vencimento]
-        quantidade_atual = titulo_antigo.quantidade
-        
-        novo_titulo = LFT(
-            data_vencimento_titulo=vencimento,
+        super().__init__(data_base=data_base,
+                         dias_liquidacao=dias_liquidacao,
+                         quantidade_padrao=quantidade_padrao,
+                         variaveis_mercado=variaveis_mercado)
+
+    @property
+    def _projecao_vna(self):
+        """Trajetória de VNA compartilhada por todos os vencimentos."""
+        return obter_projecao_vna_lft(self._vm.get_vna_lft(), self._vm.get_cdi())
+
+    def _vencimentos_disponiveis(self) -> List[str]:
+        return get_vencimentos_lft()
+
+    def _dados_estaticos(self, vencimento: str) -> dict:
+        """Taxa ANBIMA do vencimento."""
+        anbima = self._anbima("LFT", vencimento)
+        return {"taxa_anbima": anbima, "taxa": anbima}
+
+    def _precificar_lote(self, vencimentos: np.ndarray, taxas: np.ndarray) -> dict:
+        return precificar_lft_lote(
+            data=self._data_referencia,
+            data_liquidacao=self._data_liquidacao,
+            vencimentos=vencimentos,
+            taxas=taxas,
+            feriados=self._calendario,
+            cdi=self._vm.get_cdi(),
+            projecao_vna=self._projecao_vna
+        )
+
+    def _criar_titulo(self, i: int) -> LFT:
+        return LFT(
+            data_vencimento_titulo=self._chaves[i],
             data_base=self._data_base,
             dias_liquidacao=self._dias_liquidacao,
-            taxa=nova_taxa,
-            quantidade=quantidade_atual,
+            taxa=self._colunas["taxa"][i],
+            quantidade=float(self._colunas["quantidade"][i]),
             variaveis_mercado=self._vm,
+            projecao_vna=self._projecao_vna,
         )
-        
-        self._titulos[vencimento] = novo_titulo
-    
-    def obter_titulo(self, vencimento: str):
+
+    def atualizar_taxa(self, vencimento: str, nova_taxa: float):
         """
-        Obtém um título específico.
-        
+        Atualiza a taxa de um título específico.
+
         Args:
             vencimento: Data de vencimento (YYYY-MM-DD)
-        
-        Returns:
-            Instância do título LFT ou None se não encontrado
-        """
-        return self._titulos.get(vencimento)
-    
-    def obter_dados_tabela(self) -> List[Dict]:
-        """
-        Obtém dados de todos os títulos em formato de lista para tabela.
-        
-        Returns:
-            Lista de dicionários com dados dos títulos
-        """
-        dados = []
-        
-        for vencimento, titulo in sorted(self._titulos.items()):
-            dados.append({
-                "vencimento": vencimento,
-                "taxa_anbima": titulo.taxa_anbima if hasattr(titulo, 'taxa_anbima') else None,
-                "taxa": titulo.taxa if hasattr(titulo, 'taxa') else None,
-                "pu_termo": titulo.pu_termo if titulo.pu_termo else None,
-                "pu_d0": titulo.pu_d0 if titulo.pu_d0 else None,
-                "quantidade": titulo.quantidade,
-                "financeiro": titulo.financeiro if titulo.financeiro else None,
-            })
-        
-        return dados
-    
-    def obter_dados_dict(self) -> Dict[str, Dict]:
-        """
-        Obtém dados de todos os títulos em formato de dicionário.
-        
-        Returns:
-            Dicionário {vencimento: {dados do título}}
+            nova_taxa: Nova taxa de juros (%)
         """
-        dados = {}
-        
-        for vencimento, titulo in self._titulos.items():
-            dados[vencimento] = {
-                "pu_termo": titulo.pu_termo if titulo.pu_termo else None,
-                "pu_d0": titulo.pu_d0 if titulo.pu_d0 else None,
-                "quantidade": titulo.quantidade,
-                "financeiro": titulo.financeiro if titulo.financeiro else None,
-            }
-        
-        return dados
-    
-    @property
-    def vencimentos(self) -> List[str]:
-        """Lista de vencimentos disponíveis."""
-        return sorted(list(self._titulos.keys()))
-    
-    @property
-    def total_titulos(self) -> int:
-        """Número total de títulos na carteira."""
-        return len(self._titulos)
-
-
-
-
-
-
-
-
+        super().atualizar_taxa(vencimento, nova_taxa)
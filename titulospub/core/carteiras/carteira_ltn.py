@@ -5,194 +5,124 @@ Gerencia múltiplos vencimentos de LTN, permitindo ajustar parâmetros
 individuais sem recalcular todos os títulos.
 """
 
-from typing import Dict, List, Optional
-from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
 import pandas as pd
 
+from titulospub.core.auxilio import vencimento_codigo_bmf
+from titulospub.core.carteiras.carteira_base import CarteiraBase
+from titulospub.core.ltn.calculo_ltn import precificar_ltn_lote
 from titulospub.core.ltn.titulo_ltn import LTN
 from titulospub.dados.orquestrador import VariaveisMercado
+from titulospub.dados.snapshot import MarketSnapshot
 from titulospub.dados.vencimentos import get_vencimentos_ltn
 
 
-class CarteiraLTN:
+class CarteiraLTN(CarteiraBase):
     """
     Carteira de títulos LTN.
-    
-    Armazena todos os vencimentos disponíveis e permite ajustar
+
+    Armazena todos os vencimentos disponíveis em colunas e permite ajustar
     parâmetros específicos de cada vencimento.
     """
-    
+
+    _TIPO = "LTN"
+    _COLUNAS_ESTATICAS = ("taxa_anbima", "taxa", "premio", "di", "ajuste_di", "premio_anbima")
+    _COLUNAS_PRECO = ("pu_d0", "pu_termo", "pu_carregado", "dv01", "carrego_brl", "carrego_bps")
+    _COLUNAS_TABELA = ("taxa_anbima", "taxa", "pu_termo", "pu_d0", "carrego_bps", "dv01",
+                       "ajuste_di", "premio_anbima", "quantidade", "financeiro")
+    _COLUNAS_DICT = ("taxa", "pu_termo", "pu_d0", "quantidade", "financeiro", "dv01")
+
     def __init__(
         self,
         data_base: Optional[str] = None,
         dias_liquidacao: int = 1,
         quantidade_padrao: float = 50000,
         tipo_entrada: str = "taxa",  # "taxa" ou "premio_di"
-        variaveis_mercado: Optional[VariaveisMercado] = None,
+        variaveis_mercado: Optional[VariaveisMercado | MarketSnapshot] = None,
     ):
         """
         Inicializa a carteira LTN.
-        
+
         Args:
             data_base: Data base para cálculos (default: hoje)
             dias_liquidacao: Dias para liquidação (default: 1)
             quantidade_padrao: Quantidade padrão para cada título
             tipo_entrada: Tipo de entrada ("taxa" ou "premio_di")
-            variaveis_mercado: Instância compartilhada de VariaveisMercado
+            variaveis_mercado: Instância compartilhada de VariaveisMercado ou MarketSnapshot (default: snapshot do processo)
         """
-        self._vm = variaveis_mercado or VariaveisMercado()
-        self._data_base = data_base
-        self._dias_liquidacao = dias_liquidacao
-        self._quantidade_padrao = quantidade_padrao
         self._tipo_entrada = tipo_entrada
-        
-        # Dicionário de títulos: {vencimento: LTN}
-        self._titulos: Dict[str, LTN] = {}
-        
-        # Carrega vencimentos disponíveis
-        self._carregar_vencimentos()
-    
-    def _carregar_vencimentos(self):
-        """Carrega todos os vencimentos disponíveis."""
-        vencimentos = get_vencimentos_ltn()
-        
-        for vencimento in vencimentos:
-            try:
-                titulo = LTN(
-                    data_vencimento_titulo=vencimento,
-                    data_base=self._data_base,
-                    dias_liquidacao=self._dias_liquidacao,
-                    quantidade=self._quantidade_padrao,
-                    variaveis_mercado=self._vm,
-                )
-                self._titulos[vencimento] = titulo
-            except Exception as e:
-                print(f"[WARN] Erro ao carregar LTN {vencimento}: {e}")
-                continue
-    
-    def atualizar_taxa(self, vencimento: str, taxa: float):
-        """
-        Atualiza a taxa de um título específico.
-        
-        Args:
-            vencimento: Data de vencimento (YYYY-MM-DD)
-            taxa: Nova taxa de juros
-        """
-        if vencimento not in self._titulos:
-            raise ValueError(f"Vencimento {vencimento} não encontrado na carteira")
-        
-        self._titulos[vencimento].taxa = float(taxa)
-    
+        super().__init__(data_base=data_base,
+                         dias_liquidacao=dias_liquidacao,
+                         quantidade_padrao=quantidade_padrao,
+                         variaveis_mercado=variaveis_mercado)
+
+    def _vencimentos_disponiveis(self) -> List[str]:
+        return get_vencimentos_ltn()
+
+    def _dados_estaticos(self, vencimento: str) -> dict:
+        """Taxa ANBIMA e ajuste do DI de referência do vencimento."""
+        anbima = self._anbima("LTN", vencimento)
+        ajuste_di = self._ajuste_bmf("DI", vencimento_codigo_bmf(data_vencimento=pd.to_datetime(vencimento), prefixo="DI1"))
+        return {
+            "taxa_anbima": anbima,
+            "taxa": anbima,
+            "premio": None,
+            "di": None,
+            "ajuste_di": ajuste_di,
+            "premio_anbima": None if ajuste_di is None else (anbima - ajuste_di) * 100,
+        }
+
+    def _precificar_lote(self, vencimentos: np.ndarray, taxas: np.ndarray) -> dict:
+        return precificar_ltn_lote(
+            data=self._data_referencia,
+            data_liquidacao=self._data_liquidacao,
+            vencimentos=vencimentos,
+            taxas=taxas,
+            cdi=self._vm.get_cdi(),
+            feriados=self._calendario
+        )
+
+    def _criar_titulo(self, i: int) -> LTN:
+        return LTN(
+            data_vencimento_titulo=self._chaves[i],
+            data_base=self._data_base,
+            dias_liquidacao=self._dias_liquidacao,
+            taxa=self._colunas["taxa"][i],
+            premio=self._opcional(self._colunas["premio"][i]),
+            di=self._opcional(self._colunas["di"][i]),
+            quantidade=self._colunas["quantidade"][i],
+            variaveis_mercado=self._vm,
+        )
+
     def atualizar_premio_di(self, vencimento: str, premio: float, di: float):
         """
         Atualiza prêmio e DI de um título específico.
-        
+
         Args:
             vencimento: Data de vencimento (YYYY-MM-DD)
             premio: Prêmio sobre DI
             di: Taxa DI de referência
         """
-        if vencimento not in self._titulos:
-            raise ValueError(f"Vencimento {vencimento} não encontrado na carteira")
-        
-        titulo = self._titulos[vencimento]
-        titulo.premio = premio
-        titulo.di = di
-    
-    def atualizar_dias_liquidacao(self, dias: int):
-        """
-        Atualiza dias de liquidação para todos os títulos.
-        
-        Args:
-            dias: Novo número de dias para liquidação
-        """
-        self._dias_liquidacao = dias
-        for titulo in self._titulos.values():
-            titulo.dias_liquidacao = dias
-    
-    def atualizar_quantidade(self, vencimento: str, quantidade: float):
-        """
-        Atualiza a quantidade de um título específico.
-        
-        Args:
-            vencimento: Data de vencimento (YYYY-MM-DD)
-            quantidade: Nova quantidade
-        """
-        if vencimento not in self._titulos:
-            raise ValueError(f"Vencimento {vencimento} não encontrado na carteira")
-        
-        self._titulos[vencimento].quantidade = quantidade
-    
+        i = self._posicao(vencimento)
+        colunas = self._colunas
+        colunas["premio"][i] = np.nan if premio is None else float(premio)
+        colunas["di"][i] = np.nan if di is None else float(di)
+
+        # Taxa = DI + prêmio quando ambos estão definidos
+        if not (np.isnan(colunas["premio"][i]) or np.isnan(colunas["di"][i])):
+            colunas["taxa"][i] = float(colunas["di"][i] + colunas["premio"][i] / 100)
+        self._precificar(np.array([i]))
+
     def obter_titulo(self, vencimento: str) -> Optional[LTN]:
         """
-        Obtém um título específico.
-        
+        Obtém um título específico, criado a partir da linha da carteira.
+
         Args:
             vencimento: Data de vencimento (YYYY-MM-DD)
-        
+
         Returns:
             Instância do título LTN ou None se não encontrado
         """
-        return self._titulos.get(vencimento)
-    
-    def obter_dados_tabela(self) -> List[Dict]:
-        """
-        Obtém dados de todos os títulos em formato de lista para tabela.
-        
-        Returns:
-            Lista de dicionários com dados dos títulos
-        """
-        dados = []
-        
-        for vencimento, titulo in sorted(self._titulos.items()):
-            dados.append({
-                "vencimento": vencimento,
-                "taxa_anbima": getattr(titulo, "taxa_anbima", None),
-                "taxa": titulo.taxa if titulo.taxa else None,
-                "pu_termo": titulo.pu_termo if titulo.pu_termo else None,
-                "pu_d0": titulo.pu_d0 if titulo.pu_d0 else None,
-                "carrego_bps": getattr(titulo, "carrego_bps", None),
-                "dv01": titulo.dv01 if titulo.dv01 else None,
-                "ajuste_di": getattr(titulo, "ajuste_di", None),
-                "premio_anbima": getattr(titulo, "premio_anbima", None),
-                "quantidade": titulo.quantidade,
-                "financeiro": titulo.financeiro if titulo.financeiro else None,
-            })
-        
-        return dados
-    
-    def obter_dados_dict(self) -> Dict[str, Dict]:
-        """
-        Obtém dados de todos os títulos em formato de dicionário.
-        
-        Returns:
-            Dicionário {vencimento: {dados do título}}
-        """
-        dados = {}
-        
-        for vencimento, titulo in self._titulos.items():
-            dados[vencimento] = {
-                "taxa": titulo.taxa if titulo.taxa else None,
-                "pu_termo": titulo.pu_termo if titulo.pu_termo else None,
-                "pu_d0": titulo.pu_d0 if titulo.pu_d0 else None,
-                "quantidade": titulo.quantidade,
-                "financeiro": titulo.financeiro if titulo.financeiro else None,
-                "dv01": titulo.dv01 if titulo.dv01 else None,
-            }
-        
-        return dados
-    
-    @property
-    def vencimentos(self) -> List[str]:
-        """Lista de vencimentos disponíveis."""
-        return sorted(list(self._titulos.keys()))
-    
-    @property
-    def total_titulos(self) -> int:
-        """Número total de títulos na carteira."""
-        return len(self._titulos)
-
-
-
-
-
+        return super().obter_titulo(vencimento)
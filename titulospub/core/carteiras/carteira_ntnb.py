@@ -7,170 +7,139 @@ individuais sem recalcular todos os títulos.
 
 from typing import Dict, List, Optional
 
+import numpy as np
+import pandas as pd
+
+from titulospub.core.auxilio import vencimento_codigo_bmf
+from titulospub.core.carteiras.carteira_base import CarteiraBase
+from titulospub.core.dap.calculo_dap import precificar_dap_lote
+from titulospub.core.ntnb.calculo_ntnb import fatores_ntnb, precificar_ntnb_lote
 from titulospub.core.ntnb.titulo_ntnb import NTNB
 from titulospub.dados.orquestrador import VariaveisMercado
+from titulospub.dados.snapshot import MarketSnapshot
 from titulospub.dados.vencimentos import get_vencimentos_ntnb
 
 
-class CarteiraNTNB:
+class CarteiraNTNB(CarteiraBase):
     """
     Carteira de títulos NTNB.
-    
-    Armazena todos os vencimentos disponíveis e permite ajustar
-    parâmetros específicos de cada vencimento.
+
+    Armazena todos os vencimentos disponíveis em colunas e permite ajustar
+    parâmetros específicos de cada vencimento. Os VNAs e fatores de IPCA/CDI
+    e o DV01 dos DAPs de referência só são recalculados quando a data de
+    liquidação muda.
     """
-    
+
+    _TIPO = "NTNB"
+    _COLUNAS_ESTATICAS = ("taxa_anbima", "taxa", "ajuste_dap", "premio_anbima_dap")
+    _COLUNAS_PRECO = ("cotacao", "pu_d0", "pu_termo", "pu_carregado", "pu_ajustado",
+                      "duration", "dias_duration", "dv01", "carrego_brl", "carrego_bps")
+    _COLUNAS_TABELA = ("taxa_anbima", "taxa", "pu_termo", "pu_d0", "carrego_bps", "premio_anbima_dap",
+                       "hedge_dap", "quantidade", "financeiro", "dv01")
+    _COLUNAS_DICT = ("taxa", "pu_termo", "pu_d0", "quantidade", "financeiro", "dv01")
+    _COLUNAS_INTEIRAS = ("hedge_dap",)
+    _PU_FINANCEIRO = "pu_termo"
+
     def __init__(
         self,
         data_base: Optional[str] = None,
         dias_liquidacao: int = 1,
         quantidade_padrao: float = 10000,
-        variaveis_mercado: Optional[VariaveisMercado] = None,
+        variaveis_mercado: Optional[VariaveisMercado | MarketSnapshot] = None,
     ):
         """
         Inicializa a carteira NTNB.
-        
+
         Args:
             data_base: Data base para cálculos (default: hoje)
             dias_liquidacao: Dias para liquidação (default: 1)
             quantidade_padrao: Quantidade padrão para cada título
-            variaveis_mercado: Instância compartilhada de VariaveisMercado
-        """
-        self._vm = variaveis_mercado or VariaveisMercado()
-        self._data_base = data_base
-        self._dias_liquidacao = dias_liquidacao
-        self._quantidade_padrao = quantidade_padrao
-        
-        # Dicionário de títulos: {vencimento: NTNB}
-        self._titulos: Dict[str, NTNB] = {}
-        
-        # Carrega vencimentos disponíveis
-        self._carregar_vencimentos()
-    
-    def _carregar_vencimentos(self):
-        """Carrega todos os vencimentos disponíveis."""
-        vencimentos = get_vencimentos_ntnb()
-        
-        for vencimento in vencimentos:
-            try:
-                titulo = NTNB(
-                    data_vencimento_titulo=vencimento,
-                    data_base=self._data_base,
-                    dias_liquidacao=self._dias_liquidacao,
-                    quantidade=self._quantidade_padrao,
-                    variaveis_mercado=self._vm,
-                )
-                self._titulos[vencimento] = titulo
-            except Exception as e:
-                print(f"[WARN] Erro ao carregar NTNB {vencimento}: {e}")
-                continue
-    
-    def atualizar_taxa(self, vencimento: str, taxa: float):
-        """
-        Atualiza a taxa de um título específico.
-        
-        Args:
-            vencimento: Data de vencimento (YYYY-MM-DD)
-            taxa: Nova taxa de juros
-        """
-        if vencimento not in self._titulos:
-            raise ValueError(f"Vencimento {vencimento} não encontrado na carteira")
-        
-        self._titulos[vencimento].taxa = float(taxa)
-    
-    def atualizar_dias_liquidacao(self, dias: int):
-        """
-        Atualiza dias de liquidação para todos os títulos.
-        
-        Args:
-            dias: Novo número de dias para liquidação
-        """
-        self._dias_liquidacao = dias
-        for titulo in self._titulos.values():
-            titulo.dias_liquidacao = dias
-    
-    def atualizar_quantidade(self, vencimento: str, quantidade: float):
-        """
-        Atualiza a quantidade de um título específico.
-        
-        Args:
-            vencimento: Data de vencimento (YYYY-MM-DD)
-            quantidade: Nova quantidade
+            variaveis_mercado: Instância compartilhada de VariaveisMercado ou MarketSnapshot (default: snapshot do processo)
         """
-        if vencimento not in self._titulos:
-            raise ValueError(f"Vencimento {vencimento} não encontrado na carteira")
-        
-        self._titulos[vencimento].quantidade = quantidade
-    
-    def obter_titulo(self, vencimento: str):
-        """
-        Obtém um título específico.
-        
-        Args:
-            vencimento: Data de vencimento (YYYY-MM-DD)
-        
-        Returns:
-            Instância do título NTNB ou None se não encontrado
-        """
-        return self._titulos.get(vencimento)
-    
-    def obter_dados_tabela(self) -> List[Dict]:
-        """
-        Obtém dados de todos os títulos em formato de lista para tabela.
-        
-        Returns:
-            Lista de dicionários com dados dos títulos
-        """
-        dados = []
-        
-        for vencimento, titulo in sorted(self._titulos.items()):
-            dados.append({
-                "vencimento": vencimento,
-                "taxa_anbima": getattr(titulo, "taxa_anbima", None),
-                "taxa": titulo.taxa if titulo.taxa else None,
-                "pu_termo": titulo.pu_termo if titulo.pu_termo else None,
-                "pu_d0": titulo.pu_d0 if titulo.pu_d0 else None,
-                "carrego_bps": getattr(titulo, "carrego_bps", None),
-                "premio_anbima_dap": getattr(titulo, "premio_anbima_dap", None),
-                "hedge_dap": getattr(titulo, "hedge_dap", None),
-                "quantidade": titulo.quantidade,
-                "financeiro": titulo.financeiro if titulo.financeiro else None,
-                "dv01": titulo.dv01 if titulo.dv01 else None,
-            })
-        
-        return dados
-    
-    def obter_dados_dict(self) -> Dict[str, Dict]:
-        """
-        Obtém dados de todos os títulos em formato de dicionário.
-        
-        Returns:
-            Dicionário {vencimento: {dados do título}}
-        """
-        dados = {}
-        
-        for vencimento, titulo in self._titulos.items():
-            dados[vencimento] = {
-                "taxa": titulo.taxa if titulo.taxa else None,
-                "pu_termo": titulo.pu_termo if titulo.pu_termo else None,
-                "pu_d0": titulo.pu_d0 if titulo.pu_d0 else None,
-                "quantidade": titulo.quantidade,
-                "financeiro": titulo.financeiro if titulo.financeiro else None,
-                "dv01": titulo.dv01 if titulo.dv01 else None,
-            }
-        
-        return dados
-    
-    @property
-    def vencimentos(self) -> List[str]:
-        """Lista de vencimentos disponíveis."""
-        return sorted(list(self._titulos.keys()))
-    
-    @property
-    def total_titulos(self) -> int:
-        """Número total de títulos na carteira."""
-        return len(self._titulos)
+        self._fatores = None
+        super().__init__(data_base=data_base,
+                         dias_liquidacao=dias_liquidacao,
+                         quantidade_padrao=quantidade_padrao,
+                         variaveis_mercado=variaveis_mercado)
+
+    def _vencimentos_disponiveis(self) -> List[str]:
+        return get_vencimentos_ntnb()
+
+    def _dados_estaticos(self, vencimento: str) -> dict:
+        """Taxa ANBIMA e ajuste do DAP de referência do vencimento."""
+        data_vencimento = pd.to_datetime(vencimento)
+        anbima = self._anbima("NTN-B", vencimento)
+
+        dap_ref = vencimento_codigo_bmf(data_vencimento=data_vencimento, prefixo="DAP")
+        ajuste_dap = self._ajuste_bmf("DAP", dap_ref)
+        if ajuste_dap is None:
+            # Curva DAP sem vértices
+            print(f"[WARN] Ajuste DAP não encontrado para {dap_ref}. Título será criado sem dados de DAP.")
+
+        if data_vencimento < self._data_liquidacao:
+            raise ValueError(f"Vencimento {data_vencimento.date()} anterior à data de liquidação.")
+
+        return {
+            "taxa_anbima": anbima,
+            "taxa": anbima,
+            "ajuste_dap": ajuste_dap,
+            "premio_anbima_dap": None if ajuste_dap is None else (anbima - ajuste_dap) * 100,
+        }
+
+    def _precificar_todos(self):
+        """Recalcula os valores que dependem só das datas e reprecifica a carteira."""
+        self._fatores = fatores_ntnb(
+            data=self._data_referencia,
+            data_liquidacao=self._data_liquidacao,
+            cdi=self._vm.get_cdi(),
+            ipca_dict=self._vm.get_ipca_dict(),
+            feriados=self._calendario
+        )
+        self._colunas["dv01_dap"] = self._calcular_dv01_dap()
+        super()._precificar_todos()
+
+    def _calcular_dv01_dap(self) -> np.ndarray:
+        """DV01 do DAP de referência de cada vencimento (NaN sem ajuste DAP), ver precificar_dap_lote."""
+        ajuste_dap = self._colunas["ajuste_dap"]
+        dv01 = np.full(len(ajuste_dap), np.nan)
+        com_dap = ~np.isnan(ajuste_dap)
+        if not com_dap.any():
+            return dv01
 
+        # Todos os DAPs de referência (mês do vencimento do título) em uma única chamada
+        dv01[com_dap] = precificar_dap_lote(taxas=ajuste_dap[com_dap],
+                                            vencimentos=self._colunas["vencimento"][com_dap],
+                                            datas_liquidacao=self._data_liquidacao,
+                                            ipca_dict=self._vm.get_ipca_dict(),
+                                            feriados=self._calendario,
+                                            data_referencia=self._vm.data_referencia)["dv01"]
+        return dv01
 
+    def _precificar_lote(self, vencimentos: np.ndarray, taxas: np.ndarray) -> dict:
+        return precificar_ntnb_lote(
+            data=self._data_referencia,
+            data_liquidacao=self._data_liquidacao,
+            vencimentos=vencimentos,
+            taxas=taxas,
+            cdi=self._vm.get_cdi(),
+            ipca_dict=self._vm.get_ipca_dict(),
+            feriados=self._calendario,
+            fatores=self._fatores
+        )
 
+    def _colunas_derivadas(self) -> Dict[str, np.ndarray]:
+        """Hedge em contratos de DAP."""
+        derivadas = super()._colunas_derivadas()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            derivadas["hedge_dap"] = np.trunc(derivadas["dv01"] / self._colunas["dv01_dap"])
+        return derivadas
 
+    def _criar_titulo(self, i: int) -> NTNB:
+        return NTNB(
+            data_vencimento_titulo=self._chaves[i],
+            data_base=self._data_base,
+            dias_liquidacao=self._dias_liquidacao,
+            taxa=self._colunas["taxa"][i],
+            quantidade=self._colunas["quantidade"][i],
+            variaveis_mercado=self._vm,
+        )
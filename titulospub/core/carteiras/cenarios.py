@@ -0,0 +1,151 @@
+"""
+Cenários de choque de taxa para carteiras.
+
+Cada cenário é um vetor de choques em pontos base, um por vencimento da
+carteira, montado a partir do prazo (anos úteis até o vencimento):
+- paralelo: o mesmo choque em todos os vencimentos
+- inclinacao: choque linear entre o vencimento mais curto e o mais longo
+- borboleta: choque das asas nas pontas e do miolo no prazo médio
+- vetor: choques informados por vencimento
+
+A precificação dos cenários é feita por CarteiraBase.precificar_cenarios.
+"""
+
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+TIPOS_CENARIO = ("paralelo", "inclinacao", "borboleta", "vetor")
+
+
+def _posicao_relativa(prazos: np.ndarray) -> np.ndarray:
+    """Posição de cada prazo entre o mais curto (0) e o mais longo (1)."""
+    prazos = np.asarray(prazos, dtype=np.float64)
+    if len(prazos) == 0:
+        return prazos
+    amplitude = prazos.max() - prazos.min()
+    if amplitude == 0:
+        return np.zeros_like(prazos)
+    return (prazos - prazos.min()) / amplitude
+
+
+def choque_paralelo(prazos, bps: float) -> np.ndarray:
+    """
+    Choque paralelo.
+
+    Args:
+        prazos: Prazos dos vencimentos (anos úteis)
+        bps: Choque em pontos base
+
+    Returns:
+        Array de choques (bps), um por vencimento
+    """
+    return np.full(len(prazos), float(bps))
+
+
+def choque_inclinacao(prazos, curto: float, longo: float) -> np.ndarray:
+    """
+    Choque de inclinação (twist): varia linearmente com o prazo, de `curto`
+    no vencimento mais curto a `longo` no mais longo.
+
+    Args:
+        prazos: Prazos dos vencimentos (anos úteis)
+        curto: Choque no vencimento mais curto (bps)
+        longo: Choque no vencimento mais longo (bps)
+
+    Returns:
+        Array de choques (bps), um por vencimento
+    """
+    return curto + (longo - curto) * _posicao_relativa(prazos)
+
+
+def choque_borboleta(prazos, asas: float, miolo: float) -> np.ndarray:
+    """
+    Choque de borboleta: `asas` nos vencimentos das pontas e `miolo` no prazo
+    médio, variando linearmente entre eles.
+
+    Args:
+        prazos: Prazos dos vencimentos (anos úteis)
+        asas: Choque nas pontas (bps)
+        miolo: Choque no prazo médio (bps)
+
+    Returns:
+        Array de choques (bps), um por vencimento
+    """
+    distancia_meio = np.abs(2 * _posicao_relativa(prazos) - 1)
+    return miolo + (asas - miolo) * distancia_meio
+
+
+def choque_vetor(vencimentos: Sequence[str], choques) -> np.ndarray:
+    """
+    Choque informado por vencimento.
+
+    Args:
+        vencimentos: Vencimentos da carteira (YYYY-MM-DD)
+        choques: Lista com um choque por vencimento ou dicionário
+            {vencimento: bps} (vencimentos ausentes ficam sem choque)
+
+    Returns:
+        Array de choques (bps), um por vencimento
+    """
+    if isinstance(choques, dict):
+        desconhecidos = set(choques) - set(vencimentos)
+        if desconhecidos:
+            raise ValueError(f"Vencimentos não encontrados na carteira: {sorted(desconhecidos)}")
+        return np.array([float(choques.get(v, 0.0)) for v in vencimentos])
+
+    choques = np.asarray(choques, dtype=np.float64)
+    if choques.shape != (len(vencimentos),):
+        raise ValueError(f"O vetor de choques deve ter {len(vencimentos)} posições, uma por vencimento")
+    return choques
+
+
+def _parametro(especificacao: dict, nome: str) -> float:
+    valor = especificacao.get(nome)
+    if valor is None:
+        raise ValueError(f"Cenário '{especificacao.get('tipo')}' requer o parâmetro '{nome}'")
+    return float(valor)
+
+
+def montar_choques(especificacoes: List[dict], prazos, vencimentos: Sequence[str]) -> Dict[str, np.ndarray]:
+    """
+    Monta os vetores de choque a partir das especificações dos cenários.
+
+    Args:
+        especificacoes: Lista de dicionários com "tipo" e os parâmetros do
+            tipo ("bps"; "curto" e "longo"; "asas" e "miolo"; "choques") e,
+            opcionalmente, "nome"
+        prazos: Prazos dos vencimentos (anos úteis)
+        vencimentos: Vencimentos da carteira (YYYY-MM-DD), na ordem dos prazos
+
+    Returns:
+        Dicionário {nome do cenário: array de choques (bps)}
+    """
+    choques = {}
+    for especificacao in especificacoes:
+        tipo = str(especificacao.get("tipo", "")).lower()
+        if tipo == "paralelo":
+            bps = _parametro(especificacao, "bps")
+            vetor = choque_paralelo(prazos, bps)
+            padrao = f"paralelo {bps:+g}bp"
+        elif tipo == "inclinacao":
+            curto, longo = _parametro(especificacao, "curto"), _parametro(especificacao, "longo")
+            vetor = choque_inclinacao(prazos, curto, longo)
+            padrao = f"inclinacao {curto:+g}/{longo:+g}bp"
+        elif tipo == "borboleta":
+            asas, miolo = _parametro(especificacao, "asas"), _parametro(especificacao, "miolo")
+            vetor = choque_borboleta(prazos, asas, miolo)
+            padrao = f"borboleta {asas:+g}/{miolo:+g}bp"
+        elif tipo == "vetor":
+            if especificacao.get("choques") is None:
+                raise ValueError("Cenário 'vetor' requer o parâmetro 'choques'")
+            vetor = choque_vetor(vencimentos, especificacao["choques"])
+            padrao = f"vetor {len(choques) + 1}"
+        else:
+            raise ValueError(f"Tipo de cenário '{tipo}' não suportado. Use um de {TIPOS_CENARIO}.")
+
+        nome = especificacao.get("nome") or padrao
+        if nome in choques:
+            raise ValueError(f"Cenário '{nome}' informado mais de uma vez")
+        choques[nome] = vetor
+    return choques
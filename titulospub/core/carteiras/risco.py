@@ -0,0 +1,155 @@
+"""
+VaR e Expected Shortfall por simulação histórica para carteiras.
+
+Cada linha da matriz de variações históricas (uma data) é aplicada como um
+cenário de choque de taxas sobre a carteira atual (ver
+CarteiraBase.precificar_cenarios). Os cenários são divididos em lotes e
+reprecificados em paralelo em um ProcessPoolExecutor: a carteira, com o
+snapshot de mercado que ela referencia, é enviada uma única vez para cada
+processo (no inicializador), e cada tarefa recebe apenas o seu lote de
+choques.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from titulospub.dados.snapshot import MarketSnapshot, publicar_snapshot
+
+# Número de lotes por processo (equilibra a carga entre os processos)
+LOTES_POR_PROCESSO = 4
+
+# Carteira do processo de trabalho (definida por _iniciar_processo)
+_carteira_processo = None
+
+
+def carregar_variacoes_historicas(caminho: str) -> pd.DataFrame:
+    """
+    Lê a matriz de variações históricas de taxa de um arquivo local.
+
+    O arquivo tem uma linha por data e uma coluna por vencimento
+    (YYYY-MM-DD), com as variações de taxa em pontos base. A primeira
+    coluna do CSV é a data.
+
+    Args:
+        caminho: Caminho do arquivo (.csv ou .parquet)
+
+    Returns:
+        DataFrame (datas x vencimentos) com as variações em bps
+    """
+    caminho = Path(caminho)
+    if not caminho.exists():
+        raise ValueError(f"Arquivo de variações históricas não encontrado: {caminho}")
+
+    if caminho.suffix == ".parquet":
+        variacoes = pd.read_parquet(caminho)
+    elif caminho.suffix == ".csv":
+        variacoes = pd.read_csv(caminho, index_col=0)
+    else:
+        raise ValueError(f"Formato de arquivo não suportado: {caminho.suffix}. Use .csv ou .parquet.")
+
+    variacoes.columns = [pd.to_datetime(coluna).strftime("%Y-%m-%d") for coluna in variacoes.columns]
+    return variacoes.astype(np.float64)
+
+
+def _alinhar_variacoes(carteira, variacoes) -> np.ndarray:
+    """Matriz (cenários x vencimentos da carteira) de choques em bps."""
+    if isinstance(variacoes, pd.DataFrame):
+        faltantes = [v for v in carteira.vencimentos if v not in variacoes.columns]
+        if faltantes:
+            raise ValueError(f"Variações históricas sem os vencimentos: {faltantes}")
+        return variacoes[carteira.vencimentos].to_numpy(dtype=np.float64)
+
+    matriz = np.atleast_2d(np.asarray(variacoes, dtype=np.float64))
+    if matriz.shape[1] != carteira.total_titulos:
+        raise ValueError(f"A matriz de variações deve ter {carteira.total_titulos} colunas, uma por vencimento")
+    return matriz
+
+
+def _pnl_cenarios(carteira, choques: np.ndarray) -> np.ndarray:
+    """P&L total da carteira em cada linha de choques."""
+    return carteira.precificar_cenarios(dict(enumerate(choques)))["pnl_total"]
+
+
+def _iniciar_processo(carteira):
+    """Inicializador dos processos: guarda a carteira e publica o seu snapshot."""
+    global _carteira_processo
+    _carteira_processo = carteira
+    if isinstance(carteira._vm, MarketSnapshot):
+        publicar_snapshot(carteira._vm)
+
+
+def _pnl_lote(choques: np.ndarray) -> np.ndarray:
+    return _pnl_cenarios(_carteira_processo, choques)
+
+
+def simular_pnl_historico(carteira, variacoes, processos: Optional[int] = None) -> np.ndarray:
+    """
+    Reprecifica a carteira em cada cenário histórico.
+
+    Args:
+        carteira: Carteira (CarteiraLTN, CarteiraNTNF, CarteiraNTNB ou CarteiraLFT)
+        variacoes: DataFrame (datas x vencimentos) ou matriz (cenários x
+            vencimentos da carteira) com variações de taxa em bps
+        processos: Número de processos (default: número de CPUs; 1 para
+            calcular no processo atual)
+
+    Returns:
+        Array com o P&L total da carteira em cada cenário
+    """
+    choques = _alinhar_variacoes(carteira, variacoes)
+    processos = processos or os.cpu_count() or 1
+    processos = min(processos, len(choques))
+
+    if processos <= 1:
+        return _pnl_cenarios(carteira, choques)
+
+    lotes = np.array_split(choques, processos * LOTES_POR_PROCESSO)
+    lotes = [lote for lote in lotes if len(lote)]
+    with ProcessPoolExecutor(max_workers=processos, initializer=_iniciar_processo, initargs=(carteira,)) as executor:
+        return np.concatenate(list(executor.map(_pnl_lote, lotes)))
+
+
+def var_historico(carteira, variacoes, confianca: float = 0.99, processos: Optional[int] = None) -> Dict:
+    """
+    Calcula VaR e Expected Shortfall da carteira por simulação histórica.
+
+    O VaR é a perda no quantil (1 - confiança) da distribuição de P&L (o
+    cenário observado, sem interpolação) e o ES é a perda média nos
+    cenários iguais ou piores que o VaR. Ambos são reportados como perdas
+    (positivos).
+
+    Args:
+        carteira: Carteira (CarteiraLTN, CarteiraNTNF, CarteiraNTNB ou CarteiraLFT)
+        variacoes: DataFrame (datas x vencimentos) ou matriz (cenários x
+            vencimentos da carteira) com variações de taxa em bps
+            (ver carregar_variacoes_historicas)
+        confianca: Nível de confiança (ex.: 0.99)
+        processos: Número de processos (default: número de CPUs; 1 para
+            calcular no processo atual)
+
+    Returns:
+        Dicionário com confianca, var, es, cenarios (quantidade), datas
+        (se variacoes for DataFrame) e pnl (distribuição por cenário)
+    """
+    if not 0 < confianca < 1:
+        raise ValueError("Confiança deve estar entre 0 e 1")
+
+    pnl = simular_pnl_historico(carteira, variacoes, processos=processos)
+    if len(pnl) == 0:
+        raise ValueError("Nenhum cenário histórico informado")
+
+    quantil = np.quantile(pnl, 1 - confianca, method="lower")
+
+    return {
+        "confianca": confianca,
+        "var": float(-quantil),
+        "es": float(-pnl[pnl <= quantil].mean()),
+        "cenarios": len(pnl),
+        "datas": list(variacoes.index) if isinstance(variacoes, pd.DataFrame) else None,
+        "pnl": pnl,
+    }
@@ -1,30 +1,61 @@
+from functools import lru_cache
+
+import numpy as np
 import pandas as pd
 
 from titulospub.dados.ipca import inicio_fim_mes_ipca
+from titulospub.utils.calendario import Calendario, obter_calendario
 from titulospub.utils.datas import dias_trabalho_total, data_vencimento_ajustada
 from titulospub.utils.carregamento_var_globais import _carrecar_ipca_dict_se_necessario, _carregar_feriados_se_necessario
 from titulospub.dados.orquestrador import VariaveisMercado
-from titulospub.core.auxilio import codigo_vencimento_bmf
+from titulospub.core.auxilio import codigo_vencimento_bmf, potencia_vetor
+from titulospub.core.sensibilidade import METODO_BUMP, dv01_dap_vetor
 
 def dia_15_do_mes(data: pd.Timestamp) -> pd.Timestamp:
     """Retorna o dia 15 do mês e ano da data fornecida."""
     return pd.Timestamp(year=data.year, month=data.month, day=15)
 
-def calculo_prt(data=None, ipca_dict=None):
-    if data == None:
-        data = pd.Timestamp.today().normalize()
-    
-    ipca_dict = _carrecar_ipca_dict_se_necessario(ipca_dict)
+@lru_cache(maxsize=256)
+def _prt_data(data: pd.Timestamp, data_referencia: pd.Timestamp, pro_rata: float, ipca_usado: float,
+              calendario: Calendario) -> float:
+    """PRT de uma data, calculado uma única vez por data, mês do IPCA e calendário."""
+    i, f = inicio_fim_mes_ipca(data_referencia, feriados=calendario)
 
-    i, f = inicio_fim_mes_ipca(pd.Timestamp.today().normalize())
-    
-    pro_rata = ipca_dict["INDICE_IPCA_FECHADO_ATUAL"]
-    ipca_usado = ipca_dict["IPCA_USADO"]
-    dias_totais = dias_trabalho_total(i,f)
-    dias_passados = dias_trabalho_total(i, data)
+    dias_totais = dias_trabalho_total(i, f, feriados=calendario)
+    dias_passados = dias_trabalho_total(i, data, feriados=calendario)
 
     return round(pro_rata * ((1 + ipca_usado / 100) ** (dias_passados / dias_totais)), 2)
 
+def calculo_prt(data=None, ipca_dict=None, feriados=None, data_referencia=None):
+    """
+    Pró-rata do IPCA (PRT) usado no financeiro do DAP.
+
+    O mês do IPCA é o da data de referência de ipca_dict, o mesmo do índice
+    fechado (para um snapshot histórico, a data do snapshot). O resultado é guardado por data, índices e calendário, de
+    modo que precificar vários contratos na mesma data calcula o PRT uma
+    única vez.
+
+    Args:
+        data: Data de liquidação (default: hoje)
+        ipca_dict: Dicionário de IPCA (se None, carrega automaticamente)
+        feriados: Lista de feriados ou Calendario (se None, carrega automaticamente)
+        data_referencia: Data de referência de ipca_dict (default: hoje)
+
+    Returns:
+        PRT arredondado em 2 casas
+    """
+    hoje = pd.Timestamp.today().normalize()
+    data = hoje if data is None else pd.Timestamp(data)
+    data_referencia = hoje if data_referencia is None else pd.Timestamp(data_referencia).normalize()
+
+    ipca_dict = _carrecar_ipca_dict_se_necessario(ipca_dict)
+    calendario = obter_calendario(_carregar_feriados_se_necessario(feriados))
+
+    return _prt_data(data, data_referencia,
+                     float(ipca_dict["INDICE_IPCA_FECHADO_ATUAL"]),
+                     float(ipca_dict["IPCA_USADO"]),
+                     calendario)
+
 def calculo_pu_dap(taxa: float, codigo: str=None, data_liquidacao=None, data_vencimento:pd.Timestamp=None, feriados: list=None):
         feriados = _carregar_feriados_se_necessario(feriados)  
         if data_liquidacao == None: data_liquidacao=pd.Timestamp.today().normalize()
@@ -47,31 +78,99 @@ def calculo_pu_dap(taxa: float, codigo: str=None, data_liquidacao=None, data_ven
         # Ajusta para dia útil
         data_vencimento = data_vencimento_ajustada(data=data_vencimento, feriados=feriados)
         
-        dias_uteis = dias_trabalho_total(data_liquidacao, data_vencimento)
+        dias_uteis = dias_trabalho_total(data_liquidacao, data_vencimento, feriados=feriados)
         return 100000 / ((taxa / 100 +1) ** (dias_uteis / 252))
     
-def calculo_financeiro_dap(taxa: float, codigo: str=None, data_liquidacao=None, data_vencimento:pd.Timestamp=None, feriados: list=None):
-    pu = calculo_pu_dap(taxa=taxa, 
-                        codigo=codigo, 
-                        data_liquidacao=data_liquidacao,
-                        data_vencimento=data_vencimento,
-                        feriados=feriados)
-    
-    prt = calculo_prt(data=data_liquidacao)
-    return pu * 0.00025 * prt
-
-def dv01_dap(taxa: float, codigo: str=None, data_liquidacao=None, data_vencimento:pd.Timestamp=None, feriados: list=None):
-
-    fin = calculo_financeiro_dap(taxa=taxa, 
-                        codigo=codigo, 
-                        data_liquidacao=data_liquidacao,
-                        data_vencimento=data_vencimento,
-                        feriados=feriados)
-
-    fin_1bp = calculo_financeiro_dap(taxa=taxa+0.01, 
-                        codigo=codigo, 
-                        data_liquidacao=data_liquidacao,
-                        data_vencimento=data_vencimento,
-                        feriados=feriados)
-    
-    return abs(fin - fin_1bp)
\ No newline at end of file
+def precificar_dap_lote(taxas, codigos=None, vencimentos=None, datas_liquidacao=None, ipca_dict=None,
+                        feriados: list=None, metodo: str=METODO_BUMP, data_referencia=None) -> dict:
+    """
+    Precifica vários contratos de DAP de uma vez.
+
+    Os vencimentos (dia 15 do mês, ajustado para dia útil) e os dias úteis
+    são calculados em uma única passada vetorizada, e o PRT é calculado uma
+    única vez por data de liquidação distinta. Os resultados são idênticos
+    aos de calculo_pu_dap, calculo_financeiro_dap e dv01_dap para cada
+    contrato.
+
+    Args:
+        taxas: Array de taxas (%)
+        codigos: Códigos dos contratos (ex.: "DAPK35"), usados se vencimentos for None
+        vencimentos: Datas de vencimento (qualquer dia do mês do contrato)
+        datas_liquidacao: Data de liquidação ou array de datas (default: hoje)
+        ipca_dict: Dicionário de IPCA (se None, carrega automaticamente)
+        feriados: Lista de feriados ou Calendario (se None, carrega automaticamente)
+        metodo: Método do DV01 ("bump" ou "analitico")
+        data_referencia: Data de referência de ipca_dict, que define o mês do
+            IPCA no PRT (default: hoje)
+
+    Returns:
+        Dicionário com arrays pu, financeiro, dv01 e prt
+    """
+    if codigos is None and vencimentos is None:
+        raise ValueError("Fornece o codigo ou vencimento")
+
+    calendario = obter_calendario(_carregar_feriados_se_necessario(feriados))
+    ipca_dict = _carrecar_ipca_dict_se_necessario(ipca_dict)
+
+    if vencimentos is None:
+        # Cada código distinto é convertido uma única vez
+        codigos = np.atleast_1d(codigos).astype(str)
+        distintos, posicoes = np.unique(codigos, return_inverse=True)
+        vencimentos = pd.DatetimeIndex([codigo_vencimento_bmf(codigo) for codigo in distintos])[posicoes]
+    vencimentos = pd.DatetimeIndex(pd.to_datetime(np.atleast_1d(vencimentos)))
+    taxas = np.broadcast_to(np.asarray(taxas, dtype=np.float64), vencimentos.shape)
+
+    if datas_liquidacao is None:
+        datas_liquidacao = pd.Timestamp.today().normalize()
+    datas_liquidacao = pd.DatetimeIndex(np.broadcast_to(np.asarray(pd.to_datetime(datas_liquidacao),
+                                                                   dtype="datetime64[ns]"),
+                                                        vencimentos.shape))
+
+    # Vencimento do DAP: dia 15 do mês, ajustado para dia útil
+    vencimentos = calendario.proximo_dia_util(vencimentos.to_period("M").to_timestamp() + pd.Timedelta(days=14))
+    dias = np.asarray(calendario.dias_uteis(datas_liquidacao, vencimentos))
+
+    # PRT uma única vez por data de liquidação
+    datas_distintas, posicoes = np.unique(datas_liquidacao.values, return_inverse=True)
+    prt = np.array([calculo_prt(data=data, ipca_dict=ipca_dict, feriados=calendario,
+                                data_referencia=data_referencia)
+                    for data in pd.DatetimeIndex(datas_distintas)], dtype=np.float64)[posicoes]
+
+    pu = 100000 / potencia_vetor(taxas / 100 + 1, dias / 252)
+    return {
+            "pu": pu,
+            "financeiro": pu * 0.00025 * prt,
+            "dv01": dv01_dap_vetor(taxas=taxas, dias=dias, prt=prt, metodo=metodo),
+            "prt": prt
+           }
+
+def calculo_financeiro_dap(taxa: float, codigo: str=None, data_liquidacao=None, data_vencimento:pd.Timestamp=None,
+                           feriados: list=None, ipca_dict=None, data_referencia=None):
+    res = precificar_dap_lote(taxas=[taxa],
+                              codigos=None if codigo is None else [codigo],
+                              vencimentos=None if data_vencimento is None else [data_vencimento],
+                              datas_liquidacao=data_liquidacao,
+                              ipca_dict=ipca_dict,
+                              feriados=feriados,
+                              data_referencia=data_referencia)
+    return float(res["financeiro"][0])
+
+def dv01_dap(taxa: float, codigo: str=None, data_liquidacao=None, data_vencimento:pd.Timestamp=None, feriados: list=None,
+             metodo: str=METODO_BUMP, ipca_dict=None, data_referencia=None):
+    '''
+    Calcula o DV01 financeiro do DAP (diferença entre o financeiro e o financeiro com 1bp).
+
+    Os dias úteis e o PRT são calculados uma única vez e reaproveitados para a
+    taxa com +1bp (ver precificar_dap_lote). metodo="analitico" usa a derivada
+    em forma fechada (ver titulospub.core.sensibilidade). data_referencia é a
+    data de ipca_dict, que define o mês do IPCA no PRT (default: hoje).
+    '''
+    res = precificar_dap_lote(taxas=[taxa],
+                              codigos=None if codigo is None else [codigo],
+                              vencimentos=None if data_vencimento is None else [data_vencimento],
+                              datas_liquidacao=data_liquidacao,
+                              ipca_dict=ipca_dict,
+                              feriados=feriados,
+                              metodo=metodo,
+                              data_referencia=data_referencia)
+    return float(res["dv01"][0])
@@ -3,6 +3,7 @@ from math import trunc
 
 from titulospub.utils import _carregar_feriados_se_necessario, dias_trabalho_total, data_vencimento_ajustada
 from titulospub.core.auxilio import codigo_vencimento_bmf
+from titulospub.core.sensibilidade import METODO_BUMP, dv01_di_vetor
 
 def taxa_pu_di(taxa: float, codigo: str=None, data_liquidacao=None, data_vencimento:pd.Timestamp=None, feriados: list=None):  
 
@@ -30,12 +31,16 @@ def taxa_pu_di(taxa: float, codigo: str=None, data_liquidacao=None, data_vencime
 
     return pu_ltn
 
-def calculo_dv01_di(taxa: float, codigo: str=None, data_liquidacao=None, data_vencimento:pd.Timestamp=None, feriados: list=None):
+def calculo_dv01_di(taxa: float, codigo: str=None, data_liquidacao=None, data_vencimento:pd.Timestamp=None, feriados: list=None, metodo: str=METODO_BUMP):
     '''
     Calcula o Dv01 da LTN ( diferenca entre um PU e o PU com 1bp. sem considerar qtds de titulos)
+
+    Os dias úteis são contados uma única vez e reaproveitados para a taxa com +1bp.
+    metodo="analitico" usa a derivada em forma fechada (ver titulospub.core.sensibilidade).
     '''
 
     feriados = _carregar_feriados_se_necessario(feriados) 
+    if data_liquidacao == None: data_liquidacao=pd.Timestamp.today().normalize()
 
     if codigo == None and data_vencimento == None:
         raise ValueError("Fornece o codigo ou vencimento")
@@ -44,16 +49,6 @@ def calculo_dv01_di(taxa: float, codigo: str=None, data_liquidacao=None, data_ve
     else:
         data_vencimento = data_vencimento_ajustada(data=codigo_vencimento_bmf(codigo), feriados=feriados)
 
-    pu = taxa_pu_di(codigo=codigo,
-                    data_liquidacao=data_liquidacao, 
-                    data_vencimento=data_vencimento, 
-                    taxa=taxa,
-                    feriados=feriados)
-    
-    pu_1bp = taxa_pu_di(codigo=codigo,
-                        data_liquidacao=data_liquidacao, 
-                        data_vencimento=data_vencimento, 
-                        taxa=taxa + 0.01,
-                        feriados=feriados)
-    
-    return abs(pu - pu_1bp)
\ No newline at end of file
+    dias = dias_trabalho_total(data_inicio=data_liquidacao, data_fim=data_vencimento, feriados=feriados)
+
+    return float(dv01_di_vetor(taxas=[taxa], dias=[dias], metodo=metodo)[0])
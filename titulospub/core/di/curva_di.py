@@ -0,0 +1,171 @@
+"""
+Precificação de todos os contratos de DI1 da BMF de uma vez.
+
+CurvaDI converte os códigos em vencimentos (ajustados para dia útil), conta
+os dias úteis e calcula PU e DV01 de todos os contratos em uma única
+passada vetorizada, com os mesmos truncamentos de taxa_pu_di e
+calculo_dv01_di. Os arrays ficam alinhados por contrato, e o DV01 de um
+contrato é obtido por código sem nova precificação.
+"""
+
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from titulospub.core.auxilio import codigo_vencimento_bmf, potencia_vetor, truncar_vetor
+from titulospub.core.sensibilidade import METODO_BUMP, dv01_di_vetor
+from titulospub.dados.snapshot import memoizar_por_snapshot, resolver_mercado
+from titulospub.utils.calendario import obter_calendario
+
+
+class CurvaDI:
+    """
+    PU e DV01 de todos os contratos de DI1 a vencer na data de referência.
+    """
+
+    def __init__(self, data_referencia, codigos: Sequence[str], taxas: Sequence[float], feriados=None,
+                 metodo: str = METODO_BUMP):
+        """
+        Precifica os contratos.
+
+        Args:
+            data_referencia: Data de liquidação dos contratos
+            codigos: Códigos dos contratos (ex.: "DI1F27")
+            taxas: Taxas (ajustes) dos contratos (% a.a.)
+            feriados: Lista de feriados ou Calendario (se None, carrega automaticamente)
+            metodo: Método do DV01 ("bump" ou "analitico")
+        """
+        self._calendario = obter_calendario(feriados)
+        self._data_referencia = pd.Timestamp(data_referencia).normalize()
+        self._metodo = metodo
+
+        codigos = np.asarray(codigos, dtype=str)
+        taxas = np.asarray(taxas, dtype=np.float64)
+        if len(codigos) != len(taxas):
+            raise ValueError("codigos e taxas devem ter o mesmo tamanho")
+
+        vencimentos = self._calendario.proximo_dia_util(
+            pd.DatetimeIndex([codigo_vencimento_bmf(codigo) for codigo in codigos]))
+        dias = np.asarray(self._calendario.dias_uteis(self._data_referencia, vencimentos), dtype=np.int64)
+
+        # Apenas contratos a vencer, em ordem de vencimento
+        a_vencer = (dias > 0) & ~np.isnan(taxas)
+        ordem = np.argsort(dias[a_vencer], kind="stable")
+        self._codigos = codigos[a_vencer][ordem]
+        self._vencimentos = vencimentos[a_vencer][ordem]
+        self._dias = dias[a_vencer][ordem]
+        self._taxas = taxas[a_vencer][ordem]
+
+        self._pu = truncar_vetor(100000 / potencia_vetor(self._taxas / 100 + 1, self._dias / 252), 6)
+        self._dv01 = dv01_di_vetor(taxas=self._taxas, dias=self._dias, metodo=metodo)
+        self._indices: Dict[str, int] = {codigo: i for i, codigo in enumerate(self._codigos)}
+
+    # ==================== ARRAYS ====================
+
+    @property
+    def data_referencia(self) -> pd.Timestamp:
+        """Data de liquidação dos contratos."""
+        return self._data_referencia
+
+    @property
+    def codigos(self) -> np.ndarray:
+        """Códigos dos contratos."""
+        return self._codigos
+
+    @property
+    def vencimentos(self) -> pd.DatetimeIndex:
+        """Vencimentos (ajustados para dia útil)."""
+        return self._vencimentos
+
+    @property
+    def dias(self) -> np.ndarray:
+        """Dias úteis até o vencimento."""
+        return self._dias
+
+    @property
+    def taxas(self) -> np.ndarray:
+        """Taxas dos contratos (% a.a.)."""
+        return self._taxas
+
+    @property
+    def pu(self) -> np.ndarray:
+        """PU dos contratos (face 100.000)."""
+        return self._pu
+
+    @property
+    def dv01(self) -> np.ndarray:
+        """DV01 por contrato."""
+        return self._dv01
+
+    def tabela(self) -> pd.DataFrame:
+        """
+        Contratos precificados.
+
+        Returns:
+            DataFrame com CODIGO, VENCIMENTO, DIAS_UTEIS, TAXA, PU e DV01
+        """
+        return pd.DataFrame({
+            "CODIGO": self._codigos,
+            "VENCIMENTO": self._vencimentos,
+            "DIAS_UTEIS": self._dias,
+            "TAXA": self._taxas,
+            "PU": self._pu,
+            "DV01": self._dv01,
+        })
+
+    # ==================== CONSULTA ====================
+
+    def dv01_contrato(self, codigo: str, taxa: Optional[float] = None) -> float:
+        """
+        DV01 de um contrato.
+
+        Se o contrato fizer parte da curva com a mesma taxa, o DV01 já
+        calculado é reaproveitado; caso contrário (contrato sem ajuste ou
+        outra taxa), é calculado para o vencimento do código.
+
+        Args:
+            codigo: Código do contrato (ex.: "DI1F32")
+            taxa: Taxa do contrato (default: o ajuste da curva)
+
+        Returns:
+            DV01 por contrato
+        """
+        i = self._indices.get(codigo)
+        if i is not None and (taxa is None or taxa == self._taxas[i]):
+            return float(self._dv01[i])
+        if taxa is None:
+            raise ValueError(f"Contrato {codigo} não encontrado na curva de DI1.")
+
+        vencimento = self._calendario.proximo_dia_util(codigo_vencimento_bmf(codigo))
+        dias = self._calendario.dias_uteis(self._data_referencia, vencimento)
+        return float(dv01_di_vetor(taxas=[taxa], dias=[dias], metodo=self._metodo)[0])
+
+    def __repr__(self) -> str:
+        return f"CurvaDI(data_referencia={self._data_referencia.date()}, contratos={len(self._codigos)})"
+
+
+@memoizar_por_snapshot
+def _montar_curva_contratos_di(variaveis_mercado, data_referencia: pd.Timestamp) -> CurvaDI:
+    df = variaveis_mercado.get_bmf()["DI"]
+    # Ajuste zerado: contrato sem negócios (fica fora da curva)
+    df = df[df["ADJ"] > 0]
+    return CurvaDI(data_referencia=data_referencia,
+                   codigos=df["DI"],
+                   taxas=df["ADJ"],
+                   feriados=variaveis_mercado.get_calendario())
+
+
+def obter_curva_contratos_di(variaveis_mercado=None, data_base=None) -> CurvaDI:
+    """
+    Retorna os contratos de DI1 da BMF precificados (ver CurvaDI).
+
+    Args:
+        variaveis_mercado: Instância de VariaveisMercado ou MarketSnapshot (default: snapshot do processo)
+        data_base: Data de liquidação dos contratos (default: hoje)
+
+    Returns:
+        CurvaDI
+    """
+    variaveis_mercado, data_base = resolver_mercado(variaveis_mercado, data_base)
+    return _montar_curva_contratos_di(variaveis_mercado, data_base)
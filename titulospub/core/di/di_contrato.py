@@ -3,8 +3,10 @@ from titulospub.core.di.calculo_di import calculo_dv01_di, taxa_pu_di
 import pandas as pd
 
 from titulospub.dados.orquestrador import VariaveisMercado
+from titulospub.dados.snapshot import MarketSnapshot, get_snapshot
 from titulospub.utils import adicionar_dias_uteis, data_vencimento_ajustada
 from titulospub.core.auxilio import codigo_vencimento_bmf, vencimento_codigo_bmf
+from titulospub.utils.calendario import obter_calendario
 
 
 class DI:
@@ -15,13 +17,13 @@ class DI:
                        quantidade=1, 
                        cdi: float=None,  
                        feriados: list=None,
-                       variaveis_mercado: VariaveisMercado | None = None):
+                       variaveis_mercado: VariaveisMercado | MarketSnapshot | None = None):
 
         # Injete uma instância para evitar recriar VariaveisMercado várias vezes
-        self._vm = variaveis_mercado or VariaveisMercado()
+        self._vm = variaveis_mercado or get_snapshot(data_base)
 
         # Variáveis globais
-        self._feriados   = feriados   if feriados   is not None else self._vm.get_feriados()
+        self._feriados   = obter_calendario(feriados) if feriados is not None else self._vm.get_calendario()
         # Datas
         self._data_base = pd.to_datetime(data_base).normalize() if data_base else pd.Timestamp.today().normalize()
 
@@ -1,11 +1,25 @@
 """
 Função para cálculo de equivalência entre títulos públicos
 """
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .lft.calculo_lft import precificar_lft_lote
 from .lft.titulo_lft import LFT
+from .ltn.calculo_ltn import precificar_ltn_lote
 from .ltn.titulo_ltn import LTN
+from .ntnb.calculo_ntnb import precificar_ntnb_lote
 from .ntnb.titulo_ntnb import NTNB
+from .ntnf.calculo_ntnf import precificar_ntnf_lote
 from .ntnf.titulo_ntnf import NTNF
 
+CRITERIOS_EQUIVALENCIA = ("dv", "fin")
+
+# Tabela ANBIMA de cada tipo de título
+_CHAVES_ANBIMA = {"LTN": "LTN", "NTNF": "NTN-F", "NTNB": "NTN-B", "LFT": "LFT"}
+
 
 def equivalencia(titulo1: str, venc1: str, 
                  titulo2: str, venc2: str,
@@ -52,42 +66,142 @@ def equivalencia(titulo1: str, venc1: str,
         if titulo1 == "LFT" or titulo2 == "LFT":
             raise ValueError("LFT não suporta equivalência por DV01. Use critério 'fin' (financeiro) para LFT.")
 
-    # Instancia as classes correspondentes
-    titulo_1 = mapa_titulos[titulo1](data_vencimento_titulo=venc1)
-    titulo_2 = mapa_titulos[titulo2](data_vencimento_titulo=venc2)
-
-    # Define taxas se fornecidas
-    if tx1 is not None:
-        titulo_1.taxa = tx1
-    if tx2 is not None:
-        titulo_2.taxa = tx2
-    
-    # Define quantidade do primeiro título
-    if qtd1 is not None:
-        titulo_1.quantidade = qtd1
-    else:
+    if qtd1 is None:
         raise ValueError("Parâmetro 'qtd1' é obrigatório")
-    
-    # Calcula equivalência baseada no critério
-    if criterio == "dv":
-        # Validação adicional após instanciação (caso algum título tenha sido criado incorretamente)
-        if isinstance(titulo_1, LFT) or isinstance(titulo_2, LFT):
-            raise ValueError("LFT não suporta equivalência por DV01. Use critério 'fin' (financeiro) para LFT.")
-        if titulo_1.dv01 is None or titulo_2.dv01 is None:
-            raise ValueError("DV01 não disponível para um dos títulos")
-        eq = titulo_1.dv01 / titulo_2.dv01 * qtd1
-    elif criterio == "fin":
-        # Calcula financeiro do primeiro título (já tem quantidade definida)
-        financeiro_1 = titulo_1.financeiro
-        
-        # Calcula quantidade equivalente do segundo título
-        # Para isso, precisamos calcular quanto do título 2 equivale ao financeiro do título 1
-        # financeiro_1 = quantidade_2 * pu_termo_2
-        # quantidade_2 = financeiro_1 / pu_termo_2
-        titulo_2.quantidade = 1  # Quantidade unitária para obter PU
-        pu_termo_2 = titulo_2.pu_termo if hasattr(titulo_2, 'pu_termo') else titulo_2.pu_d0
-        eq = financeiro_1 / pu_termo_2
-    else:
+    if criterio not in CRITERIOS_EQUIVALENCIA:
         raise ValueError(f"Critério '{criterio}' não reconhecido. Use 'dv' ou 'fin'")
 
-    return eq
\ No newline at end of file
+    # Par único da matriz de equivalência (quantidade apenas na origem)
+    matrizes = equivalencia_matriz(origens=[{"titulo": titulo1, "vencimento": venc1, "quantidade": qtd1, "taxa": tx1}],
+                                   destinos=[{"titulo": titulo2, "vencimento": venc2, "taxa": tx2}],
+                                   criterios=[criterio])
+    eq = float(matrizes[criterio][0, 0])
+
+    return eq
+
+
+def _precificar_titulos(titulos: List[tuple], data_base, dias_liquidacao: int, variaveis_mercado) -> Dict[tuple, dict]:
+    """
+    Precifica (tipo, vencimento, taxa) distintos com uma chamada em lote por tipo.
+
+    Returns:
+        Dicionário {(tipo, vencimento, taxa): {"dv01", "pu_financeiro", "pu_termo"}}
+        com valores por unidade (dv01 None para LFT)
+    """
+    from titulospub.dados.snapshot import get_snapshot
+
+    vm = variaveis_mercado or get_snapshot(data_base)
+    calendario = vm.get_calendario()
+    cdi = vm.get_cdi()
+    data = pd.to_datetime(data_base).normalize() if data_base else pd.Timestamp.today().normalize()
+    data_liquidacao = calendario.adicionar_dias_uteis(data, dias_liquidacao)
+    anbimas = vm.get_anbimas()
+
+    resultados = {}
+    for tipo in _CHAVES_ANBIMA:
+        chaves = [t for t in dict.fromkeys(titulos) if t[0] == tipo]
+        if not chaves:
+            continue
+
+        vencimentos = pd.to_datetime([vencimento for _, vencimento, _ in chaves])
+        df = anbimas[_CHAVES_ANBIMA[tipo]]
+        taxas = []
+        for (_, _, taxa), vencimento in zip(chaves, vencimentos):
+            if taxa is None:
+                linha = df[df["VENCIMENTO"] == vencimento]
+                if linha.empty:
+                    raise ValueError(f"Vencimento {vencimento.date()} não encontrado na ANBIMA.")
+                taxa = linha.squeeze()["ANBIMA"]
+            taxas.append(float(taxa))
+
+        if tipo == "LTN":
+            res = precificar_ltn_lote(data, data_liquidacao, vencimentos, taxas, cdi=cdi, feriados=calendario)
+        elif tipo == "NTNF":
+            res = precificar_ntnf_lote(data, data_liquidacao, vencimentos, taxas, cdi=cdi, feriados=calendario)
+        elif tipo == "NTNB":
+            res = precificar_ntnb_lote(data, data_liquidacao, vencimentos, taxas, cdi=cdi,
+                                       ipca_dict=vm.get_ipca_dict(), feriados=calendario)
+        else:
+            res = precificar_lft_lote(data, data_liquidacao, vencimentos, taxas, feriados=calendario,
+                                      cdi=cdi, vna_lft=vm.get_vna_lft())
+
+        if "dv01" in res and (res["dv01"] == 0).any():
+            raise ValueError("DV01 nulo: vencimento coincide com a liquidação")
+
+        # Financeiro das posições como nas classes: NTN-B pelo PU a termo, demais pelo PU à vista
+        pu_financeiro = res["pu_termo"] if tipo == "NTNB" else res["pu_d0"]
+        for i, chave in enumerate(chaves):
+            resultados[chave] = {
+                "dv01": float(res["dv01"][i]) if "dv01" in res else None,
+                "pu_financeiro": float(pu_financeiro[i]),
+                "pu_termo": float(res["pu_termo"][i]),
+            }
+    return resultados
+
+
+def _normalizar_titulo(titulo: dict) -> tuple:
+    tipo = str(titulo["titulo"]).upper().replace("-", "")
+    if tipo not in _CHAVES_ANBIMA:
+        raise KeyError(f"Tipo de título '{titulo['titulo']}' não reconhecido. Tipos disponíveis: {list(_CHAVES_ANBIMA)}")
+    taxa = titulo.get("taxa")
+    return tipo, str(titulo["vencimento"]), None if taxa is None else float(taxa)
+
+
+def equivalencia_matriz(origens: List[dict],
+                        destinos: List[dict],
+                        criterios: Optional[List[str]] = None,
+                        data_base: str = None,
+                        dias_liquidacao: int = 1,
+                        variaveis_mercado=None) -> Dict:
+    """
+    Calcula a equivalência de todos os pares origem x destino de uma vez.
+
+    Cada título distinto (tipo, vencimento, taxa) é precificado uma única vez,
+    em uma chamada em lote por tipo, e as equivalências são calculadas com
+    operações vetoriais:
+    - dv: quantidade * DV01_origem / DV01_destino
+    - fin: financeiro da origem / PU a termo do destino
+
+    Args:
+        origens: Lista de {"titulo", "vencimento", "quantidade", "taxa" (opcional)}
+        destinos: Lista de {"titulo", "vencimento", "taxa" (opcional)}
+        criterios: Critérios a calcular ("dv" e/ou "fin"; default: ambos)
+        data_base: Data base para cálculos (default: hoje)
+        dias_liquidacao: Dias para liquidação (default: 1)
+        variaveis_mercado: Instância de VariaveisMercado ou MarketSnapshot (default: snapshot do processo)
+
+    Returns:
+        Dicionário {critério: matriz (origens x destinos)}. Na matriz "dv",
+        pares com LFT são NaN (LFT não tem DV01).
+
+    Raises:
+        KeyError: Se o tipo de título não for reconhecido
+        ValueError: Se os parâmetros forem inválidos
+    """
+    criterios = list(CRITERIOS_EQUIVALENCIA) if criterios is None else list(criterios)
+    for criterio in criterios:
+        if criterio not in CRITERIOS_EQUIVALENCIA:
+            raise ValueError(f"Critério '{criterio}' não reconhecido. Use 'dv' ou 'fin'")
+    if not origens or not destinos:
+        raise ValueError("Informe ao menos uma origem e um destino")
+
+    chaves_origem = [_normalizar_titulo(t) for t in origens]
+    chaves_destino = [_normalizar_titulo(t) for t in destinos]
+    quantidades = np.array([float(t["quantidade"]) for t in origens])
+    if (quantidades <= 0).any():
+        raise ValueError("Quantidade deve ser maior que zero")
+
+    precos = _precificar_titulos(chaves_origem + chaves_destino, data_base, dias_liquidacao, variaveis_mercado)
+
+    def coluna(chaves, campo):
+        return np.array([np.nan if precos[c][campo] is None else precos[c][campo] for c in chaves])
+
+    matrizes = {}
+    if "dv" in criterios:
+        dv01_origem = quantidades * coluna(chaves_origem, "dv01")
+        matrizes["dv"] = dv01_origem[:, None] / coluna(chaves_destino, "dv01")[None, :]
+    if "fin" in criterios:
+        financeiro_origem = quantidades * coluna(chaves_origem, "pu_financeiro")
+        matrizes["fin"] = financeiro_origem[:, None] / coluna(chaves_destino, "pu_termo")[None, :]
+    return matrizes
+
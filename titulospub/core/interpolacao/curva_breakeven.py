@@ -0,0 +1,126 @@
+"""
+Estrutura a termo da inflação implícita (breakeven).
+
+A inflação implícita entre a data de referência e um vencimento é a razão
+entre os fatores de desconto real (DAP) e nominal (DI1):
+
+    (1 + inflação) ^ (dias / 252) = fator_real / fator_nominal
+
+Os vértices da estrutura são os vencimentos dos DAPs, com a taxa nominal
+interpolada na curva de DI1 por flat-forward 252. Para outras datas, a
+inflação implícita é obtida das duas curvas em uma única operação vetorial.
+"""
+
+import numpy as np
+import pandas as pd
+
+from titulospub.core.interpolacao.funcoes_interpolacao import CurvaFlatForward252, obter_curva_dap, obter_curva_di
+from titulospub.dados.snapshot import memoizar_por_snapshot, resolver_mercado
+
+
+class CurvaBreakeven:
+    """
+    Inflação implícita a partir das curvas nominal (DI1) e real (DAP).
+    """
+
+    def __init__(self, curva_nominal: CurvaFlatForward252, curva_real: CurvaFlatForward252):
+        """
+        Inicializa a estrutura e calcula os vértices (vencimentos dos DAPs).
+
+        Args:
+            curva_nominal: Curva de juros nominais (DI1)
+            curva_real: Curva de juros reais (DAP)
+        """
+        if curva_nominal.data_referencia != curva_real.data_referencia:
+            raise ValueError("As curvas nominal e real devem ter a mesma data de referência")
+
+        self._curva_nominal = curva_nominal
+        self._curva_real = curva_real
+
+        self._vencimentos = curva_real.vencimentos
+        self._dias = curva_real.dias
+        self._taxas_reais = curva_real.taxas_vertices
+        self._taxas_nominais = curva_nominal.taxas_dias(self._dias)
+        self._inflacao = ((1 + self._taxas_nominais / 100) / (1 + self._taxas_reais / 100) - 1) * 100
+
+    @property
+    def data_referencia(self) -> pd.Timestamp:
+        """Data de referência das curvas."""
+        return self._curva_real.data_referencia
+
+    @property
+    def curva_nominal(self) -> CurvaFlatForward252:
+        """Curva de juros nominais (DI1)."""
+        return self._curva_nominal
+
+    @property
+    def curva_real(self) -> CurvaFlatForward252:
+        """Curva de juros reais (DAP)."""
+        return self._curva_real
+
+    def tabela(self) -> pd.DataFrame:
+        """
+        Vértices da estrutura.
+
+        Returns:
+            DataFrame com VENCIMENTO, DIAS_UTEIS, TAXA_NOMINAL, TAXA_REAL e
+            INFLACAO_IMPLICITA (% a.a.)
+        """
+        return pd.DataFrame({
+            "VENCIMENTO": self._vencimentos,
+            "DIAS_UTEIS": self._dias,
+            "TAXA_NOMINAL": self._taxas_nominais,
+            "TAXA_REAL": self._taxas_reais,
+            "INFLACAO_IMPLICITA": self._inflacao,
+        })
+
+    def inflacao_dias(self, dias) -> np.ndarray:
+        """
+        Inflação implícita (% a.a.) para arrays de dias úteis.
+
+        Para prazos até a data de referência, retorna a do primeiro vértice.
+        """
+        dias = np.asarray(dias, dtype=np.float64)
+        log_fatores = (self._curva_real.log_fatores_desconto_dias(dias)
+                       - self._curva_nominal.log_fatores_desconto_dias(dias))
+        inflacao = np.full(dias.shape, self._inflacao[0] if len(self._inflacao) else np.nan)
+        positivos = dias > 0
+        inflacao[positivos] = np.expm1(log_fatores[positivos] * 252 / dias[positivos]) * 100
+        return inflacao
+
+    def inflacao(self, datas) -> np.ndarray:
+        """
+        Inflação implícita (% a.a., 252 dias úteis) entre a data de
+        referência e as datas.
+
+        Args:
+            datas: Data ou array de datas
+
+        Returns:
+            Array de taxas de inflação implícita
+        """
+        return self.inflacao_dias(self._curva_real.dias_uteis(datas))
+
+    def __repr__(self) -> str:
+        return f"CurvaBreakeven(data_referencia={self.data_referencia.date()}, vertices={len(self._dias)})"
+
+
+@memoizar_por_snapshot
+def _montar_curva_breakeven(variaveis_mercado, data_referencia: pd.Timestamp) -> CurvaBreakeven:
+    return CurvaBreakeven(curva_nominal=obter_curva_di(variaveis_mercado, data_referencia),
+                          curva_real=obter_curva_dap(variaveis_mercado, data_referencia))
+
+
+def obter_curva_breakeven(variaveis_mercado=None, data_base=None) -> CurvaBreakeven:
+    """
+    Retorna a estrutura de inflação implícita (DI1 x DAP).
+
+    Args:
+        variaveis_mercado: Instância de VariaveisMercado ou MarketSnapshot (default: snapshot do processo)
+        data_base: Data de referência (default: hoje)
+
+    Returns:
+        CurvaBreakeven
+    """
+    variaveis_mercado, data_base = resolver_mercado(variaveis_mercado, data_base)
+    return _montar_curva_breakeven(variaveis_mercado, data_base)
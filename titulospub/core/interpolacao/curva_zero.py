@@ -0,0 +1,208 @@
+"""
+Curva zero prefixada a partir das taxas ANBIMA de LTN e NTN-F.
+
+As LTNs são títulos sem cupom: a taxa ANBIMA de cada uma já é a taxa zero
+do seu vencimento. As NTN-Fs que vencem depois da última LTN são
+adicionadas em ordem crescente de vencimento (bootstrap): os cupons até o
+último vértice conhecido são descontados pela curva já montada, e o fator
+de desconto do vencimento é o que faz o valor presente dos fluxos igualar a
+cotação da NTN-F na taxa ANBIMA. Os cupons entre o último vértice e o
+vencimento seguem a mesma interpolação flat-forward 252 do restante da
+curva.
+
+Os fluxos de todas as NTN-Fs são montados em uma única passada vetorizada
+(ver cronograma_ntnf), e a curva resultante é uma CurvaFlatForward252.
+"""
+
+import numpy as np
+import pandas as pd
+
+from titulospub.core.interpolacao.funcoes_interpolacao import (CurvaFlatForward252, interpolar_flat_forward_252,
+                                                               log_fatores_desconto_252)
+from titulospub.core.ntnf.cash_flow_ntnf import cotacao_ntnf_vetor, cronograma_ntnf
+from titulospub.dados.snapshot import memoizar_por_snapshot, resolver_mercado
+from titulospub.utils.calendario import obter_calendario
+
+# Iterações de Newton no ajuste de cada vértice de NTN-F
+_MAX_ITERACOES = 50
+_TOLERANCIA = 1e-12
+
+
+def _resolver_vertice(dias_vertices: np.ndarray, log_fatores: np.ndarray,
+                      fv: np.ndarray, dias: np.ndarray, cotacao: float, chute: float) -> float:
+    """
+    Log do fator de desconto no vencimento que reprecifica a NTN-F.
+
+    Os cupons até o último vértice têm valor presente fixo; os posteriores
+    são interpolados entre o último vértice e o vencimento, de modo que o
+    log do fator de cada um é linear no log do fator do vencimento.
+    """
+    x_ultimo = dias_vertices[-1] if len(dias_vertices) else 0.0
+    y_ultimo = log_fatores[-1] if len(log_fatores) else 0.0
+
+    conhecidos = dias <= x_ultimo
+    pv_conhecidos = float(np.sum(fv[conhecidos] * np.exp(interpolar_flat_forward_252(
+        dias_vertices, log_fatores, dias[conhecidos])))) if len(dias_vertices) else 0.0
+
+    fv_novos = fv[~conhecidos]
+    pesos = (dias[~conhecidos] - x_ultimo) / (dias[-1] - x_ultimo)
+
+    y = chute
+    for _ in range(_MAX_ITERACOES):
+        pv = fv_novos * np.exp(y_ultimo + (y - y_ultimo) * pesos)
+        erro = pv_conhecidos + pv.sum() - cotacao
+        passo = erro / np.sum(pv * pesos)
+        y -= passo
+        if abs(passo) < _TOLERANCIA:
+            return y
+    raise ValueError(f"Bootstrap da NTN-F com {int(dias[-1])} dias úteis não convergiu")
+
+
+class CurvaZeroPrefixada:
+    """
+    Curva zero prefixada obtida por bootstrap de LTN e NTN-F.
+    """
+
+    def __init__(self, data_referencia, vencimentos_ltn, taxas_ltn, vencimentos_ntnf, taxas_ntnf, feriados=None):
+        """
+        Monta a curva a partir das taxas dos títulos.
+
+        Args:
+            data_referencia: Data de referência das taxas
+            vencimentos_ltn: Vencimentos das LTNs
+            taxas_ltn: Taxas das LTNs (% a.a.)
+            vencimentos_ntnf: Vencimentos das NTN-Fs
+            taxas_ntnf: Taxas das NTN-Fs (% a.a.)
+            feriados: Lista de feriados ou Calendario (se None, carrega automaticamente)
+        """
+        calendario = obter_calendario(feriados)
+        data_referencia = pd.Timestamp(data_referencia).normalize()
+
+        # LTN: a taxa do título é a taxa zero do vencimento
+        curva_ltn = CurvaFlatForward252(data_referencia, vencimentos_ltn, taxas_ltn, feriados=calendario)
+        dias_vertices = curva_ltn.dias.astype(np.float64)
+        log_fatores = log_fatores_desconto_252(curva_ltn.taxas_vertices, dias_vertices)
+        vencimentos = list(curva_ltn.vencimentos)
+        titulos = ["LTN"] * len(vencimentos)
+        taxas_titulos = list(curva_ltn.taxas_vertices)
+
+        # NTN-F: apenas vencimentos depois do último vértice, em ordem crescente
+        vencimentos_ntnf = pd.DatetimeIndex(pd.to_datetime(vencimentos_ntnf))
+        taxas_ntnf = np.asarray(taxas_ntnf, dtype=np.float64)
+        if len(vencimentos_ntnf) != len(taxas_ntnf):
+            raise ValueError("vencimentos_ntnf e taxas_ntnf devem ter o mesmo tamanho")
+
+        dias_ntnf = np.asarray(calendario.dias_uteis(data_referencia, vencimentos_ntnf), dtype=np.float64)
+        x_ultimo = dias_vertices[-1] if len(dias_vertices) else 0.0
+        validas = (dias_ntnf > x_ultimo) & ~np.isnan(taxas_ntnf)
+        ordem = np.argsort(dias_ntnf[validas], kind="stable")
+        vencimentos_ntnf = vencimentos_ntnf[validas][ordem]
+        taxas_ntnf = taxas_ntnf[validas][ordem]
+
+        if len(vencimentos_ntnf):
+            cronograma = cronograma_ntnf(data_referencia, vencimentos_ntnf, calendario)
+            cotacoes = cotacao_ntnf_vetor(fv=cronograma["fv"], dias=cronograma["dias"], taxas=taxas_ntnf)
+
+            for i in range(len(vencimentos_ntnf)):
+                n = cronograma["n_cupons"][i]
+                dias = cronograma["dias"][i, :n].astype(np.float64)
+                if dias[-1] <= (dias_vertices[-1] if len(dias_vertices) else 0.0):
+                    continue
+                chute = float(log_fatores_desconto_252(taxas_ntnf[i], dias[-1]))
+                y = _resolver_vertice(dias_vertices, log_fatores, cronograma["fv"][i, :n], dias,
+                                      float(cotacoes[i]), chute)
+                dias_vertices = np.append(dias_vertices, dias[-1])
+                log_fatores = np.append(log_fatores, y)
+                vencimentos.append(vencimentos_ntnf[i])
+                titulos.append("NTN-F")
+                taxas_titulos.append(float(taxas_ntnf[i]))
+
+        self._data_referencia = data_referencia
+        self._titulos = np.asarray(titulos, dtype=object)
+        self._taxas_titulos = np.asarray(taxas_titulos, dtype=np.float64)
+        self._dias = dias_vertices
+        self._log_fatores = log_fatores
+        taxas_zero = np.expm1(-log_fatores * 252 / dias_vertices) * 100 if len(dias_vertices) else np.array([])
+        self._curva = CurvaFlatForward252(data_referencia, pd.DatetimeIndex(vencimentos), taxas_zero,
+                                          feriados=calendario)
+
+    @property
+    def data_referencia(self) -> pd.Timestamp:
+        """Data de referência das taxas."""
+        return self._data_referencia
+
+    @property
+    def curva(self) -> CurvaFlatForward252:
+        """Curva flat-forward 252 das taxas zero."""
+        return self._curva
+
+    def tabela(self) -> pd.DataFrame:
+        """
+        Vértices da curva.
+
+        Returns:
+            DataFrame com VENCIMENTO, DIAS_UTEIS, TITULO, TAXA_TITULO,
+            TAXA_ZERO (% a.a.) e FATOR_DESCONTO
+        """
+        return pd.DataFrame({
+            "VENCIMENTO": self._curva.vencimentos,
+            "DIAS_UTEIS": self._curva.dias,
+            "TITULO": self._titulos,
+            "TAXA_TITULO": self._taxas_titulos,
+            "TAXA_ZERO": self._curva.taxas_vertices,
+            "FATOR_DESCONTO": np.exp(self._log_fatores),
+        })
+
+    def fator_desconto(self, datas) -> np.ndarray:
+        """
+        Fatores de desconto entre a data de referência e as datas.
+
+        Args:
+            datas: Data ou array de datas
+
+        Returns:
+            Array de fatores de desconto
+        """
+        return self._curva.fatores_desconto(datas)
+
+    def taxa_zero(self, datas) -> np.ndarray:
+        """
+        Taxas zero (% a.a., 252 dias úteis) para as datas.
+
+        Args:
+            datas: Data ou array de datas
+
+        Returns:
+            Array de taxas zero
+        """
+        return self._curva.taxas(datas)
+
+    def __repr__(self) -> str:
+        return f"CurvaZeroPrefixada(data_referencia={self._data_referencia.date()}, vertices={len(self._dias)})"
+
+
+@memoizar_por_snapshot
+def _montar_curva_zero(variaveis_mercado, data_referencia: pd.Timestamp) -> CurvaZeroPrefixada:
+    anbimas = variaveis_mercado.get_anbimas()
+    ltn, ntnf = anbimas["LTN"], anbimas["NTN-F"]
+    return CurvaZeroPrefixada(data_referencia=data_referencia,
+                              vencimentos_ltn=ltn["VENCIMENTO"],
+                              taxas_ltn=ltn["ANBIMA"],
+                              vencimentos_ntnf=ntnf["VENCIMENTO"],
+                              taxas_ntnf=ntnf["ANBIMA"],
+                              feriados=variaveis_mercado.get_calendario())
+
+
+def obter_curva_zero(variaveis_mercado=None, data_base=None) -> CurvaZeroPrefixada:
+    """
+    Retorna a curva zero prefixada (LTN e NTN-F ANBIMA).
+
+    Args:
+        variaveis_mercado: Instância de VariaveisMercado ou MarketSnapshot (default: snapshot do processo)
+        data_base: Data de referência (default: hoje)
+
+    Returns:
+        CurvaZeroPrefixada
+    """
+    variaveis_mercado, data_base = resolver_mercado(variaveis_mercado, data_base)
+    return _montar_curva_zero(variaveis_mercado, data_base)
@@ -0,0 +1,299 @@
+"""
+Interpolação de curvas de juros (convenção de 252 dias úteis).
+
+A interpolação flat-forward 252 é linear no logaritmo do fator de desconto
+em dias úteis: a taxa a termo entre dois vértices consecutivos é constante.
+Antes do primeiro vértice vale a taxa do primeiro vértice e, depois do
+último, a taxa a termo do último trecho.
+
+CurvaFlatForward252 guarda os vértices já convertidos em dias úteis e log
+dos fatores de desconto, e interpola arrays de datas em uma única operação
+vetorial. obter_curva_di e obter_curva_dap montam as curvas de DI1 e DAP a
+partir dos ajustes da BMF, uma única vez por snapshot de mercado e data base.
+"""
+
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from titulospub.core.auxilio import codigo_vencimento_bmf
+from titulospub.core.dap.calculo_dap import dia_15_do_mes
+from titulospub.dados.snapshot import memoizar_por_snapshot, resolver_mercado
+from titulospub.utils.calendario import obter_calendario
+
+
+def log_fatores_desconto_252(taxas, dias) -> np.ndarray:
+    """
+    Logaritmo dos fatores de desconto: -dias/252 * ln(1 + taxa/100).
+
+    Args:
+        taxas: Taxas (% a.a.)
+        dias: Dias úteis
+
+    Returns:
+        Array com log dos fatores de desconto
+    """
+    return -np.asarray(dias, dtype=np.float64) / 252 * np.log1p(np.asarray(taxas, dtype=np.float64) / 100)
+
+
+def interpolar_flat_forward_252(dias_vertices, log_fatores_vertices, dias) -> np.ndarray:
+    """
+    Interpola log dos fatores de desconto por flat-forward 252.
+
+    Args:
+        dias_vertices: Dias úteis dos vértices (crescentes e positivos)
+        log_fatores_vertices: Log dos fatores de desconto dos vértices
+        dias: Dias úteis a interpolar
+
+    Returns:
+        Array com log dos fatores de desconto em `dias`
+    """
+    # A data de referência é um vértice implícito com fator 1
+    x = np.concatenate(([0.0], np.asarray(dias_vertices, dtype=np.float64)))
+    y = np.concatenate(([0.0], np.asarray(log_fatores_vertices, dtype=np.float64)))
+    dias = np.asarray(dias, dtype=np.float64)
+
+    res = np.array(np.interp(dias, x, y), dtype=np.float64)
+
+    # Após o último vértice: mantém a taxa a termo do último trecho
+    apos = dias > x[-1]
+    if apos.any():
+        termo = (y[-1] - y[-2]) / (x[-1] - x[-2])
+        res[apos] = y[-1] + termo * (dias[apos] - x[-1])
+    return res
+
+
+def vencimento_contrato_di(codigo: str) -> pd.Timestamp:
+    """Vencimento (não ajustado) do contrato DI1: primeiro dia do mês do código."""
+    return codigo_vencimento_bmf(codigo)
+
+
+def vencimento_contrato_dap(codigo: str) -> pd.Timestamp:
+    """Vencimento (não ajustado) do contrato DAP: dia 15 do mês do código."""
+    return dia_15_do_mes(codigo_vencimento_bmf(codigo))
+
+
+class CurvaFlatForward252:
+    """
+    Curva de juros com interpolação flat-forward 252.
+
+    Os vértices a vencer (dias úteis > 0 a partir da data de referência) são
+    ordenados e convertidos uma única vez em log dos fatores de desconto.
+    """
+
+    def __init__(self,
+                 data_referencia,
+                 vencimentos: Sequence,
+                 taxas: Sequence[float],
+                 feriados=None,
+                 codigos: Optional[Sequence[str]] = None,
+                 vencimento_contrato: Callable[[str], pd.Timestamp] = vencimento_contrato_di):
+        """
+        Inicializa a curva.
+
+        Args:
+            data_referencia: Data de referência das taxas
+            vencimentos: Datas de vencimento dos vértices (dias úteis)
+            taxas: Taxas dos vértices (% a.a.)
+            feriados: Lista de feriados ou Calendario (se None, carrega automaticamente)
+            codigos: Códigos dos contratos de cada vértice (ex.: "DI1F27"), opcional
+            vencimento_contrato: Vencimento de um código de contrato, usado por
+                taxa_contrato (default: vencimento do DI1)
+        """
+        self._calendario = obter_calendario(feriados)
+        self._data_referencia = pd.Timestamp(data_referencia).normalize()
+        self._vencimento_contrato = vencimento_contrato
+
+        vencimentos = pd.DatetimeIndex(pd.to_datetime(vencimentos))
+        taxas = np.asarray(taxas, dtype=np.float64)
+        if len(vencimentos) != len(taxas):
+            raise ValueError("vencimentos e taxas devem ter o mesmo tamanho")
+
+        # Taxas por código, inclusive de contratos vencidos
+        self._taxas_codigo: Dict[str, float] = {}
+        if codigos is not None:
+            self._taxas_codigo = {str(c): float(t) for c, t in zip(codigos, taxas)}
+
+        dias = np.asarray(self._calendario.dias_uteis(self._data_referencia, vencimentos))
+        a_vencer = (dias > 0) & ~np.isnan(taxas)
+        dias, indices = np.unique(dias[a_vencer], return_index=True)
+        self._dias = dias
+        self._vencimentos = vencimentos[a_vencer][indices]
+        self._taxas = taxas[a_vencer][indices]
+        self._log_fatores = log_fatores_desconto_252(self._taxas, self._dias)
+
+    # ==================== VÉRTICES ====================
+
+    @property
+    def data_referencia(self) -> pd.Timestamp:
+        """Data de referência das taxas."""
+        return self._data_referencia
+
+    @property
+    def vencimentos(self) -> pd.DatetimeIndex:
+        """Vencimentos dos vértices a vencer."""
+        return self._vencimentos
+
+    @property
+    def dias(self) -> np.ndarray:
+        """Dias úteis dos vértices."""
+        return self._dias
+
+    @property
+    def taxas_vertices(self) -> np.ndarray:
+        """Taxas dos vértices (% a.a.)."""
+        return self._taxas
+
+    def taxa_codigo(self, codigo: str) -> Optional[float]:
+        """
+        Taxa do contrato informado, se ele fizer parte da curva.
+
+        Args:
+            codigo: Código do contrato (ex.: "DI1F27")
+
+        Returns:
+            Taxa (% a.a.) ou None
+        """
+        return self._taxas_codigo.get(codigo)
+
+    # ==================== INTERPOLAÇÃO ====================
+
+    def dias_uteis(self, datas) -> np.ndarray:
+        """Dias úteis entre a data de referência e as datas."""
+        return np.asarray(self._calendario.dias_uteis(self._data_referencia, pd.to_datetime(datas)))
+
+    def log_fatores_desconto_dias(self, dias) -> np.ndarray:
+        """Log dos fatores de desconto para arrays de dias úteis."""
+        if len(self._dias) == 0:
+            raise ValueError(f"Curva sem vértices a vencer em {self._data_referencia.date()}")
+        return interpolar_flat_forward_252(self._dias, self._log_fatores, dias)
+
+    def fatores_desconto_dias(self, dias) -> np.ndarray:
+        """Fatores de desconto para arrays de dias úteis."""
+        return np.exp(self.log_fatores_desconto_dias(dias))
+
+    def taxas_dias(self, dias) -> np.ndarray:
+        """
+        Taxas interpoladas (% a.a.) para arrays de dias úteis.
+
+        Para prazos até a data de referência, retorna a taxa do primeiro vértice.
+        """
+        dias = np.asarray(dias, dtype=np.float64)
+        log_fatores = self.log_fatores_desconto_dias(dias)
+        taxas = np.full(dias.shape, self._taxas[0])
+        positivos = dias > 0
+        taxas[positivos] = np.expm1(-log_fatores[positivos] * 252 / dias[positivos]) * 100
+        return taxas
+
+    def fatores_desconto(self, datas) -> np.ndarray:
+        """
+        Fatores de desconto entre a data de referência e as datas.
+
+        Args:
+            datas: Data ou array de datas
+
+        Returns:
+            Array de fatores de desconto
+        """
+        return self.fatores_desconto_dias(self.dias_uteis(datas))
+
+    def taxas(self, datas) -> np.ndarray:
+        """
+        Taxas interpoladas (% a.a., 252 dias úteis) para as datas.
+
+        Args:
+            datas: Data ou array de datas
+
+        Returns:
+            Array de taxas
+        """
+        return self.taxas_dias(self.dias_uteis(datas))
+
+    def taxa_contrato(self, codigo: str) -> Optional[float]:
+        """
+        Taxa do contrato: o ajuste, se o contrato fizer parte da curva, ou a
+        taxa interpolada no vencimento do código.
+
+        Args:
+            codigo: Código do contrato (ex.: "DI1F27")
+
+        Returns:
+            Taxa (% a.a.), ou None se o contrato não tiver ajuste e a curva
+            não tiver vértices a vencer
+        """
+        taxa = self.taxa_codigo(codigo)
+        if taxa is not None:
+            return taxa
+        if len(self._dias) == 0:
+            return None
+        vencimento = self._calendario.proximo_dia_util(self._vencimento_contrato(codigo))
+        return float(self.taxas(vencimento))
+
+    def __repr__(self) -> str:
+        return (f"CurvaFlatForward252(data_referencia={self._data_referencia.date()}, "
+                f"vertices={len(self._dias)})")
+
+
+# Vencimento dos contratos de cada curva da BMF
+_VENCIMENTO_CONTRATO = {"DI": vencimento_contrato_di, "DAP": vencimento_contrato_dap}
+
+
+@memoizar_por_snapshot
+def _montar_curva_bmf(variaveis_mercado, chave: str, data_referencia: pd.Timestamp) -> CurvaFlatForward252:
+    df = variaveis_mercado.get_bmf()[chave]
+    # Ajuste zerado: contrato sem negócios (fica fora da curva)
+    df = df[df["ADJ"] > 0]
+    return CurvaFlatForward252(data_referencia=data_referencia,
+                               vencimentos=df["DATA_VENCIMENTO"],
+                               taxas=df["ADJ"],
+                               feriados=variaveis_mercado.get_calendario(),
+                               codigos=df[chave],
+                               vencimento_contrato=_VENCIMENTO_CONTRATO[chave])
+
+
+def obter_curva_bmf(chave: str, variaveis_mercado=None, data_base=None) -> CurvaFlatForward252:
+    """
+    Retorna a curva dos ajustes da BMF ("DI" ou "DAP") com interpolação
+    flat-forward 252.
+
+    Args:
+        chave: Curva da BMF ("DI" ou "DAP")
+        variaveis_mercado: Instância de VariaveisMercado ou MarketSnapshot (default: snapshot do processo)
+        data_base: Data de referência (default: hoje)
+
+    Returns:
+        CurvaFlatForward252 dos contratos
+    """
+    if chave not in _VENCIMENTO_CONTRATO:
+        raise ValueError(f"Curva '{chave}' não suportada. Use uma de {list(_VENCIMENTO_CONTRATO)}.")
+    variaveis_mercado, data_base = resolver_mercado(variaveis_mercado, data_base)
+    return _montar_curva_bmf(variaveis_mercado, chave, data_base)
+
+
+def obter_curva_di(variaveis_mercado=None, data_base=None) -> CurvaFlatForward252:
+    """
+    Retorna a curva de DI1 (taxas nominais), ver obter_curva_bmf.
+
+    Args:
+        variaveis_mercado: Instância de VariaveisMercado ou MarketSnapshot (default: snapshot do processo)
+        data_base: Data de referência (default: hoje)
+
+    Returns:
+        CurvaFlatForward252 dos contratos DI1
+    """
+    return obter_curva_bmf("DI", variaveis_mercado, data_base)
+
+
+def obter_curva_dap(variaveis_mercado=None, data_base=None) -> CurvaFlatForward252:
+    """
+    Retorna a curva de DAP (taxas reais, cupom de IPCA), ver obter_curva_bmf.
+
+    Args:
+        variaveis_mercado: Instância de VariaveisMercado ou MarketSnapshot (default: snapshot do processo)
+        data_base: Data de referência (default: hoje)
+
+    Returns:
+        CurvaFlatForward252 dos contratos DAP
+    """
+    return obter_curva_bmf("DAP", variaveis_mercado, data_base)
@@ -1,27 +1,128 @@
+from functools import lru_cache
+import threading
+from typing import List
+
 from titulospub.utils import dias_trabalho_total, _carregar_vna_lft_se_necessario,  _carrecar_cdi_se_necessario, _carregar_feriados_se_necessario
 import pandas as pd
 
+
+@lru_cache(maxsize=64)
+def fator_diario_cdi(cdi: float) -> float:
+    """
+    Fator diário do CDI usado na atualização do VNA da LFT,
+    arredondado em 8 casas: round((1 + cdi/100) ** (1/252), 8).
+
+    Args:
+        cdi: Taxa CDI (% a.a.)
+
+    Returns:
+        Fator diário arredondado
+    """
+    return round((1 + cdi / 100) ** (1 / 252), 8)
+
+
+class ProjecaoVNALFT:
+    """
+    Projeção do VNA da LFT pelo CDI, dia útil a dia útil.
+
+    A trajetória parte do VNA da data base e é guardada à medida que é
+    estendida: o VNA k dias úteis à frente é round(fator * VNA(k-1), 6),
+    a mesma cadeia de arredondamentos do cálculo original, de modo que os
+    valores são idênticos. Qualquer prazo de liquidação já calculado é
+    apenas uma consulta à lista.
+    """
+
+    def __init__(self, vna_lft: float, cdi: float):
+        """
+        Args:
+            vna_lft: VNA da LFT na data base
+            cdi: Taxa CDI (% a.a.)
+        """
+        self._vna_lft = vna_lft
+        self._cdi = cdi
+        self._fator = fator_diario_cdi(cdi)
+        self._trajetoria: List[float] = [vna_lft]
+        self._lock = threading.Lock()
+
+    @property
+    def vna_lft(self) -> float:
+        return self._vna_lft
+
+    @property
+    def cdi(self) -> float:
+        return self._cdi
+
+    @property
+    def fator_diario(self) -> float:
+        return self._fator
+
+    def vna(self, dias_uteis: int) -> float:
+        """
+        VNA projetado após n dias úteis (o próprio VNA para n <= 0).
+
+        Args:
+            dias_uteis: Número de dias úteis a partir da data base
+
+        Returns:
+            VNA ajustado
+        """
+        if dias_uteis <= 0:
+            return self._vna_lft
+
+        trajetoria = self._trajetoria
+        if dias_uteis >= len(trajetoria):
+            with self._lock:
+                while len(trajetoria) <= dias_uteis:
+                    trajetoria.append(round(self._fator * trajetoria[-1], 6))
+        return trajetoria[dias_uteis]
+
+    def vna_ajustado(self, data: pd.Timestamp, data_liquidacao: pd.Timestamp, feriados: list = None) -> float:
+        """
+        VNA ajustado entre a data base e a liquidação.
+
+        Args:
+            data: Data base (data do VNA)
+            data_liquidacao: Data de liquidação
+            feriados: Lista de feriados ou Calendario (se None, carrega automaticamente)
+
+        Returns:
+            VNA ajustado
+        """
+        feriados = _carregar_feriados_se_necessario(feriados)
+        liq = dias_trabalho_total(data_inicio=data, data_fim=data_liquidacao, feriados=feriados)
+        return self.vna(liq)
+
+    def __repr__(self) -> str:
+        return f"ProjecaoVNALFT(vna_lft={self._vna_lft!r}, cdi={self._cdi!r}, dias={len(self._trajetoria) - 1})"
+
+
+@lru_cache(maxsize=16)
+def obter_projecao_vna_lft(vna_lft: float, cdi: float) -> ProjecaoVNALFT:
+    """
+    Retorna a projeção de VNA compartilhada para o par (VNA, CDI).
+
+    Títulos e carteiras de LFT com os mesmos dados de mercado reaproveitam
+    a mesma trajetória.
+
+    Args:
+        vna_lft: VNA da LFT na data base
+        cdi: Taxa CDI (% a.a.)
+
+    Returns:
+        ProjecaoVNALFT
+    """
+    return ProjecaoVNALFT(vna_lft=vna_lft, cdi=cdi)
+
+
 def calculo_vna_ajustado_lft(data: pd.Timestamp, data_liquidacao: pd.Timestamp, cdi: float=None, vna_lft:float=None, feriados: list=None):
 
     feriados = _carregar_feriados_se_necessario(feriados)
     vna_lft = _carregar_vna_lft_se_necessario(vna_lft)
     cdi = _carrecar_cdi_se_necessario(cdi)
 
-    liq = dias_trabalho_total(data_inicio=data, data_fim=data_liquidacao, feriados=feriados)
-    
-    vna_ajustado = vna_lft
-    if liq > 0:
-        i = 1
-        while i <= liq:
-            vna_ajustado = round(round((1 + cdi / 100) ** (1 / 252), 8) * vna_ajustado, 6)
-            i = i + 1
-    else:
-        pass
-
-    
-    return vna_ajustado
-    
+    return obter_projecao_vna_lft(vna_lft, cdi).vna_ajustado(data=data, data_liquidacao=data_liquidacao, feriados=feriados)
+
 # Bloco condicional para garantir que o código só execute quando for executado diretamente
 if __name__ == "__main__":
     # Teste simples no arquivo principal
-    print("vna_lft")
\ No newline at end of file
+    print("vna_lft")
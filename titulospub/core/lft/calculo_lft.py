@@ -1,11 +1,13 @@
-from titulospub.core.lft.ajuste_vna_lft import calculo_vna_ajustado_lft
-from titulospub.core.auxilio import calculo_pu_carregado
+from titulospub.core.lft.ajuste_vna_lft import ProjecaoVNALFT, calculo_vna_ajustado_lft, obter_projecao_vna_lft
+from titulospub.core.auxilio import calculo_pu_carregado, fator_carregamento, potencia_vetor, truncar_vetor
+from titulospub.utils.calendario import obter_calendario
 from titulospub.utils import (dias_trabalho_total , 
                               data_vencimento_ajustada, 
                               _carrecar_cdi_se_necessario,
                               _carregar_feriados_se_necessario,
                               _carregar_vna_lft_se_necessario)
 from math import trunc
+import numpy as np
 import pandas as pd
 
 
@@ -25,11 +27,12 @@ def pu_cotcao_lft(taxa: float, data_liquidacao: pd.Timestamp, data_vencimento: p
 
 
 def taxa_pu_lft(data: pd.to_datetime, data_liquidacao: pd.to_datetime, data_vencimento: pd.to_datetime, taxa: float,  
-                feriados: list=None, cdi: float=None, vna_lft: float=None):
+                feriados: list=None, cdi: float=None, vna_lft: float=None, projecao_vna: ProjecaoVNALFT=None):
 
     feriados = _carregar_feriados_se_necessario(feriados)
     cdi = _carrecar_cdi_se_necessario(cdi)
-    vna_lft = _carregar_vna_lft_se_necessario(vna_lft)
+    if projecao_vna is None:
+        vna_lft = _carregar_vna_lft_se_necessario(vna_lft)
     
     
     liq = dias_trabalho_total(data_inicio=data, data_fim=data_liquidacao, feriados=feriados)
@@ -38,7 +41,10 @@ def taxa_pu_lft(data: pd.to_datetime, data_liquidacao: pd.to_datetime, data_venc
     cot = pu_cotcao_lft(taxa=taxa, data_liquidacao=data_liquidacao, data_vencimento=data_vencimento, feriados=feriados)
 
     #calculando o vna ajustado
-    vna_ajustado = calculo_vna_ajustado_lft(data=data, data_liquidacao=data_liquidacao, cdi=cdi, vna_lft=vna_lft, feriados=feriados)
+    if projecao_vna is not None:
+        vna_ajustado = projecao_vna.vna_ajustado(data=data, data_liquidacao=data_liquidacao, feriados=feriados)
+    else:
+        vna_ajustado = calculo_vna_ajustado_lft(data=data, data_liquidacao=data_liquidacao, cdi=cdi, vna_lft=vna_lft, feriados=feriados)
 
 
     #Funcao de truncamento
@@ -46,40 +52,79 @@ def taxa_pu_lft(data: pd.to_datetime, data_liquidacao: pd.to_datetime, data_venc
 
     return truncar(cot * vna_ajustado / 100, 6)
 
-def calcular_lft(data: pd.to_datetime, data_liquidacao: pd.to_datetime, data_vencimento: pd.to_datetime, taxa: float,  
-                feriados: list=None, cdi: float=None, vna_lft: float=None):
-    
-    feriados = _carregar_feriados_se_necessario(feriados)
+def _cotacao_lft_vetor(taxas: np.ndarray, dias: np.ndarray) -> np.ndarray:
+    """Cotação da LFT (truncada em 4 casas) para arrays de taxas e dias úteis."""
+    return truncar_vetor(100 / potencia_vetor(taxas / 100 + 1, dias / 252), 4)
+
+
+def precificar_lft_lote(data: pd.Timestamp, data_liquidacao: pd.Timestamp, vencimentos, taxas,
+                        feriados: list=None, cdi: float=None, vna_lft: float=None,
+                        projecao_vna: ProjecaoVNALFT=None) -> dict:
+    """
+    Precifica vários vencimentos de LFT de uma vez.
+
+    O VNA ajustado (D0 e liquidação) e o fator de carregamento são calculados
+    uma única vez para o par de datas. Os resultados são idênticos aos de
+    calcular_lft para cada vencimento.
+
+    Args:
+        data: Data base
+        data_liquidacao: Data de liquidação
+        vencimentos: Array de datas de vencimento
+        taxas: Array de taxas (ou uma taxa para todos os vencimentos)
+        feriados: Lista de feriados ou Calendario (se None, carrega automaticamente)
+        cdi: Taxa CDI (se None, carrega automaticamente)
+        vna_lft: VNA da LFT na data base (se None, carrega automaticamente)
+        projecao_vna: Projeção do VNA já construída (se None, usa a compartilhada)
+
+    Returns:
+        Dicionário com arrays cotacao, pu_d0, pu_termo e pu_carregado
+    """
+    calendario = obter_calendario(feriados)
     cdi = _carrecar_cdi_se_necessario(cdi)
+    if projecao_vna is None:
+        projecao_vna = obter_projecao_vna_lft(_carregar_vna_lft_se_necessario(vna_lft), cdi)
 
-    cot = pu_cotcao_lft(taxa=taxa, data_liquidacao=data_liquidacao, data_vencimento=data_vencimento, feriados=feriados)
+    data = pd.Timestamp(data)
+    data_liquidacao = pd.Timestamp(data_liquidacao)
 
-    pu_d0 = taxa_pu_lft(data=data,
-                         data_liquidacao=data,
-                         data_vencimento=data_vencimento,
-                         taxa=taxa,
-                         feriados=feriados)
-
-    pu_termo = taxa_pu_lft(data=data,
-                         data_liquidacao=data_liquidacao,
-                         data_vencimento=data_vencimento,
-                         taxa=taxa,
-                         feriados=feriados)
-    
+    # Vencimentos ajustados para dia útil
+    vencimentos = calendario.proximo_dia_util(pd.to_datetime(vencimentos))
+    taxas = np.broadcast_to(np.asarray(taxas, dtype=np.float64), vencimentos.shape)
+
+    cotacao_d0 = _cotacao_lft_vetor(taxas, calendario.dias_uteis(data, vencimentos))
+    cotacao = _cotacao_lft_vetor(taxas, calendario.dias_uteis(data_liquidacao, vencimentos))
+
+    vna_d0 = projecao_vna.vna_ajustado(data=data, data_liquidacao=data, feriados=calendario)
+    vna_termo = projecao_vna.vna_ajustado(data=data, data_liquidacao=data_liquidacao, feriados=calendario)
+
+    pu_d0 = truncar_vetor(cotacao_d0 * vna_d0 / 100, 6)
+    pu_termo = truncar_vetor(cotacao * vna_termo / 100, 6)
+
+    fator = fator_carregamento(data=data, data_liquidacao=data_liquidacao, cdi=cdi, feriados=calendario)
+    pu_carregado = truncar_vetor(fator * pu_d0, 6)
 
-    pu_carregado = calculo_pu_carregado(data=data, 
-                                        data_liquidacao=data_liquidacao, 
-                                        pu=pu_d0, 
-                                        cdi=cdi, 
-                                        feriados=feriados)
-    
     return {
-            "cotacao": cot,
+            "cotacao": cotacao,
             "pu_d0": pu_d0,
             "pu_termo": pu_termo,
             "pu_carregado": pu_carregado
             }
 
+
+def calcular_lft(data: pd.to_datetime, data_liquidacao: pd.to_datetime, data_vencimento: pd.to_datetime, taxa: float,  
+                feriados: list=None, cdi: float=None, vna_lft: float=None, projecao_vna: ProjecaoVNALFT=None):
+    res = precificar_lft_lote(data=data,
+                              data_liquidacao=data_liquidacao,
+                              vencimentos=[data_vencimento],
+                              taxas=[taxa],
+                              feriados=feriados,
+                              cdi=cdi,
+                              vna_lft=vna_lft,
+                              projecao_vna=projecao_vna)
+
+    return {chave: float(valores[0]) for chave, valores in res.items()}
+
 # Bloco condicional para garantir que o código só execute quando for executado diretamente
 if __name__ == "__main__":
     # Teste simples no arquivo principal
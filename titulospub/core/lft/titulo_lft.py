@@ -1,10 +1,20 @@
 import pandas as pd
 
+from titulospub.core.calculo_sob_demanda import CalculoSobDemanda
+from titulospub.core.lft.ajuste_vna_lft import ProjecaoVNALFT, obter_projecao_vna_lft
 from titulospub.core.lft.calculo_lft import calcular_lft
 from titulospub.dados.orquestrador import VariaveisMercado
+from titulospub.dados.snapshot import MarketSnapshot, get_snapshot
 from titulospub.utils import adicionar_dias_uteis
+from titulospub.utils.calendario import obter_calendario
+
+class LFT(CalculoSobDemanda):
+    # Saídas derivadas: {saida: (método de cálculo, entradas de que depende)}
+    _DEPENDENCIAS = {
+        "precificacao": ("_precificar", ("taxa", "datas")),
+        "financeiro": ("_calcular_financeiro", ("taxa", "datas", "quantidade")),
+    }
 
-class LFT:
     def __init__(self, data_vencimento_titulo: str, 
                        data_base: str=None, 
                        dias_liquidacao: int=1,
@@ -12,15 +22,21 @@ class LFT:
                        quantidade=10000, 
                        cdi: float=None,  
                        feriados: list=None,
-                       variaveis_mercado: VariaveisMercado | None = None):
+                       variaveis_mercado: VariaveisMercado | MarketSnapshot | None = None,
+                       projecao_vna: ProjecaoVNALFT | None = None):
 
         # Injete uma instância para evitar recriar VariaveisMercado várias vezes
-        self._vm = variaveis_mercado or VariaveisMercado()
+        self._vm = variaveis_mercado or get_snapshot(data_base)
 
         # Variáveis globais
-        self._feriados   = feriados   if feriados   is not None else self._vm.get_feriados()
+        self._feriados   = obter_calendario(feriados) if feriados is not None else self._vm.get_calendario()
         self._cdi        = cdi        if cdi        is not None else self._vm.get_cdi()
 
+        # Projeção do VNA (compartilhada entre títulos com o mesmo VNA e CDI)
+        if projecao_vna is None or projecao_vna.cdi != self._cdi:
+            projecao_vna = obter_projecao_vna_lft(self._vm.get_vna_lft(), self._cdi)
+        self._projecao_vna = projecao_vna
+
         # Datas
         self._dias_liquidacao = dias_liquidacao
         self._data_vencimento_titulo = pd.to_datetime(data_vencimento_titulo)
@@ -31,7 +47,6 @@ class LFT:
         
         # Quantidade de titulos
         self._quantidade = quantidade
-        self._financeiro = None  # Será calculado após _calcular()
         
         # Nome
         self._nome = f"LFT {self._data_vencimento_titulo.month}/{self._data_vencimento_titulo.year}"
@@ -45,18 +60,7 @@ class LFT:
 
         self._taxa = float(taxa) if taxa is not None else float(self._anbima)
 
-        # Atributos DERIVADOS (serão preenchidos em _calcular)
-        self._cotacao = None
-        self._pu_d0 = None
-        self._pu_termo = None
-        self._pu_carregado = None
-        
-
-        # Calcula já na criação
-        self._calcular()
-        
-        # Calcula o financeiro após ter o pu_d0
-        self._financeiro = self._quantidade * self._pu_d0
+        # Os valores derivados são calculados no primeiro acesso
 
 
     @property
@@ -64,23 +68,21 @@ class LFT:
     @taxa.setter
     def taxa(self, v):
         self._taxa = float(v)
-        self._calcular()
+        self._invalidar("taxa")
     
     @property
     def data_base(self): return self._data_base
     @data_base.setter
     def data_base(self, v):
         self._data_base = pd.to_datetime(v).normalize()
-        
-        self._calcular()
+        self._invalidar("datas")
     
     @property
     def data_liquidacao(self): return self._data_liquidacao
     @data_liquidacao.setter
     def data_liquidacao(self, v):
         self._data_liquidacao = pd.to_datetime(v).normalize()
-    
-        self._calcular()
+        self._invalidar("datas")
     
     @property
     def quantidade(self):
@@ -91,11 +93,9 @@ class LFT:
         if v <= 0:
             raise ValueError("Quantidade deve ser maior que zero")
             
-        # Atualiza a quantidade
+        # Atualiza a quantidade (os valores por unidade não mudam)
         self._quantidade = float(v)
-        
-        # Atualiza o financeiro baseado na nova quantidade
-        self._financeiro = self._quantidade * self._pu_d0
+        self._invalidar("quantidade")
     
     
     @property
@@ -109,58 +109,55 @@ class LFT:
                                                      n_dias=self._dias_liquidacao,
                                                      feriados=self._feriados
                                                     )
-        self._calcular()
+        self._invalidar("datas")
 
     # -------- Propriedade financeiro --------
     @property
     def financeiro(self):
-        return self._financeiro
+        return self._obter("financeiro")
 
     @financeiro.setter
     def financeiro(self, v):
         if v <= 0:
             raise ValueError("Financeiro deve ser maior que zero")
             
-        if self._pu_d0 == 0:
+        if self.pu_d0 == 0:
             raise ValueError("PU_D0 não pode ser zero para calcular quantidade")
             
         # Calcula nova quantidade baseada no financeiro
-        self._financeiro = float(v)
-        self._quantidade = round(self._financeiro / self._pu_d0, 6)
+        self._quantidade = round(float(v) / self.pu_d0, 6)
+        self._invalidar("quantidade")
+        self._definir("financeiro", float(v))
 
     
 
     # -------- Método central de cálculo --------
-    def _calcular(self):
-        res = calcular_lft(
+    def _precificar(self):
+        return calcular_lft(
             data=self._data_base,
             data_liquidacao=self._data_liquidacao,
             data_vencimento=self._data_vencimento_titulo,
             taxa=self._taxa,
             cdi=self._cdi,
-            feriados=self._feriados
+            feriados=self._feriados,
+            projecao_vna=self._projecao_vna
         )
-        # guarda os derivados
-        self._cotacao       = res["cotacao"]
-        self._pu_d0         = res["pu_d0"]
-        self._pu_termo      = res["pu_termo"]
-        self._pu_carregado  = res["pu_carregado"]
-        
-        # Atualiza o financeiro baseado na quantidade atual
-        self._financeiro = self._quantidade * self._pu_d0
+
+    def _calcular_financeiro(self):
+        return self._quantidade * self.pu_d0
         
     
 
     # -------- Propriedades somente-leitura para derivados --------
 
     @property
-    def cotacap(self): return self._cotacao
+    def cotacap(self): return self._obter("precificacao")["cotacao"]
     @property
-    def pu_d0(self): return self._pu_d0
+    def pu_d0(self): return self._obter("precificacao")["pu_d0"]
     @property
-    def pu_termo(self): return self._pu_termo
+    def pu_termo(self): return self._obter("precificacao")["pu_termo"]
     @property
-    def pu_carregado(self): return self._pu_carregado
+    def pu_carregado(self): return self._obter("precificacao")["pu_carregado"]
     @property
     def dv01(self): return self._dv01
     @property
@@ -3,9 +3,12 @@ from titulospub.utils.datas import adicionar_dias_uteis
 from titulospub.dados.orquestrador import VariaveisMercado
 
 from titulospub.utils import  dias_trabalho_total, _carregar_feriados_se_necessario, _carrecar_cdi_se_necessario, data_vencimento_ajustada
-from titulospub.core.auxilio import calculo_pu_carregado
+from titulospub.utils.calendario import obter_calendario
+from titulospub.core.auxilio import calculo_pu_carregado, fator_carregamento, potencia_vetor, truncar_vetor
+from titulospub.core.sensibilidade import METODO_BUMP, dv01_ltn_vetor
 
 from math import trunc
+import numpy as np
 import pandas as pd
 
 def taxa_pu_ltn(data: pd.Timedelta, data_liquidacao, data_vencimento:pd.Timestamp, taxa: float,  feriados: list=None):  
@@ -43,24 +46,22 @@ def pu_taxa_ltn(data: pd.Timedelta, data_liquidacao, data_vencimento:pd.Timestam
     return taxa_ltn
 
 
-def calculo_dv01_ltn(data: pd.Timedelta, data_liquidacao, data_vencimento:pd.Timestamp, taxa: float,  feriados: list=None):
+def calculo_dv01_ltn(data: pd.Timedelta, data_liquidacao, data_vencimento:pd.Timestamp, taxa: float,  feriados: list=None, metodo: str=METODO_BUMP):
     '''
     Calcula o Dv01 da LTN ( diferenca entre um PU e o PU com 1bp. sem considerar qtds de titulos)
+
+    Os dias úteis são contados uma única vez e reaproveitados para a taxa com +1bp.
+    metodo="analitico" usa a derivada em forma fechada (ver titulospub.core.sensibilidade).
     '''
 
     feriados = _carregar_feriados_se_necessario(feriados) 
 
-    pu = taxa_pu_ltn(data=data, 
-                     data_liquidacao=data_liquidacao, 
-                     data_vencimento=data_vencimento, 
-                     taxa=taxa)
-    
-    pu_1bp = taxa_pu_ltn(data=data, 
-                     data_liquidacao=data_liquidacao, 
-                     data_vencimento=data_vencimento, 
-                     taxa=taxa + 0.01)
-    
-    return abs(pu - pu_1bp)
+    # Encontrando a data de vencimento real do titulo
+    data_vencimento = data_vencimento_ajustada(data=data_vencimento, feriados=feriados)
+
+    dias = dias_trabalho_total(data_inicio=data_liquidacao, data_fim=data_vencimento, feriados=feriados)
+
+    return float(dv01_ltn_vetor(taxas=[taxa], dias=[dias], metodo=metodo)[0])
 
 
 def calculo_carrego_ltn(pu: float, pu_carregado: float, dv01:float):
@@ -71,51 +72,63 @@ def calculo_carrego_ltn(pu: float, pu_carregado: float, dv01:float):
 
     return carrego_brl, carrego_bps
 
-def calcular_ltn(data: pd.Timestamp, data_liquidacao, data_vencimento:pd.Timestamp, taxa: float, cdi: float=None,  feriados: list=None):
-    feriados = _carregar_feriados_se_necessario(feriados)
+def _pu_ltn_vetor(taxas: np.ndarray, dias: np.ndarray) -> np.ndarray:
+    """PU da LTN (truncado em 6 casas) para arrays de taxas e dias úteis."""
+    return truncar_vetor(1000 / potencia_vetor((taxas / 100) + 1, dias / 252), 6)
+
+
+def precificar_ltn_lote(data: pd.Timestamp, data_liquidacao: pd.Timestamp, vencimentos, taxas,
+                        cdi: float=None, feriados: list=None) -> dict:
+    """
+    Precifica vários vencimentos de LTN de uma vez.
+
+    As contagens de dias úteis são feitas uma única vez por vencimento e o
+    fator de carregamento uma única vez para o par de datas. Os resultados
+    são idênticos aos de calcular_ltn para cada vencimento.
+
+    Args:
+        data: Data base
+        data_liquidacao: Data de liquidação
+        vencimentos: Array de datas de vencimento
+        taxas: Array de taxas (ou uma taxa para todos os vencimentos)
+        cdi: Taxa CDI (se None, carrega automaticamente)
+        feriados: Lista de feriados ou Calendario (se None, carrega automaticamente)
+
+    Returns:
+        Dicionário com arrays pu_d0, pu_termo, pu_carregado, dv01,
+        carrego_brl e carrego_bps (carrego_bps é NaN quando dv01 é zero)
+    """
+    calendario = obter_calendario(feriados)
     cdi = _carrecar_cdi_se_necessario(cdi)
 
-    pu_d0 = taxa_pu_ltn(data=data,
-                         data_liquidacao=data,
-                         data_vencimento=data_vencimento,
-                         taxa=taxa,
-                         feriados=feriados)
-
-    pu_termo = taxa_pu_ltn(data=data,
-                         data_liquidacao=data_liquidacao,
-                         data_vencimento=data_vencimento,
-                         taxa=taxa,
-                         feriados=feriados)
-    
-    dv01 = calculo_dv01_ltn(data=data,
-                            data_liquidacao=data_liquidacao,
-                            data_vencimento=data_vencimento,
-                            taxa=taxa,
-                            feriados=feriados)
-    
-    pu_carregado = calculo_pu_carregado(data=data, 
-                                        data_liquidacao=data_liquidacao, 
-                                        pu=pu_d0, 
-                                        cdi=cdi, 
-                                        feriados=feriados)
-    
+    data = pd.Timestamp(data)
+    data_liquidacao = pd.Timestamp(data_liquidacao)
+
+    # Vencimentos ajustados para dia útil
+    vencimentos = calendario.proximo_dia_util(pd.to_datetime(vencimentos))
+    taxas = np.broadcast_to(np.asarray(taxas, dtype=np.float64), vencimentos.shape)
+
+    dias_d0 = calendario.dias_uteis(data, vencimentos)
+    dias_termo = calendario.dias_uteis(data_liquidacao, vencimentos)
+
+    pu_d0 = _pu_ltn_vetor(taxas, dias_d0)
+    pu_termo = _pu_ltn_vetor(taxas, dias_termo)
+    dv01 = dv01_ltn_vetor(taxas=taxas, dias=dias_termo)
+
+    fator = fator_carregamento(data=data, data_liquidacao=data_liquidacao, cdi=cdi, feriados=calendario)
+    pu_carregado = truncar_vetor(fator * pu_d0, 6)
+
+    # Liquidação em D0: o carregamento usa o PU a termo de D+1
     if data_liquidacao == data:
-        data_aux = adicionar_dias_uteis(data=data, n_dias=1, feriados=feriados)
-        pu_termo_real = taxa_pu_ltn(data=data,
-                                   data_liquidacao=data_aux,
-                                   data_vencimento=data_vencimento,
-                                   taxa=taxa,
-                                   feriados=feriados)
+        data_aux = calendario.adicionar_dias_uteis(data, 1)
+        pu_termo_real = _pu_ltn_vetor(taxas, calendario.dias_uteis(data_aux, vencimentos))
     else:
         pu_termo_real = pu_termo
-    
-    # Calcula o carregamento usando o PU a termo real
-    carrego_brl, carrego_bps = calculo_carrego_ltn(
-        pu=pu_termo_real,
-        pu_carregado=pu_carregado,
-        dv01=dv01
-    )
-    
+
+    carrego_brl = pu_termo_real - pu_carregado
+    with np.errstate(divide="ignore", invalid="ignore"):
+        carrego_bps = np.where(dv01 != 0, carrego_brl / dv01, np.nan)
+
     return {
             "pu_d0": pu_d0,
             "pu_termo": pu_termo,
@@ -125,6 +138,19 @@ def calcular_ltn(data: pd.Timestamp, data_liquidacao, data_vencimento:pd.Timesta
             "carrego_bps": carrego_bps
            }
 
+def calcular_ltn(data: pd.Timestamp, data_liquidacao, data_vencimento:pd.Timestamp, taxa: float, cdi: float=None,  feriados: list=None):
+    res = precificar_ltn_lote(data=data,
+                              data_liquidacao=data_liquidacao,
+                              vencimentos=[data_vencimento],
+                              taxas=[taxa],
+                              cdi=cdi,
+                              feriados=feriados)
+
+    if res["dv01"][0] == 0:
+        raise ZeroDivisionError("DV01 nulo: vencimento coincide com a liquidação")
+
+    return {chave: float(valores[0]) for chave, valores in res.items()}
+
 # =========================
 # MAIN - TESTES E EXEMPLOS
 # =========================
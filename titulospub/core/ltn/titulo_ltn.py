@@ -1,18 +1,31 @@
 import pandas as pd
+from typing import Dict, List, Optional
 
 from titulospub.core.auxilio import vencimento_codigo_bmf
+from titulospub.core.calculo_sob_demanda import CalculoSobDemanda
 from titulospub.core.di.calculo_di import calculo_dv01_di
-from titulospub.core.ltn.calculo_ltn import calcular_ltn
+from titulospub.core.ltn.calculo_ltn import calcular_ltn, precificar_ltn_lote
+from titulospub.core.interpolacao.funcoes_interpolacao import obter_curva_di
 from titulospub.dados.orquestrador import VariaveisMercado
+from titulospub.dados.snapshot import MarketSnapshot, get_snapshot
 from titulospub.utils import adicionar_dias_uteis
+from titulospub.utils.calendario import obter_calendario
 
-class LTN:
+class LTN(CalculoSobDemanda):
     """
     Classe para cálculo e gestão de títulos LTN (Letra do Tesouro Nacional).
     
     Esta classe encapsula todos os cálculos relacionados aos títulos LTN,
     incluindo preços, DV01, carregamento e hedge DI.
+
+    Os valores derivados são calculados no primeiro acesso e recalculados
+    apenas quando uma entrada da qual dependem é alterada.
     """
+
+    # Saídas derivadas: {saida: (método de cálculo, entradas de que depende)}
+    _DEPENDENCIAS = {
+        "precificacao": ("_precificar", ("taxa", "datas")),
+    }
     
     def __init__(self, 
                  data_vencimento_titulo: str, 
@@ -24,7 +37,7 @@ class LTN:
                  quantidade: float = 50000, 
                  cdi: float = None,  
                  feriados: list = None,
-                 variaveis_mercado: VariaveisMercado = None):
+                 variaveis_mercado: VariaveisMercado | MarketSnapshot | None = None):
         """
         Inicializa uma instância do título LTN.
         
@@ -37,12 +50,93 @@ class LTN:
             di: Taxa DI de referência
             quantidade: Quantidade de títulos
             cdi: Taxa CDI
-            feriados: Lista de feriados
-            variaveis_mercado: Instância de VariaveisMercado
+            feriados: Lista de feriados ou Calendario
+            variaveis_mercado: Instância de VariaveisMercado ou MarketSnapshot (default: snapshot do processo)
+        """
+        self._inicializar(data_vencimento_titulo, data_base, dias_liquidacao, taxa, premio, di,
+                          quantidade, cdi, feriados, variaveis_mercado)
+
+    @classmethod
+    def criar_lote(cls,
+                   vencimentos: List[str],
+                   data_base: str = None,
+                   dias_liquidacao: int = 1,
+                   taxas: Optional[List[float]] = None,
+                   quantidade: float = 50000,
+                   cdi: float = None,
+                   feriados: list = None,
+                   variaveis_mercado: VariaveisMercado | MarketSnapshot | None = None,
+                   ignorar_erros: bool = False) -> Dict[str, "LTN"]:
+        """
+        Cria vários títulos LTN precificando todos os vencimentos em uma única
+        chamada de precificar_ltn_lote.
+        
+        Args:
+            vencimentos: Datas de vencimento dos títulos
+            data_base: Data base para cálculos (default: hoje)
+            dias_liquidacao: Dias para liquidação (default: 1)
+            taxas: Taxas de cada vencimento (default: taxas ANBIMA)
+            quantidade: Quantidade de títulos de cada vencimento
+            cdi: Taxa CDI
+            feriados: Lista de feriados ou Calendario
+            variaveis_mercado: Instância de VariaveisMercado ou MarketSnapshot (default: snapshot do processo)
+            ignorar_erros: Se True, vencimentos inválidos são ignorados com aviso
+        
+        Returns:
+            Dicionário {vencimento: LTN}
         """
+        if taxas is not None and len(taxas) != len(vencimentos):
+            raise ValueError("taxas deve ter o mesmo tamanho de vencimentos")
+
+        variaveis_mercado = variaveis_mercado or get_snapshot(data_base)
+        data_base = data_base or pd.Timestamp.today().normalize()
+
+        titulos = {}
+        for i, vencimento in enumerate(vencimentos):
+            titulo = cls.__new__(cls)
+            try:
+                titulo._inicializar(vencimento, data_base, dias_liquidacao,
+                                    taxas[i] if taxas is not None else None, None, None,
+                                    quantidade, cdi, feriados, variaveis_mercado)
+            except Exception as e:
+                if not ignorar_erros:
+                    raise
+                print(f"[WARN] Erro ao carregar LTN {vencimento}: {e}")
+                continue
+            titulos[vencimento] = titulo
+
+        if not titulos:
+            return titulos
+
+        referencia = next(iter(titulos.values()))
+        res = precificar_ltn_lote(
+            data=referencia._data_base,
+            data_liquidacao=referencia._data_liquidacao,
+            vencimentos=[t._data_vencimento_titulo for t in titulos.values()],
+            taxas=[t._taxa for t in titulos.values()],
+            cdi=referencia._cdi,
+            feriados=referencia._feriados
+        )
+
+        for i, (vencimento, titulo) in enumerate(list(titulos.items())):
+            if res["dv01"][i] == 0:
+                if not ignorar_erros:
+                    raise ZeroDivisionError("DV01 nulo: vencimento coincide com a liquidação")
+                print(f"[WARN] Erro ao carregar LTN {vencimento}: DV01 nulo")
+                del titulos[vencimento]
+                continue
+            titulo._aplicar_resultado({chave: float(valores[i]) for chave, valores in res.items()})
+
+        return titulos
+
+    # ==================== CONFIGURAÇÃO PRIVADA ====================
+
+    def _inicializar(self, data_vencimento_titulo, data_base, dias_liquidacao, taxa, premio, di,
+                     quantidade, cdi, feriados, variaveis_mercado):
+        """Configura o título sem precificá-lo."""
         # Configuração inicial
-        self._vm = variaveis_mercado or VariaveisMercado()
-        self._feriados = feriados if feriados is not None else self._vm.get_feriados()
+        self._vm = variaveis_mercado or get_snapshot(data_base)
+        self._feriados = obter_calendario(feriados) if feriados is not None else self._vm.get_calendario()
         self._cdi = cdi if cdi is not None else self._vm.get_cdi()
         
         # Parâmetros de entrada
@@ -62,16 +156,6 @@ class LTN:
         
         # Configuração DI
         self._configurar_di()
-        
-        # Inicialização de atributos derivados
-        self._inicializar_atributos_derivados()
-        
-        # Cálculos iniciais
-        self._calcular()
-        self._hedge_di = self._calcular_hedge_di()
-        self._financeiro = self._quantidade * self._pu_d0
-
-    # ==================== CONFIGURAÇÃO PRIVADA ====================
     
     def _configurar_datas(self, data_vencimento_titulo: str, data_base: str, dias_liquidacao: int):
         """Configura as datas do título."""
@@ -109,17 +193,6 @@ class LTN:
         else:
             self._taxa = float(self._taxa)
     
-    def _inicializar_atributos_derivados(self):
-        """Inicializa atributos que serão calculados posteriormente."""
-        self._pu_d0 = None
-        self._pu_termo = None
-        self._pu_carregado = None
-        self._dv01 = None
-        self._carrego_brl = None
-        self._carrego_bps = None
-        self._hedge_di = None
-        self._financeiro = None
-
     # ==================== PROPRIEDADES DE ENTRADA ====================
     
     @property
@@ -129,8 +202,7 @@ class LTN:
     @taxa.setter
     def taxa(self, v):
         self._taxa = float(v)
-        self._calcular()
-        self._atualizar_hedge_e_financeiro()
+        self._invalidar("taxa")
     
     @property
     def premio(self):
@@ -141,8 +213,7 @@ class LTN:
     def premio(self, v):
         self._premio = float(v) if v is not None else None
         self._atualizar_taxa_premio_di()
-        self._calcular()
-        self._atualizar_hedge_e_financeiro()
+        self._invalidar("taxa")
 
     @property
     def di(self):
@@ -153,8 +224,7 @@ class LTN:
     def di(self, v):
         self._di = float(v) if v is not None else None
         self._atualizar_taxa_premio_di()
-        self._calcular()
-        self._atualizar_hedge_e_financeiro()
+        self._invalidar("taxa")
     
     @property
     def data_base(self):
@@ -163,8 +233,7 @@ class LTN:
     @data_base.setter
     def data_base(self, v):
         self._data_base = pd.to_datetime(v).normalize()
-        self._calcular()
-        self._atualizar_hedge_e_financeiro()
+        self._invalidar("datas")
     
     @property
     def data_liquidacao(self):
@@ -173,8 +242,7 @@ class LTN:
     @data_liquidacao.setter
     def data_liquidacao(self, v):
         self._data_liquidacao = pd.to_datetime(v).normalize()
-        self._calcular()
-        self._atualizar_hedge_e_financeiro()
+        self._invalidar("datas")
     
     @property
     def quantidade(self):
@@ -185,26 +253,10 @@ class LTN:
     def quantidade(self, v):
         if v <= 0:
             raise ValueError("Quantidade deve ser maior que zero")
-            
-        # Usa 1 como padrão para a primeira atribuição
-        quantidade_anterior = getattr(self, "_quantidade", 1)
-
-        # Ajusta valores para a unidade
-        self._dv01 = self._dv01 / quantidade_anterior
-        self._carrego_brl = self._carrego_brl / quantidade_anterior
 
-        # Atualiza a quantidade
+        # Os valores por unidade não mudam: nada é reprecificado
         self._quantidade = float(v)
-        
-        # Atualiza o financeiro baseado na nova quantidade
-        self._financeiro = self._quantidade * self._pu_d0
-
-        # Reaplica multiplicação
-        self._dv01 *= self._quantidade
-        self._carrego_brl *= self._quantidade
-        
-        # Atualiza hedge DI
-        self._hedge_di = self._calcular_hedge_di()
+        self._invalidar("quantidade")
 
     
     @property
@@ -219,50 +271,31 @@ class LTN:
                                                      n_dias=self._dias_liquidacao,
                                                      feriados=self._feriados
                                                     )
-        self._calcular()
-        self._atualizar_hedge_e_financeiro()
+        self._invalidar("datas")
 
     # -------- Propriedade financeiro --------
     @property
     def financeiro(self):
         """Valor financeiro total."""
-        return self._financeiro
+        return self._quantidade * self.pu_d0
 
     @financeiro.setter
     def financeiro(self, v):
         if v <= 0:
             raise ValueError("Financeiro deve ser maior que zero")
             
-        if self._pu_d0 == 0:
+        if self.pu_d0 == 0:
             raise ValueError("PU_D0 não pode ser zero para calcular quantidade")
-            
-        # Usa 1 como padrão para a primeira atribuição
-        quantidade_anterior = getattr(self, "_quantidade", 1)
-
-        # Ajusta valores para a unidade
-        self._dv01 = self._dv01 / quantidade_anterior
-        self._carrego_brl = self._carrego_brl / quantidade_anterior
 
         # Calcula nova quantidade baseada no financeiro
-        self._financeiro = float(v)
-        self._quantidade = round(self._financeiro / self._pu_d0, 6)
-
-        # Reaplica multiplicação
-        self._dv01 *= self._quantidade
-        self._carrego_brl *= self._quantidade
-        
-        # Atualiza hedge DI
-        self._hedge_di = self._calcular_hedge_di()
-        
-        # Recalcula tudo para garantir consistência
-        self._calcular()
-        self._atualizar_hedge_e_financeiro()
+        self._quantidade = round(float(v) / self.pu_d0, 6)
+        self._invalidar("quantidade")
 
     # ==================== MÉTODOS DE CÁLCULO ====================
     
-    def _calcular(self):
-        """Método principal de cálculo do título."""
-        res = calcular_ltn(
+    def _precificar(self) -> dict:
+        """Precifica o título (valores por unidade, ver calcular_ltn)."""
+        return calcular_ltn(
             data=self._data_base,
             data_liquidacao=self._data_liquidacao,
             data_vencimento=self._data_vencimento_titulo,
@@ -270,20 +303,10 @@ class LTN:
             cdi=self._cdi,
             feriados=self._feriados
         )
-        
-        # Armazena resultados
-        self._pu_d0 = res["pu_d0"]
-        self._pu_termo = res["pu_termo"]
-        self._pu_carregado = res["pu_carregado"]
-        self._dv01 = res["dv01"] * self._quantidade
-        self._carrego_brl = res["carrego_brl"] * self._quantidade
-        self._carrego_bps = res["carrego_bps"]
-        
-        # Atualiza financeiro
-        self._financeiro = self._quantidade * self._pu_d0
-        
-        # Calcula o hedge DI
-        self._hedge_di = self._calcular_hedge_di()
+    
+    def _aplicar_resultado(self, res: dict):
+        """Armazena os resultados de calcular_ltn (valores por unidade)."""
+        self._definir("precificacao", res)
     
     def _configurar_di(self):
         """Configura parâmetros relacionados ao DI."""
@@ -291,8 +314,8 @@ class LTN:
             data_vencimento=self._data_vencimento_titulo,
             prefixo="DI1"
         )
-        curva_di = self._vm.get_bmf()["DI"]
-        self._ajuste_di = curva_di.loc[curva_di["DI"] == self._di_ref].squeeze()["ADJ"]
+        # Ajuste do contrato ou, sem contrato no vencimento, DI interpolado
+        self._ajuste_di = obter_curva_di(self._vm, self._data_base).taxa_contrato(self._di_ref)
         self._premio_anbima = (self._anbima - self._ajuste_di) * 100
     
     def _calcular_hedge_di(self):
@@ -301,11 +324,6 @@ class LTN:
         # Exemplo: 50k LTN = 500 contratos DI, 100k LTN = 1000 contratos DI
         return int(self._quantidade / 100)
     
-    def _atualizar_hedge_e_financeiro(self):
-        """Atualiza hedge DI e financeiro após mudanças."""
-        self._hedge_di = self._calcular_hedge_di()
-        self._financeiro = self._quantidade * self._pu_d0
-    
     def _atualizar_taxa_premio_di(self):
         """Atualiza a taxa baseada em prêmio e DI quando ambos estão definidos."""
         if self._premio is not None and self._di is not None:
@@ -316,27 +334,27 @@ class LTN:
     @property
     def pu_d0(self):
         """Preço unitário à vista."""
-        return self._pu_d0
+        return self._obter("precificacao")["pu_d0"]
     @property
     def pu_termo(self):
         """Preço unitário a termo."""
-        return self._pu_termo
+        return self._obter("precificacao")["pu_termo"]
     @property
     def pu_carregado(self):
         """Preço unitário carregado."""
-        return self._pu_carregado
+        return self._obter("precificacao")["pu_carregado"]
     @property
     def dv01(self):
         """DV01 do título."""
-        return self._dv01
+        return self._obter("precificacao")["dv01"] * self._quantidade
     @property
     def carrego_brl(self):
         """Carregamento em BRL."""
-        return self._carrego_brl
+        return self._obter("precificacao")["carrego_brl"] * self._quantidade
     @property
     def carrego_bps(self):
         """Carregamento em pontos base."""
-        return self._carrego_bps
+        return self._obter("precificacao")["carrego_bps"]
     @property
     def ajuste_di(self):
         """Ajuste DI do título."""
@@ -348,7 +366,7 @@ class LTN:
     @property
     def hedge_di(self):
         """Hedge DI calculado."""
-        return self._hedge_di
+        return self._calcular_hedge_di()
     
     @property
     def taxa_anbima(self):
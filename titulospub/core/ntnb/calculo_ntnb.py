@@ -2,10 +2,13 @@ import numpy as np
 import pandas as pd
 from math import trunc
 
-from titulospub.core.ntnb.cash_flow_ntnb import cash_flow_ntnb
+from titulospub.core.auxilio import fator_carregamento, potencia_vetor, truncar_vetor
+from titulospub.core.ntnb.cash_flow_ntnb import cash_flow_ntnb, cronograma_ntnb, cotacao_ntnb_vetor, pv_cupons_vetor, somar_fluxos
 from titulospub.core.ntnb.vna_ntnb import calculo_vna_ajustado_ntnb, fator_ipca
+from titulospub.core.sensibilidade import METODO_BUMP, dv01_ntnb_vetor
 
 from titulospub.utils.datas import dias_trabalho_total, adicionar_dias_uteis
+from titulospub.utils.calendario import obter_calendario
 from titulospub.utils.carregamento_var_globais import (_carregar_feriados_se_necessario, 
                                                        _carrecar_ipca_dict_se_necessario,
                                                        _carrecar_cdi_se_necessario)
@@ -22,12 +25,8 @@ def data_vencimento_duration(data_liquidacao: pd.Timestamp, duration: float):
     return data_liquidacao + pd.Timedelta(days=duration * 365.25)
 
 def dias_uteis_duration(data_liquidacao, data_venc_duration, feriados=None):
-    feriados = _carregar_feriados_se_necessario(feriados)
-
-    data_inicio_np = np.datetime64(pd.to_datetime(data_liquidacao), 'D')
-    data_fim_np = np.datetime64(pd.to_datetime(data_venc_duration), 'D')
-    feriados_np = np.array([np.datetime64(pd.to_datetime(f), 'D') for f in feriados])
-    return np.busday_count(data_inicio_np, data_fim_np, holidays=feriados_np)
+    calendario = obter_calendario(feriados)
+    return calendario.contar_dias_uteis(pd.to_datetime(data_liquidacao), pd.to_datetime(data_venc_duration))
 
 '''
 def calculo_dv01_ntnb(duration, pu, taxa):
@@ -70,54 +69,120 @@ def calculo_taxa_pu_ntnb(vna_ajustado, cotacao):
     truncar = lambda valor, casas_decimais: trunc(valor * 10 ** casas_decimais) / 10 ** casas_decimais
     return truncar(vna_ajustado * (cotacao / 100), 6)
 
-def calculo_dv01_ntnb(data_vencimento, data_liquidacao, taxa, vna_ajustado, feriados=None):
-    feriados = _carregar_feriados_se_necessario(feriados)
-    cotacao_1 = cash_flow_ntnb(data_vencimento=data_vencimento, 
-                                data_liquidacao=data_liquidacao, 
-                                feriados=feriados, 
-                                taxa=taxa)["cotacao"]
-   
-    cotacao_2 = cash_flow_ntnb(data_vencimento=data_vencimento, 
-    data_liquidacao=data_liquidacao, 
-    feriados=feriados, 
-    taxa=taxa + 0.01)["cotacao"]
-
-    pu_1 = calculo_taxa_pu_ntnb(vna_ajustado=vna_ajustado, cotacao=cotacao_1)
-    pu_2 = calculo_taxa_pu_ntnb(vna_ajustado=vna_ajustado, cotacao=cotacao_2)
-
-    return abs(pu_1 - pu_2)   
-
-def calculo_ntnb(data, data_liquidacao, data_vencimento, taxa, cdi=None, ipca_dict=None, feriados=None):
-    feriados = _carregar_feriados_se_necessario(feriados)
+def calculo_dv01_ntnb(data_vencimento, data_liquidacao, taxa, vna_ajustado, feriados=None, metodo=METODO_BUMP):
+    # O cronograma é montado uma vez e reaproveitado para a taxa com +1bp
+    cronograma = cronograma_ntnb(data_liquidacao, [data_vencimento], feriados=feriados)
+    return float(dv01_ntnb_vetor(cronograma=cronograma, taxas=[taxa], vna_ajustado=vna_ajustado, metodo=metodo)[0])
+
+def fatores_ntnb(data, data_liquidacao, cdi=None, ipca_dict=None, feriados=None):
+    """
+    Calcula os valores que dependem apenas do par (data, data_liquidacao) e
+    são comuns a todos os vencimentos de NTN-B.
+
+    Args:
+        data: Data base
+        data_liquidacao: Data de liquidação
+        cdi: Taxa CDI (se None, carrega automaticamente)
+        ipca_dict: Dicionário com dados do IPCA (se None, carrega automaticamente)
+        feriados: Lista de feriados ou Calendario (se None, carrega automaticamente)
+
+    Returns:
+        Dicionário com vna_d0, vna_termo, fator_ipca (pró-rata do IPCA usado
+        no PU ajustado) e fator_cdi (carregamento pelo CDI)
+    """
+    calendario = obter_calendario(feriados)
     ipca_dict = _carrecar_ipca_dict_se_necessario(ipca_dict)
+    cdi = _carrecar_cdi_se_necessario(cdi)
 
-    cash_flow_d0 = cash_flow_ntnb(data_vencimento=data_vencimento, data_liquidacao=data, feriados=feriados, taxa=taxa)
-    datas_cupons_d0 = cash_flow_d0["datas_pagamento_cupons"]
-    pv_d0 = cash_flow_d0["pv_cupons"]
-    cotacao_d0 = cash_flow_d0["cotacao"]
-
-    cash_flow_termo = cash_flow_ntnb(data_vencimento=data_vencimento, data_liquidacao=data_liquidacao, feriados=feriados, taxa=taxa)
-    datas_cupons_termo = cash_flow_termo["datas_pagamento_cupons"]
-    pv_termo = cash_flow_termo["pv_cupons"]
-    cotacao_termo = cash_flow_termo["cotacao"]
-
-    vna_ajustado_d0 = calculo_vna_ajustado_ntnb(data=data, data_liquidacao=data, ipca_dict=ipca_dict, feriados=feriados, leilao=False)
-    vna_ajustado_termo = calculo_vna_ajustado_ntnb(data=data, data_liquidacao=data_liquidacao, ipca_dict=ipca_dict, feriados=feriados, leilao=False)
-
-    pu_d0 = calculo_taxa_pu_ntnb(vna_ajustado=vna_ajustado_d0, cotacao=cotacao_d0)
-    pu_termo = calculo_taxa_pu_ntnb(vna_ajustado=vna_ajustado_termo, cotacao=cotacao_termo)
-
-    duration = calculo_duration(datas_cupons_ajustadas=datas_cupons_termo, data_liquidacao=data_liquidacao, pv_fluxos=pv_termo)
-    dt_venc_duration = data_vencimento_duration(data_liquidacao=data_liquidacao, duration=duration)
-    duration_dias = dias_uteis_duration(data_liquidacao=data_liquidacao, data_venc_duration=dt_venc_duration, feriados=feriados)
+    vna_d0 = calculo_vna_ajustado_ntnb(data=data, data_liquidacao=data, ipca_dict=ipca_dict, feriados=calendario, leilao=False)
+    vna_termo = calculo_vna_ajustado_ntnb(data=data, data_liquidacao=data_liquidacao, ipca_dict=ipca_dict, feriados=calendario, leilao=False)
 
-    #dv01 = calculo_dv01_ntnb(duration=duration, pu=pu_termo, taxa=taxa)
-    dv01 = calculo_dv01_ntnb(data_vencimento=data_vencimento, data_liquidacao=data_liquidacao, taxa=taxa, vna_ajustado=vna_ajustado_termo, feriados=feriados)
+    # Mesma regra de calculo_pu_ajustado: liquidação em D0 usa o VNA de D+1
+    if dias_trabalho_total(data_inicio=data, data_fim=data_liquidacao, feriados=calendario) == 0:
+        data_aux = calendario.adicionar_dias_uteis(data_liquidacao, 1)
+        vna_ipca = calculo_vna_ajustado_ntnb(data=data, data_liquidacao=data_aux, ipca_dict=ipca_dict, feriados=calendario)
+    else:
+        vna_ipca = vna_termo
 
-    pu_carregado = cauculo_pu_carregado(data=data, data_liquidacao=data_liquidacao, pu=pu_d0, cdi=cdi, feriados=feriados)
-    pu_ajustado = calculo_pu_ajustado(data=data, data_liquidacao=data_liquidacao, taxa=taxa, pu=pu_d0, ipca_dict=ipca_dict, feriados=feriados)
+    return {
+        "vna_d0": vna_d0,
+        "vna_termo": vna_termo,
+        "fator_ipca": vna_ipca / vna_d0,
+        "fator_cdi": fator_carregamento(data=data, data_liquidacao=data_liquidacao, cdi=cdi, feriados=calendario)
+    }
 
-    carrego = calculo_carrego_ntnb(pu_carregado=pu_carregado, pu_ajustado=pu_ajustado, dv01=dv01)
+def _duration_vetor(cronograma, pv, feriados=None):
+    """Duration, data de vencimento da duration e dias úteis até ela, por vencimento."""
+    calendario = obter_calendario(feriados)
+    data_liquidacao = cronograma["data_liquidacao"]
+    n_cupons = cronograma["n_cupons"]
+
+    inicio = np.datetime64(data_liquidacao, "ns")
+    datas = np.where(cronograma["mascara"], cronograma["datas_pagamento_cupons"], inicio)
+    tempos = ((datas - inicio) // np.timedelta64(1, "D")) / 365.25
+
+    duration = somar_fluxos(tempos * pv, n_cupons) / somar_fluxos(pv, n_cupons)
+    # pd.Timedelta(days=...) arredonda os nanossegundos de forma diferente de pd.to_timedelta
+    dt_venc_duration = pd.DatetimeIndex([data_vencimento_duration(data_liquidacao=data_liquidacao, duration=d) for d in duration])
+    duration_dias = np.asarray(calendario.contar_dias_uteis(data_liquidacao, dt_venc_duration))
+
+    return duration, dt_venc_duration, duration_dias
+
+def precificar_ntnb_lote(data, data_liquidacao, vencimentos, taxas, cdi=None, ipca_dict=None, feriados=None, fatores=None):
+    """
+    Precifica vários vencimentos de NTN-B de uma vez.
+
+    VNA, fator de IPCA pró-rata e fator de carregamento pelo CDI são
+    calculados uma única vez para o par de datas (ver fatores_ntnb), e os
+    cupons de todos os vencimentos são descontados em matrizes. Os
+    resultados são idênticos aos de calculo_ntnb para cada vencimento.
+
+    Args:
+        data: Data base
+        data_liquidacao: Data de liquidação
+        vencimentos: Array de datas de vencimento
+        taxas: Array de taxas (ou uma taxa para todos os vencimentos)
+        cdi: Taxa CDI (se None, carrega automaticamente)
+        ipca_dict: Dicionário com dados do IPCA (se None, carrega automaticamente)
+        feriados: Lista de feriados ou Calendario (se None, carrega automaticamente)
+        fatores: Resultado de fatores_ntnb para o mesmo par de datas (se None, é calculado)
+
+    Returns:
+        Dicionário com arrays cotacao, pu_d0, pu_termo, pu_carregado,
+        pu_ajustado, duration, data_vencimento_duration, dias_duration,
+        dv01, carrego_brl e carrego_bps (carrego_bps é NaN quando dv01 é zero)
+    """
+    calendario = obter_calendario(feriados)
+    if fatores is None:
+        fatores = fatores_ntnb(data=data, data_liquidacao=data_liquidacao, cdi=cdi, ipca_dict=ipca_dict, feriados=calendario)
+
+    data = pd.Timestamp(data)
+    data_liquidacao = pd.Timestamp(data_liquidacao)
+
+    vencimentos = pd.to_datetime(vencimentos)
+    taxas = np.broadcast_to(np.asarray(taxas, dtype=np.float64), vencimentos.shape)
+
+    cronograma_d0 = cronograma_ntnb(data, vencimentos, feriados=calendario)
+    cronograma_termo = cronograma_ntnb(data_liquidacao, vencimentos, feriados=calendario)
+    if (cronograma_termo["n_cupons"] == 0).any():
+        raise ValueError("Vencimento anterior à data de liquidação")
+
+    cotacao_d0 = cotacao_ntnb_vetor(cronograma_d0, taxas)
+    pv_termo = pv_cupons_vetor(cronograma_termo, taxas)
+    cotacao_termo = truncar_vetor(somar_fluxos(pv_termo, cronograma_termo["n_cupons"]), 4)
+
+    pu_d0 = truncar_vetor(fatores["vna_d0"] * (cotacao_d0 / 100), 6)
+    pu_termo = truncar_vetor(fatores["vna_termo"] * (cotacao_termo / 100), 6)
+    dv01 = dv01_ntnb_vetor(cronograma=cronograma_termo, taxas=taxas, vna_ajustado=fatores["vna_termo"])
+
+    duration, dt_venc_duration, duration_dias = _duration_vetor(cronograma_termo, pv_termo, calendario)
+
+    pu_carregado = truncar_vetor(fatores["fator_cdi"] * pu_d0, 6)
+    pu_ajustado = truncar_vetor(pu_d0 * potencia_vetor(1 + taxas / 100, 1 / 252) * fatores["fator_ipca"], 6)
+
+    carrego_brl = pu_ajustado - pu_carregado
+    with np.errstate(divide="ignore", invalid="ignore"):
+        carrego_bps = np.where(dv01 != 0, carrego_brl / dv01, np.nan)
 
     return {
         "cotacao": cotacao_termo,
@@ -126,10 +191,41 @@ def calculo_ntnb(data, data_liquidacao, data_vencimento, taxa, cdi=None, ipca_di
         "pu_carregado": pu_carregado,
         "pu_ajustado": pu_ajustado,
         "duration": duration,
-        "data_vencimento_duaration": dt_venc_duration,
+        "data_vencimento_duration": dt_venc_duration,
         "dias_duration": duration_dias,
         "dv01": dv01,
-        "carrego": carrego
+        "carrego_brl": carrego_brl,
+        "carrego_bps": carrego_bps
+    }
+
+def calculo_ntnb(data, data_liquidacao, data_vencimento, taxa, cdi=None, ipca_dict=None, feriados=None, fatores=None):
+    res = precificar_ntnb_lote(data=data,
+                               data_liquidacao=data_liquidacao,
+                               vencimentos=[data_vencimento],
+                               taxas=[taxa],
+                               cdi=cdi,
+                               ipca_dict=ipca_dict,
+                               feriados=feriados,
+                               fatores=fatores)
+
+    if res["dv01"][0] == 0:
+        raise ZeroDivisionError("DV01 nulo: vencimento coincide com a liquidação")
+
+    return _resultado_ntnb(res, 0)
+
+def _resultado_ntnb(res, i):
+    """Extrai o resultado do i-ésimo vencimento de precificar_ntnb_lote no formato de calculo_ntnb."""
+    return {
+        "cotacao": float(res["cotacao"][i]),
+        "pu_d0": float(res["pu_d0"][i]),
+        "pu_termo": float(res["pu_termo"][i]),
+        "pu_carregado": float(res["pu_carregado"][i]),
+        "pu_ajustado": float(res["pu_ajustado"][i]),
+        "duration": float(res["duration"][i]),
+        "data_vencimento_duaration": res["data_vencimento_duration"][i],
+        "dias_duration": int(res["dias_duration"][i]),
+        "dv01": float(res["dv01"][i]),
+        "carrego": (float(res["carrego_brl"][i]), float(res["carrego_bps"][i]))
     }
 
 
@@ -2,8 +2,10 @@ import pandas as pd
 import numpy as np
 from math import trunc
 
+from titulospub.core.auxilio import truncar_vetor
 from titulospub.utils.carregamento_var_globais import _carregar_feriados_se_necessario
-from titulospub.utils.datas import datas_pagamento_cupons
+from titulospub.utils.datas import datas_pagamento_cupons, matriz_datas_cupons
+from titulospub.utils.calendario import obter_calendario
 '''
 def datas_pagamento_cupons(data_vencimento, data_liquidacao, frequencia=2, feriados=None):
     """
@@ -35,14 +37,10 @@ def calcular_pv_cupons(datas_cupons_ajustadas, data_liquidacao, feriados, taxa,
     """
     Calcula o valor presente (PV) dos cupons.
     """
-    feriados = _carregar_feriados_se_necessario(feriados)
+    calendario = obter_calendario(feriados)
 
     cupons = fv_cupons(datas_cupons_ajustadas, taxa_cupom=taxa_cupom)
-    data_inicio = np.datetime64(data_liquidacao.strftime('%Y-%m-%d'))
-    datas_cupons_np = np.array([np.datetime64(d.strftime('%Y-%m-%d')) for d in datas_cupons_ajustadas])
-    feriados_np = pd.to_datetime(feriados).to_numpy(dtype='datetime64[D]') if feriados is not None else None
-
-    dias_uteis = np.busday_count(data_inicio, datas_cupons_np.astype('datetime64[D]'), holidays=feriados_np)
+    dias_uteis = calendario.contar_dias_uteis(pd.Timestamp(data_liquidacao), pd.to_datetime(datas_cupons_ajustadas))
     anos = dias_uteis / 252
     fator_desconto = (1 + taxa / 100) ** anos
     pv = cupons / fator_desconto
@@ -72,6 +70,64 @@ def cash_flow_ntnb(data_vencimento, data_liquidacao, taxa, feriados=None, taxa_c
 
 
 
+def cronograma_ntnb(data_liquidacao, vencimentos, feriados=None, taxa_cupom=6, frequencia=2):
+    """
+    Monta o cronograma de cupons de vários vencimentos de NTN-B em matrizes
+    preenchidas (uma linha por vencimento, uma coluna por cupom).
+
+    As posições vazias têm fluxo e dias iguais a zero.
+    """
+    calendario = obter_calendario(feriados)
+    data_liquidacao = pd.Timestamp(data_liquidacao)
+    datas, mascara, n_cupons = matriz_datas_cupons(data_liquidacao, vencimentos, frequencia=frequencia, feriados=calendario)
+
+    dias_uteis = np.zeros(datas.shape, dtype=np.int64)
+    dias_uteis[mascara] = calendario.contar_dias_uteis(data_liquidacao, pd.DatetimeIndex(datas[mascara]))
+
+    valor_cupom = round(((1 + taxa_cupom / 100) ** (taxa_cupom / 12) - 1) * 100, 6)
+    fv = np.where(mascara, valor_cupom, 0.0)
+    linhas = np.flatnonzero(n_cupons > 0)
+    fv[linhas, n_cupons[linhas] - 1] += 100
+
+    return {
+        'data_liquidacao': data_liquidacao,
+        'datas_pagamento_cupons': datas,
+        'dias_uteis': dias_uteis,
+        'fv_cupons': fv,
+        'mascara': mascara,
+        'n_cupons': n_cupons
+    }
+
+
+def pv_cupons_vetor(cronograma, taxas):
+    """
+    Valor presente de todos os cupons do cronograma, para taxas com shape
+    (..., n_vencimentos). Retorna uma matriz (..., n_vencimentos, n_cupons).
+    """
+    taxas = np.asarray(taxas, dtype=np.float64)[..., None]
+    return cronograma['fv_cupons'] / (1 + taxas / 100) ** (cronograma['dias_uteis'] / 252)
+
+
+def somar_fluxos(valores, n_cupons):
+    """
+    Soma cada linha de uma matriz de fluxos considerando apenas os seus
+    n_cupons primeiros elementos, exatamente como np.sum no array do
+    vencimento isolado.
+    """
+    soma = np.zeros(valores.shape[:-1])
+    for n in np.unique(n_cupons):
+        linhas = n_cupons == n
+        soma[..., linhas] = np.sum(valores[..., linhas, :n], axis=-1)
+    return soma
+
+
+def cotacao_ntnb_vetor(cronograma, taxas):
+    """
+    Cotação (truncada em 4 casas) de todos os vencimentos do cronograma.
+    """
+    return truncar_vetor(somar_fluxos(pv_cupons_vetor(cronograma, taxas), cronograma['n_cupons']), 4)
+
+
 if __name__ == "__main__":
     # Exemplo de uso
     data_vencimento = pd.Timestamp('2028-08-15')
@@ -1,22 +1,39 @@
 import pandas as pd
-from typing import Optional
+from typing import Dict, List, Optional
 
 from titulospub.core.auxilio import vencimento_codigo_bmf
+from titulospub.core.calculo_sob_demanda import CalculoSobDemanda
 from titulospub.core.dap.calculo_dap import calculo_financeiro_dap, dv01_dap
-from titulospub.core.di.calculo_di import calculo_dv01_di
-from titulospub.core.ntnb.calculo_ntnb import calculo_ntnb, calculo_taxa_pu_ntnb
+from titulospub.core.di.curva_di import obter_curva_contratos_di
+from titulospub.core.interpolacao.funcoes_interpolacao import obter_curva_dap, obter_curva_di
+from titulospub.core.ntnb.calculo_ntnb import _resultado_ntnb, calculo_ntnb, calculo_taxa_pu_ntnb, fatores_ntnb, precificar_ntnb_lote
 from titulospub.core.ntnb.cash_flow_ntnb import cash_flow_ntnb
 from titulospub.core.ntnb.vna_ntnb import calculo_vna_ajustado_ntnb
 from titulospub.dados.orquestrador import VariaveisMercado
+from titulospub.dados.snapshot import MarketSnapshot, get_snapshot
 from titulospub.utils.datas import adicionar_dias_uteis
+from titulospub.utils.calendario import obter_calendario
 
-class NTNB:
+class NTNB(CalculoSobDemanda):
     """
     Classe para cálculo e gestão de títulos NTN-B (Nota do Tesouro Nacional - Série B).
     
     Esta classe encapsula todos os cálculos relacionados aos títulos NTN-B,
     incluindo preços, DV01, carregamento e hedge DAP.
+
+    Os valores derivados são calculados no primeiro acesso e recalculados
+    apenas quando uma entrada da qual dependem é alterada. VNAs e fatores
+    de IPCA/CDI dependem só das datas: mudar a taxa não os recalcula.
     """
+
+    # Saídas derivadas: {saida: (método de cálculo, entradas de que depende)}
+    _DEPENDENCIAS = {
+        "vnas": ("_calcular_vnas", ("datas",)),
+        "fatores": ("_calcular_fatores", ("datas",)),
+        "precificacao": ("_precificar", ("taxa", "datas")),
+        "dv01_dap": ("_calcular_dv01_dap", ("datas",)),
+        "financeiro": ("_calcular_financeiro", ("taxa", "datas", "quantidade")),
+    }
     
     def __init__(self, data_vencimento_titulo: str, 
                        data_base: str=None, 
@@ -27,7 +44,7 @@ class NTNB:
                        cdi: float=None, 
                        ipca_dict: dict=None, 
                        feriados: list=None,
-                       variaveis_mercado: VariaveisMercado | None = None):
+                       variaveis_mercado: VariaveisMercado | MarketSnapshot | None = None):
         """
         Inicializa uma instância do título NTN-B.
         
@@ -40,12 +57,105 @@ class NTNB:
             quantidade: Quantidade de títulos
             cdi: Taxa CDI
             ipca_dict: Dicionário com dados do IPCA
-            feriados: Lista de feriados
-            variaveis_mercado: Instância de VariaveisMercado
+            feriados: Lista de feriados ou Calendario
+            variaveis_mercado: Instância de VariaveisMercado ou MarketSnapshot (default: snapshot do processo)
+        """
+        self._inicializar(data_vencimento_titulo, data_base, dias_liquidacao, taxa, premio,
+                          quantidade, cdi, ipca_dict, feriados, variaveis_mercado)
+
+    @classmethod
+    def criar_lote(cls,
+                   vencimentos: List[str],
+                   data_base: str = None,
+                   dias_liquidacao: int = 1,
+                   taxas: Optional[List[float]] = None,
+                   quantidade: float = 10000,
+                   cdi: float = None,
+                   ipca_dict: dict = None,
+                   feriados: list = None,
+                   variaveis_mercado: VariaveisMercado | MarketSnapshot | None = None,
+                   ignorar_erros: bool = False) -> Dict[str, "NTNB"]:
+        """
+        Cria vários títulos NTN-B precificando todos os vencimentos em uma única
+        chamada de precificar_ntnb_lote. Os VNAs e os fatores de IPCA/CDI são
+        calculados uma única vez e compartilhados entre os títulos.
+        
+        Args:
+            vencimentos: Datas de vencimento dos títulos
+            data_base: Data base para cálculos (default: hoje)
+            dias_liquidacao: Dias para liquidação (default: 1)
+            taxas: Taxas de cada vencimento (default: taxas ANBIMA)
+            quantidade: Quantidade de títulos de cada vencimento
+            cdi: Taxa CDI
+            ipca_dict: Dicionário com dados do IPCA
+            feriados: Lista de feriados ou Calendario
+            variaveis_mercado: Instância de VariaveisMercado ou MarketSnapshot (default: snapshot do processo)
+            ignorar_erros: Se True, vencimentos inválidos são ignorados com aviso
+        
+        Returns:
+            Dicionário {vencimento: NTNB}
         """
+        if taxas is not None and len(taxas) != len(vencimentos):
+            raise ValueError("taxas deve ter o mesmo tamanho de vencimentos")
+
+        variaveis_mercado = variaveis_mercado or get_snapshot(data_base)
+        data_base = data_base or pd.Timestamp.today().normalize()
+
+        titulos = {}
+        vnas = None
+        for i, vencimento in enumerate(vencimentos):
+            titulo = cls.__new__(cls)
+            try:
+                titulo._inicializar(vencimento, data_base, dias_liquidacao,
+                                    taxas[i] if taxas is not None else None, None,
+                                    quantidade, cdi, ipca_dict, feriados, variaveis_mercado, vnas)
+                if titulo._data_vencimento_titulo < titulo._data_liquidacao:
+                    raise ValueError(f"Vencimento {titulo._data_vencimento_titulo.date()} anterior à data de liquidação.")
+            except Exception as e:
+                if not ignorar_erros:
+                    raise
+                print(f"[WARN] Erro ao carregar NTNB {vencimento}: {e}")
+                continue
+            if vnas is None:
+                vnas = titulo._obter("vnas")
+            titulos[vencimento] = titulo
+
+        if not titulos:
+            return titulos
+
+        referencia = next(iter(titulos.values()))
+        fatores = referencia._obter("fatores")
+        res = precificar_ntnb_lote(
+            data=referencia._data_base,
+            data_liquidacao=referencia._data_liquidacao,
+            vencimentos=[t._data_vencimento_titulo for t in titulos.values()],
+            taxas=[t._taxa for t in titulos.values()],
+            cdi=referencia._cdi,
+            ipca_dict=referencia._ipca_dict,
+            feriados=referencia._feriados,
+            fatores=fatores
+        )
+
+        for i, (vencimento, titulo) in enumerate(list(titulos.items())):
+            if res["dv01"][i] == 0:
+                if not ignorar_erros:
+                    raise ZeroDivisionError("DV01 nulo: vencimento coincide com a liquidação")
+                print(f"[WARN] Erro ao carregar NTNB {vencimento}: DV01 nulo")
+                del titulos[vencimento]
+                continue
+            titulo._definir("fatores", fatores)
+            titulo._aplicar_resultado(_resultado_ntnb(res, i))
+
+        return titulos
+
+    # ==================== CONFIGURAÇÃO PRIVADA ====================
+
+    def _inicializar(self, data_vencimento_titulo, data_base, dias_liquidacao, taxa, premio,
+                     quantidade, cdi, ipca_dict, feriados, variaveis_mercado, vnas=None):
+        """Configura o título sem precificá-lo (vnas: VNAs já calculados para as mesmas datas)."""
         # Configuração inicial
-        self._vm = variaveis_mercado or VariaveisMercado()
-        self._feriados = feriados if feriados is not None else self._vm.get_feriados()
+        self._vm = variaveis_mercado or get_snapshot(data_base)
+        self._feriados = obter_calendario(feriados) if feriados is not None else self._vm.get_calendario()
         self._ipca_dict = ipca_dict if ipca_dict is not None else self._vm.get_ipca_dict()
         self._cdi = cdi if cdi is not None else self._vm.get_cdi()
         
@@ -58,22 +168,13 @@ class NTNB:
         self._configurar_datas(data_vencimento_titulo, data_base, dias_liquidacao)
         
         # Configuração do título
-        self._configurar_titulo()
+        self._configurar_titulo(vnas)
         
         # Configuração DAP (deve vir antes da taxa para ter acesso ao ajuste_dap)
         self._configurar_dap()
         
         # Configuração da taxa (depois do DAP para poder usar ajuste_dap)
         self._configurar_taxa()
-        
-        # Inicialização de atributos derivados
-        self._inicializar_atributos_derivados()
-        
-        # Cálculos iniciais
-        self._calcular()
-        self._financeiro = self._quantidade * self._pu_termo
-
-    # ==================== CONFIGURAÇÃO PRIVADA ====================
     
     def _configurar_datas(self, data_vencimento_titulo: str, data_base: str, dias_liquidacao: int):
         """Configura as datas do título."""
@@ -88,7 +189,7 @@ class NTNB:
             feriados=self._feriados
         )
     
-    def _configurar_titulo(self):
+    def _configurar_titulo(self, vnas=None):
         """Configura informações básicas do título."""
         self._nome = f"NTNB {self._data_vencimento_titulo.year}"
         
@@ -100,7 +201,8 @@ class NTNB:
             raise ValueError(f"Vencimento {self._data_vencimento_titulo.date()} não encontrado na ANBIMA.")
         
         self._anbima = linha.squeeze()["ANBIMA"]
-        self._atualizar_vna()
+        if vnas is not None:
+            self._definir("vnas", vnas)
     
     def _configurar_taxa(self):
         """Configura a taxa do título baseada nos parâmetros fornecidos."""
@@ -121,46 +223,41 @@ class NTNB:
             data_vencimento=self._data_vencimento_titulo,
             prefixo="DAP"
         )
-        curva_dap = self._vm.get_bmf()["DAP"]
-        serie_adj = curva_dap.loc[curva_dap["DAP"] == self._dap_ref, "ADJ"]
-        if serie_adj.empty:
-            # DAP não disponível para este vencimento - define como None
+        # Ajuste do contrato ou, sem contrato no vencimento, DAP interpolado
+        self._ajuste_dap = obter_curva_dap(self._vm, self._data_base).taxa_contrato(self._dap_ref)
+        if self._ajuste_dap is None:
+            # Curva DAP sem vértices - define como None
             print(f"[WARN] Ajuste DAP não encontrado para {self._dap_ref}. Título será criado sem dados de DAP.")
-            self._ajuste_dap = None
             self._premio_anbima_dap = None
         else:
-            self._ajuste_dap = float(serie_adj.iloc[0])
             self._premio_anbima_dap = (self._anbima - self._ajuste_dap) * 100
     
-    def _inicializar_atributos_derivados(self):
-        """Inicializa atributos que serão calculados posteriormente."""
-        self._cotacao = None
-        self._pu_d0 = None
-        self._pu_termo = None
-        self._pu_carregado = None
-        self._pu_ajustado = None
-        self._duration = None
-        self._data_vencimento_duration = None
-        self._dias_duration = None
-        self._dv01 = None
-        self._carrego_brl = None
-        self._carrego_bps = None
-        self._hedge_dap = None
-        self._financeiro = None
-        self._vna = None
-        self._vna_tesouro = None
-    
-    def _atualizar_vna(self):
-        """Atualiza os valores de VNA."""
-        self._vna = calculo_vna_ajustado_ntnb(
+    def _calcular_vnas(self) -> tuple:
+        """Calcula o VNA ajustado e o VNA do Tesouro (leilão) para as datas do título."""
+        vna = calculo_vna_ajustado_ntnb(
             data=self._data_base,
-            data_liquidacao=self._data_liquidacao
+            data_liquidacao=self._data_liquidacao,
+            ipca_dict=self._ipca_dict,
+            feriados=self._feriados
         )
-        self._vna_tesouro = calculo_vna_ajustado_ntnb(
+        vna_tesouro = calculo_vna_ajustado_ntnb(
             data=self._data_base,
             data_liquidacao=self._data_liquidacao,
+            ipca_dict=self._ipca_dict,
+            feriados=self._feriados,
             leilao=True
         )
+        return vna, vna_tesouro
+
+    def _calcular_fatores(self) -> dict:
+        """Calcula VNAs e fatores de IPCA/CDI usados na precificação (ver fatores_ntnb)."""
+        return fatores_ntnb(
+            data=self._data_base,
+            data_liquidacao=self._data_liquidacao,
+            cdi=self._cdi,
+            ipca_dict=self._ipca_dict,
+            feriados=self._feriados
+        )
 
     # ==================== PROPRIEDADES DE ENTRADA ====================
     
@@ -172,8 +269,7 @@ class NTNB:
     @taxa.setter
     def taxa(self, v):
         self._taxa = float(v)
-        self._calcular()
-        self._atualizar_hedge_e_financeiro()
+        self._invalidar("taxa")
     
     @property
     def premio(self):
@@ -184,8 +280,7 @@ class NTNB:
     def premio(self, v):
         self._premio = float(v) if v is not None else None
         self._atualizar_taxa_premio_dap()
-        self._calcular()
-        self._atualizar_hedge_e_financeiro()
+        self._invalidar("taxa")
     
     @property
     def data_base(self):
@@ -195,9 +290,7 @@ class NTNB:
     @data_base.setter
     def data_base(self, v):
         self._data_base = pd.to_datetime(v).normalize()
-        self._atualizar_vna()
-        self._calcular()
-        self._atualizar_hedge_e_financeiro()
+        self._invalidar("datas")
     
     @property
     def data_liquidacao(self):
@@ -207,9 +300,7 @@ class NTNB:
     @data_liquidacao.setter
     def data_liquidacao(self, v):
         self._data_liquidacao = pd.to_datetime(v).normalize()
-        self._atualizar_vna()
-        self._calcular()
-        self._atualizar_hedge_e_financeiro()
+        self._invalidar("datas")
     
     @property
     def quantidade(self):
@@ -220,22 +311,27 @@ class NTNB:
     def quantidade(self, v):
         if v <= 0:
             raise ValueError("Quantidade deve ser maior que zero")
-        self._ajustar_valores_para_quantidade(v)
-        self._hedge_dap = self._calcular_hedge_dap()
+
+        # Os valores por unidade não mudam: nada é reprecificado
+        self._quantidade = float(v)
+        self._invalidar("quantidade")
 
     @property
     def financeiro(self):
         """Valor financeiro total."""
-        return self._financeiro
+        return self._obter("financeiro")
 
     @financeiro.setter
     def financeiro(self, v):
         if v <= 0:
             raise ValueError("Financeiro deve ser maior que zero")
-        if self._pu_termo == 0:
+        if self.pu_termo == 0:
             raise ValueError("PU_termo não pode ser zero para calcular quantidade")
-        self._ajustar_valores_para_financeiro(v)
-        self._hedge_dap = self._calcular_hedge_dap()
+
+        # Calcula nova quantidade baseada no financeiro
+        self._quantidade = round(float(v) / self.pu_termo, 6)
+        self._invalidar("quantidade")
+        self._definir("financeiro", float(v))
     
     @property
     def dias_liquidacao(self) -> int:
@@ -250,59 +346,47 @@ class NTNB:
             n_dias=self._dias_liquidacao,
             feriados=self._feriados
         )
-        self._atualizar_vna()
-        self._calcular()
-        self._atualizar_hedge_e_financeiro()
+        self._invalidar("datas")
 
     # ==================== MÉTODOS DE CÁLCULO ====================
     
-    def _calcular(self):
-        """Método principal de cálculo do título."""
-        res = calculo_ntnb(
+    def _precificar(self) -> dict:
+        """Precifica o título (valores por unidade, ver calculo_ntnb)."""
+        return calculo_ntnb(
             data=self._data_base,
             data_liquidacao=self._data_liquidacao,
             data_vencimento=self._data_vencimento_titulo,
             taxa=self._taxa,
             cdi=self._cdi,
             ipca_dict=self._ipca_dict,
-            feriados=self._feriados
+            feriados=self._feriados,
+            fatores=self._obter("fatores")
         )
-        
-        # Armazena resultados
-        self._cotacao = res["cotacao"]
-        self._pu_d0 = res["pu_d0"]
-        self._pu_termo = res["pu_termo"]
-        self._pu_carregado = res["pu_carregado"]
-        self._pu_ajustado = res["pu_ajustado"]
-        self._duration = res["duration"]
-        self._data_vencimento_duration = res["data_vencimento_duaration"]
-        self._dias_duration = res["dias_duration"]
-        self._dv01 = res["dv01"] * self._quantidade
-        self._carrego_brl = res["carrego"][0] * self._quantidade
-        self._carrego_bps = res["carrego"][1]
-        
-        # Atualiza financeiro
-        self._financeiro = self._quantidade * self._pu_termo
-        
-        # Calcula o hedge DAP
-        self._hedge_dap = self._calcular_hedge_dap()
     
-    def _calcular_hedge_dap(self) -> Optional[int]:
-        """Calcula o hedge DAP para o título NTNB."""
-        if self._ajuste_dap is None:
-            return None
-        dv_dap = dv01_dap(
+    def _aplicar_resultado(self, res: dict):
+        """Armazena os resultados de calculo_ntnb (valores por unidade)."""
+        self._definir("precificacao", res)
+    
+    def _calcular_financeiro(self) -> float:
+        """Financeiro da posição pelo PU a termo."""
+        return self._quantidade * self.pu_termo
+    
+    def _calcular_dv01_dap(self) -> float:
+        """DV01 do contrato DAP de referência na data de liquidação."""
+        return dv01_dap(
             taxa=self._ajuste_dap,
             codigo=self._dap_ref,
             data_liquidacao=self._data_liquidacao,
-            feriados=self._feriados
+            feriados=self._feriados,
+            ipca_dict=self._ipca_dict,
+            data_referencia=self._vm.data_referencia
         )
-        return int(self._dv01 / dv_dap)
     
-    def _atualizar_hedge_e_financeiro(self):
-        """Atualiza hedge DAP e financeiro após mudanças."""
-        self._hedge_dap = self._calcular_hedge_dap()
-        self._financeiro = self._quantidade * self._pu_termo
+    def _calcular_hedge_dap(self) -> Optional[int]:
+        """Calcula o hedge DAP para o título NTNB."""
+        if self._ajuste_dap is None:
+            return None
+        return int(self.dv01 / self._obter("dv01_dap"))
     
     def _atualizar_taxa_premio_dap(self):
         """Atualiza a taxa baseada em prêmio quando está definido."""
@@ -311,111 +395,97 @@ class NTNB:
                 raise ValueError(f"Não é possível calcular taxa a partir de prêmio DAP: ajuste DAP não disponível para {self._dap_ref}.")
             self._taxa = float(self._ajuste_dap + self._premio / 100)
     
-    def _ajustar_valores_para_quantidade(self, nova_quantidade):
-        """Ajusta valores quando a quantidade é alterada."""
-        quantidade_anterior = getattr(self, "_quantidade", 1)
-        
-        # Normaliza valores para unidade
-        self._dv01 = self._dv01 / quantidade_anterior
-        self._carrego_brl = self._carrego_brl / quantidade_anterior
-        
-        # Atualiza quantidade
-        self._quantidade = float(nova_quantidade)
-        
-        # Reaplica multiplicação
-        self._dv01 *= self._quantidade
-        self._carrego_brl *= self._quantidade
-        self._financeiro = self._quantidade * self._pu_termo
-    
-    def _ajustar_valores_para_financeiro(self, novo_financeiro):
-        """Ajusta valores quando o financeiro é alterado."""
-        quantidade_anterior = getattr(self, "_quantidade", 1)
-        
-        # Normaliza valores para unidade
-        self._dv01 = self._dv01 / quantidade_anterior
-        self._carrego_brl = self._carrego_brl / quantidade_anterior
-        
-        # Calcula nova quantidade
-        self._financeiro = float(novo_financeiro)
-        self._quantidade = round(self._financeiro / self._pu_termo, 6)
-        
-        # Reaplica multiplicação
-        self._dv01 *= self._quantidade
-        self._carrego_brl *= self._quantidade
-    
     def calcular_hedge_di(self, codigo_di: str) -> int:
         """Calcula o hedge DI para um código DI informado (ex.: "DI1F32").
-        Usa a DV01 do título atual e a DV01 do contrato DI especificado.
+        Usa a DV01 do título atual e a DV01 do contrato DI especificado
+        (com o DI interpolado na curva se o contrato não tiver ajuste).
         """
-        curva_di = self._vm.get_bmf()["DI"]
-        serie_adj = curva_di.loc[curva_di["DI"] == codigo_di, "ADJ"]
-        if serie_adj.empty:
-            raise ValueError(f"Ajuste DI não encontrado para {codigo_di}.")
-        ajuste_di = float(serie_adj.iloc[0])
-        dv_di = calculo_dv01_di(taxa=ajuste_di, codigo=codigo_di)
-        return int(self._dv01 / dv_di)
+        ajuste_di = obter_curva_di(self._vm, self._data_base).taxa_contrato(codigo_di)
+        dv_di = obter_curva_contratos_di(self._vm, self._data_base).dv01_contrato(codigo_di, ajuste_di)
+        return int(self.dv01 / dv_di)
     
     def pu_vna_manual(self, vna: float=None, taxa: float=None):
         """Calcula PU usando VNA manual e taxa opcional."""
         if vna is None:
-            vna = self._vna_tesouro
+            vna = self.vna_tesouro
 
         if taxa is not None:
             cot = cash_flow_ntnb(
                 data_vencimento=self._data_vencimento_titulo, 
                 data_liquidacao=self._data_liquidacao, 
-                taxa=taxa
+                taxa=taxa,
+                feriados=self._feriados
             )["cotacao"]
             return calculo_taxa_pu_ntnb(vna_ajustado=vna, cotacao=cot)
 
-        return calculo_taxa_pu_ntnb(vna_ajustado=vna, cotacao=self._cotacao)
+        return calculo_taxa_pu_ntnb(vna_ajustado=vna, cotacao=self.cotacao)
 
     # ==================== PROPRIEDADES SOMENTE LEITURA ====================
 
     @property
     def cotacao(self):
         """Cotação do título."""
-        return self._cotacao
+        return self._obter("precificacao")["cotacao"]
     
     @property
     def pu_d0(self):
         """Preço unitário à vista."""
-        return self._pu_d0
+        return self._obter("precificacao")["pu_d0"]
     
     @property
     def pu_termo(self):
         """Preço unitário a termo."""
-        return self._pu_termo
+        return self._obter("precificacao")["pu_termo"]
     
     @property
     def pu_carregado(self):
         """Preço unitário carregado."""
-        return self._pu_carregado
+        return self._obter("precificacao")["pu_carregado"]
     
     @property
     def pu_ajustado(self):
         """Preço unitário ajustado."""
-        return self._pu_ajustado
+        return self._obter("precificacao")["pu_ajustado"]
     
     @property
     def duration(self):
         """Duration do título."""
-        return self._duration
+        return self._obter("precificacao")["duration"]
+    
+    @property
+    def data_vencimento_duration(self):
+        """Data correspondente à duration a partir da liquidação."""
+        return self._obter("precificacao")["data_vencimento_duaration"]
+    
+    @property
+    def dias_duration(self):
+        """Dias úteis entre a liquidação e a data da duration."""
+        return self._obter("precificacao")["dias_duration"]
     
     @property
     def dv01(self):
         """DV01 do título."""
-        return self._dv01
+        return self._obter("precificacao")["dv01"] * self._quantidade
     
     @property
     def carrego_brl(self):
         """Carregamento em BRL."""
-        return self._carrego_brl
+        return self._obter("precificacao")["carrego"][0] * self._quantidade
     
     @property
     def carrego_bps(self):
         """Carregamento em pontos base."""
-        return self._carrego_bps
+        return self._obter("precificacao")["carrego"][1]
+    
+    @property
+    def vna(self):
+        """VNA ajustado na data de liquidação."""
+        return self._obter("vnas")[0]
+    
+    @property
+    def vna_tesouro(self):
+        """VNA do Tesouro (leilão) na data de liquidação."""
+        return self._obter("vnas")[1]
     
     @property
     def ajuste_dap(self):
@@ -430,7 +500,7 @@ class NTNB:
     @property
     def hedge_dap(self):
         """Hedge DAP calculado."""
-        return self._hedge_dap
+        return self._calcular_hedge_dap()
     
     @property
     def taxa_anbima(self):
@@ -1,44 +1,46 @@
+import numpy as np
 import pandas as pd
-from math import trunc
 
-from titulospub.core.ntnf.cash_flow_ntnf import f_v_ntnf, cotacao_ntnf
-from titulospub.core.auxilio import calculo_pu_carregado
-from titulospub.utils import (datas_pagamento_cupons, 
-                              listar_dias_entre_datas,
-                              _carregar_feriados_se_necessario, 
-                              _carrecar_cdi_se_necessario,
-                              adicionar_dias_uteis)
+from titulospub.core.ntnf.cash_flow_ntnf import cronograma_ntnf, cotacao_ntnf_vetor
+from titulospub.core.auxilio import fator_carregamento, truncar_vetor
+from titulospub.core.sensibilidade import METODO_BUMP, dv01_ntnf_vetor
+from titulospub.utils import _carrecar_cdi_se_necessario
+from titulospub.utils.calendario import obter_calendario
+
+def pu_ntnf_vetor(data_liquidacao: pd.Timestamp, vencimentos, taxas, feriados: list=None) -> np.ndarray:
+    """
+    PU (truncado em 6 casas) de vários vencimentos de NTN-F em uma única
+    passada vetorizada.
+
+    Args:
+        data_liquidacao: Data de liquidação
+        vencimentos: Array de datas de vencimento
+        taxas: Taxas por vencimento, com shape (..., n_vencimentos)
+        feriados: Lista de feriados ou Calendario (se None, carrega automaticamente)
+
+    Returns:
+        Array de PUs com o shape de taxas
+    """
+    cronograma = cronograma_ntnf(data_liquidacao=data_liquidacao, vencimentos=vencimentos, feriados=feriados)
+    return _pu_cronograma(cronograma, taxas)
+
+def _pu_cronograma(cronograma: dict, taxas) -> np.ndarray:
+    """PU da NTN-F a partir de um cronograma já montado."""
+    cot = cotacao_ntnf_vetor(fv=cronograma["fv"], dias=cronograma["dias"], taxas=taxas)
+    return truncar_vetor(cot * 10, 6)
 
 def taxa_pu_ntnf(data_liquidacao: pd.Timestamp, data_vencimento: pd.Timestamp, taxa:float, feriados: pd.Series=None):
 
-    feriados = _carregar_feriados_se_necessario(feriados)
-    
-    datas_cupons = datas_pagamento_cupons(data_vencimento=data_vencimento, data_liquidacao=data_liquidacao, feriados=feriados)
-    
+    return float(pu_ntnf_vetor(data_liquidacao=data_liquidacao,
+                               vencimentos=[data_vencimento],
+                               taxas=[taxa],
+                               feriados=feriados)[0])
 
-    dias = listar_dias_entre_datas(data_liquidacao=data_liquidacao, datas=datas_cupons, feriados=feriados)
-    fv = f_v_ntnf(datas_cupons)
-    cot = cotacao_ntnf(fv=fv, dias_entre_datas=dias, taxa=taxa)
+def calculo_dv01_ntnf(data_liquidacao: pd.Timestamp, data_vencimento: pd.Timestamp, taxa:float, feriados: pd.Series=None, metodo: str=METODO_BUMP):
+    cronograma = cronograma_ntnf(data_liquidacao=data_liquidacao, vencimentos=[data_vencimento], feriados=feriados)
 
-    #Funcao de truncamento
-    truncar = lambda valor, casas_decimais: trunc(valor * 10 ** casas_decimais) / 10 ** casas_decimais
-
-    return truncar(cot * 10, 6)
-
-def calculo_dv01_ntnf(data_liquidacao: pd.Timestamp, data_vencimento: pd.Timestamp, taxa:float, feriados: pd.Series=None):
-    feriados = _carregar_feriados_se_necessario(feriados)
-
-    pu = taxa_pu_ntnf(data_liquidacao=data_liquidacao,
-                      data_vencimento=data_vencimento,
-                      taxa=taxa,
-                      feriados=feriados)
-
-    pu_1bp = taxa_pu_ntnf(data_liquidacao=data_liquidacao,
-                      data_vencimento=data_vencimento,
-                      taxa=taxa + 0.01,
-                      feriados=feriados)
-    
-    return  pu - pu_1bp 
+    # O cronograma é montado uma vez e reaproveitado para a taxa com +1bp
+    return float(dv01_ntnf_vetor(cronograma=cronograma, taxas=[taxa], metodo=metodo)[0])
 
 def calculo_carrego_ntnf(pu: float, pu_carregado: float, dv01:float):
 
@@ -48,46 +50,58 @@ def calculo_carrego_ntnf(pu: float, pu_carregado: float, dv01:float):
 
     return carrego_brl, carrego_bps
 
-def calcular_ntnf(data: pd.Timestamp, data_liquidacao, data_vencimento:pd.Timestamp, taxa: float, cdi: float=None,  feriados: list=None):
-    feriados = _carregar_feriados_se_necessario(feriados)
+def precificar_ntnf_lote(data: pd.Timestamp, data_liquidacao: pd.Timestamp, vencimentos, taxas,
+                         cdi: float=None, feriados: list=None) -> dict:
+    """
+    Precifica vários vencimentos de NTN-F de uma vez.
+
+    O cronograma de cupons de todos os vencimentos é montado uma única vez
+    por data de liquidação, e todos os cupons são descontados em uma passada
+    vetorizada. Os resultados são idênticos aos de calcular_ntnf para cada
+    vencimento.
+
+    Args:
+        data: Data base
+        data_liquidacao: Data de liquidação
+        vencimentos: Array de datas de vencimento
+        taxas: Array de taxas (ou uma taxa para todos os vencimentos)
+        cdi: Taxa CDI (se None, carrega automaticamente)
+        feriados: Lista de feriados ou Calendario (se None, carrega automaticamente)
+
+    Returns:
+        Dicionário com arrays pu_d0, pu_termo, pu_carregado, dv01,
+        carrego_brl e carrego_bps (carrego_bps é NaN quando dv01 é zero)
+    """
+    calendario = obter_calendario(feriados)
     cdi = _carrecar_cdi_se_necessario(cdi)
 
-    pu_d0 = taxa_pu_ntnf(data_liquidacao=data,
-                         data_vencimento=data_vencimento,
-                         taxa=taxa,
-                         feriados=feriados)
-
-    pu_termo = taxa_pu_ntnf(data_liquidacao=data_liquidacao,
-                         data_vencimento=data_vencimento,
-                         taxa=taxa,
-                         feriados=feriados)
-    
-    dv01 = calculo_dv01_ntnf(data_liquidacao=data_liquidacao,
-                            data_vencimento=data_vencimento,
-                            taxa=taxa,
-                            feriados=feriados)
-    
-    pu_carregado = calculo_pu_carregado(data=data,
-                                        data_liquidacao=data_liquidacao, 
-                                        pu=pu_d0, 
-                                        cdi=cdi, 
-                                        feriados=feriados)
-    
+    data = pd.Timestamp(data)
+    data_liquidacao = pd.Timestamp(data_liquidacao)
+
+    vencimentos = pd.to_datetime(vencimentos)
+    taxas = np.broadcast_to(np.asarray(taxas, dtype=np.float64), vencimentos.shape)
+
+    cronograma_termo = cronograma_ntnf(data_liquidacao, vencimentos, calendario)
+    if (cronograma_termo["n_cupons"] == 0).any():
+        raise ValueError("Vencimento anterior à data de liquidação")
+
+    pu_d0 = _pu_cronograma(cronograma_ntnf(data, vencimentos, calendario), taxas)
+    pu_termo = _pu_cronograma(cronograma_termo, taxas)
+    dv01 = dv01_ntnf_vetor(cronograma=cronograma_termo, taxas=taxas)
+
+    fator = fator_carregamento(data=data, data_liquidacao=data_liquidacao, cdi=cdi, feriados=calendario)
+    pu_carregado = truncar_vetor(fator * pu_d0, 6)
+
+    # Liquidação em D0: o carregamento usa o PU a termo de D+1
     if data_liquidacao == data:
-        data_aux = adicionar_dias_uteis(data=data, n_dias=1, feriados=feriados)
-        pu_termo_real = taxa_pu_ntnf(data_liquidacao=data_aux,
-                                   data_vencimento=data_vencimento,
-                                   taxa=taxa,
-                                   feriados=feriados)
+        data_aux = calendario.adicionar_dias_uteis(data, 1)
+        pu_termo_real = pu_ntnf_vetor(data_aux, vencimentos, taxas, calendario)
     else:
         pu_termo_real = pu_termo
-    
-    # Calcula o carregamento usando o PU a termo real
-    carrego_brl, carrego_bps = calculo_carrego_ntnf(
-        pu=pu_termo_real,
-        pu_carregado=pu_carregado,
-        dv01=dv01
-    )
+
+    carrego_brl = pu_termo_real - pu_carregado
+    with np.errstate(divide="ignore", invalid="ignore"):
+        carrego_bps = np.where(dv01 != 0, carrego_brl / dv01, np.nan)
 
     return {
             "pu_d0": pu_d0,
@@ -98,6 +112,19 @@ def calcular_ntnf(data: pd.Timestamp, data_liquidacao, data_vencimento:pd.Timest
             "carrego_bps": carrego_bps
            }
 
+def calcular_ntnf(data: pd.Timestamp, data_liquidacao, data_vencimento:pd.Timestamp, taxa: float, cdi: float=None,  feriados: list=None):
+    res = precificar_ntnf_lote(data=data,
+                               data_liquidacao=data_liquidacao,
+                               vencimentos=[data_vencimento],
+                               taxas=[taxa],
+                               cdi=cdi,
+                               feriados=feriados)
+
+    if res["dv01"][0] == 0:
+        raise ZeroDivisionError("DV01 nulo: vencimento coincide com a liquidação")
+
+    return {chave: float(valores[0]) for chave, valores in res.items()}
+
 # Bloco condicional para garantir que o código só execute quando for executado diretamente
 if __name__ == "__main__":
     # Teste simples no arquivo principal
@@ -1,6 +1,10 @@
 import pandas as pd
 import numpy as np
 
+from titulospub.core.auxilio import potencia_vetor
+from titulospub.utils.calendario import obter_calendario
+from titulospub.utils.datas import matriz_datas_cupons
+
 
 def f_v_ntnf(datas_cupons_ajustadas):
     num_cupons = len(datas_cupons_ajustadas)
@@ -26,6 +30,69 @@ def cotacao_ntnf(fv, dias_entre_datas, taxa):
         cot = float(cot)
     return cot
 
+def cronograma_ntnf(data_liquidacao: pd.Timestamp, vencimentos, feriados: list=None) -> dict:
+    """
+    Monta o cronograma de cupons de vários vencimentos de NTN-F em matrizes
+    preenchidas (uma linha por vencimento, uma coluna por cupom).
+
+    As datas de cupom são as mesmas de datas_pagamento_cupons (ver
+    matriz_datas_cupons). Os cupons de cada linha ficam em ordem crescente,
+    alinhados à esquerda; as posições vazias têm fluxo e dias iguais a zero.
+
+    Args:
+        data_liquidacao: Data de liquidação
+        vencimentos: Array de datas de vencimento
+        feriados: Lista de feriados ou Calendario (se None, carrega automaticamente)
+
+    Returns:
+        Dicionário com as matrizes datas (datetime64), dias (dias úteis até
+        cada cupom), fv (fluxo de cada cupom) e mascara (posições válidas),
+        e o array n_cupons
+    """
+    calendario = obter_calendario(feriados)
+    data_liquidacao = pd.Timestamp(data_liquidacao)
+    datas, mascara, n_cupons = matriz_datas_cupons(data_liquidacao, vencimentos, feriados=calendario)
+
+    dias = np.zeros(datas.shape, dtype=np.int64)
+    dias[mascara] = calendario.dias_uteis(data_liquidacao, pd.DatetimeIndex(datas[mascara]))
+
+    valor_cupom = round((1.1 ** 0.5 -1) * 100, 6)
+    fv = np.where(mascara, valor_cupom, 0.0)
+    linhas = np.flatnonzero(n_cupons > 0)
+    fv[linhas, n_cupons[linhas] - 1] += 100
+
+    return {
+            "datas": datas,
+            "dias": dias,
+            "fv": fv,
+            "mascara": mascara,
+            "n_cupons": n_cupons
+           }
+
+def cotacao_ntnf_vetor(fv: np.ndarray, dias: np.ndarray, taxas) -> np.ndarray:
+    """
+    Cotação de vários vencimentos (e cenários de taxa) de uma vez.
+
+    Os cupons são descontados todos juntos e somados coluna a coluna, na
+    mesma ordem de cotacao_ntnf, de modo que o resultado é idêntico ao do
+    cálculo cupom a cupom.
+
+    Args:
+        fv: Matriz de fluxos (vencimentos x cupons), ver cronograma_ntnf
+        dias: Matriz de dias úteis até cada cupom
+        taxas: Taxas por vencimento, com shape (..., n_vencimentos)
+
+    Returns:
+        Array de cotações com o shape de taxas
+    """
+    taxas = np.asarray(taxas, dtype=np.float64)[..., None]
+    pv = fv / potencia_vetor(taxas / 100 + 1, dias / 252)
+
+    cot = np.zeros(pv.shape[:-1])
+    for coluna in range(pv.shape[-1]):
+        cot = cot + pv[..., coluna]
+    return cot
+
 # Bloco condicional para garantir que o código só execute quando for executado diretamente
 if __name__ == "__main__":
     # Teste simples no arquivo principal
@@ -1,18 +1,33 @@
 import pandas as pd
+from typing import Dict, List, Optional
 
 from titulospub.core.auxilio import vencimento_codigo_bmf
-from titulospub.core.di.calculo_di import calculo_dv01_di
-from titulospub.core.ntnf.calculo_ntnf import calcular_ntnf
+from titulospub.core.calculo_sob_demanda import CalculoSobDemanda
+from titulospub.core.di.curva_di import obter_curva_contratos_di
+from titulospub.core.ntnf.calculo_ntnf import calcular_ntnf, precificar_ntnf_lote
+from titulospub.core.interpolacao.funcoes_interpolacao import obter_curva_di
 from titulospub.dados.orquestrador import VariaveisMercado
+from titulospub.dados.snapshot import MarketSnapshot, get_snapshot
 from titulospub.utils import adicionar_dias_uteis
+from titulospub.utils.calendario import obter_calendario
 
-class NTNF:
+class NTNF(CalculoSobDemanda):
     """
     Classe para cálculo e gestão de títulos NTN-F (Nota do Tesouro Nacional - Série F).
     
     Esta classe encapsula todos os cálculos relacionados aos títulos NTN-F,
     incluindo preços, DV01, carregamento e hedge DI.
+
+    Os valores derivados são calculados no primeiro acesso e recalculados
+    apenas quando uma entrada da qual dependem é alterada.
     """
+
+    # Saídas derivadas: {saida: (método de cálculo, entradas de que depende)}
+    _DEPENDENCIAS = {
+        "precificacao": ("_precificar", ("taxa", "datas")),
+        "dv01_di": ("_calcular_dv01_di", ("datas",)),
+        "financeiro": ("_calcular_financeiro", ("taxa", "datas", "quantidade")),
+    }
     
     def __init__(self, 
                  data_vencimento_titulo: str, 
@@ -24,7 +39,7 @@ class NTNF:
                  quantidade: float = 50000, 
                  cdi: float = None,  
                  feriados: list = None,
-                 variaveis_mercado: VariaveisMercado = None):
+                 variaveis_mercado: VariaveisMercado | MarketSnapshot | None = None):
         """
         Inicializa uma instância do título NTN-F.
         
@@ -37,12 +52,95 @@ class NTNF:
             di: Taxa DI de referência
             quantidade: Quantidade de títulos
             cdi: Taxa CDI
-            feriados: Lista de feriados
-            variaveis_mercado: Instância de VariaveisMercado
+            feriados: Lista de feriados ou Calendario
+            variaveis_mercado: Instância de VariaveisMercado ou MarketSnapshot (default: snapshot do processo)
+        """
+        self._inicializar(data_vencimento_titulo, data_base, dias_liquidacao, taxa, premio, di,
+                          quantidade, cdi, feriados, variaveis_mercado)
+
+    @classmethod
+    def criar_lote(cls,
+                   vencimentos: List[str],
+                   data_base: str = None,
+                   dias_liquidacao: int = 1,
+                   taxas: Optional[List[float]] = None,
+                   quantidade: float = 50000,
+                   cdi: float = None,
+                   feriados: list = None,
+                   variaveis_mercado: VariaveisMercado | MarketSnapshot | None = None,
+                   ignorar_erros: bool = False) -> Dict[str, "NTNF"]:
+        """
+        Cria vários títulos NTN-F precificando todos os vencimentos em uma única
+        chamada de precificar_ntnf_lote.
+        
+        Args:
+            vencimentos: Datas de vencimento dos títulos
+            data_base: Data base para cálculos (default: hoje)
+            dias_liquidacao: Dias para liquidação (default: 1)
+            taxas: Taxas de cada vencimento (default: taxas ANBIMA)
+            quantidade: Quantidade de títulos de cada vencimento
+            cdi: Taxa CDI
+            feriados: Lista de feriados ou Calendario
+            variaveis_mercado: Instância de VariaveisMercado ou MarketSnapshot (default: snapshot do processo)
+            ignorar_erros: Se True, vencimentos inválidos são ignorados com aviso
+        
+        Returns:
+            Dicionário {vencimento: NTNF}
         """
+        if taxas is not None and len(taxas) != len(vencimentos):
+            raise ValueError("taxas deve ter o mesmo tamanho de vencimentos")
+
+        variaveis_mercado = variaveis_mercado or get_snapshot(data_base)
+        data_base = data_base or pd.Timestamp.today().normalize()
+
+        titulos = {}
+        for i, vencimento in enumerate(vencimentos):
+            titulo = cls.__new__(cls)
+            try:
+                titulo._inicializar(vencimento, data_base, dias_liquidacao,
+                                    taxas[i] if taxas is not None else None, None, None,
+                                    quantidade, cdi, feriados, variaveis_mercado)
+                if titulo._data_vencimento_titulo < titulo._data_liquidacao:
+                    raise ValueError(f"Vencimento {titulo._data_vencimento_titulo.date()} anterior à data de liquidação.")
+            except Exception as e:
+                if not ignorar_erros:
+                    raise
+                print(f"[WARN] Erro ao carregar NTNF {vencimento}: {e}")
+                continue
+            titulos[vencimento] = titulo
+
+        if not titulos:
+            return titulos
+
+        referencia = next(iter(titulos.values()))
+        res = precificar_ntnf_lote(
+            data=referencia._data_base,
+            data_liquidacao=referencia._data_liquidacao,
+            vencimentos=[t._data_vencimento_titulo for t in titulos.values()],
+            taxas=[t._taxa for t in titulos.values()],
+            cdi=referencia._cdi,
+            feriados=referencia._feriados
+        )
+
+        for i, (vencimento, titulo) in enumerate(list(titulos.items())):
+            if res["dv01"][i] == 0:
+                if not ignorar_erros:
+                    raise ZeroDivisionError("DV01 nulo: vencimento coincide com a liquidação")
+                print(f"[WARN] Erro ao carregar NTNF {vencimento}: DV01 nulo")
+                del titulos[vencimento]
+                continue
+            titulo._aplicar_resultado({chave: float(valores[i]) for chave, valores in res.items()})
+
+        return titulos
+
+    # ==================== CONFIGURAÇÃO PRIVADA ====================
+
+    def _inicializar(self, data_vencimento_titulo, data_base, dias_liquidacao, taxa, premio, di,
+                     quantidade, cdi, feriados, variaveis_mercado):
+        """Configura o título sem precificá-lo."""
         # Configuração inicial
-        self._vm = variaveis_mercado or VariaveisMercado()
-        self._feriados = feriados if feriados is not None else self._vm.get_feriados()
+        self._vm = variaveis_mercado or get_snapshot(data_base)
+        self._feriados = obter_calendario(feriados) if feriados is not None else self._vm.get_calendario()
         self._cdi = cdi if cdi is not None else self._vm.get_cdi()
         
         # Parâmetros de entrada
@@ -62,16 +160,6 @@ class NTNF:
         
         # Configuração DI
         self._configurar_di()
-        
-        # Inicialização de atributos derivados
-        self._inicializar_atributos_derivados()
-        
-        # Cálculos iniciais
-        self._calcular()
-        self._hedge_di = self._calcular_hedge_di()
-        self._financeiro = self._quantidade * self._pu_d0
-
-    # ==================== CONFIGURAÇÃO PRIVADA ====================
     
     def _configurar_datas(self, data_vencimento_titulo: str, data_base: str, dias_liquidacao: int):
         """Configura as datas do título."""
@@ -115,21 +203,10 @@ class NTNF:
             data_vencimento=self._data_vencimento_titulo,
             prefixo="DI1"
         )
-        curva_di = self._vm.get_bmf()["DI"]
-        self._ajuste_di = curva_di.loc[curva_di["DI"] == self._di_ref].squeeze()["ADJ"]
+        # Ajuste do contrato ou, sem contrato no vencimento, DI interpolado
+        self._ajuste_di = obter_curva_di(self._vm, self._data_base).taxa_contrato(self._di_ref)
         self._premio_anbima = (self._anbima - self._ajuste_di) * 100
     
-    def _inicializar_atributos_derivados(self):
-        """Inicializa atributos que serão calculados posteriormente."""
-        self._pu_d0 = None
-        self._pu_termo = None
-        self._pu_carregado = None
-        self._dv01 = None
-        self._carrego_brl = None
-        self._carrego_bps = None
-        self._hedge_di = None
-        self._financeiro = None
-
     # ==================== PROPRIEDADES DE ENTRADA ====================
     
     @property
@@ -140,8 +217,7 @@ class NTNF:
     @taxa.setter
     def taxa(self, v):
         self._taxa = float(v)
-        self._calcular()
-        self._atualizar_hedge_e_financeiro()
+        self._invalidar("taxa")
     
     @property
     def premio(self):
@@ -152,8 +228,7 @@ class NTNF:
     def premio(self, v):
         self._premio = float(v) if v is not None else None
         self._atualizar_taxa_premio_di()
-        self._calcular()
-        self._atualizar_hedge_e_financeiro()
+        self._invalidar("taxa")
 
     @property
     def di(self):
@@ -164,8 +239,7 @@ class NTNF:
     def di(self, v):
         self._di = float(v) if v is not None else None
         self._atualizar_taxa_premio_di()
-        self._calcular()
-        self._atualizar_hedge_e_financeiro()
+        self._invalidar("taxa")
     
     @property
     def data_base(self):
@@ -176,8 +250,7 @@ class NTNF:
     def data_base(self, v):
         self._data_base = pd.to_datetime(v).normalize()
         self._atualizar_data_liquidacao()
-        self._calcular()
-        self._atualizar_hedge_e_financeiro()
+        self._invalidar("datas")
     
     @property
     def data_liquidacao(self):
@@ -187,8 +260,7 @@ class NTNF:
     @data_liquidacao.setter
     def data_liquidacao(self, v):
         self._data_liquidacao = pd.to_datetime(v).normalize()
-        self._calcular()
-        self._atualizar_hedge_e_financeiro()
+        self._invalidar("datas")
     
     @property
     def quantidade(self):
@@ -199,9 +271,10 @@ class NTNF:
     def quantidade(self, v):
         if v <= 0:
             raise ValueError("Quantidade deve ser maior que zero")
-        
-        self._ajustar_valores_para_quantidade(v)
-        self._hedge_di = self._calcular_hedge_di()
+
+        # Os valores por unidade não mudam: nada é reprecificado
+        self._quantidade = float(v)
+        self._invalidar("quantidade")
 
     @property
     def dias_liquidacao(self) -> int:
@@ -212,61 +285,62 @@ class NTNF:
     def dias_liquidacao(self, n: int):
         self._dias_liquidacao = int(n)
         self._atualizar_data_liquidacao()
-        self._calcular()
-        self._atualizar_hedge_e_financeiro()
+        self._invalidar("datas")
 
     @property
     def financeiro(self):
         """Valor financeiro total."""
-        return self._financeiro
+        return self._obter("financeiro")
 
     @financeiro.setter
     def financeiro(self, v):
         if v <= 0:
             raise ValueError("Financeiro deve ser maior que zero")
             
-        if self._pu_d0 == 0:
+        if self.pu_d0 == 0:
             raise ValueError("PU_D0 não pode ser zero para calcular quantidade")
-        
-        self._ajustar_valores_para_financeiro(v)
-        self._hedge_di = self._calcular_hedge_di()
+
+        # Calcula nova quantidade baseada no financeiro
+        self._quantidade = round(float(v) / self.pu_d0, 6)
+        self._invalidar("quantidade")
+        self._definir("financeiro", float(v))
 
     # ==================== PROPRIEDADES SOMENTE LEITURA ====================
     
     @property
     def pu_d0(self):
         """Preço unitário à vista."""
-        return self._pu_d0
+        return self._obter("precificacao")["pu_d0"]
     
     @property
     def pu_termo(self):
         """Preço unitário a termo."""
-        return self._pu_termo
+        return self._obter("precificacao")["pu_termo"]
     
     @property
     def pu_carregado(self):
         """Preço unitário carregado."""
-        return self._pu_carregado
+        return self._obter("precificacao")["pu_carregado"]
     
     @property
     def dv01(self):
         """DV01 do título."""
-        return self._dv01
+        return self._obter("precificacao")["dv01"] * self._quantidade
     
     @property
     def carrego_brl(self):
         """Carregamento em BRL."""
-        return self._carrego_brl
+        return self._obter("precificacao")["carrego_brl"] * self._quantidade
     
     @property
     def carrego_bps(self):
         """Carregamento em pontos base."""
-        return self._carrego_bps
+        return self._obter("precificacao")["carrego_bps"]
     
     @property
     def hedge_di(self):
         """Hedge DI calculado."""
-        return self._hedge_di
+        return self._calcular_hedge_di()
     
     @property
     def taxa_anbima(self):
@@ -285,9 +359,9 @@ class NTNF:
 
     # ==================== MÉTODOS DE CÁLCULO ====================
     
-    def _calcular(self):
-        """Método principal de cálculo do título."""
-        res = calcular_ntnf(
+    def _precificar(self) -> dict:
+        """Precifica o título (valores por unidade, ver calcular_ntnf)."""
+        return calcular_ntnf(
             data=self._data_base,
             data_liquidacao=self._data_liquidacao,
             data_vencimento=self._data_vencimento_titulo,
@@ -295,22 +369,22 @@ class NTNF:
             cdi=self._cdi,
             feriados=self._feriados
         )
-        
-        # Armazena resultados
-        self._pu_d0 = res["pu_d0"]
-        self._pu_termo = res["pu_termo"]
-        self._pu_carregado = res["pu_carregado"]
-        self._dv01 = res["dv01"] * self._quantidade
-        self._carrego_brl = res["carrego_brl"] * self._quantidade
-        self._carrego_bps = res["carrego_bps"]
-        
-        # Atualiza financeiro
-        self._financeiro = self._quantidade * self._pu_d0
+    
+    def _aplicar_resultado(self, res: dict):
+        """Armazena os resultados de calcular_ntnf (valores por unidade)."""
+        self._definir("precificacao", res)
+    
+    def _calcular_financeiro(self) -> float:
+        """Financeiro da posição pelo PU à vista."""
+        return self._quantidade * self.pu_d0
+    
+    def _calcular_dv01_di(self) -> float:
+        """DV01 do contrato DI de referência (ver CurvaDI)."""
+        return obter_curva_contratos_di(self._vm, self._data_base).dv01_contrato(self._di_ref, self._ajuste_di)
     
     def _calcular_hedge_di(self):
         """Calcula o hedge DI para o título."""
-        dv_di = calculo_dv01_di(taxa=self._ajuste_di, codigo=self._di_ref)
-        return int(self._dv01 / dv_di)
+        return int(self.dv01 / self._obter("dv01_di"))
     
     def _atualizar_taxa_premio_di(self):
         """Atualiza a taxa baseada em prêmio e DI quando ambos estão definidos."""
@@ -324,40 +398,3 @@ class NTNF:
             n_dias=self._dias_liquidacao,
             feriados=self._feriados
         )
-    
-    def _atualizar_hedge_e_financeiro(self):
-        """Atualiza hedge DI e financeiro após mudanças."""
-        self._hedge_di = self._calcular_hedge_di()
-        self._financeiro = self._quantidade * self._pu_d0
-    
-    def _ajustar_valores_para_quantidade(self, nova_quantidade):
-        """Ajusta valores quando a quantidade é alterada."""
-        quantidade_anterior = getattr(self, "_quantidade", 1)
-        
-        # Normaliza valores para unidade
-        self._dv01 = self._dv01 / quantidade_anterior
-        self._carrego_brl = self._carrego_brl / quantidade_anterior
-        
-        # Atualiza quantidade
-        self._quantidade = float(nova_quantidade)
-        
-        # Reaplica multiplicação
-        self._dv01 *= self._quantidade
-        self._carrego_brl *= self._quantidade
-        self._financeiro = self._quantidade * self._pu_d0
-    
-    def _ajustar_valores_para_financeiro(self, novo_financeiro):
-        """Ajusta valores quando o financeiro é alterado."""
-        quantidade_anterior = getattr(self, "_quantidade", 1)
-        
-        # Normaliza valores para unidade
-        self._dv01 = self._dv01 / quantidade_anterior
-        self._carrego_brl = self._carrego_brl / quantidade_anterior
-        
-        # Calcula nova quantidade
-        self._financeiro = float(novo_financeiro)
-        self._quantidade = round(self._financeiro / self._pu_d0, 6)
-        
-        # Reaplica multiplicação
-        self._dv01 *= self._quantidade
-        self._carrego_brl *= self._quantidade
\ No newline at end of file
@@ -0,0 +1,198 @@
+"""
+Pool de títulos pré-precificados.
+
+Criar um título consulta a taxa ANBIMA e o ajuste DI/DAP do vencimento,
+calcula VNAs e fatores e precifica o título. O pool guarda um título base
+por (tipo, vencimento, data base, dias de liquidação), criado com a taxa
+ANBIMA e já precificado, e devolve cópias dele: cada requisição aplica
+apenas as suas próprias taxa, prêmio, DI e quantidade, e só as saídas
+afetadas por essas alterações são recalculadas (ver CalculoSobDemanda).
+
+O pool tem tamanho máximo, com descarte do título usado há mais tempo
+(LRU), e é esvaziado automaticamente quando a versão do snapshot de
+mercado do processo muda.
+"""
+
+import copy
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import pandas as pd
+
+from titulospub.core.lft.titulo_lft import LFT
+from titulospub.core.ltn.titulo_ltn import LTN
+from titulospub.core.ntnb.titulo_ntnb import NTNB
+from titulospub.core.ntnf.titulo_ntnf import NTNF
+from titulospub.dados.snapshot import get_snapshot
+
+TAMANHO_MAXIMO_POOL = 512
+
+_CLASSES_TITULOS = {"LTN": LTN, "NTNF": NTNF, "NTNB": NTNB, "LFT": LFT}
+
+# Valores calculados no título base e herdados pelas cópias
+_PRECALCULO = {
+    "LTN": ("pu_d0",),
+    "NTNF": ("pu_d0", "hedge_di"),
+    "NTNB": ("pu_d0", "hedge_dap"),
+    "LFT": ("pu_d0",),
+}
+
+# Parâmetros de prêmio/DI aceitos por cada tipo
+_PARAMETROS_MERCADO = {"LTN": ("premio", "di"), "NTNF": ("premio", "di"), "NTNB": ("premio",), "LFT": ()}
+
+
+class PoolTitulos:
+    """
+    Pool LRU de títulos precificados com a taxa ANBIMA no snapshot corrente.
+    """
+
+    def __init__(self, tamanho_maximo: int = TAMANHO_MAXIMO_POOL):
+        """
+        Inicializa o pool.
+
+        Args:
+            tamanho_maximo: Quantidade máxima de títulos base guardados
+        """
+        if tamanho_maximo <= 0:
+            raise ValueError("Tamanho máximo do pool deve ser maior que zero")
+        self._tamanho_maximo = tamanho_maximo
+        self._titulos = OrderedDict()
+        self._versao = None
+        self._lock = threading.Lock()
+        self._acertos = 0
+        self._falhas = 0
+
+    def obter(self,
+              tipo: str,
+              data_vencimento_titulo: str,
+              data_base: Optional[str] = None,
+              dias_liquidacao: int = 1,
+              taxa: Optional[float] = None,
+              premio: Optional[float] = None,
+              di: Optional[float] = None,
+              quantidade: Optional[float] = None):
+        """
+        Retorna uma cópia do título base com as alterações da requisição.
+
+        O resultado é o mesmo de construir o título com os mesmos argumentos:
+        prêmio e DI são aplicados antes da taxa, que prevalece quando
+        informada.
+
+        Args:
+            tipo: Tipo do título ("LTN", "NTNF", "NTNB" ou "LFT")
+            data_vencimento_titulo: Data de vencimento (YYYY-MM-DD)
+            data_base: Data base para cálculos (default: hoje)
+            dias_liquidacao: Dias para liquidação (default: 1)
+            taxa: Taxa do título (default: ANBIMA)
+            premio: Prêmio sobre DI (LTN, NTNF) ou DAP (NTNB)
+            di: Taxa DI de referência (LTN, NTNF)
+            quantidade: Quantidade de títulos (default: a da classe)
+
+        Returns:
+            Nova instância do título, independente do título base
+        """
+        tipo = tipo.upper().replace("-", "")
+        if tipo not in _CLASSES_TITULOS:
+            raise KeyError(f"Tipo de título '{tipo}' não reconhecido. Tipos disponíveis: {list(_CLASSES_TITULOS)}")
+
+        for nome, valor in (("premio", premio), ("di", di)):
+            if valor is not None and nome not in _PARAMETROS_MERCADO[tipo]:
+                raise ValueError(f"Parâmetro '{nome}' não se aplica a {tipo}")
+
+        data_base = pd.to_datetime(data_base).normalize() if data_base else pd.Timestamp.today().normalize()
+        chave = (tipo, pd.to_datetime(data_vencimento_titulo), data_base, int(dias_liquidacao))
+
+        titulo = self._clonar(self._base(chave))
+        if premio is not None:
+            titulo.premio = premio
+        if di is not None:
+            titulo.di = di
+        if taxa is not None:
+            titulo.taxa = taxa
+        if quantidade is not None:
+            titulo.quantidade = quantidade
+        return titulo
+
+    def _base(self, chave: tuple):
+        """Título base da chave, criando-o (fora do lock) se necessário."""
+        versao = get_snapshot().versao
+        with self._lock:
+            if versao != self._versao:
+                self._titulos.clear()
+                self._versao = versao
+            titulo = self._titulos.get(chave)
+            if titulo is not None:
+                self._titulos.move_to_end(chave)
+                self._acertos += 1
+                return titulo
+            self._falhas += 1
+
+        tipo, vencimento, data_base, dias_liquidacao = chave
+        titulo = _CLASSES_TITULOS[tipo](data_vencimento_titulo=vencimento,
+                                        data_base=data_base,
+                                        dias_liquidacao=dias_liquidacao)
+        for atributo in _PRECALCULO[tipo]:
+            getattr(titulo, atributo)
+
+        with self._lock:
+            # Um snapshot publicado durante a criação torna o título obsoleto
+            if versao == self._versao:
+                self._titulos[chave] = titulo
+                self._titulos.move_to_end(chave)
+                while len(self._titulos) > self._tamanho_maximo:
+                    self._titulos.popitem(last=False)
+        return titulo
+
+    @staticmethod
+    def _clonar(titulo):
+        """Cópia rasa com cache próprio de valores calculados."""
+        clone = copy.copy(titulo)
+        clone.__dict__["_calculados"] = dict(titulo._valores_calculados())
+        return clone
+
+    def limpar(self):
+        """Descarta todos os títulos do pool."""
+        with self._lock:
+            self._titulos.clear()
+
+    def estatisticas(self) -> dict:
+        """
+        Estatísticas de uso do pool.
+
+        Returns:
+            Dicionário com tamanho, tamanho_maximo, acertos, falhas e versao
+        """
+        with self._lock:
+            return {
+                "tamanho": len(self._titulos),
+                "tamanho_maximo": self._tamanho_maximo,
+                "acertos": self._acertos,
+                "falhas": self._falhas,
+                "versao": self._versao,
+            }
+
+
+# Pool compartilhado do processo
+_pool = PoolTitulos()
+
+
+def obter_titulo(tipo: str, data_vencimento_titulo: str, **kwargs):
+    """
+    Obtém um título a partir do pool compartilhado do processo.
+
+    Args:
+        tipo: Tipo do título ("LTN", "NTNF", "NTNB" ou "LFT")
+        data_vencimento_titulo: Data de vencimento (YYYY-MM-DD)
+        **kwargs: data_base, dias_liquidacao, taxa, premio, di e quantidade
+            (ver PoolTitulos.obter)
+
+    Returns:
+        Nova instância do título
+    """
+    return _pool.obter(tipo, data_vencimento_titulo, **kwargs)
+
+
+def get_pool_titulos() -> PoolTitulos:
+    """Retorna o pool compartilhado do processo."""
+    return _pool
@@ -0,0 +1,156 @@
+"""
+Sensibilidade (DV01) dos títulos e contratos sem reprecificação completa.
+
+As funções deste módulo recebem o cronograma e as contagens de dias úteis já
+calculados na precificação base e devolvem o DV01 de todos os vencimentos de
+uma vez. Há dois métodos:
+
+- "bump" (padrão): reprecifica com taxa + 0,01 reaproveitando o cronograma,
+  com os mesmos truncamentos do cálculo original. O resultado é idêntico ao
+  das funções calculo_dv01_* / dv01_dap.
+- "analitico": derivada em forma fechada do preço em relação à taxa,
+  multiplicada por 1bp, sem truncamentos.
+"""
+import numpy as np
+
+from titulospub.core.auxilio import potencia_vetor, truncar_vetor
+from titulospub.core.ntnb.cash_flow_ntnb import cotacao_ntnb_vetor, pv_cupons_vetor, somar_fluxos
+from titulospub.core.ntnf.cash_flow_ntnf import cotacao_ntnf_vetor
+
+METODO_BUMP = "bump"
+METODO_ANALITICO = "analitico"
+METODOS_DV01 = (METODO_BUMP, METODO_ANALITICO)
+
+# Um ponto-base na unidade das taxas (% a.a.) e em fração
+BP = 0.01
+_BP_FRACAO = BP / 100
+
+
+def _validar_metodo(metodo: str):
+    if metodo not in METODOS_DV01:
+        raise ValueError(f"Método de DV01 inválido: {metodo}. Use um de {METODOS_DV01}.")
+
+
+def _pu_desconto(nominal: float, taxas, dias) -> np.ndarray:
+    """Valor descontado (sem truncamento) de um fluxo único: nominal / (1 + taxa) ** (dias / 252)."""
+    return nominal / potencia_vetor(np.asarray(taxas, dtype=np.float64) / 100 + 1, np.asarray(dias) / 252)
+
+
+def _derivada_desconto(valor, taxas, dias) -> np.ndarray:
+    """Variação (em módulo) de um valor descontado para 1bp de taxa."""
+    taxas = np.asarray(taxas, dtype=np.float64)
+    return valor * (np.asarray(dias) / 252) / (1 + taxas / 100) * _BP_FRACAO
+
+
+def dv01_ltn_vetor(taxas, dias, metodo: str = METODO_BUMP) -> np.ndarray:
+    """
+    DV01 por título de LTN (PU de face 1.000).
+
+    Args:
+        taxas: Array de taxas (%)
+        dias: Dias úteis entre a liquidação e o vencimento
+        metodo: "bump" ou "analitico"
+
+    Returns:
+        Array de DV01
+    """
+    _validar_metodo(metodo)
+    taxas = np.asarray(taxas, dtype=np.float64)
+    if metodo == METODO_ANALITICO:
+        return _derivada_desconto(_pu_desconto(1000, taxas, dias), taxas, dias)
+    pu = truncar_vetor(_pu_desconto(1000, taxas, dias), 6)
+    pu_1bp = truncar_vetor(_pu_desconto(1000, taxas + BP, dias), 6)
+    return np.abs(pu - pu_1bp)
+
+
+def dv01_di_vetor(taxas, dias, metodo: str = METODO_BUMP) -> np.ndarray:
+    """
+    DV01 por contrato de DI1 (PU de face 100.000).
+
+    Args:
+        taxas: Array de taxas (%)
+        dias: Dias úteis entre a liquidação e o vencimento
+        metodo: "bump" ou "analitico"
+
+    Returns:
+        Array de DV01
+    """
+    _validar_metodo(metodo)
+    taxas = np.asarray(taxas, dtype=np.float64)
+    if metodo == METODO_ANALITICO:
+        return _derivada_desconto(_pu_desconto(100000, taxas, dias), taxas, dias)
+    pu = truncar_vetor(_pu_desconto(100000, taxas, dias), 6)
+    pu_1bp = truncar_vetor(_pu_desconto(100000, taxas + BP, dias), 6)
+    return np.abs(pu - pu_1bp)
+
+
+def dv01_dap_vetor(taxas, dias, prt, metodo: str = METODO_BUMP) -> np.ndarray:
+    """
+    DV01 financeiro por contrato de DAP (PU * 0,00025 * PRT).
+
+    Args:
+        taxas: Array de taxas (%)
+        dias: Dias úteis entre a liquidação e o vencimento
+        prt: Pró-rata do IPCA na data de liquidação
+        metodo: "bump" ou "analitico"
+
+    Returns:
+        Array de DV01
+    """
+    _validar_metodo(metodo)
+    taxas = np.asarray(taxas, dtype=np.float64)
+    financeiro = _pu_desconto(100000, taxas, dias) * 0.00025 * prt
+    if metodo == METODO_ANALITICO:
+        return _derivada_desconto(financeiro, taxas, dias)
+    financeiro_1bp = _pu_desconto(100000, taxas + BP, dias) * 0.00025 * prt
+    return np.abs(financeiro - financeiro_1bp)
+
+
+def dv01_ntnf_vetor(cronograma: dict, taxas, metodo: str = METODO_BUMP) -> np.ndarray:
+    """
+    DV01 por título de NTN-F a partir de um cronograma já montado
+    (ver cronograma_ntnf).
+
+    Args:
+        cronograma: Cronograma de cupons dos vencimentos
+        taxas: Array de taxas (%), uma por vencimento
+        metodo: "bump" ou "analitico"
+
+    Returns:
+        Array de DV01 (PU - PU com +1bp)
+    """
+    _validar_metodo(metodo)
+    taxas = np.asarray(taxas, dtype=np.float64)
+    if metodo == METODO_ANALITICO:
+        fv, dias = cronograma["fv"], cronograma["dias"]
+        pv = fv / potencia_vetor(taxas[:, None] / 100 + 1, dias / 252)
+        return np.sum(_derivada_desconto(pv, taxas[:, None], dias), axis=-1) * 10
+    cot, cot_1bp = cotacao_ntnf_vetor(fv=cronograma["fv"], dias=cronograma["dias"],
+                                      taxas=np.stack([taxas, taxas + BP]))
+    return truncar_vetor(cot * 10, 6) - truncar_vetor(cot_1bp * 10, 6)
+
+
+def dv01_ntnb_vetor(cronograma: dict, taxas, vna_ajustado: float, metodo: str = METODO_BUMP) -> np.ndarray:
+    """
+    DV01 por título de NTN-B a partir de um cronograma já montado
+    (ver cronograma_ntnb).
+
+    Args:
+        cronograma: Cronograma de cupons dos vencimentos
+        taxas: Array de taxas (%), uma por vencimento
+        vna_ajustado: VNA ajustado na data de liquidação
+        metodo: "bump" ou "analitico"
+
+    Returns:
+        Array de DV01
+    """
+    _validar_metodo(metodo)
+    taxas = np.asarray(taxas, dtype=np.float64)
+    if metodo == METODO_ANALITICO:
+        pv = pv_cupons_vetor(cronograma, taxas)
+        derivada = _derivada_desconto(pv, taxas[:, None], cronograma["dias_uteis"])
+        return vna_ajustado * (somar_fluxos(derivada, cronograma["n_cupons"]) / 100)
+    cot, cot_1bp = cotacao_ntnb_vetor(cronograma, np.stack([taxas, taxas + BP]))
+    pu = truncar_vetor(vna_ajustado * (cot / 100), 6)
+    pu_1bp = truncar_vetor(vna_ajustado * (cot_1bp / 100), 6)
+    return np.abs(pu - pu_1bp)
@@ -0,0 +1,243 @@
+"""
+Taxa implícita: inversão dos precificadores (taxa que gera um PU).
+
+O cronograma de cada vencimento (fluxos e prazos em anos úteis) é montado uma
+única vez e reaproveitado em todas as iterações de um Newton protegido por
+intervalo (bisseção quando o passo sai do intervalo que contém a raiz).
+Todos os vencimentos e PUs-alvo são resolvidos juntos, como arrays.
+
+O PU é tratado como função contínua da taxa (sem os truncamentos do cálculo
+oficial), de modo que a taxa encontrada reproduz o PU-alvo dentro da
+precisão de truncamento.
+"""
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from titulospub.core.lft.ajuste_vna_lft import calculo_vna_ajustado_lft
+from titulospub.core.ntnb.cash_flow_ntnb import cronograma_ntnb
+from titulospub.core.ntnb.vna_ntnb import calculo_vna_ajustado_ntnb
+from titulospub.core.ntnf.cash_flow_ntnf import cronograma_ntnf
+from titulospub.utils.calendario import obter_calendario
+
+# Intervalo de busca das taxas (% a.a.)
+TAXA_MINIMA = -50.0
+TAXA_MAXIMA = 200.0
+
+TIPOS_TAXA_IMPLICITA = ("LTN", "NTNF", "NTNB", "LFT")
+
+
+def resolver_taxas(fluxos, anos, pus, escala=1.0, tol: float = 1e-10, max_iter: int = 100,
+                   taxa_minima: float = TAXA_MINIMA, taxa_maxima: float = TAXA_MAXIMA) -> np.ndarray:
+    """
+    Encontra, para cada linha, a taxa r tal que
+    escala * soma(fluxos / (1 + r/100) ** anos) == pu.
+
+    Args:
+        fluxos: Matriz (vencimentos x fluxos); posições vazias com zero
+        anos: Matriz de prazos em anos úteis (dias úteis / 252)
+        pus: PUs-alvo, um por vencimento
+        escala: Fator multiplicativo do preço (escalar ou um por vencimento)
+        tol: Tolerância na taxa (% a.a.)
+        max_iter: Número máximo de iterações
+        taxa_minima: Limite inferior da busca (% a.a.)
+        taxa_maxima: Limite superior da busca (% a.a.)
+
+    Returns:
+        Array de taxas (% a.a.); NaN onde o PU está fora do intervalo de busca
+    """
+    fluxos = np.atleast_2d(np.asarray(fluxos, dtype=np.float64))
+    anos = np.atleast_2d(np.asarray(anos, dtype=np.float64))
+    pus = np.asarray(pus, dtype=np.float64).reshape(-1)
+    escala = np.broadcast_to(np.asarray(escala, dtype=np.float64), pus.shape)
+
+    if fluxos.shape[0] != pus.shape[0]:
+        raise ValueError("pus deve ter um valor por vencimento")
+    if (pus <= 0).any():
+        raise ValueError("PU deve ser maior que zero")
+
+    def preco_e_derivada(taxas):
+        fator = 1 + taxas / 100
+        desconto = fluxos * np.power(fator[:, None], -anos)
+        preco = escala * desconto.sum(axis=1)
+        derivada = -escala * (desconto * anos).sum(axis=1) / (100 * fator)
+        return preco, derivada
+
+    inferior = np.full(pus.shape, taxa_minima)
+    superior = np.full(pus.shape, taxa_maxima)
+
+    # O preço é decrescente na taxa: PU-alvo fora de [preço(máx), preço(mín)] não tem solução
+    fora = (pus > preco_e_derivada(inferior)[0]) | (pus < preco_e_derivada(superior)[0])
+
+    taxas = np.full(pus.shape, 10.0)
+    convergiu = fora.copy()
+    for _ in range(max_iter):
+        preco, derivada = preco_e_derivada(taxas)
+        erro = preco - pus
+
+        # Atualiza o intervalo que contém a raiz
+        inferior = np.where(erro > 0, taxas, inferior)
+        superior = np.where(erro < 0, taxas, superior)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            novas = taxas - erro / derivada
+        bissecao = ~((novas > inferior) & (novas < superior))
+        novas = np.where(bissecao, (inferior + superior) / 2, novas)
+
+        convergiu |= (np.abs(novas - taxas) <= tol) | (erro == 0)
+        taxas = np.where(convergiu, taxas, novas)
+        if convergiu.all():
+            break
+
+    return np.where(fora | ~convergiu, np.nan, taxas)
+
+
+def _arredondar(taxas: np.ndarray, casas_decimais: Optional[int]) -> np.ndarray:
+    return taxas if casas_decimais is None else np.round(taxas, casas_decimais)
+
+
+def taxa_ltn_de_pu(data_liquidacao: pd.Timestamp, vencimentos, pus, feriados: list = None,
+                   casas_decimais: Optional[int] = None) -> np.ndarray:
+    """
+    Taxas de LTN que geram os PUs informados na data de liquidação.
+
+    Args:
+        data_liquidacao: Data de liquidação
+        vencimentos: Array de datas de vencimento
+        pus: PUs-alvo, um por vencimento
+        feriados: Lista de feriados ou Calendario (se None, carrega automaticamente)
+        casas_decimais: Se informado, arredonda as taxas
+
+    Returns:
+        Array de taxas (% a.a.)
+    """
+    calendario = obter_calendario(feriados)
+    vencimentos = calendario.proximo_dia_util(pd.to_datetime(vencimentos))
+    dias = np.asarray(calendario.dias_uteis(pd.Timestamp(data_liquidacao), vencimentos))
+    if (dias <= 0).any():
+        raise ValueError("Vencimento anterior à data de liquidação")
+    taxas = resolver_taxas(np.full((len(dias), 1), 1000.0), dias[:, None] / 252, pus)
+    return _arredondar(taxas, casas_decimais)
+
+
+def taxa_ntnf_de_pu(data_liquidacao: pd.Timestamp, vencimentos, pus, feriados: list = None,
+                    casas_decimais: Optional[int] = None) -> np.ndarray:
+    """
+    Taxas de NTN-F que geram os PUs informados na data de liquidação.
+
+    Args:
+        data_liquidacao: Data de liquidação
+        vencimentos: Array de datas de vencimento
+        pus: PUs-alvo, um por vencimento
+        feriados: Lista de feriados ou Calendario (se None, carrega automaticamente)
+        casas_decimais: Se informado, arredonda as taxas
+
+    Returns:
+        Array de taxas (% a.a.)
+    """
+    cronograma = cronograma_ntnf(data_liquidacao=data_liquidacao, vencimentos=vencimentos, feriados=feriados)
+    if (cronograma["n_cupons"] == 0).any():
+        raise ValueError("Vencimento anterior à data de liquidação")
+    taxas = resolver_taxas(cronograma["fv"], cronograma["dias"] / 252, pus, escala=10.0)
+    return _arredondar(taxas, casas_decimais)
+
+
+def taxa_ntnb_de_pu(data_liquidacao: pd.Timestamp, vencimentos, pus, vna_ajustado: float,
+                    feriados: list = None, casas_decimais: Optional[int] = None) -> np.ndarray:
+    """
+    Taxas de NTN-B que geram os PUs informados na data de liquidação.
+
+    Args:
+        data_liquidacao: Data de liquidação
+        vencimentos: Array de datas de vencimento
+        pus: PUs-alvo, um por vencimento
+        vna_ajustado: VNA ajustado na data de liquidação
+        feriados: Lista de feriados ou Calendario (se None, carrega automaticamente)
+        casas_decimais: Se informado, arredonda as taxas
+
+    Returns:
+        Array de taxas (% a.a.)
+    """
+    cronograma = cronograma_ntnb(data_liquidacao, vencimentos, feriados=feriados)
+    if (cronograma["n_cupons"] == 0).any():
+        raise ValueError("Vencimento anterior à data de liquidação")
+    taxas = resolver_taxas(cronograma["fv_cupons"], cronograma["dias_uteis"] / 252, pus,
+                           escala=vna_ajustado / 100)
+    return _arredondar(taxas, casas_decimais)
+
+
+def taxa_lft_de_pu(data_liquidacao: pd.Timestamp, vencimentos, pus, vna_ajustado: float,
+                   feriados: list = None, casas_decimais: Optional[int] = None) -> np.ndarray:
+    """
+    Taxas de LFT que geram os PUs informados na data de liquidação.
+
+    Args:
+        data_liquidacao: Data de liquidação
+        vencimentos: Array de datas de vencimento
+        pus: PUs-alvo, um por vencimento
+        vna_ajustado: VNA da LFT atualizado até a liquidação
+        feriados: Lista de feriados ou Calendario (se None, carrega automaticamente)
+        casas_decimais: Se informado, arredonda as taxas
+
+    Returns:
+        Array de taxas (% a.a.)
+    """
+    calendario = obter_calendario(feriados)
+    vencimentos = calendario.proximo_dia_util(pd.to_datetime(vencimentos))
+    dias = np.asarray(calendario.dias_uteis(pd.Timestamp(data_liquidacao), vencimentos))
+    if (dias <= 0).any():
+        raise ValueError("Vencimento anterior à data de liquidação")
+    taxas = resolver_taxas(np.full((len(dias), 1), 100.0), dias[:, None] / 252, pus,
+                           escala=vna_ajustado / 100)
+    return _arredondar(taxas, casas_decimais)
+
+
+def calcular_taxas_implicitas(tipo: str, vencimentos, pus, data_base=None, dias_liquidacao: int = 1,
+                              casas_decimais: Optional[int] = None, variaveis_mercado=None) -> dict:
+    """
+    Calcula em lote as taxas que geram os PUs a termo informados.
+
+    Args:
+        tipo: Tipo do título ("LTN", "NTNF", "NTNB" ou "LFT")
+        vencimentos: Datas de vencimento
+        pus: PUs-alvo na data de liquidação, um por vencimento
+        data_base: Data base (default: hoje)
+        dias_liquidacao: Dias úteis para liquidação (default: 1)
+        casas_decimais: Se informado, arredonda as taxas
+        variaveis_mercado: Instância de VariaveisMercado ou MarketSnapshot (default: snapshot do processo)
+
+    Returns:
+        Dicionário com data_base, data_liquidacao e o array de taxas
+    """
+    from titulospub.dados.snapshot import get_snapshot
+
+    tipo = tipo.upper().replace("-", "")
+    if tipo not in TIPOS_TAXA_IMPLICITA:
+        raise ValueError(f"Tipo de título '{tipo}' não suportado. Use um de {TIPOS_TAXA_IMPLICITA}.")
+    if len(pus) != len(vencimentos):
+        raise ValueError("pus deve ter o mesmo tamanho de vencimentos")
+
+    vm = variaveis_mercado or get_snapshot(data_base)
+    calendario = vm.get_calendario()
+    data_base = pd.to_datetime(data_base).normalize() if data_base else pd.Timestamp.today().normalize()
+    data_liquidacao = calendario.adicionar_dias_uteis(data_base, dias_liquidacao)
+
+    if tipo == "LTN":
+        taxas = taxa_ltn_de_pu(data_liquidacao, vencimentos, pus, calendario, casas_decimais)
+    elif tipo == "NTNF":
+        taxas = taxa_ntnf_de_pu(data_liquidacao, vencimentos, pus, calendario, casas_decimais)
+    elif tipo == "NTNB":
+        vna = calculo_vna_ajustado_ntnb(data=data_base, data_liquidacao=data_liquidacao,
+                                        ipca_dict=vm.get_ipca_dict(), feriados=calendario, leilao=False)
+        taxas = taxa_ntnb_de_pu(data_liquidacao, vencimentos, pus, vna, calendario, casas_decimais)
+    else:
+        vna = calculo_vna_ajustado_lft(data=data_base, data_liquidacao=data_liquidacao, cdi=vm.get_cdi(),
+                                       vna_lft=vm.get_vna_lft(), feriados=calendario)
+        taxas = taxa_lft_de_pu(data_liquidacao, vencimentos, pus, vna, calendario, casas_decimais)
+
+    return {
+        "data_base": data_base,
+        "data_liquidacao": data_liquidacao,
+        "taxas": taxas
+    }
@@ -6,6 +6,8 @@ Este módulo contém:
 - Sistema de cache para otimização
 - Processamento de dados ANBIMA, BMF e IPCA
 - Orquestrador de variáveis de mercado
+- Snapshot imutável e versionado das variáveis de mercado
+- Benchmark da atualização com dados gravados
 """
 
 # Imports principais do módulo backup
@@ -25,6 +27,13 @@ from .cache import (
     clear_cache
 )
 
+# Imports principais do módulo armazem
+from .armazem import (
+    ArmazemMercado,
+    TabelasArmazenadas,
+    get_armazem
+)
+
 # Imports principais do módulo anbimas
 from .anbimas import (
     anbimas
@@ -43,9 +52,26 @@ from .ipca import (
 
 # Imports principais do módulo orquestrador
 from .orquestrador import (
+    DadosHistoricosIndisponiveisError,
     VariaveisMercado
 )
 
+# Imports principais do módulo benchmark_atualizacao
+from .benchmark_atualizacao import (
+    gravar_atualizacao,
+    medir_atualizacao
+)
+
+# Imports principais do módulo snapshot
+from .snapshot import (
+    MarketSnapshot,
+    carregar_snapshots,
+    get_snapshot,
+    publicar_snapshot,
+    recarregar_snapshot,
+    snapshot_historico
+)
+
 __all__ = [
     # Funções de backup
     'backup_cdi',
@@ -59,6 +85,11 @@ __all__ = [
     'save_cache',
     'load_cache',
     'clear_cache',
+
+    # Armazém de dados de mercado
+    'ArmazemMercado',
+    'TabelasArmazenadas',
+    'get_armazem',
     
     # Funções de processamento
     'anbimas',
@@ -67,7 +98,20 @@ __all__ = [
     'dicionario_ipca',
     
     # Classe principal
-    'VariaveisMercado'
+    'DadosHistoricosIndisponiveisError',
+    'VariaveisMercado',
+
+    # Benchmark da atualização
+    'gravar_atualizacao',
+    'medir_atualizacao',
+
+    # Snapshot de mercado
+    'MarketSnapshot',
+    'get_snapshot',
+    'snapshot_historico',
+    'carregar_snapshots',
+    'publicar_snapshot',
+    'recarregar_snapshot'
 ]
 
 # Versão do módulo
@@ -0,0 +1,509 @@
+"""
+Armazém local de dados de mercado, particionado por fonte e data de referência.
+
+Cada gravação cria uma partição (fonte, data) versionada em disco:
+
+    <CACHE_DIR>/armazem/
+        manifesto.json
+        anbimas/2025-06-02/v3.8d1e.../t0/c0.npy ...
+        bmf/2025-06-02/v1.5f0c.../...
+
+- Tabelas (dicionários de DataFrames, como ANBIMA e BMF) são gravadas
+  coluna a coluna em arquivos .npy, que são todos abertos com memory-map
+  na leitura; cada tabela só é montada quando acessada.
+- Listas de datas (feriados) são gravadas como um array datetime64.
+- Escalares e dicionários simples (CDI, VNA LFT, IPCA) ficam no próprio
+  manifesto, em JSON.
+
+O manifesto registra, para cada partição, a versão, o momento da gravação,
+o esquema e o SHA-256 de cada arquivo. A partição é gravada em um diretório
+temporário e renomeada para o lugar definitivo, e o manifesto é gravado em
+um arquivo temporário e renomeado sobre o anterior: leitores nunca veem uma
+gravação pela metade.
+
+Vários processos (por exemplo, workers do uvicorn) podem gravar no mesmo
+armazém: a leitura-alteração-gravação do manifesto é serializada por um
+arquivo de trava criado com O_EXCL, e cada diretório de versão recebe um
+sufixo aleatório, de modo que dois processos nunca gravam na mesma pasta.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import threading
+import time
+import uuid
+from collections.abc import Mapping
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from titulospub.dados import cache
+
+MANIFESTO = "manifesto.json"
+TRAVA = "manifesto.lock"
+
+# Trava mais antiga que isso é considerada abandonada (processo encerrado)
+TRAVA_EXPIRACAO = 60.0
+
+# Versões anteriores mantidas por partição (leitores podem estar abrindo)
+MANTER_VERSOES = 2
+
+# Releituras do manifesto quando a versão lida é descartada antes de aberta
+TENTATIVAS_LEITURA = 3
+
+_TIPO_TABELAS = "tabelas"
+_TIPO_DATAS = "datas"
+_TIPO_JSON = "json"
+_TIPO_PICKLE = "pickle"
+
+
+def _formatar_data(data) -> str:
+    return pd.Timestamp(data).strftime("%Y-%m-%d")
+
+
+def _sha256(caminho: str) -> str:
+    h = hashlib.sha256()
+    with open(caminho, "rb") as f:
+        for bloco in iter(lambda: f.read(1 << 20), b""):
+            h.update(bloco)
+    return h.hexdigest()
+
+
+def _gravar_atomico(caminho: str, conteudo: bytes):
+    """Grava em um arquivo temporário e o renomeia sobre o destino."""
+    temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temporario, "wb") as f:
+        f.write(conteudo)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporario, caminho)
+
+
+def _numero_versao(nome: str) -> Optional[int]:
+    """Número da versão a partir do nome do diretório ("v3" ou "v3.<sufixo>")."""
+    if not nome.startswith("v"):
+        return None
+    try:
+        return int(nome[1:].split(".", 1)[0])
+    except ValueError:
+        return None
+
+
+def _e_json(valor) -> bool:
+    """Escalares e dicionários de escalares representáveis sem perda em JSON."""
+    if isinstance(valor, dict):
+        return all(isinstance(k, str) and _e_json(v) for k, v in valor.items())
+    return valor is None or isinstance(valor, (bool, int, float, str))
+
+
+# ==================== COLUNAS ====================
+
+def _gravar_coluna(caminho: str, valores: np.ndarray) -> dict:
+    """Grava uma coluna em .npy e retorna o seu esquema."""
+    valores = np.asarray(valores)
+    if valores.dtype.metadata is not None:
+        # Metadados do dtype (ex.: datetime64 do pandas) não vão para o .npy
+        valores = valores.view(np.dtype(valores.dtype.str))
+    esquema = {"dtype": str(valores.dtype), "objeto": False}
+    if valores.dtype == object:
+        if all(isinstance(v, str) for v in valores):
+            # Textos como unicode de tamanho fixo (mapeável em memória)
+            valores = valores.astype(str)
+        else:
+            esquema["objeto"] = True
+    np.save(caminho, valores, allow_pickle=esquema["objeto"])
+    return esquema
+
+
+def _ler_coluna(caminho: str, esquema: dict) -> np.ndarray:
+    if esquema["objeto"]:
+        return np.load(caminho, allow_pickle=True)
+    valores = np.load(caminho, mmap_mode="r")
+    if esquema["dtype"] == "object":
+        return valores.astype(object)
+    return valores
+
+
+class TabelasArmazenadas(Mapping):
+    """
+    Dicionário somente leitura de DataFrames de uma partição do armazém.
+
+    Todas as colunas da partição são abertas (mapeadas em memória) na
+    criação, e cada DataFrame é montado a partir delas no primeiro acesso.
+    Como os arquivos já estão abertos, uma versão descartada do disco por
+    gravações posteriores (ver MANTER_VERSOES) continua legível enquanto o
+    objeto existir. Em pickle (por exemplo, ao enviar um snapshot para outro
+    processo), as tabelas são serializadas já montadas, como um dicionário
+    de DataFrames: o outro processo não depende dos arquivos da versão.
+    """
+
+    def __init__(self, diretorio: str, esquema: list):
+        self._diretorio = diretorio
+        self._esquema = esquema
+        # Tabelas na ordem em que foram gravadas, com as colunas já abertas
+        self._por_nome = {tabela["nome"]: tabela for tabela in esquema}
+        self._colunas = {tabela["nome"]: self._abrir(tabela) for tabela in esquema}
+        self._tabelas: Dict[str, pd.DataFrame] = {}
+        self._lock = threading.Lock()
+
+    def _abrir(self, tabela: dict) -> tuple:
+        pasta = os.path.join(self._diretorio, tabela["pasta"])
+        colunas = {}
+        for i, coluna in enumerate(tabela["colunas"]):
+            colunas[coluna["nome"]] = _ler_coluna(os.path.join(pasta, f"c{i}.npy"), coluna)
+        indice = None
+        if tabela["indice"] is not None:
+            indice = _ler_coluna(os.path.join(pasta, "indice.npy"), tabela["indice"])
+        return colunas, indice
+
+    def _montar(self, nome: str) -> pd.DataFrame:
+        tabela = self._por_nome[nome]
+        colunas, indice = self._colunas[nome]
+        if indice is not None:
+            indice = pd.Index(indice, name=tabela["indice"]["nome"])
+        return pd.DataFrame(colunas, index=indice, columns=[c["nome"] for c in tabela["colunas"]])
+
+    def __getitem__(self, nome: str) -> pd.DataFrame:
+        try:
+            return self._tabelas[nome]
+        except KeyError:
+            pass
+        if nome not in self._por_nome:
+            raise KeyError(nome)
+        with self._lock:
+            if nome not in self._tabelas:
+                self._tabelas[nome] = self._montar(nome)
+            return self._tabelas[nome]
+
+    def __iter__(self):
+        return iter(self._por_nome)
+
+    def __len__(self) -> int:
+        return len(self._esquema)
+
+    def __reduce__(self):
+        return (dict, (dict(self.items()),))
+
+    def __repr__(self) -> str:
+        return f"TabelasArmazenadas({list(self._por_nome)}, diretorio={self._diretorio!r})"
+
+
+# ==================== ARMAZÉM ====================
+
+class ArmazemMercado:
+    """
+    Armazém de dados de mercado por (fonte, data de referência).
+    """
+
+    def __init__(self, diretorio: Optional[str] = None):
+        """
+        Inicializa o armazém.
+
+        Args:
+            diretorio: Pasta do armazém (default: "armazem" dentro de CACHE_DIR)
+        """
+        self._diretorio = diretorio or os.path.join(cache.CACHE_DIR, "armazem")
+        self._lock = threading.Lock()
+        # Manifesto já lido, identificado por (inode, mtime, tamanho) do arquivo
+        self._manifesto_cache = None
+
+    @property
+    def diretorio(self) -> str:
+        """Pasta do armazém."""
+        return self._diretorio
+
+    # ==================== MANIFESTO ====================
+
+    @contextmanager
+    def _trava(self):
+        """
+        Trava exclusiva do manifesto, entre threads e entre processos.
+
+        O arquivo de trava é criado com O_EXCL; quem não consegue criá-lo
+        espera. Uma trava mais antiga que TRAVA_EXPIRACAO é removida.
+        """
+        caminho = os.path.join(self._diretorio, TRAVA)
+        with self._lock:
+            os.makedirs(self._diretorio, exist_ok=True)
+            while True:
+                try:
+                    fd = os.open(caminho, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                    break
+                except FileExistsError:
+                    try:
+                        if time.time() - os.path.getmtime(caminho) > TRAVA_EXPIRACAO:
+                            os.remove(caminho)
+                            continue
+                    except OSError:
+                        continue
+                    time.sleep(0.01)
+            try:
+                os.write(fd, str(os.getpid()).encode())
+                os.close(fd)
+                yield
+            finally:
+                try:
+                    os.remove(caminho)
+                except OSError:
+                    pass
+
+    def _ler_manifesto(self) -> dict:
+        """
+        Manifesto lido do disco, reaproveitado enquanto o arquivo não mudar.
+
+        O dicionário devolvido é compartilhado e não deve ser alterado.
+        """
+        caminho = os.path.join(self._diretorio, MANIFESTO)
+        try:
+            info = os.stat(caminho)
+        except FileNotFoundError:
+            return {"versao": 0, "particoes": {}}
+        chave = (info.st_ino, info.st_mtime_ns, info.st_size)
+        em_cache = self._manifesto_cache
+        if em_cache is not None and em_cache[0] == chave:
+            return em_cache[1]
+        with open(caminho, "r", encoding="utf-8") as f:
+            manifesto = json.load(f)
+        self._manifesto_cache = (chave, manifesto)
+        return manifesto
+
+    def manifesto(self) -> dict:
+        """
+        Conteúdo do manifesto.
+
+        Returns:
+            Dicionário com versao (contador global de gravações) e
+            particoes ({fonte: {data: metadados}})
+        """
+        return json.loads(json.dumps(self._ler_manifesto()))
+
+    def _gravar_manifesto(self, manifesto: dict):
+        conteudo = json.dumps(manifesto, ensure_ascii=False, indent=1, sort_keys=True).encode("utf-8")
+        _gravar_atomico(os.path.join(self._diretorio, MANIFESTO), conteudo)
+
+    def _particao(self, fonte: str, data=None, ate: bool = False) -> Optional[dict]:
+        """
+        Metadados da partição: a mais recente se data for None; com ate=True,
+        a mais recente até a data (inclusive).
+        """
+        particoes = self._ler_manifesto()["particoes"].get(fonte, {})
+        if not particoes:
+            return None
+        if data is None:
+            return particoes[max(particoes)]
+        chave = _formatar_data(data)
+        if ate:
+            anteriores = [d for d in particoes if d <= chave]
+            return particoes[max(anteriores)] if anteriores else None
+        return particoes.get(chave)
+
+    def datas(self, fonte: str) -> List[pd.Timestamp]:
+        """
+        Datas de referência gravadas para a fonte, em ordem crescente.
+
+        Args:
+            fonte: Nome da fonte (ex.: "anbimas")
+
+        Returns:
+            Lista de datas
+        """
+        return [pd.Timestamp(d) for d in sorted(self._ler_manifesto()["particoes"].get(fonte, {}))]
+
+    # ==================== GRAVAÇÃO ====================
+
+    def gravar(self, fonte: str, data, valor) -> int:
+        """
+        Grava o valor da fonte na data de referência como uma nova versão.
+
+        Args:
+            fonte: Nome da fonte (ex.: "anbimas")
+            data: Data de referência dos dados
+            valor: Dicionário de DataFrames, lista de datas, escalar ou
+                dicionário de escalares (outros tipos são gravados em pickle)
+
+        Returns:
+            Versão da partição gravada
+        """
+        data = _formatar_data(data)
+        pasta_data = os.path.join(self._diretorio, fonte, data)
+        sufixo = uuid.uuid4().hex[:12]
+
+        # Os arquivos são gravados fora da trava, em uma pasta exclusiva
+        temporario = os.path.join(pasta_data, f".{sufixo}.tmp")
+        os.makedirs(temporario)
+        try:
+            tipo, esquema = self._gravar_valor(temporario, valor)
+            arquivos = {}
+            for raiz, _, nomes in os.walk(temporario):
+                for nome in nomes:
+                    caminho = os.path.join(raiz, nome)
+                    arquivos[os.path.relpath(caminho, temporario).replace(os.sep, "/")] = _sha256(caminho)
+
+            with self._trava():
+                manifesto = self.manifesto()
+                particoes = manifesto["particoes"].setdefault(fonte, {})
+                anterior = particoes.get(data)
+                versao = anterior["versao"] + 1 if anterior else 1
+
+                relativo = os.path.join(fonte, data, f"v{versao}.{sufixo}")
+                os.replace(temporario, os.path.join(self._diretorio, relativo))
+
+                manifesto["versao"] += 1
+                particoes[data] = {
+                    "versao": versao,
+                    "caminho": relativo.replace(os.sep, "/"),
+                    "tipo": tipo,
+                    ("valor" if tipo == _TIPO_JSON else "esquema"): esquema,
+                    "arquivos": arquivos,
+                    "gravado_em": datetime.now().isoformat(timespec="seconds"),
+                }
+                self._gravar_manifesto(manifesto)
+                self._descartar_versoes(fonte, data, versao)
+                return versao
+        finally:
+            shutil.rmtree(temporario, ignore_errors=True)
+
+    def _gravar_valor(self, pasta: str, valor):
+        """
+        Grava o valor na pasta e retorna (tipo, esquema). Para o tipo JSON,
+        o "esquema" é o próprio valor.
+        """
+        if isinstance(valor, Mapping) and valor and all(isinstance(v, pd.DataFrame) for v in valor.values()):
+            esquema = []
+            for i, (nome, df) in enumerate(valor.items()):
+                subpasta = f"t{i}"
+                os.makedirs(os.path.join(pasta, subpasta))
+                colunas = []
+                for j, coluna in enumerate(df.columns):
+                    info = _gravar_coluna(os.path.join(pasta, subpasta, f"c{j}.npy"), df[coluna].to_numpy())
+                    colunas.append({"nome": coluna, **info})
+                indice = None
+                if not df.index.equals(pd.RangeIndex(len(df))):
+                    indice = {"nome": df.index.name,
+                              **_gravar_coluna(os.path.join(pasta, subpasta, "indice.npy"), df.index.to_numpy())}
+                esquema.append({"nome": nome, "pasta": subpasta, "colunas": colunas, "indice": indice})
+            return _TIPO_TABELAS, esquema
+
+        if isinstance(valor, list) and valor and all(isinstance(v, pd.Timestamp) for v in valor):
+            np.save(os.path.join(pasta, "datas.npy"), pd.DatetimeIndex(valor).to_numpy())
+            return _TIPO_DATAS, None
+
+        if _e_json(valor):
+            return _TIPO_JSON, valor
+
+        with open(os.path.join(pasta, "valor.pkl"), "wb") as f:
+            pickle.dump(valor, f)
+        return _TIPO_PICKLE, None
+
+    def _descartar_versoes(self, fonte: str, data: str, versao: int):
+        """Remove versões antigas da partição (ignora arquivos em uso)."""
+        pasta_data = os.path.join(self._diretorio, fonte, data)
+        for nome in os.listdir(pasta_data):
+            antiga = _numero_versao(nome)
+            if antiga is not None and antiga <= versao - MANTER_VERSOES:
+                shutil.rmtree(os.path.join(pasta_data, nome), ignore_errors=True)
+
+    # ==================== LEITURA ====================
+
+    def ler(self, fonte: str, data=None, ate: bool = False):
+        """
+        Lê a versão corrente da partição.
+
+        Args:
+            fonte: Nome da fonte (ex.: "anbimas")
+            data: Data de referência (default: a mais recente gravada)
+            ate: Se True, usa a partição mais recente até a data (inclusive),
+                para fontes que valem até a próxima publicação (ex.: CDI)
+
+        Returns:
+            Valor gravado (tabelas são devolvidas como TabelasArmazenadas),
+            ou None se a partição não existir
+        """
+        # A versão lida no manifesto pode ser descartada por gravações
+        # concorrentes antes de aberta: relê o manifesto e tenta de novo
+        for tentativa in range(TENTATIVAS_LEITURA):
+            particao = self._particao(fonte, data, ate)
+            if particao is None:
+                return None
+            try:
+                return self._ler_valor(particao)
+            except FileNotFoundError:
+                if tentativa == TENTATIVAS_LEITURA - 1:
+                    raise
+
+    def _ler_valor(self, particao: dict):
+        pasta = os.path.join(self._diretorio, particao["caminho"])
+        tipo = particao["tipo"]
+        if tipo == _TIPO_TABELAS:
+            return TabelasArmazenadas(pasta, particao["esquema"])
+        if tipo == _TIPO_DATAS:
+            return list(pd.DatetimeIndex(np.load(os.path.join(pasta, "datas.npy"))))
+        if tipo == _TIPO_JSON:
+            return particao["valor"]
+        with open(os.path.join(pasta, "valor.pkl"), "rb") as f:
+            return pickle.load(f)
+
+    def verificar(self, fonte: str, data=None) -> bool:
+        """
+        Confere os arquivos da partição com os checksums do manifesto.
+
+        Args:
+            fonte: Nome da fonte
+            data: Data de referência (default: a mais recente gravada)
+
+        Returns:
+            True se todos os arquivos existirem e tiverem o SHA-256 registrado
+        """
+        particao = self._particao(fonte, data)
+        if particao is None:
+            return False
+        pasta = os.path.join(self._diretorio, particao["caminho"])
+        for relativo, esperado in particao["arquivos"].items():
+            caminho = os.path.join(pasta, relativo)
+            if not os.path.exists(caminho) or _sha256(caminho) != esperado:
+                return False
+        return True
+
+    # ==================== REMOÇÃO ====================
+
+    def remover(self, fonte: str, data=None):
+        """
+        Remove partições da fonte.
+
+        Args:
+            fonte: Nome da fonte
+            data: Data de referência (default: todas as datas da fonte)
+        """
+        with self._trava():
+            manifesto = self.manifesto()
+            particoes = manifesto["particoes"].get(fonte, {})
+            datas = list(particoes) if data is None else [_formatar_data(data)]
+            for d in datas:
+                if particoes.pop(d, None) is not None:
+                    manifesto["versao"] += 1
+            if not particoes:
+                manifesto["particoes"].pop(fonte, None)
+            if os.path.exists(os.path.join(self._diretorio, MANIFESTO)):
+                self._gravar_manifesto(manifesto)
+            for d in datas:
+                shutil.rmtree(os.path.join(self._diretorio, fonte, d), ignore_errors=True)
+
+
+# Armazéns por diretório (CACHE_DIR pode ser alterado em tempo de execução)
+_armazens: Dict[str, ArmazemMercado] = {}
+_lock_armazens = threading.Lock()
+
+
+def get_armazem() -> ArmazemMercado:
+    """Retorna o armazém da pasta de cache corrente (CACHE_DIR)."""
+    diretorio = os.path.join(cache.CACHE_DIR, "armazem")
+    with _lock_armazens:
+        if diretorio not in _armazens:
+            _armazens[diretorio] = ArmazemMercado(diretorio)
+        return _armazens[diretorio]
@@ -1,26 +1,34 @@
+import io
+
 import pandas as pd
 
+from titulospub.scraping.gravacao import ler_arquivo
 from titulospub.utils.datas import adicionar_dias_uteis, e_dia_util
 
 
+def _ler_excel(caminho, **kwargs) -> pd.DataFrame:
+    """Lê a planilha de backup (gravada/reproduzida quando a gravação está ligada)."""
+    return pd.read_excel(io.BytesIO(ler_arquivo(caminho, tipo="backup")), **kwargs)
+
+
 def backup_cdi():
-    cdi_df  = pd.read_excel(r"Z:\Chila\projetos\calculadora_titulos_publicos\titulospub\dados\backup_excel\cdi.xlsx")
+    cdi_df  = _ler_excel(r"Z:\Chila\projetos\calculadora_titulos_publicos\titulospub\dados\backup_excel\cdi.xlsx")
     cdi_float = float(cdi_df.iloc[0,0])
     return cdi_float
 
 def backup_ipca_proj():
-    ipca_proj_df  = pd.read_excel(r"Y:\Applications_TulletPrebon\Applications\projetos-rendafixa\calculadora_titulos_publicos\titulospub\dados\backup_excel\ipca_proj.xlsx")
+    ipca_proj_df  = _ler_excel(r"Y:\Applications_TulletPrebon\Applications\projetos-rendafixa\calculadora_titulos_publicos\titulospub\dados\backup_excel\ipca_proj.xlsx")
     ipca_proj_float = float(ipca_proj_df.iloc[0,0])
     return ipca_proj_float
 
 def backup_feriados():
-    feriados_df = pd.read_excel(r"Z:\Chila\projetos\calculadora_titulos_publicos\titulospub\dados\backup_excel\feriados.xlsx")
+    feriados_df = _ler_excel(r"Z:\Chila\projetos\calculadora_titulos_publicos\titulospub\dados\backup_excel\feriados.xlsx")
     feriados_df["Feriados"] = pd.to_datetime(feriados_df["FERIADOS"])
     feriados_list = feriados_df["FERIADOS"].tolist()
     return feriados_list
 
 def backup_ipca_fechado():
-    ipca_fechado_df = pd.read_excel(r"Y:\Applications_TulletPrebon\Applications\projetos-rendafixa\calculadora_titulos_publicos\titulospub\dados\backup_excel\ipca_fechado.xlsx")
+    ipca_fechado_df = _ler_excel(r"Y:\Applications_TulletPrebon\Applications\projetos-rendafixa\calculadora_titulos_publicos\titulospub\dados\backup_excel\ipca_fechado.xlsx")
     ipca_fechado_df["DATA"] = ipca_fechado_df["DATA"].astype(str)
     ipca_fechado_df["DATA_CODIGO"] = ipca_fechado_df["DATA_CODIGO"].astype(str)
     ipca_fechado_df["MEDIDA"] = ipca_fechado_df["MEDIDA"].astype(str)
@@ -28,7 +36,7 @@ def backup_ipca_fechado():
     return ipca_fechado_df
 
 def backup_anbimas():
-    anbimas_df = pd.read_excel(r"Z:\Chila\projetos\calculadora_titulos_publicos\titulospub\dados\backup_excel\anbimas.xlsx")  
+    anbimas_df = _ler_excel(r"Z:\Chila\projetos\calculadora_titulos_publicos\titulospub\dados\backup_excel\anbimas.xlsx")  
     anbimas_df = anbimas_df.drop(index=0)
     anbimas_df = anbimas_df[["Código SELIC", "Data de Vencimento", "Tx. Indicativas", "PU"]]
 
@@ -61,9 +69,9 @@ def backup_anbimas():
 
 
 def backup_bmf():
-    bmf_di_df = pd.read_excel(r"Z:\Chila\projetos\calculadora_titulos_publicos\titulospub\dados\backup_excel\bmf.xlsx",
+    bmf_di_df = _ler_excel(r"Z:\Chila\projetos\calculadora_titulos_publicos\titulospub\dados\backup_excel\bmf.xlsx",
                            sheet_name="DI")
-    bmf_dap_df = pd.read_excel(r"Z:\Chila\projetos\calculadora_titulos_publicos\titulospub\dados\backup_excel\bmf.xlsx",
+    bmf_dap_df = _ler_excel(r"Z:\Chila\projetos\calculadora_titulos_publicos\titulospub\dados\backup_excel\bmf.xlsx",
                            sheet_name="DAP")
     
     bmf_dict = {"DI": bmf_di_df, "DAP": bmf_dap_df}
@@ -0,0 +1,162 @@
+"""
+Benchmark da atualização das variáveis de mercado com dados gravados.
+
+gravar_atualizacao roda atualizar_tudo uma vez com a gravação ligada (ver
+titulospub.scraping.gravacao), salvando o conteúdo bruto de todas as
+fontes; medir_atualizacao roda atualizar_tudo várias vezes reproduzindo
+essas gravações, sem internet nem compartilhamento de rede, e mede o tempo
+de ponta a ponta (download reproduzido, interpretação e gravação no
+armazém) e por fonte.
+
+As atualizações usam um VariaveisMercado fixado na data de referência da
+gravação (as URLs de ANBIMA, BMF e VNA LFT dependem da data), gravando em
+um armazém temporário e sem publicar snapshot: o cache local e os
+snapshots do processo não são alterados.
+
+Uso apenas pela linha de comando: enquanto roda, o benchmark troca estados
+globais do processo, o gravador ativo (gravacao()), o cliente HTTP
+compartilhado (usar_cliente, um cliente novo a cada atualização) e, sem
+verbose, o sys.stdout. Não chame estas funções dentro do processo da API
+ou do Dash: as requisições concorrentes usariam o gravador e o cliente do
+benchmark.
+
+Uso:
+    python -m titulospub.dados.benchmark_atualizacao gravar gravacoes/
+    python -m titulospub.dados.benchmark_atualizacao reproduzir gravacoes/ --repeticoes 5 --latencia 0.05
+"""
+
+import contextlib
+import io
+import json
+import os
+import statistics
+import tempfile
+import time
+from typing import Dict, Optional
+
+import pandas as pd
+
+from titulospub.dados.armazem import ArmazemMercado
+from titulospub.dados.orquestrador import VariaveisMercado
+from titulospub.scraping.gravacao import MODO_GRAVAR, MODO_REPRODUZIR, gravacao
+from titulospub.scraping.requisicoes import ClienteHTTP, usar_cliente
+
+# Metadados da gravação (data de referência)
+ARQUIVO_GRAVACAO = "gravacao.json"
+
+
+@contextlib.contextmanager
+def _armazem_temporario():
+    """Armazém em uma pasta temporária, removida ao final do bloco."""
+    with tempfile.TemporaryDirectory(prefix="titulospub_benchmark_") as diretorio:
+        yield ArmazemMercado(os.path.join(diretorio, "armazem"))
+
+
+def _atualizar(data_referencia: pd.Timestamp, armazem: ArmazemMercado,
+               timeouts: Optional[Dict[str, float]], verbose: bool) -> dict:
+    """
+    Uma atualização completa, sem publicar snapshot. Troca o cliente HTTP
+    compartilhado por um novo (e, sem verbose, o sys.stdout) durante a
+    atualização.
+    """
+    cliente = ClienteHTTP()
+    saida = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    try:
+        with saida, usar_cliente(cliente):
+            vm = VariaveisMercado(data_referencia=data_referencia, armazem=armazem, fontes_correntes=True)
+            return vm.atualizar_tudo(verbose=verbose, timeouts=timeouts, publicar=False)
+    finally:
+        cliente.sessao.close()
+
+
+def gravar_atualizacao(diretorio: str, data_referencia=None, verbose: bool = False) -> dict:
+    """
+    Grava o conteúdo bruto de todas as fontes de uma atualização.
+
+    Args:
+        diretorio: Pasta das gravações
+        data_referencia: Data de referência dos dados (default: hoje)
+        verbose: Se True, mostra as mensagens da atualização
+
+    Returns:
+        Relatório da atualização por fonte (ver atualizar_tudo)
+    """
+    data_referencia = (pd.to_datetime(data_referencia).normalize() if data_referencia is not None
+                       else pd.Timestamp.today().normalize())
+    with _armazem_temporario() as armazem, gravacao(MODO_GRAVAR, diretorio):
+        relatorio = _atualizar(data_referencia, armazem, None, verbose)
+
+    with open(os.path.join(diretorio, ARQUIVO_GRAVACAO), "w", encoding="utf-8") as f:
+        json.dump({"data_referencia": data_referencia.strftime("%Y-%m-%d")}, f)
+    return relatorio
+
+
+def medir_atualizacao(diretorio: str, repeticoes: int = 3, latencia=0.0, data_referencia=None,
+                      timeouts: Optional[Dict[str, float]] = None, verbose: bool = False) -> dict:
+    """
+    Mede atualizar_tudo reproduzindo as gravações.
+
+    Args:
+        diretorio: Pasta das gravações (ver gravar_atualizacao)
+        repeticoes: Número de atualizações medidas
+        latencia: Atraso (segundos) de cada leitura reproduzida, ou {tipo: segundos}
+        data_referencia: Data de referência (default: a da gravação)
+        timeouts: Timeouts por fonte (ver atualizar_tudo)
+        verbose: Se True, mostra as mensagens da atualização
+
+    Returns:
+        Dicionário com data_referencia, repeticoes, tempos (s), media,
+        minimo, maximo, atualizacoes_por_minuto e fontes ({fonte: tempo
+        médio e último status})
+    """
+    if repeticoes < 1:
+        raise ValueError("repeticoes deve ser pelo menos 1")
+    if data_referencia is None:
+        with open(os.path.join(diretorio, ARQUIVO_GRAVACAO), "r", encoding="utf-8") as f:
+            data_referencia = json.load(f)["data_referencia"]
+    data_referencia = pd.to_datetime(data_referencia).normalize()
+
+    tempos = []
+    relatorios = []
+    with _armazem_temporario() as armazem, gravacao(MODO_REPRODUZIR, diretorio, latencia=latencia):
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            relatorios.append(_atualizar(data_referencia, armazem, timeouts, verbose))
+            tempos.append(time.perf_counter() - inicio)
+
+    media = statistics.fmean(tempos)
+    return {
+        "data_referencia": data_referencia.strftime("%Y-%m-%d"),
+        "repeticoes": repeticoes,
+        "tempos": [round(t, 4) for t in tempos],
+        "media": round(media, 4),
+        "minimo": round(min(tempos), 4),
+        "maximo": round(max(tempos), 4),
+        "atualizacoes_por_minuto": round(60 / media, 2) if media > 0 else None,
+        "fontes": {
+            fonte: {
+                "media": round(statistics.fmean(r[fonte]["tempo"] for r in relatorios), 4),
+                "status": relatorios[-1][fonte]["status"],
+            }
+            for fonte in relatorios[-1]
+        },
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Benchmark da atualização com dados gravados')
+    parser.add_argument('acao', choices=['gravar', 'reproduzir'], help='Ação: gravar ou reproduzir')
+    parser.add_argument('diretorio', help='Pasta das gravações')
+    parser.add_argument('--data', help='Data de referência (default: hoje ao gravar, a da gravação ao reproduzir)')
+    parser.add_argument('--repeticoes', type=int, default=3, help='Atualizações medidas (apenas reproduzir)')
+    parser.add_argument('--latencia', type=float, default=0.0, help='Atraso por leitura reproduzida, em segundos')
+    parser.add_argument('--verbose', action='store_true', help='Mostra as mensagens da atualização')
+    args = parser.parse_args()
+
+    if args.acao == 'gravar':
+        resultado = gravar_atualizacao(args.diretorio, data_referencia=args.data, verbose=args.verbose)
+    else:
+        resultado = medir_atualizacao(args.diretorio, repeticoes=args.repeticoes, latencia=args.latencia,
+                                      data_referencia=args.data, verbose=args.verbose)
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
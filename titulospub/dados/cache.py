@@ -8,8 +8,11 @@ def save_cache(data, filename):
     # Cria a pasta cache_data se não existir
     os.makedirs(CACHE_DIR, exist_ok=True)
     filepath = os.path.join(CACHE_DIR, filename)
-    with open(filepath, 'wb') as f:
+    # Grava em um arquivo temporário e renomeia: leitores nunca veem o arquivo pela metade
+    temporario = f"{filepath}.{os.getpid()}.tmp"
+    with open(temporario, 'wb') as f:
         pickle.dump(data, f)
+    os.replace(temporario, filepath)
 
 
 def load_cache(filename):
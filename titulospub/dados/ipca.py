@@ -1,15 +1,12 @@
 from titulospub.scraping.sidra_scraping import puxar_valores_ipca_fechado
 from titulospub.scraping.anbima_scraping import scrap_proj_ipca
 from titulospub.utils.datas import e_dia_util, adicionar_dias_uteis
+from titulospub.utils.carregamento_var_globais import _carregar_feriados_se_necessario
 import pandas as pd
 from typing import Union
 
 def inicio_fim_mes_ipca(data: pd.Timestamp, feriados=None) -> tuple:
-    # Converte feriados para numpy.datetime64[D] se não for None
-    if feriados is None:
-        from titulospub.dados.orquestrador import VariaveisMercado
-        vm = VariaveisMercado()
-        feriados = vm.get_feriados()
+    feriados = _carregar_feriados_se_necessario(feriados)
 
     # Criar dicionário com os dias 15 relevantes
     dia_15_dict = {
@@ -40,10 +37,7 @@ def inicio_fim_mes_ipca(data: pd.Timestamp, feriados=None) -> tuple:
 
 def dicionario_ipca(data: pd.Timestamp, ipca_fechado_df: pd.DataFrame, ipca_proj_float:float, feriados=None):
 
-    if feriados is None:
-        from titulospub.dados.orquestrador import VariaveisMercado
-        vm = VariaveisMercado()
-        feriados = vm.get_feriados()
+    feriados = _carregar_feriados_se_necessario(feriados)
     
     #Checando qual o ipca utilizado na data atual
     #Calculando o dia 15 do mes atual
@@ -75,10 +69,7 @@ def dicionario_ipca(data: pd.Timestamp, ipca_fechado_df: pd.DataFrame, ipca_proj
 '''
 def dicionario_ipca(data, feriados=None):
 
-    if feriados is None:
-        from titulospub.dados.orquestrador import VariaveisMercado
-        vm = VariaveisMercado()
-        feriados = vm.get_feriados()
+    feriados = _carregar_feriados_se_necessario(feriados)
     
     #Aplicando a função para Pxar os valores do IPCA Fechado
     ipca_fechado_df = puxar_valores_ipca_fechado()
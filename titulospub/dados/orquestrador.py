@@ -1,7 +1,11 @@
 import os
+import queue
+import threading
+import time
 
 import pandas as pd
 
+from titulospub.dados import cache
 from titulospub.dados.anbimas import anbimas
 from titulospub.dados.backup import (
     backup_anbimas,
@@ -12,7 +16,8 @@ from titulospub.dados.backup import (
     backup_ipca_proj,
 )
 from titulospub.dados.bmf import ajustes_bmf, ajustes_bmf_net
-from titulospub.dados.cache import clear_cache, load_cache, save_cache
+from titulospub.dados.armazem import get_armazem
+from titulospub.dados.cache import clear_cache, load_cache
 from titulospub.dados.ipca import dicionario_ipca
 from titulospub.scraping import scrap_bmf_net
 from titulospub.scraping.anbima_scraping import (
@@ -22,26 +27,135 @@ from titulospub.scraping.anbima_scraping import (
     scrap_proj_ipca,
     scrap_vna_lft,
 )
+from titulospub.scraping.requisicoes import rodada
 from titulospub.scraping.sidra_scraping import puxar_valores_ipca_fechado
+from titulospub.utils.calendario import Calendario
 from titulospub.utils.datas import adicionar_dias_uteis
 
 
+# Fontes gravadas no armazém (no cache pickle legado, "<fonte>.pkl")
+FONTES_ARMAZEM = ("feriados", "ipca_dict", "cdi", "vna_lft", "anbimas", "bmf")
+
+# Dependências entre as fontes na atualização (o IPCA e a data D-1 de
+# ANBIMA/BMF usam o calendário de feriados)
+DEPENDENCIAS_ATUALIZACAO = {
+    "feriados": (),
+    "ipca_dict": ("feriados",),
+    "cdi": (),
+    "vna_lft": (),
+    "anbimas": ("feriados",),
+    "bmf": ("feriados",),
+}
+
+# Tempo máximo (segundos) de atualização de cada fonte
+TIMEOUTS_ATUALIZACAO = {
+    "feriados": 30.0,
+    "ipca_dict": 60.0,
+    "cdi": 30.0,
+    "vna_lft": 30.0,
+    "anbimas": 60.0,
+    "bmf": 90.0,
+}
+
+
+class DadosHistoricosIndisponiveisError(LookupError):
+    """Erro levantado quando a fonte de uma data passada não está no armazém
+    e só pode ser buscada com os dados correntes (ou de backup)."""
+
+
 class VariaveisMercado:
-    def __init__(self):
+    def __init__(self, data_referencia=None, armazem=None, fontes_correntes=False):
+        """
+        Inicializa as variáveis de mercado.
+
+        Args:
+            data_referencia: Data de referência para cálculos históricos. Se
+                informada, ANBIMA e BMF são as do dia útil anterior, IPCA e
+                VNA LFT os da data e o CDI o último gravado até a data; todos
+                são lidos do armazém. Se ausentes, só ANBIMA, BMF e VNA LFT
+                (buscados pela data) são buscados e gravados; para as demais
+                fontes, que só fornecem o dado corrente, uma data passada
+                levanta DadosHistoricosIndisponiveisError. Se None, usa os
+                dados correntes.
+            armazem: ArmazemMercado onde as fontes são lidas e gravadas
+                (default: o da pasta de cache corrente, ver get_armazem).
+                Um armazém informado não migra o cache pickle legado.
+            fontes_correntes: Se True, uma data de referência passada também
+                é buscada nas fontes correntes. Use apenas quando elas
+                reproduzem a própria data (ex.: gravações feitas na data, ver
+                benchmark_atualizacao)
+        """
+        self._armazem_informado = armazem
+        self._fontes_correntes = fontes_correntes
+        self._data_referencia = (pd.to_datetime(data_referencia).normalize()
+                                 if data_referencia is not None else None)
         self._feriados = None
+        self._calendario = None
+        self._calendario_feriados = None
         self._ipca_dict = None
         self._cdi = None
         self._vna_lft = None
         self._anbimas = None
         self._bmf = None
 
+    @property
+    def data_referencia(self):
+        """Data de referência dos dados (None para os dados correntes)."""
+        return self._data_referencia
+
+    def _armazem(self):
+        return self._armazem_informado or get_armazem()
+
+    def _ler_armazenado(self, fonte: str, data=None, ate: bool = False):
+        """
+        Lê a fonte do armazém: a partição da data informada (com ate=True, a
+        mais recente até a data) ou, sem data, a mais recente. Sem partição
+        gravada, usa o cache pickle legado ("<fonte>.pkl"), que é migrado
+        para o armazém.
+        """
+        armazem = self._armazem()
+        valor = armazem.ler(fonte, data, ate)
+        if valor is not None or data is not None or self._armazem_informado is not None:
+            return valor
+
+        legado = load_cache(f"{fonte}.pkl")
+        if legado is None:
+            return None
+        modificado = os.path.getmtime(os.path.join(cache.CACHE_DIR, f"{fonte}.pkl"))
+        armazem.gravar(fonte, pd.Timestamp.fromtimestamp(modificado).normalize(), legado)
+        return armazem.ler(fonte)
+
+    def _exigir_dado_corrente(self, fonte: str, data):
+        """
+        Impede que uma data passada seja preenchida com o dado corrente (ou
+        de backup) da fonte, o que gravaria no armazém um valor que não é o
+        da data.
+
+        Raises:
+            DadosHistoricosIndisponiveisError: Se a data de referência é
+                passada e a fonte não foi gravada para ela
+        """
+        hoje = pd.Timestamp.today().normalize()
+        if self._data_referencia is None or self._data_referencia >= hoje or self._fontes_correntes:
+            return
+        raise DadosHistoricosIndisponiveisError(
+            f"{fonte} de {pd.Timestamp(data).date()} não está no armazém e a fonte só fornece "
+            f"o dado corrente; grave a partição da data antes de consultá-la."
+        )
+
+    def _gravar_armazenado(self, fonte: str, data, valor):
+        """Grava a fonte no armazém na data de referência (default: hoje)."""
+        if data is None:
+            data = pd.Timestamp.today().normalize()
+        self._armazem().gravar(fonte, data, valor)
+
     def get_feriados(self, force_update=False):
 
         if self._feriados is not None and not force_update:
             return self._feriados
 
         if not force_update:
-            feriados = load_cache("feriados.pkl")
+            feriados = self._ler_armazenado("feriados")
             if feriados:
                 self._feriados = feriados
                 return feriados
@@ -54,16 +168,29 @@ class VariaveisMercado:
             feriados = backup_feriados()
             print("Feriados pego via backup")
         self._feriados = feriados
-        save_cache(feriados, "feriados.pkl")
+        self._gravar_armazenado("feriados", None, feriados)
         return feriados
+
+    def get_calendario(self, force_update=False):
+        """
+        Retorna o Calendario de dias úteis construído a partir dos feriados.
+        """
+        feriados = self.get_feriados(force_update=force_update)
+        if self._calendario is None or self._calendario_feriados is not feriados:
+            self._calendario = Calendario(feriados)
+            self._calendario_feriados = feriados
+        return self._calendario
     
     def get_ipca_dict(self, data=None, feriados=None, force_update=False):
 
         if self._ipca_dict is not None and not force_update:
             return self._ipca_dict
 
+        if data is None:
+            data = self._data_referencia
+
         if not force_update:
-            ipca_dict = load_cache("ipca_dict.pkl")
+            ipca_dict = self._ler_armazenado("ipca_dict", data)
             if ipca_dict is not None:
                 self._ipca_dict = ipca_dict
                 return ipca_dict
@@ -73,6 +200,7 @@ class VariaveisMercado:
 
         if data is None:
             data = pd.Timestamp.today().normalize()
+        self._exigir_dado_corrente("ipca_dict", data)
 
         try:
             print("Calculando IPCA dict...")
@@ -92,9 +220,12 @@ class VariaveisMercado:
                                         ipca_proj_float=ipca_proj_float, 
                                         feriados=feriados)
             print("ipca_proj_float e ipca_fechado_df pegos via backup")
+            # O backup não é necessariamente o da data: usado, mas não gravado
+            self._ipca_dict = ipca_dict
+            return ipca_dict
 
         self._ipca_dict = ipca_dict
-        save_cache(ipca_dict, "ipca_dict.pkl")
+        self._gravar_armazenado("ipca_dict", data, ipca_dict)
         return ipca_dict
     
     def get_cdi(self, force_update=False):
@@ -102,10 +233,11 @@ class VariaveisMercado:
             return self._cdi
         
         if not force_update:
-            cdi = load_cache("cdi.pkl")
+            cdi = self._ler_armazenado("cdi", self._data_referencia, ate=True)
             if cdi is not None:
                 self._cdi = cdi
                 return cdi
+        self._exigir_dado_corrente("cdi", self._data_referencia)
 
         try:
             print("Buscando CDI...")
@@ -117,29 +249,34 @@ class VariaveisMercado:
             print("cdi pego via backup")
             if cdi is None:
                 raise RuntimeError("[ERRO] Falha no scraping e no backup do CDI") from e
+            self._cdi = cdi
+            return cdi
 
         self._cdi = cdi
-        save_cache(cdi, "cdi.pkl")
+        self._gravar_armazenado("cdi", None, cdi)
         return cdi
     
     def get_vna_lft(self, data=None, force_update=False):
         if self._vna_lft is not None and not force_update:
             return self._vna_lft
 
+        if data is None:
+            data = self._data_referencia
+        data_referencia = data
         if data is None:
            data=pd.Timestamp.today().normalize()
 
         if not force_update:
-            cache = load_cache("vna_lft.pkl")
-            if cache is not None:
+            armazenado = self._ler_armazenado("vna_lft", data_referencia)
+            if armazenado is not None:
                 print("[OK] Usando cache existente de VNA_LFT completo.")
-                self._vna_lft = cache
-                return cache
+                self._vna_lft = armazenado
+                return armazenado
 
         try:
             print("Realizando scraping VNA_LFT...")
             vna_lft = scrap_vna_lft(data=data)
-            save_cache(vna_lft, "vna_lft.pkl")
+            self._gravar_armazenado("vna_lft", data, vna_lft)
             print("[OK] Cache salvo para VNA_LFT.")
             self._vna_lft = vna_lft
             return vna_lft
@@ -154,16 +291,19 @@ class VariaveisMercado:
         if self._anbimas and not force_update:
             return self._anbimas
 
+        if data is None and self._data_referencia is not None:
+            data = adicionar_dias_uteis(data=self._data_referencia, n_dias=-1, feriados=self.get_calendario())
+        data_referencia = data
         if data is None:
             data = adicionar_dias_uteis(data=pd.Timestamp.today().normalize(),
-                                        n_dias=-1)
+                                        n_dias=-1, feriados=self.get_calendario())
 
         if not force_update:
-            cache = load_cache("anbimas.pkl")
-            if cache is not None:
+            armazenado = self._ler_armazenado("anbimas", data_referencia)
+            if armazenado is not None:
                 print("[OK] Usando cache existente de ANBIMAS completo.")
-                self._anbimas = cache
-                return cache
+                self._anbimas = armazenado
+                return armazenado
 
         try:
             print("Realizando scraping ANBIMA...")
@@ -171,12 +311,12 @@ class VariaveisMercado:
             anbimas_dict = anbimas(df_anbima)
         except Exception as e:
             print(f"[ERRO] Erro ao fazer scraping/parsing ANBIMA: {e}")
-            # Aqui pode colocar fallback via backup_anbimas()
-            anbimas_dict = backup_anbimas()
-            #self._anbimas = {}
-            #return {}
+            self._exigir_dado_corrente("anbimas", data)
+            # O backup não é necessariamente o da data: usado, mas não gravado
+            self._anbimas = backup_anbimas()
+            return self._anbimas
 
-        save_cache(anbimas_dict, "anbimas.pkl")
+        self._gravar_armazenado("anbimas", data, anbimas_dict)
         print("[OK] Cache salvo para todos os títulos ANBIMA.")
 
         self._anbimas = anbimas_dict
@@ -186,70 +326,210 @@ class VariaveisMercado:
         if self._bmf and not force_update:
             return self._bmf
 
+        if data is None and self._data_referencia is not None:
+            data = adicionar_dias_uteis(data=self._data_referencia, n_dias=-1, feriados=self.get_calendario())
+        data_referencia = data
         if data is None:
             data = adicionar_dias_uteis(data=pd.Timestamp.today().normalize(),
-                                        n_dias=-1)
+                                        n_dias=-1, feriados=self.get_calendario())
 
         if not force_update:
-            cache = load_cache("bmf.pkl")
-            if cache is not None:
+            armazenado = self._ler_armazenado("bmf", data_referencia)
+            if armazenado is not None:
                 print("[OK] Usando cache existente de BMF completo.")
-                self._bmf = cache
-                return cache
+                self._bmf = armazenado
+                return armazenado
         
         try:
             print("Realizando scraping BMF...")
             df_bmf = ajustes_bmf(data=data)
         except Exception as e:
+            self._exigir_dado_corrente("bmf", data)
             try:
                 bmf_dict = scrap_bmf_net()
                 df_bmf = ajustes_bmf_net(bmf_dict=bmf_dict, data=data)
                 print(f"[ERRO] Erro ao fazer scraping/parsing BMF, buscando da net: {e}")
             except:
                 print(f"[ERRO] Erro ao fazer scraping/parsing BMF, biscando do excel backup: {e}")
-                # Aqui pode colocar fallback via backup_anbimas()
                 df_bmf = backup_bmf()
-            
+            # Os ajustes da net (últimos publicados) e o backup não são
+            # necessariamente os da data: usados, mas não gravados
+            self._bmf = df_bmf
+            return df_bmf
 
-        save_cache(df_bmf, "bmf.pkl")
+        self._gravar_armazenado("bmf", data, df_bmf)
         print("[OK] Cache salvo para todos os contrados de DI e DAP.")
 
         self._bmf = df_bmf
         return df_bmf
 
-    def atualizar_tudo(self, verbose=True):
+    def _restaurar_armazenado(self, fonte: str) -> bool:
+        """Usa a última versão gravada da fonte até a data de referência (fallback da atualização)."""
+        valor = self._ler_armazenado(fonte, self._data_referencia, ate=True)
+        if valor is None:
+            return False
+        setattr(self, f"_{fonte}", valor)
+        return True
+
+    def _copia_para_atualizacao(self) -> "VariaveisMercado":
+        """
+        Instância vazia com o mesmo armazém, data de referência e feriados,
+        em que uma fonte é buscada sem alterar esta instância.
         """
-        Força a atualização de todas as variáveis de mercado.
-        Faz fallback automático em caso de erro.
+        copia = type(self)(self._data_referencia, armazem=self._armazem_informado,
+                           fontes_correntes=self._fontes_correntes)
+        copia._feriados = self._feriados
+        copia._calendario = self._calendario
+        copia._calendario_feriados = self._calendario_feriados
+        return copia
+
+    def _atualizar_fontes(self, fontes, timeouts) -> dict:
+        """
+        Atualiza as fontes em paralelo, respeitando DEPENDENCIAS_ATUALIZACAO.
+
+        Cada fonte roda em sua própria thread assim que as fontes de que
+        depende terminam, buscando em uma cópia da instância. Se a
+        atualização falhar ou passar do timeout, a fonte usa a última versão
+        gravada no armazém. Uma busca que termine depois do timeout só grava
+        no armazém (para a próxima carga): o valor desta instância continua
+        o do fallback já reportado.
+        """
+        concluidas = queue.Queue()
+        relatorio = {}
+        pendentes = list(fontes)
+        em_execucao = {}  # fonte -> (início, limite)
+        lock = threading.Lock()
+        resolvidas = set()  # terminaram no prazo (resultado já na fila)
+        expiradas = set()   # passaram do timeout
+
+        def executar(fonte):
+            inicio = time.perf_counter()
+            with lock:
+                copia = self._copia_para_atualizacao()
+            erro = valor = None
+            try:
+                valor = getattr(copia, f"get_{fonte}")(force_update=True)
+            except Exception as e:
+                erro = e
+            with lock:
+                if fonte in expiradas:
+                    return
+                if erro is None:
+                    setattr(self, f"_{fonte}", valor)
+                resolvidas.add(fonte)
+            concluidas.put((fonte, erro, time.perf_counter() - inicio))
+
+        def concluir(fonte, status, tempo, erro=None):
+            fallback = status != "ok" and self._restaurar_armazenado(fonte)
+            relatorio[fonte] = {
+                "status": status,
+                "tempo": round(tempo, 3),
+                "fallback": "armazem" if fallback else None,
+                "erro": None if erro is None else str(erro),
+            }
+
+        while pendentes or em_execucao:
+            for fonte in list(pendentes):
+                dependencias = [d for d in DEPENDENCIAS_ATUALIZACAO[fonte] if d in fontes]
+                if all(d in relatorio for d in dependencias):
+                    pendentes.remove(fonte)
+                    inicio = time.monotonic()
+                    em_execucao[fonte] = (inicio, inicio + timeouts[fonte])
+                    threading.Thread(target=executar, args=(fonte,), daemon=True,
+                                     name=f"atualizar-{fonte}").start()
+
+            with lock:
+                limites = [limite for fonte, (_, limite) in em_execucao.items() if fonte not in resolvidas]
+            espera = max(0.0, min(limites) - time.monotonic()) if limites else None
+            try:
+                fonte, erro, tempo = concluidas.get(timeout=espera)
+            except queue.Empty:
+                agora = time.monotonic()
+                with lock:
+                    vencidas = [fonte for fonte, (_, limite) in em_execucao.items()
+                                if limite <= agora and fonte not in resolvidas]
+                    expiradas.update(vencidas)
+                for fonte in vencidas:
+                    inicio, _ = em_execucao.pop(fonte)
+                    concluir(fonte, "timeout", agora - inicio,
+                             TimeoutError(f"{fonte} não atualizou em {timeouts[fonte]:g}s"))
+                continue
+
+            del em_execucao[fonte]
+            concluir(fonte, "ok" if erro is None else "erro", tempo, erro)
+
+        return {fonte: relatorio[fonte] for fonte in fontes}
+
+    def atualizar_tudo(self, verbose=True, timeouts=None, publicar=True):
+        """
+        Força a atualização de todas as variáveis de mercado e publica um novo
+        snapshot do processo.
+
+        As fontes independentes são buscadas em paralelo (o IPCA e ANBIMA/BMF
+        esperam os feriados), de modo que o tempo total é limitado pela fonte
+        mais lenta. Cada fonte tem seu próprio timeout; em caso de erro ou
+        timeout, usa a última versão gravada no armazém.
+
+        Args:
+            verbose: Se True, imprime o andamento e o resumo por fonte
+            timeouts: Timeouts (segundos) por fonte, sobrepondo
+                TIMEOUTS_ATUALIZACAO
+            publicar: Se False, apenas atualiza e grava as fontes, sem
+                publicar um snapshot (ex.: benchmarks com armazém temporário)
+
+        Returns:
+            Dicionário {fonte: {status, tempo, fallback, erro}}, com status
+            "ok", "erro" ou "timeout" e fallback "armazem" quando a última
+            versão gravada foi usada
         """
         if verbose:
             print("Atualizando variáveis de mercado...")
 
-        self.get_feriados(force_update=True)
-        self.get_ipca_dict(force_update=True)
-        self.get_cdi(force_update=True)
-        self.get_anbimas(force_update=True)
-        self.get_bmf(force_update=True)
-        self.get_vna_lft(force_update=True)
+        timeouts = {**TIMEOUTS_ATUALIZACAO, **(timeouts or {})}
+        inicio = time.perf_counter()
+        # Na rodada, cada URL é baixada uma única vez (ex.: indicadores.xls para CDI e IPCA)
+        with rodada():
+            relatorio = self._atualizar_fontes(FONTES_ARMAZEM, timeouts)
         # Futuro:
         # self.get_curvas(force_update=True)
 
         if verbose:
-            print("[OK] Atualização concluída.")
+            for fonte, resultado in relatorio.items():
+                detalhe = f" ({resultado['erro']})" if resultado["erro"] else ""
+                print(f"  - {fonte}: {resultado['status']} em {resultado['tempo']:.2f}s{detalhe}")
+
+        indisponiveis = [fonte for fonte, resultado in relatorio.items()
+                         if resultado["status"] != "ok" and resultado["fallback"] is None]
+        if indisponiveis:
+            raise RuntimeError(f"Falha na atualização sem dados gravados para: {', '.join(indisponiveis)}")
+
+        if not publicar:
+            if verbose:
+                print(f"[OK] Atualização concluída em {time.perf_counter() - inicio:.2f}s (sem publicar snapshot)")
+            return relatorio
+
+        # Publica um novo snapshot do processo com os dados atualizados
+        from titulospub.dados.snapshot import recarregar_snapshot
+        snapshot = recarregar_snapshot(self).carregar()
+
+        if verbose:
+            print(f"[OK] Atualização concluída em {time.perf_counter() - inicio:.2f}s. Snapshot {snapshot.versao}")
+        return relatorio
 
     def limpar_cache(self):
-        clear_cache("feriados.pkl")
-        clear_cache("ipca_dict.pkl")
-        clear_cache("cdi.pkl")
-        clear_cache("anbimas.pkl")
-        clear_cache("vna_lft.pkl")
-        # clear_cache("curva_ltn.pkl")
-        # ...
+        """Remove todas as fontes do armazém e do cache pickle legado."""
+        armazem = self._armazem()
+        for fonte in FONTES_ARMAZEM:
+            armazem.remover(fonte)
+            clear_cache(f"{fonte}.pkl")
         self._feriados = None
+        self._calendario = None
+        self._calendario_feriados = None
         self._ipca_dict = None
         self._cdi = None
         self._anbimas = None
         self._vna_lft = None
+        self._bmf = None
 if __name__ == "__main__":
     print("Testando orquestrador de variáveis de mercado...")
     
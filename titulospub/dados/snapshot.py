@@ -0,0 +1,413 @@
+"""
+Snapshot imutável e versionado das variáveis de mercado.
+
+O MarketSnapshot é compartilhado por todo o processo: cada fonte (feriados,
+IPCA, CDI, VNA LFT, ANBIMA e BMF) é carregada uma única vez, na primeira vez
+em que é pedida, e a partir daí é servida da memória, sem acesso a disco ou
+rede. Os helpers de fallback (_carregar_*_se_necessario) e as classes de
+títulos e carteiras usam o snapshot corrente quando nada é injetado.
+
+Para trocar os dados (por exemplo, após atualizar_tudo), um novo snapshot
+é publicado com uma nova versão; o anterior continua válido para quem ainda
+o referencia.
+
+Snapshots históricos (get_snapshot(data_base) com data passada) são fixados
+na data de referência: as fontes são lidas das partições do armazém daquela
+data (e só buscadas se ausentes). Os mais recentes ficam em memória, de modo
+que reprecificar na mesma data não relê o disco; carregar_snapshots carrega
+várias datas em paralelo (ex.: backtests).
+
+Resultados derivados do snapshot (curvas, por exemplo) são memoizados por
+snapshot com memoizar_por_snapshot: ficam presos ao snapshot por
+referência fraca e são liberados junto com ele.
+"""
+import functools
+import itertools
+import threading
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+import pandas as pd
+
+from titulospub.utils.calendario import Calendario
+from titulospub.utils.instrumentacao import aquecimento, medir_carga
+
+# Fontes de dados disponíveis no snapshot
+FONTES = ("feriados", "ipca_dict", "cdi", "vna_lft", "anbimas", "bmf")
+
+# Snapshots históricos mantidos em memória (os menos usados são descartados)
+MAXIMO_SNAPSHOTS_HISTORICOS = 32
+
+# Resultados memoizados por snapshot em cada função (ver memoizar_por_snapshot)
+MAXIMO_RESULTADOS_POR_SNAPSHOT = 8
+
+_contador_versao = itertools.count(1)
+
+
+def _congelar(valor):
+    """Converte listas e dicionários para versões somente leitura."""
+    if isinstance(valor, list):
+        return tuple(valor)
+    if isinstance(valor, dict):
+        return MappingProxyType(dict(valor))
+    return valor
+
+
+class MarketSnapshot:
+    """
+    Fotografia somente leitura das variáveis de mercado.
+
+    Expõe a mesma interface de leitura de VariaveisMercado (get_feriados,
+    get_calendario, get_ipca_dict, get_cdi, get_vna_lft, get_anbimas,
+    get_bmf), de modo que pode ser injetado onde um VariaveisMercado é
+    aceito. Os parâmetros de data dos getters são ignorados: o conteúdo do
+    snapshot é fixo. DataFrames de ANBIMA/BMF são compartilhados e não
+    devem ser modificados.
+    """
+
+    def __init__(self, variaveis_mercado=None, data_referencia=None):
+        """
+        Cria um snapshot vazio; as fontes são carregadas sob demanda.
+
+        Args:
+            variaveis_mercado: Instância de VariaveisMercado usada para carregar
+                as fontes (se None, cria uma nova na primeira carga)
+            data_referencia: Data de referência dos dados (None para os dados
+                correntes); usada ao criar o VariaveisMercado
+        """
+        if data_referencia is None and variaveis_mercado is not None:
+            data_referencia = getattr(variaveis_mercado, "data_referencia", None)
+        self._data_referencia = (pd.to_datetime(data_referencia).normalize()
+                                 if data_referencia is not None else None)
+        self._vm = variaveis_mercado
+        self._dados = {}
+        self._calendario = None
+        self._lock = threading.RLock()
+        self._criado_em = datetime.now()
+        self._versao = f"{self._criado_em:%Y%m%d%H%M%S}-{next(_contador_versao)}"
+
+    # ==================== PROPRIEDADES ====================
+
+    @property
+    def versao(self) -> str:
+        """Identificador único da versão dos dados deste snapshot."""
+        return self._versao
+
+    @property
+    def data_referencia(self) -> Optional[pd.Timestamp]:
+        """Data de referência dos dados (None para os dados correntes)."""
+        return self._data_referencia
+
+    @property
+    def criado_em(self) -> datetime:
+        """Momento de criação do snapshot."""
+        return self._criado_em
+
+    @property
+    def fontes_carregadas(self) -> tuple:
+        """Fontes já carregadas em memória."""
+        return tuple(f for f in FONTES if f in self._dados)
+
+    # ==================== CARREGAMENTO ====================
+
+    def _variaveis_mercado(self):
+        if self._vm is None:
+            from titulospub.dados.orquestrador import VariaveisMercado
+            self._vm = VariaveisMercado(data_referencia=self._data_referencia)
+        return self._vm
+
+    def _carregar_fonte(self, fonte: str):
+        vm = self._variaveis_mercado()
+        if fonte == "ipca_dict":
+            return vm.get_ipca_dict(feriados=list(self.get_feriados()))
+        return getattr(vm, f"get_{fonte}")()
+
+    def _obter(self, fonte: str):
+        try:
+            return self._dados[fonte]
+        except KeyError:
+            pass
+
+        with self._lock:
+            if fonte not in self._dados:
+                with medir_carga(fonte):
+                    self._dados[fonte] = _congelar(self._carregar_fonte(fonte))
+            return self._dados[fonte]
+
+    def carregar(self, fontes: Optional[Iterable[str]] = None) -> "MarketSnapshot":
+        """
+        Carrega antecipadamente as fontes informadas (todas, se None).
+
+        Esta é a forma explícita de aquecer o snapshot: cargas feitas aqui
+        não contam como implícitas nem disparam o modo estrito.
+
+        Args:
+            fontes: Nomes das fontes (ver FONTES)
+
+        Returns:
+            O próprio snapshot
+        """
+        with aquecimento():
+            for fonte in (FONTES if fontes is None else fontes):
+                if fonte not in FONTES:
+                    raise ValueError(f"Fonte desconhecida: {fonte}")
+                self._obter(fonte)
+            self.get_calendario()
+        return self
+
+    # ==================== GETTERS ====================
+
+    def get_feriados(self) -> tuple:
+        return self._obter("feriados")
+
+    def get_calendario(self) -> Calendario:
+        if self._calendario is None:
+            with self._lock:
+                if self._calendario is None:
+                    self._calendario = Calendario(self.get_feriados())
+        return self._calendario
+
+    def get_ipca_dict(self, data=None, feriados=None):
+        return self._obter("ipca_dict")
+
+    def get_cdi(self) -> float:
+        return self._obter("cdi")
+
+    def get_vna_lft(self, data=None) -> float:
+        return self._obter("vna_lft")
+
+    def get_anbimas(self, data=None):
+        return self._obter("anbimas")
+
+    def get_bmf(self, data=None):
+        return self._obter("bmf")
+
+    # ==================== SERIALIZAÇÃO ====================
+
+    def __getstate__(self) -> dict:
+        """
+        Estado para pickle: versão e fontes já carregadas.
+
+        O lock e a instância de VariaveisMercado não são serializados; em
+        outro processo, fontes ainda não carregadas são lidas do cache local.
+        """
+        with self._lock:
+            dados = {fonte: dict(valor) if isinstance(valor, MappingProxyType) else valor
+                     for fonte, valor in self._dados.items()}
+            return {
+                "versao": self._versao,
+                "data_referencia": self._data_referencia,
+                "criado_em": self._criado_em,
+                "dados": dados,
+                "calendario": self._calendario,
+            }
+
+    def __setstate__(self, estado: dict):
+        self._vm = None
+        self._dados = {fonte: _congelar(valor) for fonte, valor in estado["dados"].items()}
+        self._calendario = estado["calendario"]
+        self._lock = threading.RLock()
+        self._criado_em = estado["criado_em"]
+        self._versao = estado["versao"]
+        self._data_referencia = estado.get("data_referencia")
+
+    def __repr__(self) -> str:
+        if self._data_referencia is not None:
+            return (f"MarketSnapshot(versao={self._versao!r}, data_referencia={self._data_referencia.date()}, "
+                    f"fontes={self.fontes_carregadas})")
+        return f"MarketSnapshot(versao={self._versao!r}, fontes={self.fontes_carregadas})"
+
+
+# Snapshot corrente do processo
+_snapshot_atual: Optional[MarketSnapshot] = None
+_lock_snapshot = threading.Lock()
+
+# Snapshots históricos por data de referência (LRU)
+_snapshots_historicos: "OrderedDict[pd.Timestamp, MarketSnapshot]" = OrderedDict()
+
+
+def get_snapshot(data_base=None) -> MarketSnapshot:
+    """
+    Retorna o snapshot do processo para a data base.
+
+    Sem data base, ou com a data de hoje (ou futura), retorna o snapshot
+    corrente, criando-o na primeira chamada. Com uma data passada, retorna
+    o snapshot histórico da data (ver snapshot_historico).
+
+    Args:
+        data_base: Data base dos cálculos (default: hoje)
+
+    Returns:
+        MarketSnapshot compartilhado
+    """
+    if data_base is not None:
+        data_base = pd.to_datetime(data_base).normalize()
+        if data_base < pd.Timestamp.today().normalize():
+            return snapshot_historico(data_base)
+
+    global _snapshot_atual
+    snapshot = _snapshot_atual
+    if snapshot is None:
+        with _lock_snapshot:
+            if _snapshot_atual is None:
+                _snapshot_atual = MarketSnapshot()
+            snapshot = _snapshot_atual
+    return snapshot
+
+
+def snapshot_historico(data_referencia) -> MarketSnapshot:
+    """
+    Retorna o snapshot fixado na data de referência.
+
+    Os snapshots são mantidos em memória (até MAXIMO_SNAPSHOTS_HISTORICOS,
+    descartando os menos usados); as fontes são carregadas sob demanda a
+    partir do armazém local. Uma fonte que só fornece o dado corrente (IPCA,
+    CDI) e não foi gravada para a data levanta
+    DadosHistoricosIndisponiveisError, em vez de gravar o dado de hoje na
+    data passada.
+
+    Args:
+        data_referencia: Data de referência dos dados
+
+    Returns:
+        MarketSnapshot da data
+    """
+    data_referencia = pd.to_datetime(data_referencia).normalize()
+    with _lock_snapshot:
+        snapshot = _snapshots_historicos.get(data_referencia)
+        if snapshot is None:
+            snapshot = MarketSnapshot(data_referencia=data_referencia)
+            _snapshots_historicos[data_referencia] = snapshot
+            while len(_snapshots_historicos) > MAXIMO_SNAPSHOTS_HISTORICOS:
+                _snapshots_historicos.popitem(last=False)
+        else:
+            _snapshots_historicos.move_to_end(data_referencia)
+    return snapshot
+
+
+def carregar_snapshots(datas: Iterable, fontes: Optional[Iterable[str]] = None,
+                       max_workers: Optional[int] = None) -> Dict[pd.Timestamp, MarketSnapshot]:
+    """
+    Carrega em paralelo os snapshots históricos de várias datas.
+
+    Args:
+        datas: Datas de referência
+        fontes: Fontes a carregar em cada snapshot (todas, se None)
+        max_workers: Número máximo de threads (default: do ThreadPoolExecutor)
+
+    Returns:
+        Dicionário {data: MarketSnapshot}, na ordem das datas
+    """
+    datas = list(dict.fromkeys(pd.to_datetime(d).normalize() for d in datas))
+    fontes = tuple(fontes) if fontes is not None else None
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        snapshots = executor.map(lambda data: snapshot_historico(data).carregar(fontes), datas)
+        return dict(zip(datas, snapshots))
+
+
+def publicar_snapshot(snapshot: MarketSnapshot) -> MarketSnapshot:
+    """
+    Substitui o snapshot corrente do processo (ou, para um snapshot com
+    data de referência, o snapshot histórico dessa data).
+
+    Args:
+        snapshot: Novo snapshot
+
+    Returns:
+        O snapshot publicado
+    """
+    global _snapshot_atual
+    with _lock_snapshot:
+        if snapshot.data_referencia is not None:
+            _snapshots_historicos[snapshot.data_referencia] = snapshot
+            _snapshots_historicos.move_to_end(snapshot.data_referencia)
+            while len(_snapshots_historicos) > MAXIMO_SNAPSHOTS_HISTORICOS:
+                _snapshots_historicos.popitem(last=False)
+        else:
+            _snapshot_atual = snapshot
+    return snapshot
+
+
+def recarregar_snapshot(variaveis_mercado=None) -> MarketSnapshot:
+    """
+    Cria e publica um novo snapshot (nova versão) a partir das variáveis de mercado.
+
+    Args:
+        variaveis_mercado: Instância de VariaveisMercado já atualizada
+            (se None, as fontes são lidas novamente do cache)
+
+    Returns:
+        O novo snapshot
+    """
+    return publicar_snapshot(MarketSnapshot(variaveis_mercado))
+
+
+def resolver_mercado(variaveis_mercado=None, data_base=None) -> Tuple[object, pd.Timestamp]:
+    """
+    Variáveis de mercado e data base efetivas de um cálculo.
+
+    Args:
+        variaveis_mercado: Instância de VariaveisMercado ou MarketSnapshot
+            (default: snapshot do processo para a data base)
+        data_base: Data base (default: hoje)
+
+    Returns:
+        Tupla (variaveis_mercado, data_base normalizada)
+    """
+    variaveis_mercado = variaveis_mercado or get_snapshot(data_base)
+    data_base = pd.to_datetime(data_base).normalize() if data_base is not None else pd.Timestamp.today().normalize()
+    return variaveis_mercado, data_base
+
+
+def memoizar_por_snapshot(montar: Callable) -> Callable:
+    """
+    Decorador que memoiza montar(variaveis_mercado, *args) por snapshot.
+
+    Como o MarketSnapshot é imutável, cada combinação de argumentos (ex.:
+    data base) é calculada uma única vez por snapshot. Os resultados ficam
+    em um WeakKeyDictionary indexado pelo snapshot: um snapshot substituído
+    que ninguém mais referencia é liberado com os seus resultados. Cada
+    snapshot guarda até MAXIMO_RESULTADOS_POR_SNAPSHOT resultados (os menos
+    usados são descartados). Com um VariaveisMercado, montar é sempre
+    chamada.
+
+    Args:
+        montar: Função (variaveis_mercado, *args) com argumentos hashable
+
+    Returns:
+        Função memoizada, com o método cache_clear
+    """
+    resultados: "weakref.WeakKeyDictionary[MarketSnapshot, OrderedDict]" = weakref.WeakKeyDictionary()
+    lock = threading.Lock()
+
+    @functools.wraps(montar)
+    def memoizada(variaveis_mercado, *args):
+        if not isinstance(variaveis_mercado, MarketSnapshot):
+            return montar(variaveis_mercado, *args)
+
+        with lock:
+            por_argumentos = resultados.get(variaveis_mercado)
+            if por_argumentos is not None and args in por_argumentos:
+                por_argumentos.move_to_end(args)
+                return por_argumentos[args]
+
+        # Calculado fora do lock (montar pode usar outras funções memoizadas)
+        resultado = montar(variaveis_mercado, *args)
+
+        with lock:
+            por_argumentos = resultados.setdefault(variaveis_mercado, OrderedDict())
+            por_argumentos[args] = resultado
+            while len(por_argumentos) > MAXIMO_RESULTADOS_POR_SNAPSHOT:
+                por_argumentos.popitem(last=False)
+        return resultado
+
+    def cache_clear():
+        with lock:
+            resultados.clear()
+
+    memoizada.cache_clear = cache_clear
+    return memoizada
@@ -5,7 +5,7 @@ import pandas as pd
 from typing import List, Dict
 from datetime import datetime
 
-from titulospub.dados.orquestrador import VariaveisMercado
+from titulospub.dados.snapshot import get_snapshot
 
 
 def get_vencimentos_ltn() -> List[str]:
@@ -22,7 +22,7 @@ def get_vencimentos_ltn() -> List[str]:
         old_stdout = sys.stdout
         sys.stdout = io.StringIO()
         
-        vm = VariaveisMercado()
+        vm = get_snapshot()
         anbimas_dict = vm.get_anbimas()
         
         # Restaurar stdout
@@ -61,7 +61,7 @@ def get_vencimentos_lft() -> List[str]:
         old_stdout = sys.stdout
         sys.stdout = io.StringIO()
         
-        vm = VariaveisMercado()
+        vm = get_snapshot()
         anbimas_dict = vm.get_anbimas()
         
         sys.stdout = old_stdout
@@ -99,7 +99,7 @@ def get_vencimentos_ntnb() -> List[str]:
         old_stdout = sys.stdout
         sys.stdout = io.StringIO()
         
-        vm = VariaveisMercado()
+        vm = get_snapshot()
         anbimas_dict = vm.get_anbimas()
         
         sys.stdout = old_stdout
@@ -137,7 +137,7 @@ def get_vencimentos_ntnf() -> List[str]:
         old_stdout = sys.stdout
         sys.stdout = io.StringIO()
         
-        vm = VariaveisMercado()
+        vm = get_snapshot()
         anbimas_dict = vm.get_anbimas()
         
         sys.stdout = old_stdout
@@ -170,7 +170,7 @@ def get_codigos_di_disponiveis() -> List[str]:
         List[str]: Lista de códigos DI disponíveis
     """
     try:
-        vm = VariaveisMercado()
+        vm = get_snapshot()
         bmf_dict = vm.get_bmf()
         
         if "DI" not in bmf_dict:
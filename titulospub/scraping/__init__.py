@@ -5,8 +5,31 @@ Este módulo contém funções para fazer scraping de dados de diferentes fontes
 - ANBIMA: Dados de títulos públicos
 - SIDRA: Dados do IPCA
 - UpToData: Dados da BMF
+
+As requisições HTTP passam pelo cliente compartilhado de requisicoes.py
+(sessão com pool de conexões, memoização por rodada, requisições
+condicionais e interpretação por hash de conteúdo). Todas as leituras
+externas podem ser gravadas e reproduzidas offline (gravacao.py).
 """
 
+# Imports principais do módulo gravacao
+from .gravacao import (
+    GravacaoAusenteError,
+    Gravador,
+    get_gravador,
+    gravacao
+)
+
+# Imports principais do módulo requisicoes
+from .requisicoes import (
+    ClienteHTTP,
+    baixar,
+    criar_sessao,
+    get_cliente,
+    ler_url,
+    rodada
+)
+
 # Imports principais do módulo anbima_scraping
 from .anbima_scraping import (
     scrap_cdi,
@@ -33,6 +56,20 @@ from .bmf_net_scraping import (
 )
 
 __all__ = [
+    # Gravação/reprodução
+    'GravacaoAusenteError',
+    'Gravador',
+    'get_gravador',
+    'gravacao',
+
+    # Requisições HTTP
+    'ClienteHTTP',
+    'baixar',
+    'criar_sessao',
+    'get_cliente',
+    'ler_url',
+    'rodada',
+
     # ANBIMA scraping
     'scrap_cdi',
     'scrap_feriados', 
@@ -1,6 +1,22 @@
+import io
+import re
+
 import pandas as pd
 import requests
-import re
+
+from titulospub.scraping.requisicoes import baixar, ler_url
+
+# Planilha de indicadores da ANBIMA (CDI e projeção de IPCA)
+URL_INDICADORES = "https://www.anbima.com.br/informacoes/indicadores/arqs/indicadores.xls"
+
+
+def _ler_excel(conteudo: bytes) -> pd.DataFrame:
+    return pd.read_excel(io.BytesIO(conteudo))
+
+
+def _ler_anbimas(conteudo: bytes) -> pd.DataFrame:
+    return pd.read_csv(io.BytesIO(conteudo), sep='@', encoding='latin1', header=1)
+
 
 def scrap_anbimas(data)-> pd.DataFrame: 
     """""
@@ -19,14 +35,14 @@ def scrap_anbimas(data)-> pd.DataFrame:
     #Difinindo o caminho do arquivo
     caminho = f"https://www.anbima.com.br/informacoes/merc-sec/arqs/ms{ano}{mes}{dia}.txt"
 
-    #Lendo o DataFrame
-    anbima_df = pd.read_csv(caminho, sep='@', encoding='latin1', header=1)
+    #Lendo o DataFrame (cópia: o interpretado é compartilhado pelo cliente HTTP)
+    anbima_df = ler_url(caminho, _ler_anbimas).copy()
     
     #Retornando o DataFrame com as Anbimas
     return anbima_df
 
 def scrap_cdi():
-    cdi_df = pd.read_excel("https://www.anbima.com.br/informacoes/indicadores/arqs/indicadores.xls")
+    cdi_df = ler_url(URL_INDICADORES, _ler_excel)
     cdi_float = cdi_df[cdi_df.iloc[:, 0] == "Estimativa SELIC1"].iloc[0, 2]
 
     return cdi_float
@@ -36,10 +52,10 @@ def scrap_feriados():
     caminho = "https://www.anbima.com.br/feriados/arqs/feriados_nacionais.xls"
 
     # Fazendo a leitura do DataFrame com o pandas
-    feriados_df = pd.read_excel(caminho)
+    feriados_df = ler_url(caminho, _ler_excel)
 
     # Removendo os valores NaN do DataFrame
-    feriados_df.dropna(inplace=True)
+    feriados_df = feriados_df.dropna()
 
     # Transformando os valores para o formato data do pandas e convertendo numa lista
     feriados_lista = pd.to_datetime(feriados_df['Data']).to_list()
@@ -49,7 +65,7 @@ def scrap_feriados():
 
 def scrap_proj_ipca():
 
-    proj_df = pd.read_excel("https://www.anbima.com.br/informacoes/indicadores/arqs/indicadores.xls")
+    proj_df = ler_url(URL_INDICADORES, _ler_excel)
     proj_float = proj_df[proj_df.iloc[:, 0] == "IPCA1"].iloc[0, 2]
     
     return proj_float
@@ -62,13 +78,13 @@ def scrap_vna_lft(data: pd.Timestamp):
     ano = str(data.year)
 
     # Baixar o arquivo .tex da internet
-    response = requests.get(f"https://www.anbima.com.br/informacoes/res-238/arqs/{ano}{mes}{dia}_238.tex")
-
-    if response.status_code != 200:
-        raise Exception(f"Erro ao baixar o arquivo: {response.status_code}")
+    try:
+        conteudo = baixar(f"https://www.anbima.com.br/informacoes/res-238/arqs/{ano}{mes}{dia}_238.tex")
+    except requests.HTTPError as e:
+        raise Exception(f"Erro ao baixar o arquivo: {e.response.status_code}") from e
 
         # Supondo que o arquivo .tex tenha dados tabulares
-    linhas = response.text.split("\n")  # Separar por linhas
+    linhas = conteudo.decode("latin1").split("\n")  # Separar por linhas
     linhas = linhas[3]
 
     # String de exemplo
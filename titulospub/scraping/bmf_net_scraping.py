@@ -1,7 +1,15 @@
 #importando as bibliotecas
 import pandas as pd
 import json
-import requests, json
+
+from titulospub.scraping.requisicoes import ler_url
+
+
+def _ler_cotacoes(conteudo: bytes) -> pd.DataFrame:
+    #carregando o conteúdo de resposta
+    dados = json.loads(conteudo)
+    return pd.json_normalize(dados['Scty'])
+
 
 def scrap_bmf_net():
 
@@ -9,14 +17,10 @@ def scrap_bmf_net():
 
     bmf_dict = {}
     for simbolo in simbolos:
-        url = requests.get(f"https://cotacao.b3.com.br/mds/api/v1/DerivativeQuotation/{simbolo}")
-
-        #lendo o conteúdo da resposta
-        text = url.text
+        url = f"https://cotacao.b3.com.br/mds/api/v1/DerivativeQuotation/{simbolo}"
 
-        #carregando o conteúdo de resposta
-        dados = json.loads(text)
-        df = pd.json_normalize(dados['Scty'])
+        #lendo o conteúdo da resposta (cópia: o interpretado é compartilhado pelo cliente HTTP)
+        df = ler_url(url, _ler_cotacoes).copy()
 
         if simbolo == "DI1":
             simbolo = "DI"
@@ -0,0 +1,234 @@
+"""
+Gravação e reprodução (record/replay) dos dados brutos das fontes externas.
+
+Todas as leituras externas passam por aqui: downloads HTTP (ClienteHTTP),
+a API SIDRA, o arquivo de ajustes da BMF no compartilhamento de rede e as
+planilhas de backup. No modo de gravação, cada leitura é feita normalmente
+e o conteúdo bruto é salvo em um diretório local; no modo de reprodução,
+nada é lido da rede ou do compartilhamento: o conteúdo vem do diretório,
+opcionalmente com uma latência artificial por leitura. Assim é possível
+rodar atualizar_tudo (e medir o seu desempenho) sem internet e de forma
+determinística.
+
+O modo pode ser ligado pelo context manager gravacao() ou pelas variáveis
+de ambiente TITULOSPUB_GRAVACAO ("gravar" ou "reproduzir"),
+TITULOSPUB_DIR_GRAVACAO e TITULOSPUB_LATENCIA_GRAVACAO (segundos).
+
+Layout do diretório: <diretorio>/<tipo>/<identificador>-<hash>.bin, em que
+tipo é "http", "sidra", "arquivo" ou "backup".
+"""
+
+import hashlib
+import os
+import pickle
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, Union
+
+VARIAVEL_AMBIENTE_MODO = "TITULOSPUB_GRAVACAO"
+VARIAVEL_AMBIENTE_DIRETORIO = "TITULOSPUB_DIR_GRAVACAO"
+VARIAVEL_AMBIENTE_LATENCIA = "TITULOSPUB_LATENCIA_GRAVACAO"
+
+MODO_GRAVAR = "gravar"
+MODO_REPRODUZIR = "reproduzir"
+MODOS = (MODO_GRAVAR, MODO_REPRODUZIR)
+
+
+class GravacaoAusenteError(FileNotFoundError):
+    """Erro levantado na reprodução quando o conteúdo não foi gravado."""
+
+
+def _nome_arquivo(identificador: str) -> str:
+    """Nome legível e único para o identificador (URL, caminho, consulta)."""
+    legivel = re.sub(r"[^A-Za-z0-9._-]+", "_", identificador).strip("_")[-80:]
+    return f"{legivel}-{hashlib.sha256(identificador.encode('utf-8')).hexdigest()[:12]}.bin"
+
+
+class Gravador:
+    """
+    Grava ou reproduz o conteúdo bruto das leituras externas.
+    """
+
+    def __init__(self, diretorio: str, modo: str, latencia: Union[float, Dict[str, float]] = 0.0):
+        """
+        Inicializa o gravador.
+
+        Args:
+            diretorio: Pasta das gravações
+            modo: "gravar" ou "reproduzir"
+            latencia: Atraso (segundos) de cada leitura reproduzida; um
+                dicionário {tipo: segundos} define o atraso por tipo
+        """
+        if modo not in MODOS:
+            raise ValueError(f"Modo de gravação desconhecido: {modo}. Use um de {list(MODOS)}.")
+        if not diretorio:
+            raise ValueError("Informe o diretório das gravações")
+        self._diretorio = diretorio
+        self._modo = modo
+        self._latencia = latencia
+
+    @property
+    def diretorio(self) -> str:
+        """Pasta das gravações."""
+        return self._diretorio
+
+    @property
+    def modo(self) -> str:
+        """"gravar" ou "reproduzir"."""
+        return self._modo
+
+    def caminho(self, tipo: str, identificador: str) -> str:
+        """
+        Arquivo da gravação.
+
+        Args:
+            tipo: Tipo da leitura ("http", "sidra", "arquivo", "backup")
+            identificador: URL, caminho ou consulta lida
+
+        Returns:
+            Caminho do arquivo
+        """
+        return os.path.join(self._diretorio, tipo, _nome_arquivo(identificador))
+
+    def _atrasar(self, tipo: str):
+        latencia = self._latencia.get(tipo, 0.0) if isinstance(self._latencia, dict) else self._latencia
+        if latencia > 0:
+            time.sleep(latencia)
+
+    def bytes(self, tipo: str, identificador: str, obter: Callable[[], bytes]) -> bytes:
+        """
+        Conteúdo bruto da leitura: gravado após obter() ou reproduzido do disco.
+
+        Args:
+            tipo: Tipo da leitura
+            identificador: URL, caminho ou consulta lida
+            obter: Função que faz a leitura real
+
+        Returns:
+            Conteúdo em bytes
+
+        Raises:
+            GravacaoAusenteError: Na reprodução, se a leitura não foi gravada
+        """
+        caminho = self.caminho(tipo, identificador)
+        if self._modo == MODO_REPRODUZIR:
+            self._atrasar(tipo)
+            if not os.path.exists(caminho):
+                raise GravacaoAusenteError(f"Leitura não gravada ({tipo}): {identificador}")
+            with open(caminho, "rb") as f:
+                return f.read()
+
+        conteudo = obter()
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporario, "wb") as f:
+            f.write(conteudo)
+        os.replace(temporario, caminho)
+        return conteudo
+
+    def objeto(self, tipo: str, identificador: str, obter: Callable[[], Any]) -> Any:
+        """
+        Como bytes(), para leituras que já devolvem objetos Python (ex.:
+        DataFrame da API SIDRA), gravados em pickle.
+        """
+        resultado = {}
+
+        def obter_serializado() -> bytes:
+            resultado["valor"] = obter()
+            return pickle.dumps(resultado["valor"])
+
+        conteudo = self.bytes(tipo, identificador, obter_serializado)
+        return resultado["valor"] if "valor" in resultado else pickle.loads(conteudo)
+
+    def __repr__(self) -> str:
+        return f"Gravador(modo={self._modo!r}, diretorio={self._diretorio!r})"
+
+
+# Gravador ativo (context manager) e gravadores criados pelas variáveis de ambiente
+_gravador: Optional[Gravador] = None
+_gravadores_ambiente: Dict[tuple, Gravador] = {}
+_lock = threading.Lock()
+
+
+def get_gravador() -> Optional[Gravador]:
+    """
+    Retorna o gravador ativo: o do context manager gravacao() ou, fora
+    dele, o definido pelas variáveis de ambiente (None se desligado).
+    """
+    if _gravador is not None:
+        return _gravador
+
+    modo = os.environ.get(VARIAVEL_AMBIENTE_MODO, "").strip().lower()
+    if not modo:
+        return None
+    chave = (modo, os.environ.get(VARIAVEL_AMBIENTE_DIRETORIO, ""),
+             float(os.environ.get(VARIAVEL_AMBIENTE_LATENCIA, "0") or 0))
+    with _lock:
+        if chave not in _gravadores_ambiente:
+            _gravadores_ambiente[chave] = Gravador(diretorio=chave[1], modo=chave[0], latencia=chave[2])
+        return _gravadores_ambiente[chave]
+
+
+@contextmanager
+def gravacao(modo: str, diretorio: str, latencia: Union[float, Dict[str, float]] = 0.0):
+    """
+    Liga a gravação ou a reprodução dentro do bloco, para todo o processo
+    (inclusive nas threads da atualização).
+
+    Args:
+        modo: "gravar" ou "reproduzir"
+        diretorio: Pasta das gravações
+        latencia: Atraso (segundos) de cada leitura reproduzida, ou {tipo: segundos}
+    """
+    global _gravador
+    gravador = Gravador(diretorio=diretorio, modo=modo, latencia=latencia)
+    with _lock:
+        anterior = _gravador
+        _gravador = gravador
+    try:
+        yield gravador
+    finally:
+        with _lock:
+            _gravador = anterior
+
+
+def ler_bytes(tipo: str, identificador: str, obter: Callable[[], bytes]) -> bytes:
+    """
+    Faz a leitura pelo gravador ativo (ou diretamente, se desligado).
+
+    Args:
+        tipo: Tipo da leitura ("http", "sidra", "arquivo", "backup")
+        identificador: URL, caminho ou consulta lida
+        obter: Função que faz a leitura real
+
+    Returns:
+        Conteúdo em bytes
+    """
+    gravador = get_gravador()
+    return obter() if gravador is None else gravador.bytes(tipo, identificador, obter)
+
+
+def ler_objeto(tipo: str, identificador: str, obter: Callable[[], Any]) -> Any:
+    """Como ler_bytes(), para leituras que devolvem objetos Python."""
+    gravador = get_gravador()
+    return obter() if gravador is None else gravador.objeto(tipo, identificador, obter)
+
+
+def ler_arquivo(caminho: str, tipo: str = "arquivo") -> bytes:
+    """
+    Lê um arquivo local ou de rede pelo gravador ativo.
+
+    Args:
+        caminho: Caminho do arquivo
+        tipo: Tipo da leitura (default: "arquivo")
+
+    Returns:
+        Conteúdo em bytes
+    """
+    def obter() -> bytes:
+        with open(caminho, "rb") as f:
+            return f.read()
+
+    return ler_bytes(tipo, caminho, obter)
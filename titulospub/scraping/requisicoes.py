@@ -0,0 +1,292 @@
+"""
+Camada comum de requisições HTTP do scraping.
+
+Todas as fontes baixadas pela internet passam por um ClienteHTTP:
+
+- Uma única requests.Session com pool de conexões (keep-alive) é reusada
+  por todos os scrapers.
+- Durante uma rodada de atualização (ver rodada()), cada URL é baixada uma
+  única vez; chamadas concorrentes para a mesma URL esperam a primeira.
+  Ex.: indicadores.xls é usado pelo CDI e pela projeção de IPCA.
+- Fora da rodada, a URL já baixada é revalidada com If-None-Match /
+  If-Modified-Since; uma resposta 304 reaproveita o conteúdo guardado.
+- ler_url guarda o resultado da interpretação junto com o SHA-256 do
+  conteúdo: se o conteúdo não mudou (304 ou bytes idênticos), a
+  interpretação (ex.: pd.read_excel) não é refeita.
+
+Com a gravação ligada (ver gravacao.py), o conteúdo de cada URL é gravado
+ou reproduzido do diretório local, sem requisições condicionais.
+
+Os valores interpretados são compartilhados entre chamadas e não devem ser
+modificados (os scrapers devolvem cópias quando o chamador pode alterá-los).
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from titulospub.scraping.gravacao import get_gravador
+
+# Tempo máximo (segundos) de conexão e leitura de cada requisição
+TIMEOUT_REQUISICAO = 30.0
+
+# URLs com conteúdo guardado para requisições condicionais (as menos usadas são descartadas)
+MAXIMO_URLS = 64
+
+# Conexões mantidas abertas por host
+CONEXOES_POR_HOST = 8
+
+
+def criar_sessao(conexoes_por_host: int = CONEXOES_POR_HOST) -> requests.Session:
+    """
+    Cria uma sessão HTTP com pool de conexões.
+
+    Args:
+        conexoes_por_host: Conexões mantidas abertas por host
+
+    Returns:
+        requests.Session
+    """
+    sessao = requests.Session()
+    adaptador = HTTPAdapter(pool_connections=conexoes_por_host, pool_maxsize=conexoes_por_host)
+    sessao.mount("http://", adaptador)
+    sessao.mount("https://", adaptador)
+    return sessao
+
+
+def _registro(conteudo: bytes, etag: Optional[str] = None, last_modified: Optional[str] = None) -> dict:
+    return {
+        "conteudo": conteudo,
+        "hash": hashlib.sha256(conteudo).hexdigest(),
+        "etag": etag,
+        "last_modified": last_modified,
+    }
+
+
+class ClienteHTTP:
+    """
+    Cliente HTTP com sessão compartilhada, memoização por rodada,
+    requisições condicionais e interpretação por hash de conteúdo.
+    """
+
+    def __init__(self, sessao: Optional[requests.Session] = None, timeout: float = TIMEOUT_REQUISICAO,
+                 maximo_urls: int = MAXIMO_URLS):
+        """
+        Inicializa o cliente.
+
+        Args:
+            sessao: Sessão HTTP (default: uma nova, com pool de conexões)
+            timeout: Tempo máximo (segundos) de cada requisição
+            maximo_urls: URLs com conteúdo guardado
+        """
+        self._sessao = sessao or criar_sessao()
+        self._timeout = timeout
+        self._maximo_urls = maximo_urls
+        self._lock = threading.Lock()
+        self._locks_url: Dict[str, threading.Lock] = {}
+        # url -> {"conteudo", "hash", "etag", "last_modified"}
+        self._respostas: "OrderedDict[str, dict]" = OrderedDict()
+        # (url, interpretar) -> (hash, valor)
+        self._interpretados: Dict[tuple, tuple] = {}
+        self._rodadas = 0
+        self._baixadas_na_rodada = set()
+        self._estatisticas = dict.fromkeys(
+            ("requisicoes", "nao_modificadas", "memoizadas", "interpretacoes", "interpretacoes_evitadas"), 0)
+
+    @property
+    def sessao(self) -> requests.Session:
+        """Sessão HTTP compartilhada."""
+        return self._sessao
+
+    # ==================== RODADA ====================
+
+    @contextmanager
+    def rodada(self):
+        """
+        Delimita uma rodada de atualização: dentro dela (em qualquer thread),
+        cada URL é baixada no máximo uma vez.
+        """
+        with self._lock:
+            self._rodadas += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._rodadas -= 1
+                if self._rodadas == 0:
+                    self._baixadas_na_rodada.clear()
+
+    # ==================== REQUISIÇÕES ====================
+
+    def _lock_url(self, url: str) -> threading.Lock:
+        with self._lock:
+            return self._locks_url.setdefault(url, threading.Lock())
+
+    def _requisitar(self, url: str, cabecalhos: dict) -> requests.Response:
+        resposta = self._sessao.get(url, headers=cabecalhos, timeout=self._timeout)
+        if resposta.status_code != 304:
+            resposta.raise_for_status()
+        return resposta
+
+    def _obter(self, url: str) -> dict:
+        """Conteúdo da URL (memoizado na rodada ou revalidado no servidor)."""
+        with self._lock_url(url):
+            with self._lock:
+                anterior = self._respostas.get(url)
+                if anterior is not None and url in self._baixadas_na_rodada:
+                    self._estatisticas["memoizadas"] += 1
+                    return anterior
+
+            gravador = get_gravador()
+            if gravador is not None:
+                # Gravação/reprodução: sempre o conteúdo completo, sem validadores
+                conteudo = gravador.bytes("http", url, lambda: self._requisitar(url, {}).content)
+                registro = _registro(conteudo)
+                if anterior is not None and anterior["hash"] == registro["hash"]:
+                    registro = anterior
+            else:
+                cabecalhos = {}
+                if anterior is not None:
+                    if anterior["etag"]:
+                        cabecalhos["If-None-Match"] = anterior["etag"]
+                    if anterior["last_modified"]:
+                        cabecalhos["If-Modified-Since"] = anterior["last_modified"]
+
+                resposta = self._requisitar(url, cabecalhos)
+                if resposta.status_code == 304 and anterior is not None:
+                    registro = anterior
+                else:
+                    registro = _registro(resposta.content, resposta.headers.get("ETag"),
+                                         resposta.headers.get("Last-Modified"))
+
+            with self._lock:
+                self._estatisticas["requisicoes"] += 1
+                if registro is anterior:
+                    self._estatisticas["nao_modificadas"] += 1
+                self._respostas[url] = registro
+                self._respostas.move_to_end(url)
+                while len(self._respostas) > self._maximo_urls:
+                    descartada, _ = self._respostas.popitem(last=False)
+                    self._interpretados = {chave: valor for chave, valor in self._interpretados.items()
+                                           if chave[0] != descartada}
+                if self._rodadas:
+                    self._baixadas_na_rodada.add(url)
+            return registro
+
+    def baixar(self, url: str) -> bytes:
+        """
+        Baixa o conteúdo da URL.
+
+        Args:
+            url: Endereço do arquivo
+
+        Returns:
+            Conteúdo em bytes
+
+        Raises:
+            requests.HTTPError: Se o servidor responder com erro
+        """
+        return self._obter(url)["conteudo"]
+
+    def ler_url(self, url: str, interpretar: Callable[[bytes], Any]) -> Any:
+        """
+        Baixa e interpreta o conteúdo da URL.
+
+        Se o conteúdo tiver o mesmo SHA-256 da última interpretação com a
+        mesma função, o resultado anterior é devolvido sem reinterpretar.
+
+        Args:
+            url: Endereço do arquivo
+            interpretar: Função que converte os bytes no valor (ex.: DataFrame)
+
+        Returns:
+            Valor interpretado (compartilhado; não deve ser modificado)
+        """
+        registro = self._obter(url)
+        chave = (url, interpretar)
+        with self._lock:
+            anterior = self._interpretados.get(chave)
+            if anterior is not None and anterior[0] == registro["hash"]:
+                self._estatisticas["interpretacoes_evitadas"] += 1
+                return anterior[1]
+
+        valor = interpretar(registro["conteudo"])
+        with self._lock:
+            self._estatisticas["interpretacoes"] += 1
+            if url in self._respostas:
+                self._interpretados[chave] = (registro["hash"], valor)
+        return valor
+
+    # ==================== ESTADO ====================
+
+    def estatisticas(self) -> dict:
+        """
+        Contadores de uso do cliente.
+
+        Returns:
+            Dicionário com requisicoes, nao_modificadas (304), memoizadas
+            (na rodada), interpretacoes e interpretacoes_evitadas (mesmo hash)
+        """
+        with self._lock:
+            return dict(self._estatisticas)
+
+    def limpar(self):
+        """Descarta conteúdos, validadores e valores interpretados guardados."""
+        with self._lock:
+            self._respostas.clear()
+            self._interpretados.clear()
+            self._baixadas_na_rodada.clear()
+
+
+# Cliente compartilhado do processo
+_cliente: Optional[ClienteHTTP] = None
+_lock_cliente = threading.Lock()
+
+
+def get_cliente() -> ClienteHTTP:
+    """Retorna o ClienteHTTP compartilhado pelos scrapers."""
+    global _cliente
+    if _cliente is None:
+        with _lock_cliente:
+            if _cliente is None:
+                _cliente = ClienteHTTP()
+    return _cliente
+
+
+@contextmanager
+def usar_cliente(cliente: ClienteHTTP):
+    """
+    Usa outro cliente como cliente compartilhado durante o bloco e restaura
+    o anterior (com o seu conteúdo guardado) ao final.
+
+    Args:
+        cliente: Cliente usado pelos scrapers dentro do bloco
+    """
+    global _cliente
+    with _lock_cliente:
+        anterior, _cliente = _cliente, cliente
+    try:
+        yield cliente
+    finally:
+        with _lock_cliente:
+            _cliente = anterior
+
+
+def rodada():
+    """Rodada de atualização no cliente compartilhado (ver ClienteHTTP.rodada)."""
+    return get_cliente().rodada()
+
+
+def baixar(url: str) -> bytes:
+    """Baixa a URL pelo cliente compartilhado (ver ClienteHTTP.baixar)."""
+    return get_cliente().baixar(url)
+
+
+def ler_url(url: str, interpretar: Callable[[bytes], Any]) -> Any:
+    """Baixa e interpreta a URL pelo cliente compartilhado (ver ClienteHTTP.ler_url)."""
+    return get_cliente().ler_url(url, interpretar)
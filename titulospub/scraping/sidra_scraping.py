@@ -2,14 +2,17 @@ from nt import replace
 import pandas as pd
 import sidrapy
 
+from titulospub.scraping.gravacao import ler_objeto
+
 def puxar_valores_ipca_fechado():
-      
-    ipca_df = sidrapy.get_table(
+
+    # Consulta à API SIDRA (gravada/reproduzida quando a gravação está ligada)
+    ipca_df = ler_objeto("sidra", "6691/n1/1/last 2", lambda: sidrapy.get_table(
         table_code="6691",  # Código da tabela IPCA com número-índice
         territorial_level="1",  # Brasil
         ibge_territorial_code="1",  # Código Brasil
         period="last 2"  # Últimos 2 meses
-    )
+    ))
 
     # Define a segunda linha como o cabeçalho
     ipca_df.columns = ipca_df.iloc[0]  # A segunda linha será usada como os novos cabeçalhos
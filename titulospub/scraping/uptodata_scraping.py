@@ -65,13 +65,25 @@ def definir_caminho_adj_bmf(data):
         traceback.print_exc()
         return None
 
+import io
+
 import pandas as pd
 
+from titulospub.scraping.gravacao import ler_bytes
+
 def scrap_ajustes_bmf(data):
 
-    caminho = definir_caminho_adj_bmf(data)
+    def ler_arquivo_ajustes() -> bytes:
+        caminho = definir_caminho_adj_bmf(data)
+        if caminho is None:
+            raise FileNotFoundError(f"Arquivo de ajustes BMF de {data:%Y-%m-%d} não encontrado")
+        with open(caminho, "rb") as f:
+            return f.read()
+
+    # Identificado pela data (o nome do arquivo mais recente só é conhecido na pasta)
+    conteudo = ler_bytes("arquivo", f"ajustes_bmf/{data:%Y%m%d}", ler_arquivo_ajustes)
 
-    return pd.read_csv(caminho, sep=";")
+    return pd.read_csv(io.BytesIO(conteudo), sep=";")
     
 if __name__ == "__main__":
     print("uptodata_clients")
\ No newline at end of file
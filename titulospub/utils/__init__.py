@@ -3,6 +3,8 @@ Módulo de utilitários para o projeto.
 
 Este módulo contém funções utilitárias para:
 - Manipulação de datas
+- Calendário de dias úteis pré-computado
+- Instrumentação de cargas implícitas de dados de mercado
 - Gerenciamento de caminhos de arquivos
 """
 
@@ -16,6 +18,20 @@ from .datas import (
     e_dia_util,
     listar_datas,
     listar_dias_entre_datas,
+    matriz_datas_cupons,
+)
+
+# Imports principais do módulo calendario
+from .calendario import Calendario, obter_calendario
+
+# Imports principais do módulo instrumentacao
+from .instrumentacao import (
+    CargaImplicitaError,
+    estatisticas_cargas,
+    modo_estrito,
+    modo_estrito_ativo,
+    resetar_estatisticas,
+    total_cargas_implicitas,
 )
 
 # Imports principais do módulo paths
@@ -39,6 +55,17 @@ __all__ = [
     "listar_datas",
     "data_vencimento_ajustada",
     "datas_pagamento_cupons",
+    "matriz_datas_cupons",
+    # Calendário
+    "Calendario",
+    "obter_calendario",
+    # Instrumentação
+    "CargaImplicitaError",
+    "estatisticas_cargas",
+    "modo_estrito",
+    "modo_estrito_ativo",
+    "resetar_estatisticas",
+    "total_cargas_implicitas",
     # Funções de paths
     "path_backup_csv",
     "path_backup_pickle",
@@ -0,0 +1,262 @@
+"""
+Calendário de dias úteis pré-computado.
+
+O Calendario é construído uma única vez por conjunto de feriados e guarda um
+índice acumulado de dias úteis para um intervalo denso de datas. Com isso,
+contagem de dias úteis, soma de n dias úteis, verificação de dia útil e
+ajuste para o próximo dia útil viram consultas em arrays (O(1) por data).
+"""
+import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from titulospub.utils.carregamento_var_globais import _carregar_feriados_se_necessario
+
+_NS_POR_DIA = 86_400_000_000_000
+
+# Intervalo padrão coberto pelo índice denso
+_DATA_INICIO_PADRAO = "1990-01-01"
+_DATA_FIM_PADRAO = "2100-12-31"
+
+
+class Calendario:
+    """
+    Calendário de dias úteis (segunda a sexta, exceto feriados).
+
+    Todas as operações aceitam uma data escalar (pd.Timestamp, datetime, str,
+    np.datetime64) ou um array de datas, e devolvem o resultado no mesmo formato.
+    """
+
+    def __init__(self, feriados, data_inicio: str = _DATA_INICIO_PADRAO,
+                 data_fim: str = _DATA_FIM_PADRAO):
+        """
+        Constrói o índice de dias úteis.
+
+        Args:
+            feriados: Lista (ou array) de datas de feriados
+            data_inicio: Primeira data coberta pelo calendário
+            data_fim: Última data coberta pelo calendário
+        """
+        feriados_np = np.unique(
+            pd.to_datetime(list(feriados)).values.astype("datetime64[D]")
+        )
+
+        dia_inicio = int(np.datetime64(data_inicio, "D").astype(np.int64))
+        dia_fim = int(np.datetime64(data_fim, "D").astype(np.int64))
+        if len(feriados_np):
+            dia_inicio = min(dia_inicio, int(feriados_np[0].astype(np.int64)))
+            dia_fim = max(dia_fim, int(feriados_np[-1].astype(np.int64)))
+
+        dias = np.arange(dia_inicio, dia_fim + 1, dtype=np.int64)
+
+        # 01/01/1970 foi uma quinta-feira (weekday 3)
+        util = ((dias + 3) % 7) < 5
+        util[feriados_np.astype(np.int64) - dia_inicio] = False
+
+        self._feriados = feriados_np
+        self._dia0 = dia_inicio
+        self._util = util
+        # _antes[i] = quantidade de dias úteis estritamente antes do dia i
+        self._antes = np.concatenate(([0], np.cumsum(util, dtype=np.int64)))
+        # Posição (índice no array denso) de cada dia útil, em ordem
+        self._posicoes_uteis = np.flatnonzero(util)
+
+    def __reduce__(self):
+        # Serializa só os feriados e o intervalo: os índices são reconstruídos
+        data_inicio = str(np.datetime64(self._dia0, "D"))
+        data_fim = str(np.datetime64(self._dia0 + len(self._util) - 1, "D"))
+        return (Calendario, (self._feriados, data_inicio, data_fim))
+
+    # ==================== CONVERSÕES ====================
+
+    @staticmethod
+    def _e_escalar(datas) -> bool:
+        return isinstance(datas, (pd.Timestamp, datetime.date, str, np.datetime64))
+
+    def _indices(self, datas) -> Tuple[np.ndarray, bool]:
+        """Converte datas para índices no array denso."""
+        if isinstance(datas, pd.Timestamp):
+            idx = np.asarray(datas.value // _NS_POR_DIA - self._dia0)
+            escalar = True
+        else:
+            escalar = self._e_escalar(datas)
+            valores = pd.to_datetime(datas if not escalar else [datas])
+            idx = np.asarray(valores.values.astype("datetime64[ns]").astype(np.int64))
+            idx = idx // _NS_POR_DIA - self._dia0
+
+        if idx.size and (idx.min() < 0 or idx.max() >= len(self._util)):
+            raise ValueError("Data fora do intervalo coberto pelo calendário.")
+
+        return (idx.reshape(()) if escalar else idx), escalar
+
+    def _para_datas(self, idx: np.ndarray, escalar: bool):
+        """Converte índices do array denso de volta para datas."""
+        ns = (np.asarray(idx, dtype=np.int64) + self._dia0) * _NS_POR_DIA
+        if escalar:
+            return pd.Timestamp(int(ns))
+        return pd.DatetimeIndex(ns.astype("datetime64[ns]"))
+
+    def _contar(self, i: np.ndarray, f: np.ndarray) -> np.ndarray:
+        """
+        Contagem de dias úteis entre índices, com a convenção de np.busday_count:
+        [i, f) quando f >= i e -(f, i] quando f < i.
+        """
+        return np.where(
+            f >= i,
+            self._antes[f] - self._antes[i],
+            self._antes[f + 1] - self._antes[i + 1],
+        )
+
+    # ==================== CONSULTAS ====================
+
+    @property
+    def feriados(self) -> np.ndarray:
+        """Feriados do calendário (datetime64[D], ordenados)."""
+        return self._feriados
+
+    def e_dia_util(self, datas):
+        """
+        Verifica se a(s) data(s) é(são) dia(s) útil(eis).
+
+        Args:
+            datas: Data ou array de datas
+
+        Returns:
+            bool (ou array de bool)
+        """
+        idx, escalar = self._indices(datas)
+        res = self._util[idx]
+        return bool(res) if escalar else res
+
+    def contar_dias_uteis(self, data_inicio, data_fim):
+        """
+        Conta os dias úteis em [data_inicio, data_fim), como np.busday_count.
+
+        Args:
+            data_inicio: Data inicial (escalar ou array)
+            data_fim: Data final (escalar ou array)
+
+        Returns:
+            int (ou array de int); negativo se data_fim < data_inicio
+        """
+        i, escalar_i = self._indices(data_inicio)
+        f, escalar_f = self._indices(data_fim)
+        res = self._contar(i, f)
+        return int(res) if (escalar_i and escalar_f) else res
+
+    def dias_uteis(self, data_inicio, data_fim):
+        """
+        Número de dias úteis entre duas datas, com a mesma convenção de
+        dias_trabalho_total (a data inicial não é contada se for dia útil).
+
+        Args:
+            data_inicio: Data inicial (escalar ou array)
+            data_fim: Data final (escalar ou array)
+
+        Returns:
+            int (ou array de int)
+        """
+        i, escalar_i = self._indices(data_inicio)
+        f, escalar_f = self._indices(data_fim)
+        res = self._contar(i, f) + self._util[i] - 1
+        return int(res) if (escalar_i and escalar_f) else res
+
+    def adicionar_dias_uteis(self, datas, n_dias: int):
+        """
+        Adiciona n dias úteis, com a mesma convenção de
+        pd.offsets.CustomBusinessDay (datas não úteis rolam para o dia útil
+        seguinte ao somar e para o anterior ao subtrair).
+
+        Args:
+            datas: Data ou array de datas
+            n_dias: Número de dias úteis (pode ser negativo ou zero)
+
+        Returns:
+            pd.Timestamp (ou pd.DatetimeIndex)
+        """
+        idx, escalar = self._indices(datas)
+        k = self._antes[idx] + n_dias
+        if n_dias > 0:
+            k = k - (~self._util[idx])
+
+        if np.any(k < 0) or np.any(k >= len(self._posicoes_uteis)):
+            raise ValueError("Resultado fora do intervalo coberto pelo calendário.")
+
+        resultado = self._para_datas(self._posicoes_uteis[k], escalar)
+
+        # Preserva o horário, como o offset do pandas
+        if escalar:
+            data = pd.Timestamp(datas)
+            if data != data.normalize():
+                resultado = resultado + (data - data.normalize())
+        return resultado
+
+    def proximo_dia_util(self, datas):
+        """
+        Ajusta cada data para o próximo dia útil se não for dia útil.
+
+        Args:
+            datas: Data ou array de datas
+
+        Returns:
+            pd.Timestamp (ou pd.DatetimeIndex)
+        """
+        idx, escalar = self._indices(datas)
+        return self._para_datas(self._posicoes_uteis[self._antes[idx]], escalar)
+
+    def listar_dias_uteis(self, data_inicio, data_fim) -> pd.DatetimeIndex:
+        """
+        Lista os dias úteis entre data_inicio e data_fim (inclusive).
+
+        Args:
+            data_inicio: Data inicial
+            data_fim: Data final
+
+        Returns:
+            DatetimeIndex com os dias úteis
+        """
+        i, _ = self._indices(data_inicio)
+        f, _ = self._indices(data_fim)
+        k_ini = self._antes[i]
+        k_fim = self._antes[f + 1]
+        return self._para_datas(self._posicoes_uteis[k_ini:k_fim], False)
+
+
+# Calendários já construídos para listas de feriados: {id(lista): (lista, tamanho, Calendario)}
+_CALENDARIOS: Dict[int, Tuple[list, int, Calendario]] = {}
+_MAX_CALENDARIOS = 8
+
+
+def obter_calendario(feriados: Optional[List] = None) -> Calendario:
+    """
+    Retorna um Calendario para os feriados informados.
+
+    Aceita um Calendario (retornado como está), uma lista de feriados
+    (o Calendario é construído uma vez e reaproveitado enquanto a mesma
+    lista for passada) ou None (carrega os feriados automaticamente).
+
+    Args:
+        feriados: Calendario, lista de feriados ou None
+
+    Returns:
+        Calendario correspondente
+    """
+    if isinstance(feriados, Calendario):
+        return feriados
+
+    feriados = _carregar_feriados_se_necessario(feriados)
+    if isinstance(feriados, Calendario):
+        return feriados
+
+    chave = id(feriados)
+    item = _CALENDARIOS.get(chave)
+    if item is not None and item[0] is feriados and item[1] == len(feriados):
+        return item[2]
+
+    calendario = Calendario(feriados)
+    if len(_CALENDARIOS) >= _MAX_CALENDARIOS:
+        _CALENDARIOS.pop(next(iter(_CALENDARIOS)))
+    _CALENDARIOS[chave] = (feriados, len(feriados), calendario)
+    return calendario
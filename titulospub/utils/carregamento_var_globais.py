@@ -1,39 +1,42 @@
+from titulospub.utils.instrumentacao import registrar_acesso_implicito
+
+
 def _carregar_feriados_se_necessario(feriados):
     """
-    Se feriados for None, busca do orquestrador.
+    Se feriados for None, busca do snapshot de mercado do processo.
     """
     if feriados is None:
-        from titulospub.dados.orquestrador import VariaveisMercado
-        vm = VariaveisMercado()
-        feriados = vm.get_feriados()
+        from titulospub.dados.snapshot import get_snapshot
+        registrar_acesso_implicito("feriados")
+        feriados = get_snapshot().get_feriados()
     return feriados
 
 def _carrecar_ipca_dict_se_necessario(ipca_dict):
     """
-    Se ipca_dict for None, busca do orquestrador.
+    Se ipca_dict for None, busca do snapshot de mercado do processo.
     """
     if ipca_dict is None:
-        from titulospub.dados.orquestrador import VariaveisMercado
-        vm = VariaveisMercado()
-        ipca_dict = vm.get_ipca_dict()
+        from titulospub.dados.snapshot import get_snapshot
+        registrar_acesso_implicito("ipca_dict")
+        ipca_dict = get_snapshot().get_ipca_dict()
     return ipca_dict
 
 def _carrecar_cdi_se_necessario(cdi):
     """
-    Se ipca_dict for None, busca do orquestrador.
+    Se cdi for None, busca do snapshot de mercado do processo.
     """
     if cdi is None:
-        from titulospub.dados.orquestrador import VariaveisMercado
-        vm = VariaveisMercado()
-        cdi = vm.get_cdi()
+        from titulospub.dados.snapshot import get_snapshot
+        registrar_acesso_implicito("cdi")
+        cdi = get_snapshot().get_cdi()
     return cdi
 
 def _carregar_vna_lft_se_necessario(vna_lft):
     """
-    Se vna_lft for None, busca do orquestrador.
+    Se vna_lft for None, busca do snapshot de mercado do processo.
     """
     if vna_lft is None:
-        from titulospub.dados.orquestrador import VariaveisMercado
-        vm = VariaveisMercado()
-        vna_lft = vm.get_vna_lft()
-    return vna_lft
\ No newline at end of file
+        from titulospub.dados.snapshot import get_snapshot
+        registrar_acesso_implicito("vna_lft")
+        vna_lft = get_snapshot().get_vna_lft()
+    return vna_lft
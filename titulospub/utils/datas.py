@@ -3,7 +3,7 @@ from typing import List, Optional
 import numpy as np
 import pandas as pd
 
-from titulospub.utils.carregamento_var_globais import _carregar_feriados_se_necessario
+from titulospub.utils.calendario import obter_calendario
 
 
 def adicionar_dias_uteis(
@@ -15,14 +15,13 @@ def adicionar_dias_uteis(
     Args:
         data: Data base
         n_dias: Número de dias úteis a adicionar
-        feriados: Lista opcional de feriados (se None, carrega automaticamente)
+        feriados: Lista opcional de feriados ou Calendario (se None, carrega automaticamente)
 
     Returns:
         Data resultante após adicionar n dias úteis
     """
-    feriados = _carregar_feriados_se_necessario(feriados)
-    custom_bday = pd.offsets.CustomBusinessDay(holidays=feriados)
-    return data + n_dias * custom_bday
+    calendario = obter_calendario(feriados)
+    return calendario.adicionar_dias_uteis(data, n_dias)
 
 
 def e_dia_util(data: pd.Timestamp, feriados: Optional[List] = None) -> bool:
@@ -31,13 +30,13 @@ def e_dia_util(data: pd.Timestamp, feriados: Optional[List] = None) -> bool:
 
     Args:
         data: Data a verificar
-        feriados: Lista opcional de feriados (se None, carrega automaticamente)
+        feriados: Lista opcional de feriados ou Calendario (se None, carrega automaticamente)
 
     Returns:
         True se for dia útil, False caso contrário
     """
-    feriados = _carregar_feriados_se_necessario(feriados)
-    return data.weekday() < 5 and data not in feriados
+    calendario = obter_calendario(feriados)
+    return calendario.e_dia_util(data)
 
 
 def dias_trabalho_total(
@@ -49,20 +48,13 @@ def dias_trabalho_total(
     Args:
         data_inicio: Data inicial
         data_fim: Data final
-        feriados: Lista opcional de feriados (se None, carrega automaticamente)
+        feriados: Lista opcional de feriados ou Calendario (se None, carrega automaticamente)
 
     Returns:
         Número de dias úteis entre as datas
     """
-    feriados = _carregar_feriados_se_necessario(feriados)
-    data_inicio_str = data_inicio.strftime("%Y-%m-%d")
-    data_fim_str = data_fim.strftime("%Y-%m-%d")
-    feriados_str = pd.to_datetime(feriados).strftime("%Y-%m-%d").tolist()
-
-    dias_uteis = np.busday_count(data_inicio_str, data_fim_str, holidays=feriados_str)
-    if np.is_busday(data_inicio_str, holidays=feriados_str):
-        dias_uteis += 1
-    return dias_uteis - 1
+    calendario = obter_calendario(feriados)
+    return calendario.dias_uteis(data_inicio, data_fim)
 
 
 def listar_dias_entre_datas(
@@ -74,19 +66,13 @@ def listar_dias_entre_datas(
     Args:
         data_liquidacao: Data de liquidação
         datas: Array de datas
-        feriados: Lista opcional de feriados (se None, carrega automaticamente)
+        feriados: Lista opcional de feriados ou Calendario (se None, carrega automaticamente)
 
     Returns:
         Array com número de dias úteis para cada data
     """
-    feriados = _carregar_feriados_se_necessario(feriados)
-    data_inicio = data_liquidacao + pd.Timedelta(days=1)
-    return np.array(
-        [
-            dias_trabalho_total(data_inicio - pd.Timedelta(days=1), data_fim, feriados)
-            for data_fim in datas
-        ]
-    )
+    calendario = obter_calendario(feriados)
+    return np.asarray(calendario.dias_uteis(data_liquidacao, pd.to_datetime(datas)))
 
 
 def ajustar_para_proximo_dia_util(
@@ -97,22 +83,13 @@ def ajustar_para_proximo_dia_util(
 
     Args:
         datas: Array de datas a ajustar
-        feriados: Lista opcional de feriados (se None, carrega automaticamente)
+        feriados: Lista opcional de feriados ou Calendario (se None, carrega automaticamente)
 
     Returns:
         DatetimeIndex com datas ajustadas
     """
-    feriados = _carregar_feriados_se_necessario(feriados)
-    datas_ajustadas = []
-    for data in datas:
-        if e_dia_util(data, feriados):
-            datas_ajustadas.append(data)
-        else:
-            data_ajustada = data
-            while not e_dia_util(data_ajustada, feriados):
-                data_ajustada += pd.Timedelta(days=1)
-            datas_ajustadas.append(data_ajustada)
-    return pd.to_datetime(datas_ajustadas)
+    calendario = obter_calendario(feriados)
+    return calendario.proximo_dia_util(pd.to_datetime(datas))
 
 
 def listar_datas(
@@ -124,26 +101,15 @@ def listar_datas(
     Args:
         data_inicio: Data inicial
         data_fim: Data final
-        feriados: Lista opcional de feriados (se None, carrega automaticamente)
+        feriados: Lista opcional de feriados ou Calendario (se None, carrega automaticamente)
 
     Returns:
         Lista de timestamps representando dias úteis
     """
-    feriados = _carregar_feriados_se_necessario(feriados=feriados)
-    lista_datas = []
-
-    d = data_inicio
-
-    while d <= data_fim:
-
-        if e_dia_util(d, feriados):
-            lista_datas.append(d)
-        else:
-            pass
-
-        d = adicionar_dias_uteis(data=d, n_dias=1, feriados=feriados)
-
-    return lista_datas
+    calendario = obter_calendario(feriados)
+    if data_fim < data_inicio:
+        return []
+    return list(calendario.listar_dias_uteis(data_inicio, data_fim))
 
 
 def data_vencimento_ajustada(
@@ -154,17 +120,17 @@ def data_vencimento_ajustada(
 
     Args:
         data: Data de vencimento
-        feriados: Lista opcional de feriados (se None, carrega automaticamente)
+        feriados: Lista opcional de feriados ou Calendario (se None, carrega automaticamente)
 
     Returns:
         Data ajustada para dia útil
     """
-    feriados = _carregar_feriados_se_necessario(feriados)
+    calendario = obter_calendario(feriados)
 
     return (
         data
-        if e_dia_util(data=data, feriados=feriados)
-        else adicionar_dias_uteis(data=data, n_dias=1, feriados=feriados)
+        if calendario.e_dia_util(data)
+        else calendario.adicionar_dias_uteis(data, 1)
     )
 
 
@@ -181,12 +147,12 @@ def datas_pagamento_cupons(
         data_vencimento: Data de vencimento do título
         data_liquidacao: Data de liquidação
         frequencia: Frequência de pagamento de cupons por ano (padrão: 2 = semestral)
-        feriados: Lista opcional de feriados (se None, carrega automaticamente)
+        feriados: Lista opcional de feriados ou Calendario (se None, carrega automaticamente)
 
     Returns:
         DatetimeIndex com datas de pagamento de cupons ajustadas
     """
-    feriados = _carregar_feriados_se_necessario(feriados)
+    calendario = obter_calendario(feriados)
 
     intervalo_meses = 12 // frequencia
     datas = []
@@ -194,8 +160,69 @@ def datas_pagamento_cupons(
     while data_prox_cupom >= data_liquidacao:
         datas.append(data_prox_cupom)
         data_prox_cupom -= pd.DateOffset(months=intervalo_meses)
-    return ajustar_para_proximo_dia_util(datas=np.array(datas[::-1]), feriados=feriados)
+    return calendario.proximo_dia_util(pd.to_datetime(datas[::-1]))
+
+
+
+def matriz_datas_cupons(
+    data_liquidacao: pd.Timestamp,
+    vencimentos,
+    frequencia: int = 2,
+    feriados: Optional[List] = None,
+) -> tuple:
+    """
+    Gera as datas de pagamento de cupons de vários vencimentos de uma vez,
+    em uma matriz preenchida (uma linha por vencimento).
+
+    Cada linha contém as mesmas datas de datas_pagamento_cupons para o
+    vencimento correspondente, em ordem crescente e alinhadas à esquerda;
+    as posições excedentes ficam com NaT.
+
+    Args:
+        data_liquidacao: Data de liquidação
+        vencimentos: Array de datas de vencimento
+        frequencia: Frequência de pagamento de cupons por ano (padrão: 2 = semestral)
+        feriados: Lista opcional de feriados ou Calendario (se None, carrega automaticamente)
+
+    Returns:
+        Tupla (datas, mascara, n_cupons): matriz datetime64[ns] de datas
+        ajustadas para dias úteis, matriz booleana das posições válidas e
+        array com o número de cupons de cada vencimento
+    """
+    calendario = obter_calendario(feriados)
+    intervalo_meses = 12 // frequencia
+    data_liquidacao = pd.Timestamp(data_liquidacao)
+    vencimentos = pd.DatetimeIndex(pd.to_datetime(vencimentos)).normalize()
+
+    # Meses contados desde 1970-01
+    meses_venc = np.asarray((vencimentos.year - 1970) * 12 + (vencimentos.month - 1), dtype=np.int64)
+    meses_liq = (data_liquidacao.year - 1970) * 12 + (data_liquidacao.month - 1)
+    n_colunas = max(int(np.max(meses_venc, initial=meses_liq)) - meses_liq, 0) // intervalo_meses + 2
+
+    # Recuo de intervalo_meses em intervalo_meses: o dia é limitado ao fim de
+    # cada mês e, como nas subtrações sucessivas de DateOffset, não volta a crescer
+    inicio_mes = (meses_venc[:, None] - intervalo_meses * np.arange(n_colunas)).astype("datetime64[M]")
+    dias_no_mes = (
+        (inicio_mes + 1).astype("datetime64[D]") - inicio_mes.astype("datetime64[D]")
+    ).astype(np.int64)
+    dia = np.minimum.accumulate(
+        np.minimum(np.asarray(vencimentos.day)[:, None], dias_no_mes), axis=1
+    )
+    datas = (inicio_mes.astype("datetime64[D]") + (dia - 1)).astype("datetime64[ns]")
+
+    n_cupons = (datas >= np.datetime64(data_liquidacao)).sum(axis=1)
+
+    # Reordena cada linha em ordem crescente, alinhada à esquerda
+    indices = n_cupons[:, None] - 1 - np.arange(n_colunas)
+    mascara = indices >= 0
+    datas = np.take_along_axis(datas, np.clip(indices, 0, None), axis=1)
+
+    datas[mascara] = np.asarray(
+        calendario.proximo_dia_util(pd.DatetimeIndex(datas[mascara])), dtype="datetime64[ns]"
+    )
+    datas[~mascara] = np.datetime64("NaT")
 
+    return datas, mascara, n_cupons
 
 # Teste local
 if __name__ == "__main__":
@@ -0,0 +1,186 @@
+"""
+Instrumentação de cargas implícitas de dados de mercado.
+
+Uma carga implícita acontece quando uma função recebe None em um parâmetro de
+mercado (feriados, ipca_dict, cdi, vna_lft) e resolve o valor sozinha, ou
+quando o snapshot do processo precisa buscar uma fonte em disco/rede sem ter
+sido aquecido. Este módulo conta e cronometra esses eventos por fonte e por
+função chamadora, e oferece um modo estrito que transforma qualquer carga
+implícita com I/O em erro.
+
+O modo estrito pode ser ligado pela variável de ambiente
+TITULOSPUB_MODO_ESTRITO=1 ou pelo context manager modo_estrito().
+"""
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+VARIAVEL_AMBIENTE_ESTRITO = "TITULOSPUB_MODO_ESTRITO"
+
+# Módulos ignorados ao identificar a função chamadora
+_MODULOS_INTERNOS = {
+    __name__,
+    "titulospub.utils.carregamento_var_globais",
+    "titulospub.utils.calendario",
+    "titulospub.dados.snapshot",
+    "contextlib",
+}
+
+_estrito: ContextVar[Optional[bool]] = ContextVar("titulospub_modo_estrito", default=None)
+_aquecendo: ContextVar[bool] = ContextVar("titulospub_aquecendo", default=False)
+
+# {(fonte, funcao): {"acessos": int, "cargas": int, "tempo": float}}
+_estatisticas: Dict[Tuple[str, str], Dict[str, float]] = {}
+_lock = threading.Lock()
+
+
+class CargaImplicitaError(RuntimeError):
+    """Erro levantado no modo estrito quando há carga implícita de dados de mercado."""
+
+
+# ==================== MODO ESTRITO ====================
+
+def modo_estrito_ativo() -> bool:
+    """
+    Indica se o modo estrito está ativo no contexto atual.
+
+    Returns:
+        True se ativado pelo context manager ou pela variável de ambiente
+    """
+    valor = _estrito.get()
+    if valor is not None:
+        return valor
+    return os.environ.get(VARIAVEL_AMBIENTE_ESTRITO, "").strip().lower() in ("1", "true", "sim", "yes")
+
+
+@contextmanager
+def modo_estrito(ativo: bool = True):
+    """
+    Liga (ou desliga) o modo estrito dentro do bloco.
+
+    Args:
+        ativo: True para levantar CargaImplicitaError em cargas implícitas
+    """
+    token = _estrito.set(ativo)
+    try:
+        yield
+    finally:
+        _estrito.reset(token)
+
+
+@contextmanager
+def aquecimento():
+    """
+    Marca o bloco como aquecimento explícito: cargas feitas aqui não são
+    implícitas e não disparam o modo estrito.
+    """
+    token = _aquecendo.set(True)
+    try:
+        yield
+    finally:
+        _aquecendo.reset(token)
+
+
+# ==================== REGISTRO ====================
+
+def _funcao_chamadora() -> str:
+    """Identifica a primeira função fora dos módulos de carregamento."""
+    frame = sys._getframe(1)
+    while frame is not None:
+        modulo = frame.f_globals.get("__name__", "")
+        if modulo not in _MODULOS_INTERNOS:
+            nome = getattr(frame.f_code, "co_qualname", frame.f_code.co_name)
+            return f"{modulo}.{nome}"
+        frame = frame.f_back
+    return "<desconhecida>"
+
+
+def _registrar(fonte: str, funcao: str, acessos: int = 0, cargas: int = 0, tempo: float = 0.0):
+    with _lock:
+        item = _estatisticas.setdefault((fonte, funcao), {"acessos": 0, "cargas": 0, "tempo": 0.0})
+        item["acessos"] += acessos
+        item["cargas"] += cargas
+        item["tempo"] += tempo
+
+
+def registrar_acesso_implicito(fonte: str):
+    """
+    Registra que uma função recebeu None e resolveu a fonte implicitamente.
+
+    Args:
+        fonte: Nome da fonte (feriados, ipca_dict, cdi, vna_lft, anbimas, bmf)
+    """
+    _registrar(fonte, _funcao_chamadora(), acessos=1)
+
+
+@contextmanager
+def medir_carga(fonte: str):
+    """
+    Envolve uma carga de fonte com I/O (disco ou rede), cronometrando-a.
+
+    No modo estrito, fora de um bloco de aquecimento, levanta
+    CargaImplicitaError antes de qualquer I/O.
+
+    Args:
+        fonte: Nome da fonte carregada
+    """
+    if _aquecendo.get():
+        yield
+        return
+
+    funcao = _funcao_chamadora()
+    if modo_estrito_ativo():
+        raise CargaImplicitaError(
+            f"Carga implícita de '{fonte}' em {funcao} com o modo estrito ativo."
+        )
+
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        _registrar(fonte, funcao, cargas=1, tempo=time.perf_counter() - inicio)
+
+
+# ==================== CONSULTA ====================
+
+def estatisticas_cargas() -> List[dict]:
+    """
+    Retorna as estatísticas acumuladas de acessos e cargas implícitas.
+
+    Returns:
+        Lista de dicionários com fonte, funcao, acessos, cargas e tempo_s,
+        ordenada pelo tempo total de carga (maior primeiro)
+    """
+    with _lock:
+        itens = [
+            {
+                "fonte": fonte,
+                "funcao": funcao,
+                "acessos": int(valores["acessos"]),
+                "cargas": int(valores["cargas"]),
+                "tempo_s": valores["tempo"],
+            }
+            for (fonte, funcao), valores in _estatisticas.items()
+        ]
+    return sorted(itens, key=lambda item: (-item["tempo_s"], item["fonte"], item["funcao"]))
+
+
+def total_cargas_implicitas() -> int:
+    """
+    Número total de cargas implícitas com I/O registradas.
+
+    Returns:
+        Soma das cargas de todas as fontes
+    """
+    with _lock:
+        return int(sum(valores["cargas"] for valores in _estatisticas.values()))
+
+
+def resetar_estatisticas():
+    """Zera as estatísticas acumuladas."""
+    with _lock:
+        _estatisticas.clear()